@@ -0,0 +1,420 @@
+"""
+Background backfill jobs.
+
+A backfill job computes and stores the daily reports of one organization over a date range.
+Jobs are persisted in the `backfill_jobs` table with their status and progress, so the API
+returns a job id immediately, progress can be polled, and jobs interrupted by a restart are
+resumed on startup. With REPORT_QUEUE_ENABLED=true, jobs are handed to the report workers
+as `backfill` tasks instead of running in the API process (see report_queue.py).
+
+A job only runs in the process holding its lease (`locked_by` / `lease_expires_at`, renewed
+every third of BACKFILL_LEASE_SECONDS while it runs), so several API workers or replicas
+resuming the same job at startup run it once. A job whose process died is taken over once
+its lease expires: on the next startup, or by the scheduler leader's heartbeat.
+
+The range is split into chunks of BACKFILL_BATCH_DAYS days (one grouped ClickHouse query
+each, see scheduler.generate_daily_reports_batch) and at most BACKFILL_CONCURRENCY chunks
+run at once. Days that already have a complete report are skipped, which is also what makes
+a resumed job pick up where it stopped; days whose report is degraded are rebuilt. Cancellation, and whether this process still holds
+the lease, are checked before each chunk.
+
+Command line (runs a job in the foreground with the same engine):
+    python -m backfill --org-id <org_id> --start 2025-01-01 --end 2025-03-31
+    python -m backfill --resume <job_id>
+
+Configuration via environment variables:
+- BACKFILL_BATCH_DAYS: Days computed per ClickHouse query (default: 31)
+- BACKFILL_CONCURRENCY: Chunks computed at once per job (default: 2)
+- BACKFILL_LEASE_SECONDS: Job lease duration, renewed every third of it (default: 120)
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import socket
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+
+if __name__ == "__main__":
+    # Load `.env` before storage reads DATABASE_URL at import time
+    load_dotenv(dotenv_path=Path(__file__).parent / ".env", override=False)
+
+from storage import (
+    BackfillJob,
+    Organization,
+    claim_backfill_job,
+    create_backfill_job,
+    ensure_db_initialized,
+    get_all_report_dates,
+    get_backfill_job,
+    get_backfill_jobs,
+    get_organization,
+    log_scheduler_run,
+    release_backfill_job,
+    renew_backfill_job_lease,
+    request_backfill_job_cancel,
+    update_backfill_job,
+)
+from scheduler import generate_daily_report_for_org, generate_daily_reports_batch
+from report_queue import TASK_BACKFILL, enqueue_task, is_report_queue_enabled
+
+logger = logging.getLogger(__name__)
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_SUCCEEDED = "succeeded"
+STATUS_PARTIAL = "partial"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_RUNNING)
+
+# Lease holder prefix of this process; each run of a job adds its own suffix
+_instance_id = f"{socket.gethostname()}:{os.getpid()}"
+
+# Jobs running in this process: job id -> thread
+_running_jobs: Dict[int, threading.Thread] = {}
+_running_jobs_lock = threading.Lock()
+
+
+def get_backfill_batch_days() -> int:
+    """Get number of days computed per ClickHouse query when backfilling."""
+    return max(1, int(os.getenv("BACKFILL_BATCH_DAYS", "31")))
+
+
+def get_backfill_concurrency() -> int:
+    """Get number of chunks a backfill job computes at once."""
+    return max(1, int(os.getenv("BACKFILL_CONCURRENCY", "2")))
+
+
+def get_backfill_lease_seconds() -> float:
+    """Get the backfill job lease duration; the lease is renewed every third of it."""
+    return max(3.0, float(os.getenv("BACKFILL_LEASE_SECONDS", "120")))
+
+
+def _job_dates(job: BackfillJob) -> List[str]:
+    start = datetime.fromisoformat(job.start_date).date()
+    end = datetime.fromisoformat(job.end_date).date()
+    dates = []
+    current = start
+    while current <= end:
+        dates.append(current.isoformat())
+        current += timedelta(days=1)
+    return dates
+
+
+def _run_chunk(org: Organization, dates: List[str], existing_dates: Set[str]) -> Tuple[List[str], List[str]]:
+    """
+    Generate the missing reports of one chunk. Returns (done, failed) dates; days that
+    already had a report count as done.
+    """
+    missing = [d for d in dates if d not in existing_dates]
+    saved: Set[str] = set()
+    try:
+        saved = set(generate_daily_reports_batch(org, missing))
+    except Exception as e:
+        # Fall back to one day at a time (with per-day retries) for this chunk
+        logger.exception("Batch backfill failed for %s (%s to %s), retrying per day: %s",
+                         org.name, dates[0], dates[-1], e)
+        for date_str in missing:
+            if generate_daily_report_for_org(org, date_str) is not None:
+                saved.add(date_str)
+
+    done = [d for d in dates if d in existing_dates or d in saved]
+    failed = [d for d in missing if d not in saved]
+    return done, failed
+
+
+def _cancel_requested(job_id: int) -> bool:
+    job = get_backfill_job(job_id)
+    return job is None or job.cancel_requested
+
+
+def _keep_lease(job_id: int, holder: str, done: threading.Event, lost: threading.Event) -> None:
+    """Renew the job's lease until `done` is set; sets `lost` if another process takes the job over."""
+    lease = get_backfill_lease_seconds()
+    while not done.wait(lease / 3):
+        try:
+            if not renew_backfill_job_lease(job_id, holder, lease):
+                logger.warning("Lost the lease on backfill job %s", job_id)
+                lost.set()
+                return
+        except Exception as e:
+            logger.warning("Could not renew lease on backfill job %s: %s", job_id, e)
+
+
+def run_backfill_job(job_id: int) -> Optional[BackfillJob]:
+    """
+    Run (or resume) a backfill job to completion in the calling thread, unless another process
+    holds its lease. Progress is saved after every chunk. Returns the final job (as stored, if
+    it is running elsewhere), or None if it does not exist.
+    """
+    job = get_backfill_job(job_id)
+    if not job:
+        logger.error("Backfill job %s not found", job_id)
+        return None
+    if job.status not in ACTIVE_STATUSES:
+        logger.info("Backfill job %s is already %s", job_id, job.status)
+        return job
+
+    holder = f"{_instance_id}:{uuid.uuid4().hex[:8]}"
+    if not claim_backfill_job(job.id, holder, get_backfill_lease_seconds()):
+        logger.info("Backfill job %s is running in %s, not starting it here", job_id, job.locked_by)
+        return job
+
+    done = threading.Event()
+    lease_lost = threading.Event()
+    renewer = threading.Thread(target=_keep_lease, args=(job.id, holder, done, lease_lost),
+                               name=f"backfill-lease-{job.id}", daemon=True)
+    renewer.start()
+    try:
+        return _run_claimed_job(job, lease_lost)
+    finally:
+        done.set()
+        release_backfill_job(job.id, holder)
+
+
+def _run_claimed_job(job: BackfillJob, lease_lost: threading.Event) -> BackfillJob:
+    """
+    Run a job whose lease this process holds (see run_backfill_job). Once `lease_lost` is set,
+    no further chunk is started and the job's progress is left to the process that took it over.
+    """
+    org = get_organization(job.org_id)
+    if not org:
+        job.status = STATUS_FAILED
+        job.error_message = f"Organization {job.org_id} not found"
+        return update_backfill_job(job)
+
+    dates = _job_dates(job)
+    batch_days = get_backfill_batch_days()
+    chunks = [dates[i:i + batch_days] for i in range(0, len(dates), batch_days)]
+
+    # Progress is recounted from scratch: on resume, already-saved days are skipped as done
+    job.status = STATUS_RUNNING
+    job.days_total = len(dates)
+    job.days_done = 0
+    job.days_failed = 0
+    job.failed_dates = []
+    job.error_message = None
+    update_backfill_job(job)
+    logger.info("Running backfill job %s for %s: %d days in %d chunks", job.id, org.name, len(dates), len(chunks))
+
+    cancelled = False
+    progress_lock = threading.Lock()
+
+    def process(chunk: List[str]) -> Optional[Tuple[List[str], List[str]]]:
+        if lease_lost.is_set() or _cancel_requested(job.id):
+            return None
+        return _run_chunk(org, chunk, existing_dates)
+
+    try:
+        # Degraded reports are rebuilt, like the scheduler regenerates them
+        existing_dates = set(get_all_report_dates(org.org_id, include_degraded=False))
+
+        with ThreadPoolExecutor(max_workers=get_backfill_concurrency(), thread_name_prefix=f"backfill-{job.id}") as pool:
+            futures = [pool.submit(process, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                result = future.result()
+                if result is None:
+                    cancelled = True
+                    continue
+                if lease_lost.is_set():
+                    continue
+                done, failed = result
+                with progress_lock:
+                    job.days_done += len(done)
+                    job.days_failed += len(failed)
+                    job.failed_dates = sorted(job.failed_dates + failed)
+                    update_backfill_job(job)
+
+        if cancelled:
+            job.status = STATUS_CANCELLED
+        elif job.days_failed == 0:
+            job.status = STATUS_SUCCEEDED
+        elif job.days_done > 0:
+            job.status = STATUS_PARTIAL
+        else:
+            job.status = STATUS_FAILED
+    except Exception as e:
+        logger.exception("Backfill job %s failed: %s", job.id, e)
+        job.status = STATUS_FAILED
+        job.error_message = str(e)
+
+    if lease_lost.is_set():
+        logger.warning("Stopped backfill job %s: another process took it over", job.id)
+        return get_backfill_job(job.id) or job
+
+    update_backfill_job(job)
+    log_scheduler_run(
+        "backfill",
+        "success" if job.status == STATUS_SUCCEEDED else ("error" if job.status == STATUS_FAILED else "partial"),
+        reports_generated=job.days_done,
+        error_message=job.error_message or (f"{job.days_failed} failed" if job.days_failed else None),
+    )
+    logger.info("Backfill job %s %s: %d done, %d failed, %d remaining",
+                job.id, job.status, job.days_done, job.days_failed, job.days_remaining)
+    return job
+
+
+def _start_job_thread(job_id: int) -> bool:
+    """Run a job on a background thread unless it is already running in this process."""
+    with _running_jobs_lock:
+        thread = _running_jobs.get(job_id)
+        if thread is not None and thread.is_alive():
+            return False
+
+        def target():
+            try:
+                run_backfill_job(job_id)
+            finally:
+                with _running_jobs_lock:
+                    _running_jobs.pop(job_id, None)
+
+        thread = threading.Thread(target=target, name=f"backfill-job-{job_id}", daemon=True)
+        _running_jobs[job_id] = thread
+        thread.start()
+        return True
+
+
+def create_job(org_id: str, start_date: str, end_date: str) -> BackfillJob:
+    """
+    Validate and persist a new backfill job (status queued) without starting it.
+
+    Raises:
+        ValueError: if the organization does not exist or the dates are invalid
+    """
+    if not get_organization(org_id):
+        raise ValueError(f"Organization {org_id} not found")
+    start = datetime.fromisoformat(start_date).date()
+    end = datetime.fromisoformat(end_date).date()
+    if start > end:
+        raise ValueError("start_date must be before end_date")
+
+    return create_backfill_job(BackfillJob(
+        id=None,
+        org_id=org_id,
+        start_date=start.isoformat(),
+        end_date=end.isoformat(),
+        days_total=(end - start).days + 1,
+    ))
+
+
+def _dispatch_job(job_id: int) -> bool:
+    """Queue the job for the report workers, or run it on a thread here without the queue."""
+    if is_report_queue_enabled():
+        enqueue_task(TASK_BACKFILL, payload={"job_id": job_id}, dedupe_key=f"backfill:{job_id}")
+        return True
+    return _start_job_thread(job_id)
+
+
+def start_backfill_job(org_id: str, start_date: str, end_date: str) -> BackfillJob:
+    """
+    Create a backfill job and run it in the background (or queue it for the report workers).
+
+    Raises:
+        ValueError: if the organization does not exist or the dates are invalid
+    """
+    job = create_job(org_id, start_date, end_date)
+    _dispatch_job(job.id)
+    return job
+
+
+def cancel_backfill_job(job_id: int) -> Optional[BackfillJob]:
+    """
+    Request cancellation of a job. A running job stops before its next chunk; a queued job
+    that no process has claimed yet is cancelled immediately.
+    """
+    job = request_backfill_job_cancel(job_id)
+    if not job:
+        return None
+    with _running_jobs_lock:
+        running_here = job_id in _running_jobs
+    leased = bool(job.locked_by) and (job.lease_expires_at or 0) > time.time()
+    if job.status == STATUS_QUEUED and not running_here and not leased:
+        job.status = STATUS_CANCELLED
+        update_backfill_job(job)
+    return job
+
+
+def resume_backfill_jobs() -> List[int]:
+    """
+    Restart queued/running jobs left over from a previous process (call on startup). Jobs whose
+    lease another process still holds are left to it. With the report queue enabled this only
+    queues jobs that have no task yet; the workers reclaim the tasks of jobs whose worker died.
+    """
+    resumed = []
+    for job in get_backfill_jobs(statuses=list(ACTIVE_STATUSES), limit=100):
+        if job.locked_by and (job.lease_expires_at or 0) > time.time():
+            continue
+        if job.cancel_requested:
+            job.status = STATUS_CANCELLED
+            update_backfill_job(job)
+            continue
+        if _dispatch_job(job.id):
+            resumed.append(job.id)
+    if resumed:
+        logger.info("Resumed backfill jobs: %s", resumed)
+    return resumed
+
+
+def job_to_dict(job: BackfillJob) -> Dict[str, Any]:
+    """JSON-friendly view of a job for the API and CLI."""
+    return {
+        "job_id": job.id,
+        "org_id": job.org_id,
+        "start_date": job.start_date,
+        "end_date": job.end_date,
+        "status": job.status,
+        "progress": {
+            "days_total": job.days_total,
+            "days_done": job.days_done,
+            "days_failed": job.days_failed,
+            "days_remaining": job.days_remaining,
+        },
+        "failed_dates": job.failed_dates,
+        "cancel_requested": job.cancel_requested,
+        "error_message": job.error_message,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backfill", description="Backfill daily reports for an organization.")
+    parser.add_argument("--org-id", help="Organization to backfill")
+    parser.add_argument("--start", help="First day to backfill (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Last day to backfill, inclusive (YYYY-MM-DD)")
+    parser.add_argument("--resume", type=int, metavar="JOB_ID", help="Resume an existing job instead of creating one")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+    ensure_db_initialized()
+
+    if args.resume is not None:
+        job_id = args.resume
+    else:
+        if not (args.org_id and args.start and args.end):
+            parser.error("--org-id, --start and --end are required unless --resume is given")
+        try:
+            job_id = create_job(args.org_id, args.start, args.end).id
+        except ValueError as e:
+            parser.error(str(e))
+
+    job = run_backfill_job(job_id)
+    if job is None:
+        print(json.dumps({"error": f"Backfill job {job_id} not found"}))
+        return 1
+    print(json.dumps(job_to_dict(job), indent=2))
+    return 0 if job.status == STATUS_SUCCEEDED else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""
+In-process result cache for the ClickHouse metric fetchers.
+
+Fetchers in db.py are wrapped with `@cached_metric("<name>")`. Results are keyed by the
+fetcher's QueryContext (org_id, broker/FBR node ids, excluded-numbers hash), start/end, query
+plan and query-definition hash, and held in an LRU with an entry count and a memory cap.
+
+TTL depends on whether the range can still change:
+- ranges ending before today (in the context's timezone) are complete -> CACHE_TTL_PAST_SECONDS
+- ranges touching today, or with no explicit range -> CACHE_TTL_RECENT_SECONDS
+Empty/None results get the short TTL, and results of a fetch whose query failed (the fetchers
+return None/[] on errors too, see db.track_query_errors) are not cached at all, so a retry
+runs the query again.
+
+Configuration via environment variables:
+- CACHE_ENABLED: 'true' (default) / 'false'
+- CACHE_MAX_ENTRIES: default 2048
+- CACHE_MAX_BYTES: default 67108864 (64 MB of pickled results)
+- CACHE_TTL_PAST_SECONDS: default 86400
+- CACHE_TTL_RECENT_SECONDS: default 300
+"""
+
+import os
+import time
+import pickle
+import hashlib
+import inspect
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, time as dt_time
+from functools import lru_cache, wraps
+from typing import Any, Callable, Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+
+def cache_enabled() -> bool:
+    return os.getenv("CACHE_ENABLED", "true").lower() in ("true", "1", "yes")
+
+
+def get_cache_max_entries() -> int:
+    return int(os.getenv("CACHE_MAX_ENTRIES", "2048"))
+
+
+def get_cache_max_bytes() -> int:
+    return int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+def get_ttl_past_seconds() -> int:
+    return int(os.getenv("CACHE_TTL_PAST_SECONDS", "86400"))
+
+
+def get_ttl_recent_seconds() -> int:
+    return int(os.getenv("CACHE_TTL_RECENT_SECONDS", "300"))
+
+
+class ResultCache:
+    """
+    Thread-safe LRU of pickled results with per-entry expiry.
+    Values are stored pickled, which both sizes them for the memory cap and hands every
+    caller its own copy.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple, Tuple[bytes, float, Optional[str]]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Tuple) -> Tuple[bool, Any]:
+        """Return (found, value)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            payload, expires_at, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return True, pickle.loads(payload)
+
+    def put(self, key: Tuple, value: Any, ttl_seconds: int, org_id: Optional[str]) -> None:
+        if ttl_seconds <= 0:
+            return
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (payload, time.monotonic() + ttl_seconds, org_id)
+            self._bytes += len(payload)
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: Tuple) -> None:
+        payload, _, _ = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+    def invalidate_org(self, org_id: str) -> int:
+        """Drop every entry for an org. Returns the number of entries removed."""
+        with self._lock:
+            keys = [k for k, (_, _, entry_org) in self._entries.items() if entry_org == org_id]
+            for k in keys:
+                self._remove(k)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> int:
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+            self.invalidations += removed
+            return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": cache_enabled(),
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+_cache: Optional[ResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Get or create the process-wide result cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResultCache(get_cache_max_entries(), get_cache_max_bytes())
+    return _cache
+
+
+def _parse_range_end(end_date: str, tz: ZoneInfo) -> datetime:
+    end = datetime.fromisoformat(end_date.strip().replace(" ", "T").replace("Z", "+00:00"))
+    return end if end.tzinfo else end.replace(tzinfo=tz)
+
+
+def ttl_for_range(start_date: Optional[str], end_date: Optional[str], tz_name: str) -> int:
+    """Long TTL for ranges that ended before today in tz_name, short TTL otherwise."""
+    if not (start_date and end_date):
+        return get_ttl_recent_seconds()  # default "last 30 days" window moves with now()
+    try:
+        tz = ZoneInfo(tz_name)
+        today_start = datetime.combine(datetime.now(tz).date(), dt_time.min, tzinfo=tz)
+        if _parse_range_end(end_date, tz) <= today_start:
+            return get_ttl_past_seconds()
+    except Exception as e:
+        logger.warning("Could not parse end_date %r for cache TTL: %s", end_date, e)
+    return get_ttl_recent_seconds()
+
+
+def _short_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+@lru_cache(maxsize=1)
+def _queries_source() -> str:
+    import queries
+    try:
+        return inspect.getsource(queries)
+    except (OSError, TypeError):
+        return ""
+
+
+def _definition_hash(fn: Callable) -> str:
+    """Hash of the fetcher and the query builders it uses, so edited queries miss old entries."""
+    try:
+        return _short_hash(inspect.getsource(fn) + _queries_source())
+    except (OSError, TypeError):
+        return _short_hash(fn.__qualname__ + _queries_source())
+
+
+def cached_metric(metric: str) -> Callable:
+    """Decorator for `fetch_*(start_date=None, end_date=None, ctx=None)` functions in db.py."""
+
+    def decorator(fn: Callable) -> Callable:
+        definition_hash = _definition_hash(fn)
+
+        @wraps(fn)
+        def wrapper(start_date: Optional[str] = None, end_date: Optional[str] = None, ctx=None):
+            if not cache_enabled():
+                return fn(start_date, end_date, ctx)
+
+            # Imported here: db.py imports this module to decorate its fetchers
+            from db import QueryContext, track_query_errors
+            from queries import get_query_plan
+
+            ctx = ctx or QueryContext.from_env()
+            key = (
+                metric,
+                ctx.org_id,
+                ctx.broker_node_persistent_id,
+                ctx.fbr_node_persistent_id,
+                start_date,
+                end_date,
+                _short_hash(ctx.excluded_user_numbers_sql()),
+                get_query_plan(),
+                definition_hash,
+            )
+            cache = get_result_cache()
+            found, value = cache.get(key)
+            if found:
+                return value
+
+            with track_query_errors() as errors:
+                value = fn(start_date, end_date, ctx)
+            if errors:
+                return value
+            ttl = ttl_for_range(start_date, end_date, ctx.timezone) if value else get_ttl_recent_seconds()
+            cache.put(key, value, ttl, ctx.org_id)
+            return value
+
+        wrapper.uncached = fn
+        return wrapper
+
+    return decorator
@@ -3,20 +3,29 @@
 from __future__ import annotations
 
 import os
-import sys
+import re
+import base64
 import logging
 import json
-from dataclasses import dataclass
-from typing import List, Optional, Tuple, Dict, Any
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from typing import List, Optional, Tuple, Dict, Any, Iterator, Sequence
 
 # pip install clickhouse-connect python-dateutil pytz
 import clickhouse_connect
+from clickhouse_connect.driver import httputil
+
+from cache import cached_metric
 
 # If you already have your own utilities, import them instead of these stubs:
 # from timezone_utils import get_time_filter, format_timestamp_for_display
 from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
 
-from queries import carrier_asked_transfer_over_total_transfer_attempt_stats_query, carrier_asked_transfer_over_total_call_attempts_stats_query, calls_ending_in_each_call_stage_stats_query, load_not_found_stats_query, load_status_stats_query, successfully_transferred_for_booking_stats_query, call_classifcation_stats_query, carrier_qualification_stats_query, pricing_stats_query, carrier_end_state_query, percent_non_convertible_calls_query, non_convertible_calls_with_carrier_not_qualified_query, non_convertible_calls_without_carrier_not_qualified_query, carrier_not_qualified_stats_query, number_of_unique_loads_query, list_of_unique_loads_query, number_of_unique_loads_query_broker_node, list_of_unique_loads_query_broker_node, calls_without_carrier_asked_for_transfer_query, total_calls_and_total_duration_query, duration_carrier_asked_for_transfer_query
+from queries import flat_data_fields_sql, flat_string_sql, carrier_asked_transfer_over_total_transfer_attempt_stats_query, carrier_asked_transfer_over_total_call_attempts_stats_query, calls_ending_in_each_call_stage_stats_query, load_not_found_stats_query, load_status_stats_query, successfully_transferred_for_booking_stats_query, call_classifcation_stats_query, carrier_qualification_stats_query, pricing_stats_query, carrier_end_state_query, percent_non_convertible_calls_query, non_convertible_calls_with_carrier_not_qualified_query, non_convertible_calls_without_carrier_not_qualified_query, carrier_not_qualified_stats_query, number_of_unique_loads_query, list_of_unique_loads_query, number_of_unique_loads_query_broker_node, list_of_unique_loads_query_broker_node, number_of_unique_loads_across_cutoff_query, calls_without_carrier_asked_for_transfer_query, total_calls_and_total_duration_query, duration_carrier_asked_for_transfer_query, daily_report_query, all_orgs_daily_report_query, daily_call_cube_query, unique_load_ids_by_day_query
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -24,9 +33,9 @@ logger.setLevel(logging.INFO)
 
 # ---- Config / Client ---------------------------------------------------------
 
-def get_clickhouse_client():
+def _clickhouse_config() -> Dict[str, Any]:
     """
-    Create a ClickHouse HTTP client from environment variables.
+    Resolve ClickHouse connection settings from environment variables.
     Supports both naming conventions:
     - CLICKHOUSE_URL or CLICKHOUSE_HOST
     - CLICKHOUSE_USERNAME or CLICKHOUSE_USER
@@ -35,7 +44,7 @@ def get_clickhouse_client():
     - CLICKHOUSE_SECURE (true/false for HTTPS)
     """
     from urllib.parse import urlparse
-    
+
     # Support both CLICKHOUSE_URL and CLICKHOUSE_HOST
     host_raw = os.getenv("CLICKHOUSE_URL") or os.getenv("CLICKHOUSE_HOST", "localhost:8123")
     # Support both CLICKHOUSE_USERNAME and CLICKHOUSE_USER
@@ -46,23 +55,6 @@ def get_clickhouse_client():
     secure_str = os.getenv("CLICKHOUSE_SECURE", "false").lower()
     is_secure = secure_str in ("true", "1", "yes")
 
-    # Debug: Log what env vars were found
-    has_url_env = os.getenv("CLICKHOUSE_URL") is not None
-    has_host_env = os.getenv("CLICKHOUSE_HOST") is not None
-    has_user_env = (os.getenv("CLICKHOUSE_USERNAME") is not None or 
-                    os.getenv("CLICKHOUSE_USER") is not None)
-    
-    logger.info("ClickHouse config - URL/HOST='%s' (from env: %s)", 
-                host_raw, "yes" if (has_url_env or has_host_env) else "no (using default)")
-    logger.info("ClickHouse config - USER='%s' (from env: %s)", 
-                user, "yes" if has_user_env else "no (using default)")
-    logger.info("ClickHouse config - SECURE=%s", is_secure)
-    
-    # Also print to stderr for immediate visibility
-    print(f"[DEBUG] CLICKHOUSE_URL/HOST from env: {has_url_env or has_host_env}, value: '{host_raw}'", file=sys.stderr)
-    print(f"[DEBUG] CLICKHOUSE_USERNAME/USER from env: {has_user_env}, value: '{user}'", file=sys.stderr)
-    print(f"[DEBUG] CLICKHOUSE_SECURE: {is_secure}", file=sys.stderr)
-
     # Parse host URL to extract hostname and port separately
     # Handle both formats: "http://localhost:8123" or "localhost:8123" or just "hostname"
     if "://" in host_raw:
@@ -84,20 +76,234 @@ def get_clickhouse_client():
             # Default ports: 8443 for HTTPS, 8123 for HTTP
             port = 8443 if is_secure else 8123
 
-    # Log final connection details
-    logger.info("Connecting to ClickHouse host=%s port=%s secure=%s db=%s user=%s", 
-                hostname, port, is_secure, database, user)
-
-    return clickhouse_connect.get_client(
-        host=hostname,
-        port=port,
-        username=user,
-        password=password,
-        database=database,
-        secure=is_secure,
-        connect_timeout=30,
-        send_receive_timeout=120,
-    )
+    return {
+        "host_raw": host_raw,
+        "host": hostname,
+        "port": port,
+        "username": user,
+        "password": password,
+        "database": database,
+        "secure": is_secure,
+    }
+
+
+def get_clickhouse_pool_size() -> int:
+    """Max number of concurrent ClickHouse clients (and keep-alive connections) per process."""
+    return max(1, int(os.getenv("CLICKHOUSE_POOL_SIZE", "8")))
+
+
+def get_clickhouse_ping_interval() -> int:
+    """Seconds a pooled client may sit idle before it is pinged on checkout."""
+    return int(os.getenv("CLICKHOUSE_POOL_PING_SECONDS", "60"))
+
+
+class ClickHouseClientPool:
+    """
+    Fixed-size pool of clickhouse-connect clients.
+
+    All clients share one urllib3 pool manager, so HTTP keep-alive connections (and their
+    TLS sessions) are reused across queries. Each client has its own ClickHouse session, so
+    a client is only ever used by one thread at a time; clients are created lazily up to `size`.
+    """
+
+    def __init__(self, config: Dict[str, Any], size: int):
+        self.config = config
+        self.size = size
+        self._pool_mgr = httputil.get_pool_manager(maxsize=size)
+        self._idle: "queue.LifoQueue[Tuple[Any, float]]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _new_client(self):
+        return clickhouse_connect.get_client(
+            host=self.config["host"],
+            port=self.config["port"],
+            username=self.config["username"],
+            password=self.config["password"],
+            database=self.config["database"],
+            secure=self.config["secure"],
+            connect_timeout=30,
+            send_receive_timeout=120,
+            pool_mgr=self._pool_mgr,
+        )
+
+    def _forget(self, client) -> None:
+        with self._lock:
+            self._created -= 1
+        try:
+            client.close()
+        except Exception:
+            pass
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Check out a client, creating one if the pool isn't full, else waiting for a free one."""
+        try:
+            client, last_used = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    return self._new_client()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            try:
+                client, last_used = self._idle.get(timeout=timeout)
+            except queue.Empty:
+                raise TimeoutError(f"No ClickHouse client available within {timeout}s (pool size {self.size})")
+
+        if time.monotonic() - last_used > get_clickhouse_ping_interval() and not client.ping():
+            logger.warning("Pooled ClickHouse client failed health ping, replacing it")
+            self._forget(client)
+            with self._lock:
+                self._created += 1
+            try:
+                return self._new_client()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        return client
+
+    def release(self, client) -> None:
+        """Return a client to the pool (closing it instead if the pool was shut down)."""
+        if self._closed:
+            self._forget(client)
+            return
+        self._idle.put((client, time.monotonic()))
+
+    @contextmanager
+    def client(self, timeout: Optional[float] = None):
+        client = self.acquire(timeout=timeout)
+        try:
+            yield client
+        finally:
+            self.release(client)
+
+    def close(self) -> None:
+        """Close idle clients; clients still checked out are closed when released."""
+        self._closed = True
+        while True:
+            try:
+                client, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._forget(client)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"size": self.size, "created": self._created, "idle": self._idle.qsize()}
+
+
+class PooledClickHouseClient:
+    """
+    Stand-in for a clickhouse-connect client that borrows a pooled client per call,
+    so existing `client = get_clickhouse_client(); client.query(...)` code keeps working.
+    """
+
+    def __init__(self, pool: ClickHouseClientPool):
+        self._pool = pool
+
+    def query(self, *args, **kwargs):
+        """
+        Run a query and read its whole result before the client goes back to the pool.
+        clickhouse-connect only parses the first block eagerly and streams the rest from the
+        client's session when the result is read, so the result must not outlive the checkout.
+        Read `result_columns` from the returned result (its block stream is used up).
+        """
+        with self._pool.client() as client:
+            result = client.query(*args, **kwargs)
+            result.result_columns
+            return result
+
+    def command(self, *args, **kwargs):
+        with self._pool.client() as client:
+            return client.command(*args, **kwargs)
+
+    def ping(self) -> bool:
+        with self._pool.client() as client:
+            return client.ping()
+
+
+_clickhouse_pool: Optional[ClickHouseClientPool] = None
+_clickhouse_pool_key: Optional[Tuple[Any, ...]] = None
+_clickhouse_pool_lock = threading.Lock()
+
+
+def get_clickhouse_pool() -> ClickHouseClientPool:
+    """
+    Get the process-wide client pool, (re)building it when the ClickHouse env config
+    or CLICKHOUSE_POOL_SIZE changed since it was created.
+    """
+    global _clickhouse_pool, _clickhouse_pool_key
+
+    config = _clickhouse_config()
+    size = get_clickhouse_pool_size()
+    key = tuple(sorted(config.items())) + (size,)
+    if _clickhouse_pool is not None and _clickhouse_pool_key == key:
+        return _clickhouse_pool
+
+    with _clickhouse_pool_lock:
+        if _clickhouse_pool is not None and _clickhouse_pool_key == key:
+            return _clickhouse_pool
+
+        has_url_env = os.getenv("CLICKHOUSE_URL") is not None
+        has_host_env = os.getenv("CLICKHOUSE_HOST") is not None
+        has_user_env = (os.getenv("CLICKHOUSE_USERNAME") is not None or
+                        os.getenv("CLICKHOUSE_USER") is not None)
+        logger.info("ClickHouse config - URL/HOST='%s' (from env: %s)",
+                    config["host_raw"], "yes" if (has_url_env or has_host_env) else "no (using default)")
+        logger.info("ClickHouse config - USER='%s' (from env: %s)",
+                    config["username"], "yes" if has_user_env else "no (using default)")
+        logger.info("ClickHouse config - SECURE=%s", config["secure"])
+        logger.debug("CLICKHOUSE_URL/HOST from env: %s, value: '%s'", has_url_env or has_host_env, config["host_raw"])
+        logger.debug("CLICKHOUSE_USERNAME/USER from env: %s, value: '%s'", has_user_env, config["username"])
+        logger.debug("CLICKHOUSE_SECURE: %s", config["secure"])
+        logger.info("Creating ClickHouse client pool host=%s port=%s secure=%s db=%s user=%s size=%d",
+                    config["host"], config["port"], config["secure"], config["database"], config["username"], size)
+
+        old_pool = _clickhouse_pool
+        _clickhouse_pool = ClickHouseClientPool(config, size)
+        _clickhouse_pool_key = key
+        if old_pool is not None:
+            logger.info("ClickHouse config changed, closing previous client pool")
+            old_pool.close()
+        return _clickhouse_pool
+
+
+def get_clickhouse_client() -> PooledClickHouseClient:
+    """
+    Get a ClickHouse client backed by the process-wide pool (see get_clickhouse_pool).
+    """
+    return PooledClickHouseClient(get_clickhouse_pool())
+
+
+def warm_clickhouse_pool() -> bool:
+    """
+    Open the first pooled connection ahead of traffic. Returns whether ClickHouse answered the ping.
+    """
+    try:
+        with get_clickhouse_pool().client(timeout=30) as client:
+            ok = client.ping()
+        logger.info("ClickHouse pool warm-up %s", "succeeded" if ok else "failed (ping returned false)")
+        return ok
+    except Exception as e:
+        logger.warning("ClickHouse pool warm-up failed: %s", e)
+        return False
+
+
+def close_clickhouse_pool() -> None:
+    """Close the process-wide pool (e.g. on shutdown)."""
+    global _clickhouse_pool, _clickhouse_pool_key
+    with _clickhouse_pool_lock:
+        if _clickhouse_pool is not None:
+            _clickhouse_pool.close()
+        _clickhouse_pool = None
+        _clickhouse_pool_key = None
 
 
 # ---- Env helpers -------------------------------------------------------------
@@ -190,19 +396,68 @@ def diagnostics_enabled() -> bool:
     return (os.getenv("ENABLE_DIAGNOSTICS", "false").lower() in ("true", "1", "yes"))
 
 
-def excluded_user_numbers_sql(prefix: Optional[str] = None) -> str:
-    """
-    Build a ClickHouse SQL snippet to exclude configured user numbers.
-    Returns an empty string if no exclusions are configured.
-    """
+def get_excluded_user_numbers() -> Tuple[str, ...]:
     excluded_raw = os.getenv("EXCLUDED_USER_NUMBERS", "")
-    excluded_nums = [n.strip() for n in excluded_raw.split(",") if n.strip()]
+    return tuple(n.strip() for n in excluded_raw.split(",") if n.strip())
+
+
+def _excluded_numbers_sql(excluded_nums: Tuple[str, ...], prefix: Optional[str] = None) -> str:
     if not excluded_nums:
         return ""
     excluded_list = ", ".join([f"'{n}'" for n in excluded_nums])
     col = f"{prefix}.user_number" if prefix else "user_number"
     return f"AND {col} NOT IN ({excluded_list})"
 
+
+def excluded_user_numbers_sql(prefix: Optional[str] = None) -> str:
+    """
+    Build a ClickHouse SQL snippet to exclude configured user numbers.
+    Returns an empty string if no exclusions are configured.
+    """
+    return _excluded_numbers_sql(get_excluded_user_numbers(), prefix)
+
+
+@dataclass(frozen=True)
+class QueryContext:
+    """
+    Everything a fetcher needs to know about the client it queries for.
+
+    Fetchers take an optional `ctx`; without one they use QueryContext.from_env() (the
+    ORG_ID / BROKER_NODE_PERSISTENT_ID / ... env vars), which is what the API endpoints do.
+    The scheduler builds one per organization with for_org, so reports for different orgs
+    can be generated concurrently without touching os.environ.
+    """
+    org_id: Optional[str]
+    broker_node_persistent_id: str
+    fbr_node_persistent_id: str
+    timezone: str = "UTC"
+    excluded_user_numbers: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_env(cls) -> "QueryContext":
+        return cls(
+            org_id=get_org_id(),
+            broker_node_persistent_id=get_broker_node_persistent_id(),
+            fbr_node_persistent_id=get_fbr_node_persistent_id(),
+            timezone=get_default_timezone(),
+            excluded_user_numbers=get_excluded_user_numbers(),
+        )
+
+    @classmethod
+    def for_org(cls, org_id: str, node_persistent_id: str, timezone: str) -> "QueryContext":
+        """Context for a stored organization; FBR node and excluded numbers still come from env."""
+        return cls(
+            org_id=org_id,
+            broker_node_persistent_id=node_persistent_id,
+            fbr_node_persistent_id=os.getenv("FBR_NODE_PERSISTENT_ID") or node_persistent_id,
+            timezone=timezone,
+            excluded_user_numbers=get_excluded_user_numbers(),
+        )
+
+    def excluded_user_numbers_sql(self, prefix: Optional[str] = None) -> str:
+        """Same as the module-level excluded_user_numbers_sql, for this context's numbers."""
+        return _excluded_numbers_sql(self.excluded_user_numbers, prefix)
+
 # ClickHouse query settings for large date ranges
 CLICKHOUSE_QUERY_SETTINGS = {
     "max_execution_time": 180,  # Increased from 60 to 180 seconds
@@ -348,6 +603,38 @@ class TotalCallsAndTotalDurationStats:
 class DurationCarrierAskedForTransferStats:
     duration_carrier_asked_for_transfer: int
 
+@dataclass
+class DailyReportStats:
+    """Every metric the daily report needs, as returned by the individual fetchers."""
+    call_stage: List[TransferStats]
+    call_classification: List[CallClassificationStats]
+    load_status: List[LoadStatusStats]
+    pricing: List[PricingStats]
+    carrier_end_state: List[CarrierEndStateStats]
+    carrier_transfer_over_transfer_attempts: Optional[CarrierTransferStatsTotalTransferAttempts]
+    carrier_transfer_over_call_attempts: Optional[CarrierTransferStatsTotalCallAttempts]
+    successfully_transferred_for_booking: Optional[SuccessfullyTransferredForBooking]
+    non_convertible_with_cnq: Optional[NonConvertibleCallsWithCarrierNotQualifiedStats]
+    non_convertible_without_cnq: Optional[NonConvertibleCallsWithoutCarrierNotQualifiedStats]
+    carrier_not_qualified: Optional[CarrierNotQualifiedStats]
+    total_calls_and_duration: Optional[TotalCallsAndTotalDurationStats]
+    # Metrics whose queries kept failing; their values are missing (None/[]), not empty
+    degraded_metrics: List[str] = field(default_factory=list)
+
+
+@dataclass
+class CallCubeCell:
+    """One cell of the daily call cube (see queries.daily_call_cube_query)."""
+    call_classification: str
+    call_stage: str
+    load_status: str
+    pricing_notes: str
+    carrier_end_state: str
+    transfer_reason: str
+    transfer_attempt: str
+    calls: int
+    duration_seconds: float
+
 
 @dataclass
 class DailyNodeOutputRow:
@@ -382,66 +669,83 @@ class DailyNodeOutputRow:
 
 # ---- Queries ----------------------------------------------------------------
 
+@dataclass
+class QueryColumns:
+    """
+    Columnar query result: column names resolved once, one list of values per column.
+    Long/wide results are converted column by column instead of through a dict per row.
+    """
+    names: Tuple[str, ...]
+    columns: List[List[Any]]
+
+    def __len__(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    def column(self, name: str, default: Any = None) -> List[Any]:
+        """Values of a column; a column missing from the result reads as `default` on every row."""
+        try:
+            return self.columns[self.names.index(name)]
+        except ValueError:
+            return [default] * len(self)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        return [dict(zip(self.names, values)) for values in zip(*self.columns)]
+
+
+# Error lists of the active track_query_errors() blocks, per thread
+_query_error_trackers = threading.local()
+
+
+@contextmanager
+def track_query_errors() -> Iterator[List[BaseException]]:
+    """
+    Collect the exceptions of ClickHouse queries run in this thread inside the block.
+
+    The fetch_* functions log and swallow query errors, returning None/[] just like for an
+    empty result; this tells the two apart without changing their return values:
+
+        with track_query_errors() as errors:
+            stats = fetch_pricing_stats(start, end, ctx)
+        if errors: ...  # the query failed, `stats` is not an empty result
+    """
+    errors: List[BaseException] = []
+    stack = getattr(_query_error_trackers, "stack", None)
+    if stack is None:
+        stack = _query_error_trackers.stack = []
+    stack.append(errors)
+    try:
+        yield errors
+    finally:
+        stack.remove(errors)
+
+
+def _query_columns(client, query: str, settings: Optional[Dict[str, Any]] = None) -> QueryColumns:
+    """
+    Run a query and return its result columnar. ClickHouse's Native format is already
+    columnar, so this skips clickhouse-connect's row transpose as well as per-row dicts.
+    """
+    try:
+        rs = client.query(query, settings=settings or {})
+        # Reading the columns can fail too (the rest of the response streams in here)
+        return QueryColumns(names=tuple(rs.column_names), columns=rs.result_columns)
+    except Exception as e:
+        for errors in getattr(_query_error_trackers, "stack", ()):
+            errors.append(e)
+        raise
+
+
 def _json_each_row(client, query: str, settings: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
     """
     Run a query and return rows as list[dict], similar to JSONEachRow.
-    clickhouse-connect already returns rows as python types; but to match the TS behavior,
-    we'll get column names and recompose dicts.
+    Fine for the small aggregate results; prefer _query_columns for long or wide ones.
     """
-    rs = client.query(query, settings=settings or {})
-    
-    # Get column names - handle different clickhouse-connect API versions
-    # The error suggests rs.result_set might be a list, so check that first
-    cols = None
-    
-    # Method 1: Check if rs has column_names directly
-    if hasattr(rs, 'column_names'):
-        cols = rs.column_names
-    # Method 2: Check if rs has columns_with_types directly  
-    elif hasattr(rs, 'columns_with_types'):
-        cols_data = rs.columns_with_types
-        if isinstance(cols_data, list):
-            cols = [c[0] if isinstance(c, (list, tuple)) else str(c) for c in cols_data]
-        else:
-            cols = [c[0] for c in cols_data]
-    # Method 3: Check result_set, but handle the case where it's a list
-    elif hasattr(rs, 'result_set'):
-        result_set = rs.result_set
-        if isinstance(result_set, list):
-            # result_set is a list, not an object - try to get columns from rs itself
-            # This might be the actual rows, so skip this path
-            pass
-        elif hasattr(result_set, 'column_names'):
-            cols = result_set.column_names
-        elif hasattr(result_set, 'columns_with_types'):
-            cols_data = result_set.columns_with_types
-            if isinstance(cols_data, list):
-                cols = [c[0] if isinstance(c, (list, tuple)) else str(c) for c in cols_data]
-            else:
-                cols = [c[0] for c in cols_data]
-    
-    # Method 4: Try to get column names from query result metadata
-    if cols is None and hasattr(rs, 'names'):
-        cols = rs.names
-    
-    # Method 5: Last resort - infer from result_rows structure
-    if cols is None:
-        if rs.result_rows:
-            num_cols = len(rs.result_rows[0]) if rs.result_rows else 0
-            # Try to get column names from the query itself or use generic names
-            cols = [f"column_{i}" for i in range(num_cols)]
-            logger.warning(f"Could not determine column names, using generic names: {cols}")
-        else:
-            cols = []
-    
-    out = []
-    for row in rs.result_rows:
-        out.append({col: row[i] for i, col in enumerate(cols)})
-    return out
+    return _query_columns(client, query, settings=settings).rows()
 
 
-def fetch_calls_ending_in_each_call_stage_stats(start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[TransferStats]:
-    org_id = get_org_id()
+@cached_metric("call_stage")
+def fetch_calls_ending_in_each_call_stage_stats(start_date: Optional[str] = None, end_date: Optional[str] = None, ctx: Optional[QueryContext] = None) -> List[TransferStats]:
+    ctx = ctx or QueryContext.from_env()
+    org_id = ctx.org_id
     if not org_id:
         logger.error("❌ ORG_ID not found in environment variables. Please check your .env and restart the app.")
         return []
@@ -458,11 +762,11 @@ def fetch_calls_ending_in_each_call_stage_stats(start_date: Optional[str] = None
         else:
             logger.info("Fetching call stage stats for last 30 days (no date range provided)")
 
-        broker_node_id = get_broker_node_persistent_id()
+        broker_node_id = ctx.broker_node_persistent_id
         logger.info("Using ORG_ID: %s...", org_id[:8])
         logger.info("Using node_persistent_id: %s", broker_node_id)
 
-        excluded_sql = excluded_user_numbers_sql()
+        excluded_sql = ctx.excluded_user_numbers_sql()
         query = calls_ending_in_each_call_stage_stats_query(date_filter, org_id, broker_node_id, excluded_sql)
 
         client = get_clickhouse_client()
@@ -572,8 +876,10 @@ def fetch_calls_ending_in_each_call_stage_stats(start_date: Optional[str] = None
         return []
 
 
-def fetch_carrier_asked_transfer_over_total_transfer_attempts_stats(start_date: Optional[str] = None, end_date: Optional[str] = None) -> Optional[CarrierTransferStats]:
-    org_id = get_org_id()
+@cached_metric("carrier_asked_transfer_over_total_transfer_attempts")
+def fetch_carrier_asked_transfer_over_total_transfer_attempts_stats(start_date: Optional[str] = None, end_date: Optional[str] = None, ctx: Optional[QueryContext] = None) -> Optional[CarrierTransferStats]:
+    ctx = ctx or QueryContext.from_env()
+    org_id = ctx.org_id
     if not org_id:
         logger.error("❌ ORG_ID not found in environment variables. Please check your .env and restart the app.")
         return None
@@ -590,8 +896,8 @@ def fetch_carrier_asked_transfer_over_total_transfer_attempts_stats(start_date:
         else:
             logger.info("Fetching carrier transfer stats for last 30 days (no date range provided)")
 
-        broker_node_id = get_broker_node_persistent_id()
-        excluded_sql = excluded_user_numbers_sql()
+        broker_node_id = ctx.broker_node_persistent_id
+        excluded_sql = ctx.excluded_user_numbers_sql()
         query = carrier_asked_transfer_over_total_transfer_attempt_stats_query(date_filter, org_id, broker_node_id, excluded_sql)
 
         client = get_clickhouse_client()
@@ -605,16 +911,21 @@ def fetch_carrier_asked_transfer_over_total_transfer_attempts_stats(start_date:
                 WHERE {date_filter}
             )
             SELECT
-                JSONExtractString(no.flat_data, 'result.transfer.transfer_attempt') AS transfer_attempt,
+                transfer_attempt,
                 COUNT(*) AS count
-            FROM public_node_outputs no
-            INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-            INNER JOIN public_nodes n ON no.node_id = n.id
-            WHERE n.org_id = '{org_id}'
-              AND no.node_persistent_id = '{broker_node_id}'
-              AND JSONHas(no.flat_data, 'result.transfer.transfer_reason') = 1
-              AND JSONExtractString(no.flat_data, 'result.transfer.transfer_reason') != ''
-              AND JSONExtractString(no.flat_data, 'result.transfer.transfer_reason') != 'null'
+            FROM (
+                SELECT
+                    {flat_data_fields_sql()} AS flat_fields,
+                    {flat_string_sql('result.transfer.transfer_attempt')} AS transfer_attempt,
+                    {flat_string_sql('result.transfer.transfer_reason')} AS transfer_reason
+                FROM public_node_outputs no
+                INNER JOIN recent_runs rr ON no.run_id = rr.run_id
+                INNER JOIN public_nodes n ON no.node_id = n.id
+                WHERE n.org_id = '{org_id}'
+                  AND no.node_persistent_id = '{broker_node_id}'
+            )
+            WHERE transfer_reason != ''
+              AND transfer_reason != 'null'
             GROUP BY transfer_attempt
             ORDER BY count DESC
         """
@@ -652,8 +963,10 @@ def fetch_carrier_asked_transfer_over_total_transfer_attempts_stats(start_date:
         logger.exception("Error fetching carrier transfer stats: %s", e)
         return None
 
-def fetch_carrier_asked_transfer_over_total_call_attempts_stats(start_date: Optional[str] = None, end_date: Optional[str] = None) -> Optional[CarrierTransferStats]:
-    org_id = get_org_id()
+@cached_metric("carrier_asked_transfer_over_total_call_attempts")
+def fetch_carrier_asked_transfer_over_total_call_attempts_stats(start_date: Optional[str] = None, end_date: Optional[str] = None, ctx: Optional[QueryContext] = None) -> Optional[CarrierTransferStats]:
+    ctx = ctx or QueryContext.from_env()
+    org_id = ctx.org_id
     if not org_id:
         logger.error("❌ ORG_ID not found in environment variables. Please check your .env and restart the app.")
         return None
@@ -670,8 +983,8 @@ def fetch_carrier_asked_transfer_over_total_call_attempts_stats(start_date: Opti
         else:
             logger.info("Fetching carrier transfer stats for last 30 days (no date range provided)")
 
-        broker_node_id = get_broker_node_persistent_id()
-        excluded_sql = excluded_user_numbers_sql()
+        broker_node_id = ctx.broker_node_persistent_id
+        excluded_sql = ctx.excluded_user_numbers_sql()
         query = carrier_asked_transfer_over_total_call_attempts_stats_query(date_filter, org_id, broker_node_id, excluded_sql)
 
         client = get_clickhouse_client()
@@ -697,8 +1010,10 @@ def fetch_carrier_asked_transfer_over_total_call_attempts_stats(start_date: Opti
         logger.exception("Error fetching carrier transfer stats: %s", e)
         return None
 
-def fetch_load_not_found_stats(start_date: Optional[str] = None, end_date: Optional[str] = None) -> Optional[LoadNotFoundStats]:
-    org_id = get_org_id()
+@cached_metric("load_not_found")
+def fetch_load_not_found_stats(start_date: Optional[str] = None, end_date: Optional[str] = None, ctx: Optional[QueryContext] = None) -> Optional[LoadNotFoundStats]:
+    ctx = ctx or QueryContext.from_env()
+    org_id = ctx.org_id
     if not org_id:
         logger.error("❌ ORG_ID not found in environment variables. Please check your .env and restart the app.")
         return None
@@ -714,8 +1029,8 @@ def fetch_load_not_found_stats(start_date: Optional[str] = None, end_date: Optio
             logger.info("Fetching load not found stats for date range: %s to %s", start_date, end_date)
         else:
             logger.info("Fetching load not found stats for last 30 days (no date range provided)")
-        broker_node_id = get_broker_node_persistent_id()
-        excluded_sql = excluded_user_numbers_sql()
+        broker_node_id = ctx.broker_node_persistent_id
+        excluded_sql = ctx.excluded_user_numbers_sql()
         query = load_not_found_stats_query(date_filter, org_id, broker_node_id, excluded_sql)
         
         client = get_clickhouse_client()
@@ -739,8 +1054,10 @@ def fetch_load_not_found_stats(start_date: Optional[str] = None, end_date: Optio
         logger.exception("Error fetching load not found stats: %s", e)
         return None
 
-def fetch_load_status_stats(start_date: Optional[str] = None, end_date: Optional[str] = None) -> Optional[List[LoadStatusStats]]:
-    org_id = get_org_id()
+@cached_metric("load_status")
+def fetch_load_status_stats(start_date: Optional[str] = None, end_date: Optional[str] = None, ctx: Optional[QueryContext] = None) -> Optional[List[LoadStatusStats]]:
+    ctx = ctx or QueryContext.from_env()
+    org_id = ctx.org_id
     if not org_id:
         logger.error("❌ ORG_ID not found in environment variables. Please check your .env and restart the app.")
         return None
@@ -756,8 +1073,8 @@ def fetch_load_status_stats(start_date: Optional[str] = None, end_date: Optional
             logger.info("Fetching load status stats for date range: %s to %s", start_date, end_date)
         else:
             logger.info("Fetching load status stats for last 30 days (no date range provided)")
-        broker_node_id = get_broker_node_persistent_id()
-        excluded_sql = excluded_user_numbers_sql()
+        broker_node_id = ctx.broker_node_persistent_id
+        excluded_sql = ctx.excluded_user_numbers_sql()
         query = load_status_stats_query(date_filter, org_id, broker_node_id, excluded_sql)
         
         client = get_clickhouse_client()
@@ -777,8 +1094,10 @@ def fetch_load_status_stats(start_date: Optional[str] = None, end_date: Optional
         logger.exception("Error fetching load status stats: %s", e)
         return []
 
-def fetch_successfully_transferred_for_booking_stats(start_date: Optional[str] = None, end_date: Optional[str] = None) -> Optional[SuccessfullyTransferredForBooking]:
-    org_id = get_org_id()
+@cached_metric("successfully_transferred_for_booking")
+def fetch_successfully_transferred_for_booking_stats(start_date: Optional[str] = None, end_date: Optional[str] = None, ctx: Optional[QueryContext] = None) -> Optional[SuccessfullyTransferredForBooking]:
+    ctx = ctx or QueryContext.from_env()
+    org_id = ctx.org_id
     if not org_id:
         logger.error("❌ ORG_ID not found in environment variables. Please check your .env and restart the app.")
         return None
@@ -794,8 +1113,8 @@ def fetch_successfully_transferred_for_booking_stats(start_date: Optional[str] =
             logger.info("Fetching successfully transferred for booking stats for date range: %s to %s", start_date, end_date)
         else:
             logger.info("Fetching successfully transferred for booking stats for last 30 days (no date range provided)")
-        broker_node_id = get_broker_node_persistent_id()
-        excluded_sql = excluded_user_numbers_sql()
+        broker_node_id = ctx.broker_node_persistent_id
+        excluded_sql = ctx.excluded_user_numbers_sql()
         query = successfully_transferred_for_booking_stats_query(date_filter, org_id, broker_node_id, excluded_sql)
         
         client = get_clickhouse_client()
@@ -815,8 +1134,10 @@ def fetch_successfully_transferred_for_booking_stats(start_date: Optional[str] =
         logger.exception("Error fetching successfully transferred for booking stats: %s", e)
         return None
 
-def fetch_call_classifcation_stats(start_date: Optional[str] = None, end_date: Optional[str] = None) -> Optional[CallClassificationStats]:
-    org_id = get_org_id()
+@cached_metric("call_classification")
+def fetch_call_classifcation_stats(start_date: Optional[str] = None, end_date: Optional[str] = None, ctx: Optional[QueryContext] = None) -> Optional[CallClassificationStats]:
+    ctx = ctx or QueryContext.from_env()
+    org_id = ctx.org_id
     if not org_id:
         logger.error("❌ ORG_ID not found in environment variables. Please check your .env and restart the app.")
         return None
@@ -832,8 +1153,8 @@ def fetch_call_classifcation_stats(start_date: Optional[str] = None, end_date: O
             logger.info("Fetching call classification stats for date range: %s to %s", start_date, end_date)
         else:
             logger.info("Fetching call classification stats for last 30 days (no date range provided)")
-        broker_node_id = get_broker_node_persistent_id()
-        excluded_sql = excluded_user_numbers_sql()
+        broker_node_id = ctx.broker_node_persistent_id
+        excluded_sql = ctx.excluded_user_numbers_sql()
         query = call_classifcation_stats_query(date_filter, org_id, broker_node_id, excluded_sql)
         
         client = get_clickhouse_client()
@@ -853,8 +1174,10 @@ def fetch_call_classifcation_stats(start_date: Optional[str] = None, end_date: O
         logger.exception("Error fetching call classification stats: %s", e)
         return []
 
-def fetch_carrier_qualification_stats(start_date: Optional[str] = None, end_date: Optional[str] = None) -> Optional[CarrierQualificationStats]:
-    org_id = get_org_id()
+@cached_metric("carrier_qualification")
+def fetch_carrier_qualification_stats(start_date: Optional[str] = None, end_date: Optional[str] = None, ctx: Optional[QueryContext] = None) -> Optional[CarrierQualificationStats]:
+    ctx = ctx or QueryContext.from_env()
+    org_id = ctx.org_id
     if not org_id:
         logger.error("❌ ORG_ID not found in environment variables. Please check your .env and restart the app.")
         return None
@@ -870,8 +1193,8 @@ def fetch_carrier_qualification_stats(start_date: Optional[str] = None, end_date
             logger.info("Fetching carrier qualification stats for date range: %s to %s", start_date, end_date)
         else:
             logger.info("Fetching carrier qualification stats for last 30 days (no date range provided)")
-        broker_node_id = get_broker_node_persistent_id()
-        excluded_sql = excluded_user_numbers_sql()
+        broker_node_id = ctx.broker_node_persistent_id
+        excluded_sql = ctx.excluded_user_numbers_sql()
         query = carrier_qualification_stats_query(date_filter, org_id, broker_node_id, excluded_sql)
         
         client = get_clickhouse_client()
@@ -891,8 +1214,10 @@ def fetch_carrier_qualification_stats(start_date: Optional[str] = None, end_date
         return []
 
 
-def fetch_pricing_stats(start_date: Optional[str] = None, end_date: Optional[str] = None) -> Optional[PricingStats]:
-    org_id = get_org_id()
+@cached_metric("pricing")
+def fetch_pricing_stats(start_date: Optional[str] = None, end_date: Optional[str] = None, ctx: Optional[QueryContext] = None) -> Optional[PricingStats]:
+    ctx = ctx or QueryContext.from_env()
+    org_id = ctx.org_id
     if not org_id:
         logger.error("❌ ORG_ID not found in environment variables. Please check your .env and restart the app.")
         return None
@@ -908,8 +1233,8 @@ def fetch_pricing_stats(start_date: Optional[str] = None, end_date: Optional[str
             logger.info("Fetching pricing stats for date range: %s to %s", start_date, end_date)
         else:
             logger.info("Fetching pricing stats for last 30 days (no date range provided)")
-        broker_node_id = get_broker_node_persistent_id()
-        excluded_sql = excluded_user_numbers_sql()
+        broker_node_id = ctx.broker_node_persistent_id
+        excluded_sql = ctx.excluded_user_numbers_sql()
         query = pricing_stats_query(date_filter, org_id, broker_node_id, excluded_sql)
         
         client = get_clickhouse_client()
@@ -928,8 +1253,10 @@ def fetch_pricing_stats(start_date: Optional[str] = None, end_date: Optional[str
         logger.exception("Error fetching pricing stats: %s", e)
         return []
 
-def fetch_carrier_end_state_stats(start_date: Optional[str] = None, end_date: Optional[str] = None) -> Optional[CarrierEndStateStats]:
-    org_id = get_org_id()
+@cached_metric("carrier_end_state")
+def fetch_carrier_end_state_stats(start_date: Optional[str] = None, end_date: Optional[str] = None, ctx: Optional[QueryContext] = None) -> Optional[CarrierEndStateStats]:
+    ctx = ctx or QueryContext.from_env()
+    org_id = ctx.org_id
     if not org_id:
         logger.error("❌ ORG_ID not found in environment variables. Please check your .env and restart the app.")
         return None
@@ -945,8 +1272,8 @@ def fetch_carrier_end_state_stats(start_date: Optional[str] = None, end_date: Op
             logger.info("Fetching carrier end state stats for date range: %s to %s", start_date, end_date)
         else:
             logger.info("Fetching carrier end state stats for last 30 days (no date range provided)")
-        broker_node_id = get_broker_node_persistent_id()
-        excluded_sql = excluded_user_numbers_sql()
+        broker_node_id = ctx.broker_node_persistent_id
+        excluded_sql = ctx.excluded_user_numbers_sql()
         query = carrier_end_state_query(date_filter, org_id, broker_node_id, excluded_sql)
         
         client = get_clickhouse_client()
@@ -966,8 +1293,10 @@ def fetch_carrier_end_state_stats(start_date: Optional[str] = None, end_date: Op
         return []
 
 
-def fetch_percent_non_convertible_calls(start_date: Optional[str] = None, end_date: Optional[str] = None) -> Optional[PercentNonConvertibleCallsStats]:
-    org_id = get_org_id()
+@cached_metric("percent_non_convertible_calls")
+def fetch_percent_non_convertible_calls(start_date: Optional[str] = None, end_date: Optional[str] = None, ctx: Optional[QueryContext] = None) -> Optional[PercentNonConvertibleCallsStats]:
+    ctx = ctx or QueryContext.from_env()
+    org_id = ctx.org_id
     if not org_id:
         logger.error("❌ ORG_ID not found in environment variables. Please check your .env and restart the app.")
         return None
@@ -983,8 +1312,8 @@ def fetch_percent_non_convertible_calls(start_date: Optional[str] = None, end_da
             logger.info("Fetching percent non convertible calls for date range: %s to %s", start_date, end_date)
         else:
             logger.info("Fetching percent non convertible calls for last 30 days (no date range provided)")
-        broker_node_id = get_broker_node_persistent_id()
-        excluded_sql = excluded_user_numbers_sql()
+        broker_node_id = ctx.broker_node_persistent_id
+        excluded_sql = ctx.excluded_user_numbers_sql()
         query = percent_non_convertible_calls_query(date_filter, org_id, broker_node_id, excluded_sql)
         
         client = get_clickhouse_client()
@@ -1004,12 +1333,14 @@ def fetch_percent_non_convertible_calls(start_date: Optional[str] = None, end_da
         logger.exception("Error fetching percent non convertible calls: %s", e)
         return None
 
-def fetch_non_convertible_calls_with_carrier_not_qualified(start_date: Optional[str] = None, end_date: Optional[str] = None) -> Optional[NonConvertibleCallsWithCarrierNotQualifiedStats]:
+@cached_metric("non_convertible_calls_with_carrier_not_qualified")
+def fetch_non_convertible_calls_with_carrier_not_qualified(start_date: Optional[str] = None, end_date: Optional[str] = None, ctx: Optional[QueryContext] = None) -> Optional[NonConvertibleCallsWithCarrierNotQualifiedStats]:
     """
     Fetches non-convertible calls INCLUDING carrier_not_qualified.
     These are all calls that wouldn't have converted anyway (AI saved time).
     """
-    org_id = get_org_id()
+    ctx = ctx or QueryContext.from_env()
+    org_id = ctx.org_id
     if not org_id:
         logger.error("❌ ORG_ID not found in environment variables. Please check your .env and restart the app.")
         return None
@@ -1026,8 +1357,8 @@ def fetch_non_convertible_calls_with_carrier_not_qualified(start_date: Optional[
         else:
             logger.info("Fetching non-convertible calls (with carrier_not_qualified) for last 30 days")
 
-        broker_node_id = get_broker_node_persistent_id()
-        excluded_sql = excluded_user_numbers_sql()
+        broker_node_id = ctx.broker_node_persistent_id
+        excluded_sql = ctx.excluded_user_numbers_sql()
         query = non_convertible_calls_with_carrier_not_qualified_query(date_filter, org_id, broker_node_id, excluded_sql)
 
         client = get_clickhouse_client()
@@ -1048,12 +1379,14 @@ def fetch_non_convertible_calls_with_carrier_not_qualified(start_date: Optional[
         logger.exception("Error fetching non-convertible calls (with carrier_not_qualified): %s", e)
         return None
 
-def fetch_non_convertible_calls_without_carrier_not_qualified(start_date: Optional[str] = None, end_date: Optional[str] = None) -> Optional[NonConvertibleCallsWithoutCarrierNotQualifiedStats]:
+@cached_metric("non_convertible_calls_without_carrier_not_qualified")
+def fetch_non_convertible_calls_without_carrier_not_qualified(start_date: Optional[str] = None, end_date: Optional[str] = None, ctx: Optional[QueryContext] = None) -> Optional[NonConvertibleCallsWithoutCarrierNotQualifiedStats]:
     """
     Fetches non-convertible calls EXCLUDING carrier_not_qualified.
     These are calls with specific issues (equipment, timing, load status, etc).
     """
-    org_id = get_org_id()
+    ctx = ctx or QueryContext.from_env()
+    org_id = ctx.org_id
     if not org_id:
         logger.error("❌ ORG_ID not found in environment variables. Please check your .env and restart the app.")
         return None
@@ -1070,8 +1403,8 @@ def fetch_non_convertible_calls_without_carrier_not_qualified(start_date: Option
         else:
             logger.info("Fetching non-convertible calls (without carrier_not_qualified) for last 30 days")
 
-        broker_node_id = get_broker_node_persistent_id()
-        excluded_sql = excluded_user_numbers_sql()
+        broker_node_id = ctx.broker_node_persistent_id
+        excluded_sql = ctx.excluded_user_numbers_sql()
         query = non_convertible_calls_without_carrier_not_qualified_query(date_filter, org_id, broker_node_id, excluded_sql)
 
         client = get_clickhouse_client()
@@ -1092,12 +1425,14 @@ def fetch_non_convertible_calls_without_carrier_not_qualified(start_date: Option
         logger.exception("Error fetching non-convertible calls (without carrier_not_qualified): %s", e)
         return None
 
-def fetch_carrier_not_qualified_stats(start_date: Optional[str] = None, end_date: Optional[str] = None) -> Optional[CarrierNotQualifiedStats]:
+@cached_metric("carrier_not_qualified")
+def fetch_carrier_not_qualified_stats(start_date: Optional[str] = None, end_date: Optional[str] = None, ctx: Optional[QueryContext] = None) -> Optional[CarrierNotQualifiedStats]:
     """
     Fetches standalone metric for carrier_not_qualified calls.
     These are carriers that didn't meet qualification requirements.
     """
-    org_id = get_org_id()
+    ctx = ctx or QueryContext.from_env()
+    org_id = ctx.org_id
     if not org_id:
         logger.error("❌ ORG_ID not found in environment variables. Please check your .env and restart the app.")
         return None
@@ -1114,8 +1449,8 @@ def fetch_carrier_not_qualified_stats(start_date: Optional[str] = None, end_date
         else:
             logger.info("Fetching carrier_not_qualified stats for last 30 days")
 
-        broker_node_id = get_broker_node_persistent_id()
-        excluded_sql = excluded_user_numbers_sql()
+        broker_node_id = ctx.broker_node_persistent_id
+        excluded_sql = ctx.excluded_user_numbers_sql()
         query = carrier_not_qualified_stats_query(date_filter, org_id, broker_node_id, excluded_sql)
 
         client = get_clickhouse_client()
@@ -1174,8 +1509,10 @@ def _split_date_range_for_unique_loads(start_date: Optional[str], end_date: Opti
         logger.warning(f"Error parsing dates for split: {e}, using single query")
         return None, None
 
-def fetch_number_of_unique_loads(start_date: Optional[str] = None, end_date: Optional[str] = None) -> Optional[NumberOfUniqueLoadsStats]:
-    org_id = get_org_id()
+@cached_metric("number_of_unique_loads")
+def fetch_number_of_unique_loads(start_date: Optional[str] = None, end_date: Optional[str] = None, ctx: Optional[QueryContext] = None) -> Optional[NumberOfUniqueLoadsStats]:
+    ctx = ctx or QueryContext.from_env()
+    org_id = ctx.org_id
     if not org_id:
         logger.error("❌ ORG_ID not found in environment variables. Please check your .env and restart the app.")
         return None
@@ -1183,9 +1520,9 @@ def fetch_number_of_unique_loads(start_date: Optional[str] = None, end_date: Opt
     try:
         broker_range, fbr_range = _split_date_range_for_unique_loads(start_date, end_date)
         
-        broker_node_id = get_broker_node_persistent_id()
-        fbr_node_id = get_fbr_node_persistent_id()
-        excluded_sql = excluded_user_numbers_sql()
+        broker_node_id = ctx.broker_node_persistent_id
+        fbr_node_id = ctx.fbr_node_persistent_id
+        excluded_sql = ctx.excluded_user_numbers_sql()
 
         # If no date range provided, use default
         if not start_date or not end_date:
@@ -1208,43 +1545,20 @@ def fetch_number_of_unique_loads(start_date: Optional[str] = None, end_date: Opt
             logger.info("Fetching number of unique loads for split date range: broker_node %s-%s, FBR %s-%s", 
                        broker_range[0], broker_range[1], fbr_range[0], fbr_range[1])
             
-            # Get broker_node results
             broker_filter = f"timestamp >= parseDateTime64BestEffort('{broker_range[0]}') AND timestamp < parseDateTime64BestEffort('{broker_range[1]}')"
-            broker_query = number_of_unique_loads_query_broker_node(broker_filter, org_id, broker_node_id, excluded_sql)
-            
-            # Get FBR results
             fbr_filter = f"timestamp >= parseDateTime64BestEffort('{fbr_range[0]}') AND timestamp < parseDateTime64BestEffort('{fbr_range[1]}')"
-            fbr_query = number_of_unique_loads_query(fbr_filter, org_id, fbr_node_id, excluded_sql)
-            
+
+            # One query: both periods' load ids are unioned and de-duplicated in ClickHouse
+            query = number_of_unique_loads_across_cutoff_query(
+                broker_filter, fbr_filter, org_id, broker_node_id, fbr_node_id, excluded_sql
+            )
             client = get_clickhouse_client()
-            
-            # Execute broker_node query
-            broker_rows = _json_each_row(client, broker_query, settings=CLICKHOUSE_QUERY_SETTINGS)
-            broker_result = broker_rows[0] if broker_rows else {"number_of_unique_loads": 0, "total_calls": 0}
-            
-            # Execute FBR query
-            fbr_rows = _json_each_row(client, fbr_query, settings=CLICKHOUSE_QUERY_SETTINGS)
-            fbr_result = fbr_rows[0] if fbr_rows else {"number_of_unique_loads": 0, "total_calls": 0}
-            
-            # Get lists to count unique combined
-            broker_list_query = list_of_unique_loads_query_broker_node(broker_filter, org_id, broker_node_id, excluded_sql)
-            fbr_list_query = list_of_unique_loads_query(fbr_filter, org_id, fbr_node_id, excluded_sql)
-            
-            broker_list_rows = _json_each_row(client, broker_list_query, settings=CLICKHOUSE_QUERY_SETTINGS)
-            fbr_list_rows = _json_each_row(client, fbr_list_query, settings=CLICKHOUSE_QUERY_SETTINGS)
-            
-            broker_loads = {str(r.get("custom_load_id")) for r in broker_list_rows if r.get("custom_load_id")}
-            fbr_loads = {str(r.get("custom_load_id")) for r in fbr_list_rows if r.get("custom_load_id")}
-            
-            # Combine and count unique
-            combined_unique_loads = len(broker_loads | fbr_loads)
-            combined_total_calls = int(broker_result.get("total_calls", 0)) + int(fbr_result.get("total_calls", 0))
-            combined_calls_per_load = round(combined_total_calls / combined_unique_loads, 2) if combined_unique_loads > 0 else 0.0
-            
+            rows = _json_each_row(client, query, settings=CLICKHOUSE_QUERY_SETTINGS)
+            r = rows[0] if rows else {}
             return NumberOfUniqueLoadsStats(
-                number_of_unique_loads=combined_unique_loads,
-                total_calls=combined_total_calls,
-                calls_per_unique_load=combined_calls_per_load,
+                number_of_unique_loads=int(r.get("number_of_unique_loads", 0)),
+                total_calls=int(r.get("total_calls", 0)),
+                calls_per_unique_load=float(r.get("calls_per_unique_load", 0.0)),
             )
         
         # Single period - determine which query to use
@@ -1273,8 +1587,10 @@ def fetch_number_of_unique_loads(start_date: Optional[str] = None, end_date: Opt
         logger.exception("Error fetching number of unique loads: %s", e)
         return None
 
-def fetch_list_of_unique_loads(start_date: Optional[str] = None, end_date: Optional[str] = None) -> Optional[ListOfUniqueLoadsStats]:
-    org_id = get_org_id()
+@cached_metric("list_of_unique_loads")
+def fetch_list_of_unique_loads(start_date: Optional[str] = None, end_date: Optional[str] = None, ctx: Optional[QueryContext] = None) -> Optional[ListOfUniqueLoadsStats]:
+    ctx = ctx or QueryContext.from_env()
+    org_id = ctx.org_id
     if not org_id:
         logger.error("❌ ORG_ID not found in environment variables. Please check your .env and restart the app.")
         return None
@@ -1283,9 +1599,9 @@ def fetch_list_of_unique_loads(start_date: Optional[str] = None, end_date: Optio
         broker_range, fbr_range = _split_date_range_for_unique_loads(start_date, end_date)
         logger.info(f"After split - broker_range: {broker_range}, fbr_range: {fbr_range}")
         
-        broker_node_id = get_broker_node_persistent_id()
-        fbr_node_id = get_fbr_node_persistent_id()
-        excluded_sql = excluded_user_numbers_sql()
+        broker_node_id = ctx.broker_node_persistent_id
+        fbr_node_id = ctx.fbr_node_persistent_id
+        excluded_sql = ctx.excluded_user_numbers_sql()
 
         # If no date range provided, use default
         if not start_date or not end_date:
@@ -1293,8 +1609,8 @@ def fetch_list_of_unique_loads(start_date: Optional[str] = None, end_date: Optio
             logger.info("Fetching list of unique loads for last 30 days (no date range provided)")
             query = list_of_unique_loads_query(date_filter, org_id, fbr_node_id, excluded_sql)
             client = get_clickhouse_client()
-            rows = _json_each_row(client, query, settings=CLICKHOUSE_QUERY_SETTINGS)
-            rows = [str(r.get("custom_load_id")) for r in rows if r.get("custom_load_id")]
+            cols = _query_columns(client, query, settings=CLICKHOUSE_QUERY_SETTINGS)
+            rows = [str(v) for v in cols.column("custom_load_id") if v]
             return ListOfUniqueLoadsStats(list_of_unique_loads=rows)
         
         all_loads = set()
@@ -1309,17 +1625,16 @@ def fetch_list_of_unique_loads(start_date: Optional[str] = None, end_date: Optio
             broker_filter = f"timestamp >= parseDateTime64BestEffort('{broker_range[0]}') AND timestamp < parseDateTime64BestEffort('{broker_range[1]}')"
             print(f'broker_filter: {broker_filter}')
             broker_query = list_of_unique_loads_query_broker_node(broker_filter, org_id, broker_node_id, excluded_sql)
-            broker_rows = _json_each_row(client, broker_query, settings=CLICKHOUSE_QUERY_SETTINGS)
-            broker_loads = {str(r.get("custom_load_id")) for r in broker_rows if r.get("custom_load_id")}
+            broker_cols = _query_columns(client, broker_query, settings=CLICKHOUSE_QUERY_SETTINGS)
+            broker_loads = {str(v) for v in broker_cols.column("custom_load_id") if v}
             all_loads.update(broker_loads)
             
             # Get FBR results
             fbr_filter = f"timestamp >= parseDateTime64BestEffort('{fbr_range[0]}') AND timestamp < parseDateTime64BestEffort('{fbr_range[1]}')"
             print(f'fbr_filter: {fbr_filter}')
             fbr_query = list_of_unique_loads_query(fbr_filter, org_id, fbr_node_id, excluded_sql)
-            fbr_rows = _json_each_row(client, fbr_query, settings=CLICKHOUSE_QUERY_SETTINGS)
-            # print(f'fbr_rows: {fbr_rows}')
-            fbr_loads = {str(r.get("custom_load_id")) for r in fbr_rows if r.get("custom_load_id")}
+            fbr_cols = _query_columns(client, fbr_query, settings=CLICKHOUSE_QUERY_SETTINGS)
+            fbr_loads = {str(v) for v in fbr_cols.column("custom_load_id") if v}
             all_loads.update(fbr_loads)
             
             return ListOfUniqueLoadsStats(list_of_unique_loads=sorted(list(all_loads)))
@@ -1339,9 +1654,9 @@ def fetch_list_of_unique_loads(start_date: Optional[str] = None, end_date: Optio
             logger.warning("Neither broker_range nor fbr_range was set! This should not happen.")
             return ListOfUniqueLoadsStats(list_of_unique_loads=[])
         
-        rows = _json_each_row(client, query, settings=CLICKHOUSE_QUERY_SETTINGS)
-        logger.info(f"Query returned {len(rows)} rows")
-        rows = [str(r.get("custom_load_id")) for r in rows if r.get("custom_load_id")]
+        cols = _query_columns(client, query, settings=CLICKHOUSE_QUERY_SETTINGS)
+        logger.info(f"Query returned {len(cols)} rows")
+        rows = [str(v) for v in cols.column("custom_load_id") if v]
         logger.info(f"After filtering, {len(rows)} rows with custom_load_id")
         if not rows:
             logger.info("No list of unique loads found")
@@ -1353,8 +1668,10 @@ def fetch_list_of_unique_loads(start_date: Optional[str] = None, end_date: Optio
         logger.exception("Error fetching list of unique loads: %s", e)
         return None
 
-def fetch_calls_without_carrier_asked_for_transfer(start_date: Optional[str] = None, end_date: Optional[str] = None) -> Optional[CallsWithoutCarrierAskedForTransferStats]:
-    org_id = get_org_id()
+@cached_metric("calls_without_carrier_asked_for_transfer")
+def fetch_calls_without_carrier_asked_for_transfer(start_date: Optional[str] = None, end_date: Optional[str] = None, ctx: Optional[QueryContext] = None) -> Optional[CallsWithoutCarrierAskedForTransferStats]:
+    ctx = ctx or QueryContext.from_env()
+    org_id = ctx.org_id
     if not org_id:
         logger.error("❌ ORG_ID not found in environment variables. Please check your .env and restart the app.")
         return None
@@ -1370,8 +1687,8 @@ def fetch_calls_without_carrier_asked_for_transfer(start_date: Optional[str] = N
             logger.info("Fetching calls without carrier asked for transfer for date range: %s to %s", start_date, end_date)
         else:
             logger.info("Fetching calls without carrier asked for transfer for last 30 days (no date range provided)")
-        broker_node_id = get_broker_node_persistent_id()
-        excluded_sql = excluded_user_numbers_sql()
+        broker_node_id = ctx.broker_node_persistent_id
+        excluded_sql = ctx.excluded_user_numbers_sql()
         query = calls_without_carrier_asked_for_transfer_query(date_filter, org_id, broker_node_id, excluded_sql)
         client = get_clickhouse_client()
         rows = _json_each_row(client, query, settings=CLICKHOUSE_QUERY_SETTINGS)
@@ -1407,16 +1724,18 @@ def fetch_calls_without_carrier_asked_for_transfer(start_date: Optional[str] = N
         logger.exception("Error fetching calls without carrier asked for transfer: %s", e)
         return None
 
-def fetch_total_calls_and_total_duration(start_date: Optional[str] = None, end_date: Optional[str] = None) -> Optional[TotalCallsAndTotalDurationStats]:
-    org_id = get_org_id()
+@cached_metric("total_calls_and_total_duration")
+def fetch_total_calls_and_total_duration(start_date: Optional[str] = None, end_date: Optional[str] = None, ctx: Optional[QueryContext] = None) -> Optional[TotalCallsAndTotalDurationStats]:
+    ctx = ctx or QueryContext.from_env()
+    org_id = ctx.org_id
     if not org_id:
         logger.error("❌ ORG_ID not found in environment variables. Please check your .env and restart the app.")
         return None
     
     try:
         # Define calls as runs that reached this node within the date range, then join to sessions for duration.
-        broker_node_id = get_broker_node_persistent_id()
-        excluded_sql_sessions = excluded_user_numbers_sql()
+        broker_node_id = ctx.broker_node_persistent_id
+        excluded_sql_sessions = ctx.excluded_user_numbers_sql()
 
         date_filter = (
             f"timestamp >= parseDateTime64BestEffort('{start_date}') AND timestamp < parseDateTime64BestEffort('{end_date}')"
@@ -1424,35 +1743,7 @@ def fetch_total_calls_and_total_duration(start_date: Optional[str] = None, end_d
             else "timestamp >= now() - INTERVAL 30 DAY"
         )
 
-        query = f"""
-            WITH recent_runs AS (
-                SELECT id AS run_id
-                FROM public_runs
-                WHERE {date_filter}
-                  AND org_id = '{org_id}'
-            ),
-            node_runs AS (
-                SELECT DISTINCT no.run_id AS run_id
-                FROM public_node_outputs no
-                INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-                WHERE no.node_persistent_id = '{broker_node_id}'
-            ),
-            per_run AS (
-                SELECT
-                    nr.run_id AS run_id,
-                    any(s.duration) AS duration
-                FROM node_runs nr
-                LEFT JOIN public_sessions s ON s.run_id = nr.run_id
-                WHERE s.org_id = '{org_id}'
-                {excluded_sql_sessions}
-                GROUP BY nr.run_id
-            )
-            SELECT
-                ifNull(sum(duration), 0) AS total_duration,
-                count() AS total_calls,
-                ifNull(round((sum(duration) / nullIf(count(), 0)) / 60, 2), 0) AS avg_minutes_per_call
-            FROM per_run
-        """
+        query = total_calls_and_total_duration_query(date_filter, org_id, broker_node_id, excluded_sql_sessions)
 
         client = get_clickhouse_client()
         rows = _json_each_row(client, query, settings=CLICKHOUSE_QUERY_SETTINGS)
@@ -1468,15 +1759,17 @@ def fetch_total_calls_and_total_duration(start_date: Optional[str] = None, end_d
         logger.exception("Error fetching total calls and total duration: %s", e)
         return None
 
-def fetch_duration_carrier_asked_for_transfer(start_date: Optional[str] = None, end_date: Optional[str] = None) -> Optional[DurationCarrierAskedForTransferStats]:
-    org_id = get_org_id()
+@cached_metric("duration_carrier_asked_for_transfer")
+def fetch_duration_carrier_asked_for_transfer(start_date: Optional[str] = None, end_date: Optional[str] = None, ctx: Optional[QueryContext] = None) -> Optional[DurationCarrierAskedForTransferStats]:
+    ctx = ctx or QueryContext.from_env()
+    org_id = ctx.org_id
     if not org_id:
         logger.error("❌ ORG_ID not found in environment variables. Please check your .env and restart the app.")
         return None
     
     try:
-        broker_node_id = get_broker_node_persistent_id()
-        excluded_sql_sessions = excluded_user_numbers_sql()
+        broker_node_id = ctx.broker_node_persistent_id
+        excluded_sql_sessions = ctx.excluded_user_numbers_sql()
 
         date_filter = (
             f"timestamp >= parseDateTime64BestEffort('{start_date}') AND timestamp < parseDateTime64BestEffort('{end_date}')"
@@ -1484,33 +1777,7 @@ def fetch_duration_carrier_asked_for_transfer(start_date: Optional[str] = None,
             else "timestamp >= now() - INTERVAL 30 DAY"
         )
 
-        query = f"""
-            WITH recent_runs AS (
-                SELECT id AS run_id
-                FROM public_runs
-                WHERE {date_filter}
-                  AND org_id = '{org_id}'
-            ),
-            carrier_asked_runs AS (
-                SELECT DISTINCT no.run_id AS run_id
-                FROM public_node_outputs no
-                INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-                WHERE no.node_persistent_id = '{broker_node_id}'
-                  AND upper(JSONExtractString(no.flat_data, 'result.transfer.transfer_reason')) = 'CARRIER_ASKED_FOR_TRANSFER'
-            ),
-            per_run AS (
-                SELECT
-                    cr.run_id AS run_id,
-                    any(s.duration) AS duration
-                FROM carrier_asked_runs cr
-                LEFT JOIN public_sessions s ON s.run_id = cr.run_id
-                WHERE s.org_id = '{org_id}'
-                {excluded_sql_sessions}
-                GROUP BY cr.run_id
-            )
-            SELECT ifNull(sum(duration), 0) AS duration_carrier_asked_for_transfer
-            FROM per_run
-        """
+        query = duration_carrier_asked_for_transfer_query(date_filter, org_id, broker_node_id, excluded_sql_sessions)
 
         client = get_clickhouse_client()
         rows = _json_each_row(client, query, settings=CLICKHOUSE_QUERY_SETTINGS)
@@ -1523,20 +1790,446 @@ def fetch_duration_carrier_asked_for_transfer(start_date: Optional[str] = None,
     except Exception as e:
         logger.exception("Error fetching duration carrier asked for transfer: %s", e)
         return None
-def fetch_daily_node_outputs(
+
+def _breakdown_rows(r: Dict[str, Any], prefix: str) -> List[Tuple[str, int, float]]:
+    """
+    Zip the parallel <prefix>_keys / _counts / _percentages arrays of daily_report_query
+    into (value, count, percentage) tuples, largest count first like the per-metric queries.
+    """
+    keys = r.get(f"{prefix}_keys") or []
+    counts = r.get(f"{prefix}_counts") or []
+    percentages = r.get(f"{prefix}_percentages") or []
+    rows = [(str(k), int(c), float(p)) for k, c, p in zip(keys, counts, percentages)]
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return rows
+
+
+@cached_metric("daily_report")
+def fetch_daily_report_stats(start_date: Optional[str] = None, end_date: Optional[str] = None, ctx: Optional[QueryContext] = None) -> Optional[DailyReportStats]:
+    """
+    Fetches every daily report metric with a single ClickHouse query (see daily_report_query).
+    Returns the same values the individual fetch_* functions would, including their None results
+    for ratios whose denominator is zero.
+    """
+    ctx = ctx or QueryContext.from_env()
+    org_id = ctx.org_id
+    if not org_id:
+        logger.error("❌ ORG_ID not found in environment variables. Please check your .env and restart the app.")
+        return None
+
+    try:
+        date_filter = (
+            f"timestamp >= parseDateTime64BestEffort('{start_date}') AND timestamp < parseDateTime64BestEffort('{end_date}')"
+            if start_date and end_date
+            else "timestamp >= now() - INTERVAL 30 DAY"
+        )
+
+        if start_date and end_date:
+            logger.info("Fetching daily report stats for date range: %s to %s", start_date, end_date)
+        else:
+            logger.info("Fetching daily report stats for last 30 days (no date range provided)")
+
+        broker_node_id = ctx.broker_node_persistent_id
+        excluded_sql = ctx.excluded_user_numbers_sql()
+        query = daily_report_query(date_filter, org_id, broker_node_id, excluded_sql)
+
+        client = get_clickhouse_client()
+        rows = _json_each_row(client, query, settings=CLICKHOUSE_QUERY_SETTINGS)
+        if not rows:
+            logger.info("No daily report stats found")
+            return None
+        return _daily_report_stats_from_row(rows[0])
+    except Exception as e:
+        logger.exception("Error fetching daily report stats: %s", e)
+        return None
+
+
+def fetch_daily_report_stats_by_day(
+    start_day: str,
+    end_day: str,
+    tz_name: str,
+    ctx: Optional[QueryContext] = None,
+) -> Optional[Dict[str, DailyReportStats]]:
+    """
+    Fetches every daily report metric for each calendar day in [start_day, end_day] (YYYY-MM-DD,
+    inclusive, in tz_name) with one ClickHouse query grouped by day.
+    Returns {YYYY-MM-DD: stats} for every day in the range; days without runs get the stats of an
+    empty day, exactly as fetch_daily_report_stats would return for them.
+    """
+    ctx = ctx or QueryContext.from_env()
+    org_id = ctx.org_id
+    if not org_id:
+        logger.error("❌ ORG_ID not found in environment variables. Please check your .env and restart the app.")
+        return None
+
+    try:
+        tz = ZoneInfo(tz_name)
+        first = datetime.fromisoformat(start_day).date()
+        last = datetime.fromisoformat(end_day).date()
+        range_start = datetime.combine(first, datetime.min.time(), tzinfo=tz).isoformat()
+        range_end = datetime.combine(last + timedelta(days=1), datetime.min.time(), tzinfo=tz).isoformat()
+        date_filter = (
+            f"timestamp >= parseDateTime64BestEffort('{range_start}') AND timestamp < parseDateTime64BestEffort('{range_end}')"
+        )
+        logger.info("Fetching daily report stats by day for %s to %s (%s)", start_day, end_day, tz_name)
+
+        broker_node_id = ctx.broker_node_persistent_id
+        excluded_sql = ctx.excluded_user_numbers_sql()
+        query = daily_report_query(date_filter, org_id, broker_node_id, excluded_sql, day_tz=tz_name)
+
+        client = get_clickhouse_client()
+        rows = _json_each_row(client, query, settings=CLICKHOUSE_QUERY_SETTINGS)
+        rows_by_day = {str(r.get("report_day")): r for r in rows}
+
+        out: Dict[str, DailyReportStats] = {}
+        day = first
+        while day <= last:
+            out[day.isoformat()] = _daily_report_stats_from_row(rows_by_day.get(day.isoformat(), {}))
+            day += timedelta(days=1)
+        return out
+    except Exception as e:
+        logger.exception("Error fetching daily report stats by day: %s", e)
+        return None
+
+
+def fetch_daily_call_cube(
+    start_day: str,
+    end_day: str,
+    tz_name: str,
+    contexts: Sequence[QueryContext],
+) -> Optional[Dict[str, Dict[str, List[CallCubeCell]]]]:
+    """
+    Fetches the call cube of each org and calendar day in [start_day, end_day] (YYYY-MM-DD,
+    inclusive, in tz_name) with one ClickHouse query grouped by org and day, each org read from
+    its context's broker node. Returns {org_id: {YYYY-MM-DD: cells}} for every context and day;
+    days without runs have no cells.
+
+    The contexts must share their excluded user numbers (they all come from EXCLUDED_USER_NUMBERS).
+    """
+    contexts = [ctx for ctx in contexts if ctx.org_id]
+    if not contexts:
+        return {}
+
+    try:
+        excluded_sql = contexts[0].excluded_user_numbers_sql()
+        if any(ctx.excluded_user_numbers_sql() != excluded_sql for ctx in contexts):
+            raise ValueError("All contexts must exclude the same user numbers")
+
+        tz = ZoneInfo(tz_name)
+        first = datetime.fromisoformat(start_day).date()
+        last = datetime.fromisoformat(end_day).date()
+        range_start = datetime.combine(first, datetime.min.time(), tzinfo=tz).isoformat()
+        range_end = datetime.combine(last + timedelta(days=1), datetime.min.time(), tzinfo=tz).isoformat()
+        date_filter = (
+            f"timestamp >= parseDateTime64BestEffort('{range_start}') AND timestamp < parseDateTime64BestEffort('{range_end}')"
+        )
+        logger.info("Fetching daily call cube for %d orgs for %s to %s (%s)", len(contexts), start_day, end_day, tz_name)
+
+        org_nodes = [(ctx.org_id, ctx.broker_node_persistent_id) for ctx in contexts]
+        query = daily_call_cube_query(date_filter, org_nodes, excluded_sql, day_tz=tz_name)
+        client = get_clickhouse_client()
+        cols = _query_columns(client, query, settings=CLICKHOUSE_QUERY_SETTINGS)
+
+        out: Dict[str, Dict[str, List[CallCubeCell]]] = {}
+        for ctx in contexts:
+            days = out.setdefault(ctx.org_id, {})
+            day = first
+            while day <= last:
+                days[day.isoformat()] = []
+                day += timedelta(days=1)
+        dimensions = [f.name for f in fields(CallCubeCell) if f.name not in ("calls", "duration_seconds")]
+        values = [cols.column(name, "") for name in dimensions]
+        rows = zip(cols.column("report_org_id"), cols.column("report_day"), cols.column("calls"), cols.column("duration_seconds"))
+        for i, (org_id, report_day, calls, duration) in enumerate(rows):
+            cell = CallCubeCell(
+                *(str(column[i] or "") for column in values),
+                calls=int(calls or 0),
+                duration_seconds=float(duration or 0),
+            )
+            out.setdefault(str(org_id), {}).setdefault(str(report_day), []).append(cell)
+        return out
+    except Exception as e:
+        logger.exception("Error fetching daily call cube: %s", e)
+        return None
+
+
+def fetch_unique_load_ids_by_day(
+    start_day: str,
+    end_day: str,
+    tz_name: str,
+    contexts: Sequence[QueryContext],
+) -> Optional[Dict[str, Dict[str, List[str]]]]:
+    """
+    Fetches the unique load ids of each org and calendar day in [start_day, end_day]
+    (YYYY-MM-DD, inclusive, in tz_name) with one ClickHouse query grouped by org and day (see
+    unique_load_ids_by_day_query). Returns {org_id: {YYYY-MM-DD: sorted ids}} for every context
+    and day, the same ids fetch_list_of_unique_loads returns for each day's window.
+
+    The contexts must share their excluded user numbers (they all come from EXCLUDED_USER_NUMBERS).
+    """
+    contexts = [ctx for ctx in contexts if ctx.org_id]
+    if not contexts:
+        return {}
+
+    try:
+        excluded_sql = contexts[0].excluded_user_numbers_sql()
+        if any(ctx.excluded_user_numbers_sql() != excluded_sql for ctx in contexts):
+            raise ValueError("All contexts must exclude the same user numbers")
+
+        tz = ZoneInfo(tz_name)
+        first = datetime.fromisoformat(start_day).date()
+        last = datetime.fromisoformat(end_day).date()
+        range_start = datetime.combine(first, datetime.min.time(), tzinfo=tz)
+        range_end = datetime.combine(last + timedelta(days=1), datetime.min.time(), tzinfo=tz)
+        cutoff = datetime.fromisoformat(UNIQUE_LOADS_CUTOFF_DATE).replace(tzinfo=timezone.utc)
+
+        def window(start: datetime, end: datetime) -> Optional[str]:
+            if start >= end:
+                return None
+            return f"timestamp >= parseDateTime64BestEffort('{start.isoformat()}') AND timestamp < parseDateTime64BestEffort('{end.isoformat()}')"
+
+        logger.info("Fetching unique load ids by day for %d orgs for %s to %s (%s)", len(contexts), start_day, end_day, tz_name)
+        query = unique_load_ids_by_day_query(
+            window(range_start, min(range_end, cutoff)),
+            window(max(range_start, cutoff), range_end),
+            [(ctx.org_id, ctx.broker_node_persistent_id) for ctx in contexts],
+            [(ctx.org_id, ctx.fbr_node_persistent_id) for ctx in contexts],
+            excluded_sql,
+            day_tz=tz_name,
+        )
+        client = get_clickhouse_client()
+        cols = _query_columns(client, query, settings=CLICKHOUSE_QUERY_SETTINGS)
+
+        out: Dict[str, Dict[str, List[str]]] = {}
+        for ctx in contexts:
+            days = out.setdefault(ctx.org_id, {})
+            day = first
+            while day <= last:
+                days[day.isoformat()] = []
+                day += timedelta(days=1)
+        for org_id, report_day, load_ids in zip(cols.column("report_org_id"), cols.column("report_day"), cols.column("load_ids")):
+            if str(org_id) in out:
+                out[str(org_id)][str(report_day)] = [str(v) for v in load_ids if v]
+        return out
+    except Exception as e:
+        logger.exception("Error fetching unique load ids by day: %s", e)
+        return None
+
+
+def fetch_daily_report_stats_for_orgs(
+    start_date: str,
+    end_date: str,
+    contexts: Sequence[QueryContext],
+) -> Optional[Dict[str, DailyReportStats]]:
+    """
+    Fetches every daily report metric for several orgs over the same window with one ClickHouse
+    query grouped by org (see all_orgs_daily_report_query), each org read from its context's
+    broker node. Returns {org_id: stats} for every context; orgs without runs get the stats of
+    an empty window, exactly as fetch_daily_report_stats would return for them.
+
+    The contexts must share their excluded user numbers (they all come from EXCLUDED_USER_NUMBERS).
+    """
+    contexts = [ctx for ctx in contexts if ctx.org_id]
+    if not contexts:
+        return {}
+
+    try:
+        excluded_sql = contexts[0].excluded_user_numbers_sql()
+        if any(ctx.excluded_user_numbers_sql() != excluded_sql for ctx in contexts):
+            raise ValueError("All contexts must exclude the same user numbers")
+
+        date_filter = (
+            f"timestamp >= parseDateTime64BestEffort('{start_date}') AND timestamp < parseDateTime64BestEffort('{end_date}')"
+        )
+        logger.info("Fetching daily report stats for %d orgs for date range: %s to %s", len(contexts), start_date, end_date)
+
+        org_nodes = [(ctx.org_id, ctx.broker_node_persistent_id) for ctx in contexts]
+        query = all_orgs_daily_report_query(date_filter, org_nodes, excluded_sql)
+
+        client = get_clickhouse_client()
+        rows = _json_each_row(client, query, settings=CLICKHOUSE_QUERY_SETTINGS)
+        rows_by_org = {str(r.get("report_org_id")): r for r in rows}
+        return {ctx.org_id: _daily_report_stats_from_row(rows_by_org.get(ctx.org_id, {})) for ctx in contexts}
+    except Exception as e:
+        logger.exception("Error fetching daily report stats for orgs: %s", e)
+        return None
+
+
+def _daily_report_stats_from_row(r: Dict[str, Any]) -> DailyReportStats:
+    """
+    Build DailyReportStats from one daily_report_query row. An empty dict gives the stats of a
+    day without runs (what the ungrouped query returns for an empty window).
+    """
+    load_status_rows = _breakdown_rows(r, "load_status")
+    load_status_total = sum(count for _, count, _ in load_status_rows)
+
+    carrier_transfer_over_transfer_attempts = None
+    if int(r.get("carrier_asked_transfer_attempts") or 0) > 0:
+        carrier_transfer_over_transfer_attempts = CarrierTransferStatsTotalTransferAttempts(
+            carrier_asked_count=int(r["carrier_asked_transfer_attempts"]),
+            total_transfer_attempts=int(r.get("total_transfer_attempts", 0)),
+            carrier_asked_percentage=float(r["carrier_asked_transfer_attempts_percentage"]),
+        )
+
+    carrier_transfer_over_call_attempts = None
+    if r.get("carrier_asked_percentage") is not None:
+        carrier_transfer_over_call_attempts = CarrierTransferStatsTotalCallAttempts(
+            carrier_asked_count=int(r.get("carrier_asked_count", 0)),
+            total_call_attempts=int(r.get("total_call_attempts", 0)),
+            carrier_asked_percentage=float(r["carrier_asked_percentage"]),
+        )
+
+    non_convertible_with_cnq = None
+    if r.get("non_convertible_with_cnq_percentage") is not None:
+        non_convertible_with_cnq = NonConvertibleCallsWithCarrierNotQualifiedStats(
+            non_convertible_calls_count=int(r.get("non_convertible_with_cnq_count", 0)),
+            total_calls=int(r.get("classified_calls", 0)),
+            non_convertible_calls_percentage=float(r["non_convertible_with_cnq_percentage"]),
+        )
+
+    non_convertible_without_cnq = None
+    if r.get("non_convertible_without_cnq_percentage") is not None:
+        non_convertible_without_cnq = NonConvertibleCallsWithoutCarrierNotQualifiedStats(
+            non_convertible_calls_count=int(r.get("non_convertible_without_cnq_count", 0)),
+            total_calls=int(r.get("classified_calls", 0)),
+            non_convertible_calls_percentage=float(r["non_convertible_without_cnq_percentage"]),
+        )
+
+    carrier_not_qualified = None
+    if r.get("carrier_not_qualified_percentage") is not None:
+        carrier_not_qualified = CarrierNotQualifiedStats(
+            carrier_not_qualified_count=int(r.get("carrier_not_qualified_count", 0)),
+            total_calls=int(r.get("classified_calls", 0)),
+            carrier_not_qualified_percentage=float(r["carrier_not_qualified_percentage"]),
+        )
+
+    return DailyReportStats(
+        call_stage=[
+            TransferStats(call_stage=k, count=c, percentage=p)
+            for k, c, p in _breakdown_rows(r, "call_stage")
+        ],
+        call_classification=[
+            CallClassificationStats(call_classification=k, count=c, percentage=p)
+            for k, c, p in _breakdown_rows(r, "call_classification")
+        ],
+        load_status=[
+            LoadStatusStats(load_status=k, count=c, total_calls=load_status_total, load_status_percentage=p)
+            for k, c, p in load_status_rows
+        ],
+        pricing=[
+            PricingStats(pricing_notes=k, count=c, percentage=p)
+            for k, c, p in _breakdown_rows(r, "pricing_notes")
+        ],
+        carrier_end_state=[
+            CarrierEndStateStats(carrier_end_state=k, count=c, percentage=p)
+            for k, c, p in _breakdown_rows(r, "carrier_end_state")
+        ],
+        carrier_transfer_over_transfer_attempts=carrier_transfer_over_transfer_attempts,
+        carrier_transfer_over_call_attempts=carrier_transfer_over_call_attempts,
+        successfully_transferred_for_booking=SuccessfullyTransferredForBooking(
+            successfully_transferred_for_booking_count=int(r.get("successfully_transferred_for_booking_count", 0)),
+            total_calls=int(r.get("booking_total_calls", 0)),
+            successfully_transferred_for_booking_percentage=float(r.get("successfully_transferred_for_booking_percentage", 0.0)),
+        ),
+        non_convertible_with_cnq=non_convertible_with_cnq,
+        non_convertible_without_cnq=non_convertible_without_cnq,
+        carrier_not_qualified=carrier_not_qualified,
+        total_calls_and_duration=TotalCallsAndTotalDurationStats(
+            total_duration=int(r.get("total_duration", 0)),
+            total_calls=int(r.get("total_calls", 0)),
+            avg_minutes_per_call=float(r.get("avg_minutes_per_call", 0.0)),
+        ),
+    )
+
+
+# DailyReportStats field -> per-metric fetcher (the pre-single-pass path)
+DAILY_REPORT_FETCHERS = {
+    "call_stage": fetch_calls_ending_in_each_call_stage_stats,
+    "call_classification": fetch_call_classifcation_stats,
+    "load_status": fetch_load_status_stats,
+    "pricing": fetch_pricing_stats,
+    "carrier_end_state": fetch_carrier_end_state_stats,
+    "carrier_transfer_over_transfer_attempts": fetch_carrier_asked_transfer_over_total_transfer_attempts_stats,
+    "carrier_transfer_over_call_attempts": fetch_carrier_asked_transfer_over_total_call_attempts_stats,
+    "successfully_transferred_for_booking": fetch_successfully_transferred_for_booking_stats,
+    "non_convertible_with_cnq": fetch_non_convertible_calls_with_carrier_not_qualified,
+    "non_convertible_without_cnq": fetch_non_convertible_calls_without_carrier_not_qualified,
+    "carrier_not_qualified": fetch_carrier_not_qualified_stats,
+    "total_calls_and_duration": fetch_total_calls_and_total_duration,
+}
+
+# Breakdown fields: the fetchers return None when there are no rows
+DAILY_REPORT_LIST_FIELDS = ("call_stage", "call_classification", "load_status", "pricing", "carrier_end_state")
+
+
+def daily_report_stats_from_results(results: Dict[str, Any]) -> DailyReportStats:
+    """Assemble DailyReportStats from {field: fetcher result} (see DAILY_REPORT_FETCHERS)."""
+    return DailyReportStats(**{
+        field: (results.get(field) or []) if field in DAILY_REPORT_LIST_FIELDS else results.get(field)
+        for field in DAILY_REPORT_FETCHERS
+    })
+
+
+def fetch_daily_report_stats_per_metric(start_date: Optional[str] = None, end_date: Optional[str] = None, ctx: Optional[QueryContext] = None) -> DailyReportStats:
+    """
+    Fetches the daily report metrics with one query per metric (the pre-single-pass path).
+    Kept to diff the two engines against each other; DAILY_REPORT_ENGINE=per_metric goes through
+    report_engine.fetch_report_stats_per_metric, which also retries failed metrics.
+    """
+    ctx = ctx or QueryContext.from_env()
+    return daily_report_stats_from_results({
+        field: fetcher(start_date, end_date, ctx) for field, fetcher in DAILY_REPORT_FETCHERS.items()
+    })
+
+
+NODE_OUTPUTS_CURSOR_TIMESTAMP_RE = re.compile(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(\.\d{1,9})?$")
+NODE_OUTPUTS_CURSOR_RUN_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+def encode_node_outputs_cursor(run_timestamp: str, run_id: str) -> str:
+    """Opaque keyset cursor for the (run_timestamp, run_id) of the last row of a page."""
+    payload = json.dumps([run_timestamp, run_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_node_outputs_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Decode a cursor from encode_node_outputs_cursor.
+
+    Raises:
+        ValueError: if the cursor is malformed (its values are interpolated into SQL, so they
+            are validated strictly)
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        run_timestamp, run_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+    if not (isinstance(run_timestamp, str) and NODE_OUTPUTS_CURSOR_TIMESTAMP_RE.match(run_timestamp)):
+        raise ValueError("Invalid cursor: bad run_timestamp")
+    if not (isinstance(run_id, str) and NODE_OUTPUTS_CURSOR_RUN_ID_RE.match(run_id)):
+        raise ValueError("Invalid cursor: bad run_id")
+    return run_timestamp, run_id
+
+
+def _daily_node_outputs_query(
     start_date: str,
     end_date: str,
     node_persistent_id: str,
-    limit: int = 500,
-    include_flat_data: bool = True,
-) -> List[DailyNodeOutputRow]:
+    limit: int,
+    after: Optional[Tuple[str, str]] = None,
+    paginate: bool = False,
+    ctx: Optional[QueryContext] = None,
+) -> str:
     """
-    Fetch raw-ish node outputs for a specific node persistent id over a date range.
+    Node outputs for a node over [start_date, end_date), newest run first.
 
-    Intended as a “start here” endpoint for new clients: pull yesterday’s runs and inspect the
-    `flat_data` payloads + core extracted fields.
+    With `paginate`, rows are ordered by (run_timestamp, run_id) and the page is extended
+    `WITH TIES` so it never ends part-way through a run; `after` is the (run_timestamp, run_id)
+    keyset of the previous page's last row.
     """
-    org_id = os.getenv("ORG_ID")
+    ctx = ctx or QueryContext.from_env()
+    org_id = ctx.org_id
 
     # Date filter compatible with existing query style (end_date is exclusive)
     date_filter = (
@@ -1548,14 +2241,22 @@ def fetch_daily_node_outputs(
     org_filter_sessions = f"AND org_id = '{org_id}'" if org_id else ""
 
     # Optional excluded test numbers (applied in sessions CTE if present)
-    excluded_filter = excluded_user_numbers_sql()
+    excluded_filter = ctx.excluded_user_numbers_sql()
 
-    query = f"""
+    # Keyset pagination: runs strictly before the previous page's last (timestamp, run_id)
+    keyset_filter = (
+        f"AND (timestamp, toString(id)) < (toDateTime64('{after[0]}', 6), '{after[1]}')"
+        if after
+        else ""
+    )
+
+    return f"""
         WITH recent_runs AS (
             SELECT id AS run_id, timestamp
             FROM public_runs
             WHERE {date_filter}
             {org_filter_runs}
+            {keyset_filter}
         ),
         sessions AS (
             SELECT run_id, user_number, duration
@@ -1563,88 +2264,154 @@ def fetch_daily_node_outputs(
             WHERE {date_filter}
             {org_filter_sessions}
             {excluded_filter}
+        ),
+        outputs AS (
+            SELECT
+                run_id,
+                node_persistent_id,
+                flat_data,
+                {flat_data_fields_sql('flat_data')} AS flat_fields,
+                {flat_string_sql('result.metadata.processing_timestamp')} AS processing_timestamp,
+                {flat_string_sql('result.call.call_classification')} AS call_classification,
+                {flat_string_sql('result.call.call_stage')} AS call_stage,
+                {flat_string_sql('result.call.notes')} AS call_notes,
+                {flat_string_sql('result.transfer.transfer_attempt')} AS transfer_attempt,
+                {flat_string_sql('result.transfer.transfer_reason')} AS transfer_reason,
+                {flat_string_sql('result.transfer.transfer_success')} AS transfer_success,
+                {flat_string_sql('result.load.load_status')} AS load_status,
+                {flat_string_sql('result.load.reference_number')} AS reference_number,
+                {flat_string_sql('result.carrier.carrier_name')} AS carrier_name,
+                {flat_string_sql('result.carrier.carrier_mc')} AS carrier_mc,
+                {flat_string_sql('result.carrier.carrier_qualification')} AS carrier_qualification,
+                {flat_string_sql('result.carrier.carrier_end_state')} AS carrier_end_state,
+                {flat_string_sql('result.pricing.pricing_notes')} AS pricing_notes,
+                {flat_string_sql('result.pricing.agreed_upon_rate')} AS agreed_upon_rate
+            FROM public_node_outputs
+            WHERE node_persistent_id = '{node_persistent_id}'
+              AND run_id IN (SELECT run_id FROM recent_runs)
         )
         SELECT
-            rr.run_id AS run_id,
-            rr.timestamp AS run_timestamp,
+            toString(rr.run_id) AS run_id,
+            toString(rr.timestamp) AS run_timestamp,
             no.node_persistent_id AS node_persistent_id,
             s.user_number AS user_number,
             s.duration AS duration_seconds,
-            JSONExtractString(no.flat_data, 'result.metadata.processing_timestamp') AS processing_timestamp,
+            no.processing_timestamp AS processing_timestamp,
 
-            JSONExtractString(no.flat_data, 'result.call.call_classification') AS call_classification,
-            JSONExtractString(no.flat_data, 'result.call.call_stage') AS call_stage,
-            JSONExtractString(no.flat_data, 'result.call.notes') AS call_notes,
+            no.call_classification AS call_classification,
+            no.call_stage AS call_stage,
+            no.call_notes AS call_notes,
 
-            JSONExtractString(no.flat_data, 'result.transfer.transfer_attempt') AS transfer_attempt,
-            JSONExtractString(no.flat_data, 'result.transfer.transfer_reason') AS transfer_reason,
-            JSONExtractString(no.flat_data, 'result.transfer.transfer_success') AS transfer_success,
+            no.transfer_attempt AS transfer_attempt,
+            no.transfer_reason AS transfer_reason,
+            no.transfer_success AS transfer_success,
 
-            JSONExtractString(no.flat_data, 'result.load.load_status') AS load_status,
-            JSONExtractString(no.flat_data, 'result.load.reference_number') AS reference_number,
+            no.load_status AS load_status,
+            no.reference_number AS reference_number,
 
-            JSONExtractString(no.flat_data, 'result.carrier.carrier_name') AS carrier_name,
-            JSONExtractString(no.flat_data, 'result.carrier.carrier_mc') AS carrier_mc,
-            JSONExtractString(no.flat_data, 'result.carrier.carrier_qualification') AS carrier_qualification,
-            JSONExtractString(no.flat_data, 'result.carrier.carrier_end_state') AS carrier_end_state,
+            no.carrier_name AS carrier_name,
+            no.carrier_mc AS carrier_mc,
+            no.carrier_qualification AS carrier_qualification,
+            no.carrier_end_state AS carrier_end_state,
 
-            JSONExtractString(no.flat_data, 'result.pricing.pricing_notes') AS pricing_notes,
-            JSONExtractString(no.flat_data, 'result.pricing.agreed_upon_rate') AS agreed_upon_rate,
+            no.pricing_notes AS pricing_notes,
+            no.agreed_upon_rate AS agreed_upon_rate,
 
             no.flat_data AS flat_data
-        FROM public_node_outputs no
+        FROM outputs no
         INNER JOIN recent_runs rr ON no.run_id = rr.run_id
         LEFT JOIN sessions s ON no.run_id = s.run_id
-        WHERE no.node_persistent_id = '{node_persistent_id}'
-        ORDER BY rr.timestamp DESC
-        LIMIT {int(limit)}
+        ORDER BY rr.timestamp DESC, run_id DESC
+        LIMIT {int(limit)}{" WITH TIES" if paginate else ""}
     """
 
+
+def _maybe_parse_flat_data(v: Any, include_flat_data: bool) -> Optional[Dict[str, Any]]:
+    if not include_flat_data:
+        return None
+    if v is None:
+        return None
+    if isinstance(v, dict):
+        return v
+    if isinstance(v, str):
+        try:
+            return json.loads(v)
+        except Exception:
+            return {"_raw": v}
+    return {"_raw": str(v)}
+
+
+def _optional_str_column(values: List[Any]) -> List[Optional[str]]:
+    return [str(v) if v is not None else None for v in values]
+
+
+def _daily_node_output_rows(cols: QueryColumns, include_flat_data: bool) -> List[DailyNodeOutputRow]:
+    """Build DailyNodeOutputRow objects column by column from a _daily_node_outputs_query result."""
+    converted: Dict[str, List[Any]] = {}
+    for f in fields(DailyNodeOutputRow):
+        values = cols.column(f.name)
+        if f.name in ("run_id", "run_timestamp", "node_persistent_id"):
+            converted[f.name] = [str(v) if v is not None else "" for v in values]
+        elif f.name == "duration_seconds":
+            converted[f.name] = [int(v) if v is not None else None for v in values]
+        elif f.name == "flat_data":
+            converted[f.name] = [_maybe_parse_flat_data(v, include_flat_data) for v in values]
+        else:
+            converted[f.name] = _optional_str_column(values)
+    return [DailyNodeOutputRow(**dict(zip(converted, values))) for values in zip(*converted.values())]
+
+
+def fetch_daily_node_outputs(
+    start_date: str,
+    end_date: str,
+    node_persistent_id: str,
+    limit: int = 500,
+    include_flat_data: bool = True,
+    ctx: Optional[QueryContext] = None,
+) -> List[DailyNodeOutputRow]:
+    """
+    Fetch raw-ish node outputs for a specific node persistent id over a date range.
+
+    Intended as a “start here” endpoint for new clients: pull yesterday’s runs and inspect the
+    `flat_data` payloads + core extracted fields.
+    """
+    query = _daily_node_outputs_query(start_date, end_date, node_persistent_id, limit, ctx=ctx)
+
     client = get_clickhouse_client()
-    rows = _json_each_row(client, query, settings=CLICKHOUSE_QUERY_SETTINGS)
+    cols = _query_columns(client, query, settings=CLICKHOUSE_QUERY_SETTINGS)
+    return _daily_node_output_rows(cols, include_flat_data)
 
-    def _maybe_parse_flat_data(v: Any) -> Optional[Dict[str, Any]]:
-        if not include_flat_data:
-            return None
-        if v is None:
-            return None
-        if isinstance(v, dict):
-            return v
-        if isinstance(v, str):
-            try:
-                return json.loads(v)
-            except Exception:
-                return {"_raw": v}
-        return {"_raw": str(v)}
-
-    out: List[DailyNodeOutputRow] = []
-    for r in rows:
-        out.append(
-            DailyNodeOutputRow(
-                run_id=str(r.get("run_id", "")),
-                run_timestamp=str(r.get("run_timestamp", "")),
-                node_persistent_id=str(r.get("node_persistent_id", "")),
-                user_number=(str(r.get("user_number")) if r.get("user_number") is not None else None),
-                duration_seconds=(int(r.get("duration_seconds")) if r.get("duration_seconds") is not None else None),
-                processing_timestamp=(str(r.get("processing_timestamp")) if r.get("processing_timestamp") is not None else None),
-                call_classification=(str(r.get("call_classification")) if r.get("call_classification") is not None else None),
-                call_stage=(str(r.get("call_stage")) if r.get("call_stage") is not None else None),
-                call_notes=(str(r.get("call_notes")) if r.get("call_notes") is not None else None),
-                transfer_attempt=(str(r.get("transfer_attempt")) if r.get("transfer_attempt") is not None else None),
-                transfer_reason=(str(r.get("transfer_reason")) if r.get("transfer_reason") is not None else None),
-                transfer_success=(str(r.get("transfer_success")) if r.get("transfer_success") is not None else None),
-                load_status=(str(r.get("load_status")) if r.get("load_status") is not None else None),
-                reference_number=(str(r.get("reference_number")) if r.get("reference_number") is not None else None),
-                carrier_name=(str(r.get("carrier_name")) if r.get("carrier_name") is not None else None),
-                carrier_mc=(str(r.get("carrier_mc")) if r.get("carrier_mc") is not None else None),
-                carrier_qualification=(str(r.get("carrier_qualification")) if r.get("carrier_qualification") is not None else None),
-                carrier_end_state=(str(r.get("carrier_end_state")) if r.get("carrier_end_state") is not None else None),
-                pricing_notes=(str(r.get("pricing_notes")) if r.get("pricing_notes") is not None else None),
-                agreed_upon_rate=(str(r.get("agreed_upon_rate")) if r.get("agreed_upon_rate") is not None else None),
-                flat_data=_maybe_parse_flat_data(r.get("flat_data")),
-            )
-        )
-    return out
+
+def iter_daily_node_outputs(
+    start_date: str,
+    end_date: str,
+    node_persistent_id: str,
+    limit: int = 1000,
+    include_flat_data: bool = True,
+    cursor: Optional[str] = None,
+    ctx: Optional[QueryContext] = None,
+) -> Iterator[DailyNodeOutputRow]:
+    """
+    Stream one page of node outputs, newest run first, as ClickHouse returns blocks.
+
+    Rows are decoded block by block from query_column_block_stream, so memory stays flat
+    regardless of `limit`. A page holds at least `limit` rows when more exist (it is
+    extended to the end of its last run); resume with
+    encode_node_outputs_cursor(last.run_timestamp, last.run_id).
+
+    The pooled client is held until the generator is exhausted or closed.
+
+    Raises:
+        ValueError: if `cursor` is malformed
+    """
+    after = decode_node_outputs_cursor(cursor) if cursor else None
+    query = _daily_node_outputs_query(start_date, end_date, node_persistent_id, limit, after=after, paginate=True, ctx=ctx)
+
+    with get_clickhouse_pool().client() as client:
+        with client.query_column_block_stream(query, settings=CLICKHOUSE_QUERY_SETTINGS) as stream:
+            column_names = tuple(stream.source.column_names)
+            for block in stream:
+                yield from _daily_node_output_rows(QueryColumns(names=column_names, columns=block), include_flat_data)
 
 
 def fetch_table_schema(table_name: str) -> List[Dict[str, Any]]:
@@ -1653,9 +2420,8 @@ def fetch_table_schema(table_name: str) -> List[Dict[str, Any]]:
     """
     client = get_clickhouse_client()
     query = f"DESCRIBE TABLE {table_name}"
-    rows = _json_each_row(client, query, settings=CLICKHOUSE_QUERY_SETTINGS)
     # Typical columns: name, type, default_type, default_expression, comment, codec_expression, ttl_expression
-    return rows
+    return _query_columns(client, query, settings=CLICKHOUSE_QUERY_SETTINGS).rows()
 
 
 def fetch_node_output_counts(
@@ -1797,26 +2563,3 @@ def fetch_node_output_orgs(node_persistent_id: str, days: int = 30) -> Dict[str,
         "runs_orgs": runs_rows,
         "sessions_orgs": session_rows,
     }
-    
-    try:
-        date_filter = (
-            f"timestamp >= parseDateTime64BestEffort('{start_date}') AND timestamp < parseDateTime64BestEffort('{end_date}')"
-            if start_date and end_date
-            else "timestamp >= now() - INTERVAL 30 DAY"
-        )
-        broker_node_id = get_broker_node_persistent_id()
-        excluded_sql = excluded_user_numbers_sql()
-        query = duration_carrier_asked_for_transfer_query(date_filter, org_id, broker_node_id, excluded_sql)
-        client = get_clickhouse_client()
-        rows = _json_each_row(client, query, settings=CLICKHOUSE_QUERY_SETTINGS)
-        logger.info("Duration carrier asked for transfer query result: %d rows", len(rows))
-        if not rows:
-            logger.info("No duration carrier asked for transfer found")
-            return None
-        r = rows[0]
-        return DurationCarrierAskedForTransferStats(
-            duration_carrier_asked_for_transfer=int(r.get("duration_carrier_asked_for_transfer", 0)),
-        )
-    except Exception as e:
-        logger.exception("Error fetching duration carrier asked for transfer: %s", e)
-        return None
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""
+Async execution layer for the blocking ClickHouse fetchers.
+
+The `db.fetch_*` functions are synchronous. Calling them directly from an `async def`
+endpoint blocks the event loop for the whole query, so every other request (including
+`/health`) waits. Endpoints use `run_blocking` for a single fetch and `gather_blocking`
+to fan several fetches out concurrently.
+
+Configuration via environment variables:
+- FETCH_EXECUTOR_WORKERS: threads shared by all requests (default: CLICKHOUSE_POOL_SIZE)
+- FETCH_CONCURRENCY_PER_REQUEST: max fetches one request runs at once (default: 6)
+"""
+
+import os
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+from db import get_clickhouse_pool_size
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor_workers() -> int:
+    """Get the number of fetch executor threads."""
+    return max(1, int(os.getenv("FETCH_EXECUTOR_WORKERS", str(get_clickhouse_pool_size()))))
+
+
+def get_request_concurrency() -> int:
+    """Get the max number of fetches a single request may run concurrently."""
+    return max(1, int(os.getenv("FETCH_CONCURRENCY_PER_REQUEST", "6")))
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get or create the process-wide fetch executor."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = get_executor_workers()
+                logger.info("Starting fetch executor with %d workers", workers)
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch")
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Shut down the fetch executor (on app shutdown)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+async def run_blocking(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking function on the fetch executor without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), partial(fn, *args, **kwargs))
+
+
+class FanOutResults:
+    """
+    Results of `gather_blocking`, keyed by name.
+    Indexing a name whose call raised re-raises that exception, so callers can keep
+    their per-metric try/except blocks.
+    """
+
+    def __init__(self, values: Dict[str, Any], errors: Dict[str, BaseException]):
+        self.values = values
+        self.errors = errors
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self.errors:
+            raise self.errors[name]
+        return self.values[name]
+
+
+async def gather_blocking(
+    calls: Dict[str, Callable[[], Any]],
+    limit: Optional[int] = None,
+) -> FanOutResults:
+    """
+    Run zero-argument blocking callables concurrently on the fetch executor,
+    at most `limit` (default FETCH_CONCURRENCY_PER_REQUEST) at a time.
+    Exceptions are collected per name instead of cancelling the other calls.
+    """
+    semaphore = asyncio.Semaphore(limit or get_request_concurrency())
+
+    async def _run(fn: Callable[[], Any]) -> Any:
+        async with semaphore:
+            return await run_blocking(fn)
+
+    names = list(calls.keys())
+    outcomes = await asyncio.gather(*(_run(calls[name]) for name in names), return_exceptions=True)
+
+    values: Dict[str, Any] = {}
+    errors: Dict[str, BaseException] = {}
+    for name, outcome in zip(names, outcomes):
+        if isinstance(outcome, BaseException):
+            errors[name] = outcome
+        else:
+            values[name] = outcome
+    return FanOutResults(values, errors)
@@ -1,19 +1,27 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from dotenv import load_dotenv
-from db import fetch_calls_ending_in_each_call_stage_stats, fetch_carrier_asked_transfer_over_total_transfer_attempts_stats, fetch_carrier_asked_transfer_over_total_call_attempts_stats,fetch_load_not_found_stats, fetch_load_status_stats, fetch_successfully_transferred_for_booking_stats, fetch_call_classifcation_stats, fetch_carrier_qualification_stats, fetch_pricing_stats, fetch_carrier_end_state_stats, fetch_percent_non_convertible_calls, fetch_non_convertible_calls_with_carrier_not_qualified, fetch_non_convertible_calls_without_carrier_not_qualified, fetch_carrier_not_qualified_stats, fetch_number_of_unique_loads, fetch_list_of_unique_loads, fetch_calls_without_carrier_asked_for_transfer, fetch_total_calls_and_total_duration, fetch_duration_carrier_asked_for_transfer, fetch_daily_node_outputs, fetch_table_schema, fetch_node_output_counts, fetch_node_output_orgs
+from db import fetch_calls_ending_in_each_call_stage_stats, fetch_carrier_asked_transfer_over_total_transfer_attempts_stats, fetch_carrier_asked_transfer_over_total_call_attempts_stats,fetch_load_not_found_stats, fetch_load_status_stats, fetch_successfully_transferred_for_booking_stats, fetch_call_classifcation_stats, fetch_carrier_qualification_stats, fetch_pricing_stats, fetch_carrier_end_state_stats, fetch_percent_non_convertible_calls, fetch_non_convertible_calls_with_carrier_not_qualified, fetch_non_convertible_calls_without_carrier_not_qualified, fetch_carrier_not_qualified_stats, fetch_number_of_unique_loads, fetch_list_of_unique_loads, fetch_calls_without_carrier_asked_for_transfer, fetch_total_calls_and_total_duration, fetch_duration_carrier_asked_for_transfer, fetch_daily_node_outputs, iter_daily_node_outputs, encode_node_outputs_cursor, decode_node_outputs_cursor, fetch_table_schema, fetch_node_output_counts, fetch_node_output_orgs, warm_clickhouse_pool, close_clickhouse_pool, get_clickhouse_pool_size
 from typing import Optional, List
 from pydantic import BaseModel
 import os
+import json
+import asyncio
 import logging
 from pathlib import Path
 from datetime import datetime, timedelta, time
+from time import perf_counter
 from zoneinfo import ZoneInfo
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, nullcontext
+from functools import partial
+from dataclasses import asdict
+from queries import get_query_plan
 
 # Storage and scheduler imports
 from storage import (
     ensure_db_initialized,
+    close_db_pool,
     seed_default_organization,
     get_all_organizations,
     get_organization,
@@ -22,20 +30,29 @@ from storage import (
     upsert_organization,
     get_daily_report,
     get_latest_report,
-    get_recent_reports,
-    get_reports_in_range,
+    get_report_summaries,
     get_all_report_dates,
-    get_report_count,
-    get_date_range,
+    save_daily_report,
     Organization,
     DailyReport,
 )
+from report_engine import build_daily_report_async, build_daily_reports_for_orgs
+from executor import run_blocking, gather_blocking, shutdown_executor
 from scheduler import (
     start_scheduler,
     stop_scheduler,
     trigger_daily_report_now,
-    backfill_reports,
+    query_context_for_org,
+    new_daily_reports,
+    is_report_complete,
 )
+from backfill import (
+    start_backfill_job,
+    cancel_backfill_job,
+    resume_backfill_jobs,
+    job_to_dict,
+)
+from report_queue import task_to_dict
 
 # Logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
@@ -48,6 +65,19 @@ load_dotenv(dotenv_path=env_path, override=False)
 
 client_name = os.getenv("CLIENT_NAME", "Logistics")
 
+# Startup phase durations (seconds) and time to ready, reported by /api/scheduler/health
+startup_timings: dict = {"phases": {}, "ready_seconds": None}
+
+
+def get_startup_warmup_timeout() -> float:
+    """Seconds startup waits for the ClickHouse warm-up before serving without it."""
+    return float(os.getenv("STARTUP_WARMUP_TIMEOUT_SECONDS", "10"))
+
+
+def is_daily_report_read_through_enabled() -> bool:
+    """Check if /daily-report serves completed days of stored organizations from daily_reports."""
+    return os.getenv("DAILY_REPORT_READ_THROUGH", "true").lower() in ("true", "1", "yes")
+
 
 # Lifespan context manager for startup/shutdown
 @asynccontextmanager
@@ -55,16 +85,43 @@ async def lifespan(app: FastAPI):
     """Startup and shutdown events."""
     # Startup
     logger.info("Starting up...")
-    ensure_db_initialized()
-    seed_default_organization()
-    start_scheduler()
-    logger.info("Startup complete")
+    startup_started = perf_counter()
+    phases = startup_timings["phases"]
+
+    def run_phase(name, fn):
+        started = perf_counter()
+        try:
+            return fn()
+        finally:
+            phases[name] = round(perf_counter() - started, 3)
+
+    run_phase("db_init", ensure_db_initialized)
+    run_phase("seed_organization", seed_default_organization)
+
+    # Warm-up only saves the first request a connect; don't let a slow ClickHouse hold up startup
+    warmup_started = perf_counter()
+    try:
+        await asyncio.wait_for(run_blocking(warm_clickhouse_pool), timeout=get_startup_warmup_timeout())
+    except asyncio.TimeoutError:
+        logger.warning("ClickHouse warm-up still running after %ss, continuing startup", get_startup_warmup_timeout())
+    phases["clickhouse_warmup"] = round(perf_counter() - warmup_started, 3)
+
+    # The scheduler only schedules catch-up here; it runs in the background once we're serving
+    run_phase("start_scheduler", start_scheduler)
+    run_phase("resume_backfill_jobs", resume_backfill_jobs)
+
+    startup_timings["ready_seconds"] = round(perf_counter() - startup_started, 3)
+    logger.info("Startup complete in %.2fs (%s)", startup_timings["ready_seconds"],
+                ", ".join(f"{name}={seconds:.2f}s" for name, seconds in phases.items()))
 
     yield
 
     # Shutdown
     logger.info("Shutting down...")
     stop_scheduler()
+    shutdown_executor()
+    close_clickhouse_pool()
+    close_db_pool()
     logger.info("Shutdown complete")
 
 
@@ -133,6 +190,8 @@ async def debug_config():
             "user": clickhouse_user,
             "secure": clickhouse_secure,
             "password_present": bool(os.getenv("CLICKHOUSE_PASSWORD")),
+            "pool_size": get_clickhouse_pool_size(),
+            "query_plan": get_query_plan(),
         },
         "env_file_loaded": env_path.exists(),
         "log_level": os.getenv("LOG_LEVEL", "INFO"),
@@ -154,7 +213,7 @@ async def debug_schema(table_name: str):
     if table_name not in allowed:
         raise HTTPException(status_code=400, detail=f"table_name must be one of: {sorted(list(allowed))}")
     try:
-        return fetch_table_schema(table_name)
+        return await run_blocking(fetch_table_schema, table_name)
     except Exception as e:
         logger.exception("Error in debug_schema endpoint")
         raise HTTPException(status_code=500, detail=f"Error describing table {table_name}: {str(e)}")
@@ -170,7 +229,7 @@ async def debug_node_count(node_persistent_id: Optional[str] = None, days: int =
         if not node_id:
             raise HTTPException(status_code=400, detail="Missing node_persistent_id (param or BROKER_NODE_PERSISTENT_ID).")
         org_id = os.getenv("ORG_ID")
-        return fetch_node_output_counts(node_id, org_id, days=days)
+        return await run_blocking(fetch_node_output_counts, node_id, org_id, days=days)
     except HTTPException:
         raise
     except Exception as e:
@@ -187,7 +246,7 @@ async def debug_node_orgs(node_persistent_id: Optional[str] = None, days: int =
         node_id = node_persistent_id or os.getenv("BROKER_NODE_PERSISTENT_ID")
         if not node_id:
             raise HTTPException(status_code=400, detail="Missing node_persistent_id (param or BROKER_NODE_PERSISTENT_ID).")
-        return fetch_node_output_orgs(node_id, days=days)
+        return await run_blocking(fetch_node_output_orgs, node_id, days=days)
     except HTTPException:
         raise
     except Exception as e:
@@ -223,122 +282,152 @@ def _day_range_iso(date_str: Optional[str], tz_name: str) -> tuple[str, str]:
     return start_dt.isoformat(), end_dt.isoformat()
 
 
+# Read-through fills in flight: (org_id, date) -> task computing and saving that report
+_report_fills: dict = {}
+
+
+def _save_computed_report(org: Organization, report_date: str, report_data: dict) -> dict:
+    """Store a report computed for /daily-report like the scheduler would (load ids, call cube)."""
+    report = new_daily_reports([org], {org.org_id: {report_date: report_data}}, query_slot=nullcontext)[0]
+    return save_daily_report(report).report_data
+
+
+def _live_report_shape(report_data: dict) -> dict:
+    """
+    A stored report in the shape /daily-report computes live: without the storage-only
+    metadata and number_of_unique_loads (the rollups' load-id state).
+    """
+    shaped = {key: value for key, value in report_data.items() if key != "metadata"}
+    shaped["kpis"] = {key: value for key, value in (report_data.get("kpis") or {}).items() if key != "number_of_unique_loads"}
+    shaped["degraded_metrics"] = [m for m in report_data.get("degraded_metrics") or [] if m != "number_of_unique_loads"]
+    return shaped
+
+
+async def _fill_stored_report(org: Organization, report_date: str, start_date: str, end_date: str) -> dict:
+    report_data = await build_daily_report_async(start_date, end_date, org.timezone, query_context_for_org(org))
+    try:
+        return await run_blocking(_save_computed_report, org, report_date, report_data)
+    except Exception as e:
+        # Still serve the computed report; the scheduler fills the day in later
+        logger.exception("Could not store computed report for %s on %s: %s", org.org_id, report_date, e)
+        return report_data
+
+
 @app.get("/daily-report")
 async def get_live_daily_report(
+    response: Response,
     date: Optional[str] = None,
     tz: Optional[str] = None,
+    org_id: Optional[str] = None,
+    fresh: bool = False,
 ):
     """
     One-stop daily analytics report.
 
     - If `date` is omitted: returns yesterday (previous calendar day) in `tz`.
     - `date` format: YYYY-MM-DD
+    - Metrics come from one ClickHouse query unless DAILY_REPORT_ENGINE=per_metric.
+    - Read-through: a completed day (before today) of a stored organization (`org_id`, default
+      ORG_ID), asked for in that organization's timezone, is served from the stored report.
+      A missing or degraded report is computed once, saved and served; `fresh=true` recomputes
+      (and re-saves) it. Today, other timezones and unknown orgs are computed live as before.
+      The `X-Report-Source` header says which: stored, computed or live. All three return the
+      same shape (stored reports are served without their storage-only fields).
+    """
+    try:
+        tz_name = tz or os.getenv("DEFAULT_TIMEZONE", "UTC")
+        start_date, end_date = _day_range_iso(date, tz_name)
+        report_date = start_date[:10]
+
+        read_through = is_daily_report_read_through_enabled()
+        org = None
+        if org_id or (read_through and os.getenv("ORG_ID")):
+            org = await run_blocking(get_organization, org_id or os.getenv("ORG_ID"))
+            if org_id and org is None:
+                raise HTTPException(status_code=404, detail=f"Organization {org_id} not found")
+
+        completed = report_date < datetime.now(ZoneInfo(tz_name)).date().isoformat()
+        if not (read_through and org and org.timezone == tz_name and completed):
+            response.headers["X-Report-Source"] = "live"
+            # Without org_id the report keeps using the env configuration
+            ctx = query_context_for_org(org) if org_id else None
+            return await build_daily_report_async(start_date, end_date, tz_name, ctx)
+
+        if not fresh:
+            stored = await run_blocking(get_daily_report, org.org_id, report_date)
+            if is_report_complete(stored):
+                response.headers["X-Report-Source"] = "stored"
+                return _live_report_shape(stored.report_data)
+
+        # Concurrent requests for the same day share one computation
+        key = (org.org_id, report_date)
+        fill = _report_fills.get(key)
+        if fill is None:
+            fill = asyncio.ensure_future(_fill_stored_report(org, report_date, start_date, end_date))
+            _report_fills[key] = fill
+            fill.add_done_callback(lambda _: _report_fills.pop(key, None))
+        response.headers["X-Report-Source"] = "computed"
+        return _live_report_shape(await asyncio.shield(fill))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error in get_daily_report endpoint")
+        raise HTTPException(status_code=500, detail=f"Error fetching daily report: {str(e)}")
+
+
+@app.get("/daily-report/compare")
+async def compare_daily_report_kpis(
+    date: Optional[str] = None,
+    tz: Optional[str] = None,
+    org_ids: Optional[str] = None,
+):
+    """
+    Compare daily report KPIs across organizations for one calendar day.
+
+    - `date` / `tz`: same as /daily-report (default: yesterday in DEFAULT_TIMEZONE)
+    - `org_ids`: comma-separated org ids (default: every active organization)
+    - All orgs are computed with one ClickHouse query grouped by org, each from its own broker node.
+    - Orgs are sorted by total calls, busiest first.
     """
     try:
         tz_name = tz or os.getenv("DEFAULT_TIMEZONE", "UTC")
         start_date, end_date = _day_range_iso(date, tz_name)
 
-        # Pull core metrics (reuses existing ClickHouse-backed fetchers)
-        call_stage = fetch_calls_ending_in_each_call_stage_stats(start_date, end_date)
-        call_classification = fetch_call_classifcation_stats(start_date, end_date)
-        load_status = fetch_load_status_stats(start_date, end_date)
-        pricing = fetch_pricing_stats(start_date, end_date)
-        carrier_end_state = fetch_carrier_end_state_stats(start_date, end_date)
-
-        carrier_transfer_over_transfer_attempts = fetch_carrier_asked_transfer_over_total_transfer_attempts_stats(start_date, end_date)
-        carrier_transfer_over_call_attempts = fetch_carrier_asked_transfer_over_total_call_attempts_stats(start_date, end_date)
-        successfully_transferred_for_booking = fetch_successfully_transferred_for_booking_stats(start_date, end_date)
-        percent_non_convertible = fetch_percent_non_convertible_calls(start_date, end_date)
-        non_convertible_with_cnq = fetch_non_convertible_calls_with_carrier_not_qualified(start_date, end_date)
-        non_convertible_without_cnq = fetch_non_convertible_calls_without_carrier_not_qualified(start_date, end_date)
-        carrier_not_qualified = fetch_carrier_not_qualified_stats(start_date, end_date)
-        total_calls_and_duration = fetch_total_calls_and_total_duration(start_date, end_date)
-
-        # Helper to compute success rate from call classification distribution
-        success_rate = None
-        if call_classification:
-            total = sum(int(r.count) for r in call_classification if r is not None)
-            success = sum(int(r.count) for r in call_classification if (r is not None and r.call_classification == "success"))
-            success_rate = round((success / total) * 100.0, 2) if total else 0.0
+        organizations = await run_blocking(get_all_organizations, active_only=not org_ids)
+        if org_ids:
+            wanted = {o.strip() for o in org_ids.split(",") if o.strip()}
+            organizations = [org for org in organizations if org.org_id in wanted]
+            missing = wanted - {org.org_id for org in organizations}
+            if missing:
+                raise HTTPException(status_code=404, detail=f"Organizations not found: {', '.join(sorted(missing))}")
+
+        reports = await run_blocking(
+            build_daily_reports_for_orgs,
+            start_date,
+            end_date,
+            tz_name,
+            [query_context_for_org(org) for org in organizations],
+        )
+        orgs = [
+            {
+                "org_id": org.org_id,
+                "org_name": org.name,
+                "kpis": reports[org.org_id]["kpis"],
+            }
+            for org in organizations
+        ]
+        orgs.sort(key=lambda o: o["kpis"]["total_calls"], reverse=True)
 
         return {
-            "date_range": {
-                "tz": tz_name,
-                "start_date": start_date,
-                "end_date": end_date,
-            },
-            "kpis": {
-                "total_calls": (total_calls_and_duration.total_calls if total_calls_and_duration else 0),
-                "classified_calls": (non_convertible_with_cnq.total_calls if non_convertible_with_cnq else 0),
-                "total_duration_hours": (round(total_calls_and_duration.total_duration / 3600.0, 2) if total_calls_and_duration else 0.0),
-                "avg_minutes_per_call": (total_calls_and_duration.avg_minutes_per_call if total_calls_and_duration else 0.0),
-                "success_rate_percent": success_rate,
-                "non_convertible_calls_with_carrier_not_qualified": (
-                    {
-                        "count": non_convertible_with_cnq.non_convertible_calls_count,
-                        "total_calls": non_convertible_with_cnq.total_calls,
-                        "percentage": non_convertible_with_cnq.non_convertible_calls_percentage,
-                    }
-                    if non_convertible_with_cnq
-                    else None
-                ),
-                "non_convertible_calls_without_carrier_not_qualified": (
-                    {
-                        "count": non_convertible_without_cnq.non_convertible_calls_count,
-                        "total_calls": non_convertible_without_cnq.total_calls,
-                        "percentage": non_convertible_without_cnq.non_convertible_calls_percentage,
-                    }
-                    if non_convertible_without_cnq
-                    else None
-                ),
-                "carrier_not_qualified": (
-                    {
-                        "count": carrier_not_qualified.carrier_not_qualified_count,
-                        "total_calls": carrier_not_qualified.total_calls,
-                        "percentage": carrier_not_qualified.carrier_not_qualified_percentage,
-                    }
-                    if carrier_not_qualified
-                    else None
-                ),
-                "carrier_transfer_over_total_transfer_attempts": (
-                    {
-                        "carrier_asked_count": carrier_transfer_over_transfer_attempts.carrier_asked_count,
-                        "total_transfer_attempts": carrier_transfer_over_transfer_attempts.total_transfer_attempts,
-                        "carrier_asked_percentage": carrier_transfer_over_transfer_attempts.carrier_asked_percentage,
-                    }
-                    if carrier_transfer_over_transfer_attempts
-                    else None
-                ),
-                "carrier_transfer_over_total_call_attempts": (
-                    {
-                        "carrier_asked_count": carrier_transfer_over_call_attempts.carrier_asked_count,
-                        "total_call_attempts": carrier_transfer_over_call_attempts.total_call_attempts,
-                        "carrier_asked_percentage": carrier_transfer_over_call_attempts.carrier_asked_percentage,
-                    }
-                    if carrier_transfer_over_call_attempts
-                    else None
-                ),
-                "successfully_transferred_for_booking": (
-                    {
-                        "successfully_transferred_for_booking_count": successfully_transferred_for_booking.successfully_transferred_for_booking_count,
-                        "total_calls": successfully_transferred_for_booking.total_calls,
-                        "successfully_transferred_for_booking_percentage": successfully_transferred_for_booking.successfully_transferred_for_booking_percentage,
-                    }
-                    if successfully_transferred_for_booking
-                    else None
-                ),
-            },
-            "breakdowns": {
-                "call_stage": [{"call_stage": r.call_stage, "count": r.count, "percentage": r.percentage} for r in (call_stage or [])],
-                "call_classification": [{"call_classification": r.call_classification, "count": r.count, "percentage": r.percentage} for r in (call_classification or [])],
-                "load_status": [{"load_status": r.load_status, "count": r.count, "total_calls": r.total_calls, "load_status_percentage": r.load_status_percentage} for r in (load_status or [])],
-                "pricing_notes": [{"pricing_notes": r.pricing_notes, "count": r.count, "percentage": r.percentage} for r in (pricing or [])],
-                "carrier_end_state": [{"carrier_end_state": r.carrier_end_state, "count": r.count, "percentage": r.percentage} for r in (carrier_end_state or [])],
-            },
+            "date_range": {"tz": tz_name, "start_date": start_date, "end_date": end_date},
+            "count": len(orgs),
+            "orgs": orgs,
         }
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.exception("Error in get_daily_report endpoint")
-        raise HTTPException(status_code=500, detail=f"Error fetching daily report: {str(e)}")
+        logger.exception("Error in compare_daily_report_kpis endpoint")
+        raise HTTPException(status_code=500, detail=f"Error comparing daily reports: {str(e)}")
 
 
 @app.get("/daily-node-outputs")
@@ -377,7 +466,8 @@ async def get_daily_node_outputs(
         else:
             start_date, end_date = _yesterday_range_iso(tz_name)
 
-        rows = fetch_daily_node_outputs(
+        rows = await run_blocking(
+            fetch_daily_node_outputs,
             start_date=start_date,
             end_date=end_date,
             node_persistent_id=node_id,
@@ -420,11 +510,79 @@ async def get_daily_node_outputs(
         logger.exception("Error in get_daily_node_outputs endpoint")
         raise HTTPException(status_code=500, detail=f"Error fetching daily node outputs: {str(e)}")
 
+
+@app.get("/daily-node-outputs/stream")
+async def stream_daily_node_outputs(
+    node_persistent_id: Optional[str] = None,
+    tz: Optional[str] = None,
+    date: Optional[str] = None,
+    limit: int = 1000,
+    include_flat_data: bool = True,
+    cursor: Optional[str] = None,
+):
+    """
+    Stream node outputs for a single day as NDJSON, one page per request.
+
+    Each line is a node output row (same fields as `/daily-node-outputs`), newest run first.
+    The last line is `{"next_cursor": ..., "row_count": ...}`; pass `next_cursor` back as
+    `cursor` to fetch the next page. `next_cursor` is null on the last page. If the query
+    fails mid-stream the last line is `{"error": ...}` instead.
+
+    Pages are keyed on (run_timestamp, run_id), so a page always ends on a run boundary and
+    may hold a few more than `limit` rows.
+    """
+    tz_name = tz or os.getenv("DEFAULT_TIMEZONE", "UTC")
+
+    node_id = node_persistent_id or os.getenv("BROKER_NODE_PERSISTENT_ID")
+    if not node_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing node_persistent_id. Provide query param `node_persistent_id` or set env var BROKER_NODE_PERSISTENT_ID.",
+        )
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be >= 1")
+    try:
+        start_date, end_date = _day_range_iso(date, tz_name)
+        if cursor:
+            decode_node_outputs_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def ndjson():
+        # Runs in Starlette's threadpool (sync iterator), so the ClickHouse read never blocks the loop
+        row_count = 0
+        last = None
+        try:
+            for row in iter_daily_node_outputs(
+                start_date=start_date,
+                end_date=end_date,
+                node_persistent_id=node_id,
+                limit=limit,
+                include_flat_data=include_flat_data,
+                cursor=cursor,
+            ):
+                row_count += 1
+                last = row
+                yield json.dumps(asdict(row), default=str) + "\n"
+        except Exception as e:
+            logger.exception("Error in stream_daily_node_outputs endpoint")
+            yield json.dumps({"error": f"Error streaming daily node outputs: {str(e)}", "row_count": row_count}) + "\n"
+            return
+
+        next_cursor = (
+            encode_node_outputs_cursor(last.run_timestamp, last.run_id)
+            if last is not None and row_count >= limit
+            else None
+        )
+        yield json.dumps({"next_cursor": next_cursor, "row_count": row_count}) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
 @app.get("/call-stage-stats")
 async def get_call_stage_stats(start_date: Optional[str] = None, end_date: Optional[str] = None):
     """Get call stage stats"""
     try:
-        results = fetch_calls_ending_in_each_call_stage_stats(start_date, end_date)
+        results = await run_blocking(fetch_calls_ending_in_each_call_stage_stats, start_date, end_date)
         # Convert dataclass objects to dictionaries for JSON serialization
         return [{"call_stage": r.call_stage, "count": r.count, "percentage": r.percentage} for r in results]
     except Exception as e:
@@ -438,7 +596,7 @@ async def get_call_stage_stats(start_date: Optional[str] = None, end_date: Optio
 async def get_carrier_asked_transfer_over_total_transfer_attempts_stats(start_date: Optional[str] = None, end_date: Optional[str] = None):
     """Get carrier asked transfer over total transfer attempts stats"""
     try:
-        result = fetch_carrier_asked_transfer_over_total_transfer_attempts_stats(start_date, end_date)
+        result = await run_blocking(fetch_carrier_asked_transfer_over_total_transfer_attempts_stats, start_date, end_date)
         if result is None:
             raise HTTPException(status_code=404, detail="No carrier asked transfer over total transfer attempts stats found")
         # Convert dataclass object to dictionary for JSON serialization
@@ -457,7 +615,7 @@ async def get_carrier_asked_transfer_over_total_transfer_attempts_stats(start_da
 async def get_carrier_asked_transfer_over_total_call_attempts_stats(start_date: Optional[str] = None, end_date: Optional[str] = None):
     """Get carrier asked transfer over total call attempts stats"""
     try:
-        result = fetch_carrier_asked_transfer_over_total_call_attempts_stats(start_date, end_date)
+        result = await run_blocking(fetch_carrier_asked_transfer_over_total_call_attempts_stats, start_date, end_date)
         if result is None:
             raise HTTPException(status_code=404, detail="No carrier asked transfer over total call attempts stats found")
         # Convert dataclass object to dictionary for JSON serialization
@@ -476,7 +634,7 @@ async def get_carrier_asked_transfer_over_total_call_attempts_stats(start_date:
 async def get_load_not_found_stats(start_date: Optional[str] = None, end_date: Optional[str] = None):
     """Get load not found stats"""
     try:
-        result = fetch_load_not_found_stats(start_date, end_date)
+        result = await run_blocking(fetch_load_not_found_stats, start_date, end_date)
         if result is None:
             raise HTTPException(status_code=404, detail="No load not found stats found")
         # Convert dataclass object to dictionary for JSON serialization
@@ -495,7 +653,7 @@ async def get_load_not_found_stats(start_date: Optional[str] = None, end_date: O
 async def get_load_status_stats(start_date: Optional[str] = None, end_date: Optional[str] = None):
     """Get load status stats"""
     try:
-        result = fetch_load_status_stats(start_date, end_date)
+        result = await run_blocking(fetch_load_status_stats, start_date, end_date)
         if result is None:
             raise HTTPException(status_code=500, detail="Error fetching load status stats")
         if not result:
@@ -511,7 +669,7 @@ async def get_load_status_stats(start_date: Optional[str] = None, end_date: Opti
 async def get_successfully_transferred_for_booking_stats(start_date: Optional[str] = None, end_date: Optional[str] = None):
     """Get successfully transferred for booking stats"""
     try:
-        result = fetch_successfully_transferred_for_booking_stats(start_date, end_date)
+        result = await run_blocking(fetch_successfully_transferred_for_booking_stats, start_date, end_date)
         if result is None:
             raise HTTPException(status_code=404, detail="No successfully transferred for booking stats found")
         # Convert dataclass object to dictionary for JSON serialization
@@ -530,7 +688,7 @@ async def get_successfully_transferred_for_booking_stats(start_date: Optional[st
 async def get_call_classification_stats(start_date: Optional[str] = None, end_date: Optional[str] = None):
     """Get call classification stats"""
     try:
-        results = fetch_call_classifcation_stats(start_date, end_date)
+        results = await run_blocking(fetch_call_classifcation_stats, start_date, end_date)
         return [{"call_classification": r.call_classification, "count": r.count, "percentage": r.percentage} for r in results]
     except Exception as e:
         import logging
@@ -542,7 +700,7 @@ async def get_call_classification_stats(start_date: Optional[str] = None, end_da
 async def get_carrier_qualification_stats(start_date: Optional[str] = None, end_date: Optional[str] = None):
     """Get carrier qualification stats"""
     try:
-        results = fetch_carrier_qualification_stats(start_date, end_date)
+        results = await run_blocking(fetch_carrier_qualification_stats, start_date, end_date)
         return [{"carrier_qualification": r.carrier_qualification, "count": r.count, "percentage": r.percentage} for r in results]
     except Exception as e:
         import logging
@@ -555,7 +713,7 @@ async def get_carrier_qualification_stats(start_date: Optional[str] = None, end_
 async def get_pricing_stats(start_date: Optional[str] = None, end_date: Optional[str] = None):
     """Get pricing stats"""
     try:
-        results = fetch_pricing_stats(start_date, end_date)
+        results = await run_blocking(fetch_pricing_stats, start_date, end_date)
         return [{"pricing_notes": r.pricing_notes, "count": r.count, "percentage": r.percentage} for r in results]
     except Exception as e:
         import logging
@@ -567,7 +725,7 @@ async def get_pricing_stats(start_date: Optional[str] = None, end_date: Optional
 async def get_carrier_end_state_stats(start_date: Optional[str] = None, end_date: Optional[str] = None):
     """Get carrier end state stats"""
     try:
-        results = fetch_carrier_end_state_stats(start_date, end_date)
+        results = await run_blocking(fetch_carrier_end_state_stats, start_date, end_date)
         return [{"carrier_end_state": r.carrier_end_state, "count": r.count, "percentage": r.percentage} for r in results]
     except Exception as e:
         import logging
@@ -579,7 +737,7 @@ async def get_carrier_end_state_stats(start_date: Optional[str] = None, end_date
 async def get_percent_non_convertible_calls_stats(start_date: Optional[str] = None, end_date: Optional[str] = None):
     """Get percent non convertible calls stats (legacy)"""
     try:
-        result = fetch_percent_non_convertible_calls(start_date, end_date)
+        result = await run_blocking(fetch_percent_non_convertible_calls, start_date, end_date)
         return {
             "non_convertible_calls_count": result.non_convertible_calls_count,
             "total_calls_count": result.total_calls_count,
@@ -595,7 +753,7 @@ async def get_percent_non_convertible_calls_stats(start_date: Optional[str] = No
 async def get_non_convertible_calls_with_carrier_not_qualified_stats(start_date: Optional[str] = None, end_date: Optional[str] = None):
     """Get non-convertible calls INCLUDING carrier_not_qualified"""
     try:
-        result = fetch_non_convertible_calls_with_carrier_not_qualified(start_date, end_date)
+        result = await run_blocking(fetch_non_convertible_calls_with_carrier_not_qualified, start_date, end_date)
         if result is None:
             raise HTTPException(status_code=404, detail="No data found")
         return {
@@ -613,7 +771,7 @@ async def get_non_convertible_calls_with_carrier_not_qualified_stats(start_date:
 async def get_non_convertible_calls_without_carrier_not_qualified_stats(start_date: Optional[str] = None, end_date: Optional[str] = None):
     """Get non-convertible calls EXCLUDING carrier_not_qualified"""
     try:
-        result = fetch_non_convertible_calls_without_carrier_not_qualified(start_date, end_date)
+        result = await run_blocking(fetch_non_convertible_calls_without_carrier_not_qualified, start_date, end_date)
         if result is None:
             raise HTTPException(status_code=404, detail="No data found")
         return {
@@ -631,7 +789,7 @@ async def get_non_convertible_calls_without_carrier_not_qualified_stats(start_da
 async def get_carrier_not_qualified_stats(start_date: Optional[str] = None, end_date: Optional[str] = None):
     """Get standalone carrier_not_qualified stats"""
     try:
-        result = fetch_carrier_not_qualified_stats(start_date, end_date)
+        result = await run_blocking(fetch_carrier_not_qualified_stats, start_date, end_date)
         if result is None:
             raise HTTPException(status_code=404, detail="No data found")
         return {
@@ -649,7 +807,7 @@ async def get_carrier_not_qualified_stats(start_date: Optional[str] = None, end_
 async def get_number_of_unique_loads_stats(start_date: Optional[str] = None, end_date: Optional[str] = None):
     """Get number of unique loads stats"""
     try:
-        result = fetch_number_of_unique_loads(start_date, end_date)
+        result = await run_blocking(fetch_number_of_unique_loads, start_date, end_date)
         return {
             "number_of_unique_loads": result.number_of_unique_loads,
             "total_calls_count": result.total_calls,
@@ -666,7 +824,7 @@ async def get_number_of_unique_loads_stats(start_date: Optional[str] = None, end
 async def get_list_of_unique_loads_stats(start_date: Optional[str] = None, end_date: Optional[str] = None):
     """Get list of unique loads stats"""
     try:
-        result = fetch_list_of_unique_loads(start_date, end_date)
+        result = await run_blocking(fetch_list_of_unique_loads, start_date, end_date)
         if result:
             return {
                 "list_of_unique_loads": result.list_of_unique_loads
@@ -689,10 +847,26 @@ async def get_all_stats(start_date: Optional[str] = None, end_date: Optional[str
     
     stats = {}
     errors = {}
+
+    # Run every metric query concurrently; exceptions surface below when a result is read
+    fetched = await gather_blocking({
+        "call_stage_stats": partial(fetch_calls_ending_in_each_call_stage_stats, start_date, end_date),
+        "carrier_asked_transfer_over_total_transfer_attempts": partial(fetch_carrier_asked_transfer_over_total_transfer_attempts_stats, start_date, end_date),
+        "carrier_asked_transfer_over_total_call_attempts": partial(fetch_carrier_asked_transfer_over_total_call_attempts_stats, start_date, end_date),
+        "load_not_found": partial(fetch_load_not_found_stats, start_date, end_date),
+        "load_status": partial(fetch_load_status_stats, start_date, end_date),
+        "successfully_transferred_for_booking": partial(fetch_successfully_transferred_for_booking_stats, start_date, end_date),
+        "call_classification": partial(fetch_call_classifcation_stats, start_date, end_date),
+        "carrier_qualification": partial(fetch_carrier_qualification_stats, start_date, end_date),
+        "pricing": partial(fetch_pricing_stats, start_date, end_date),
+        "carrier_end_state": partial(fetch_carrier_end_state_stats, start_date, end_date),
+        "percent_non_convertible_calls": partial(fetch_percent_non_convertible_calls, start_date, end_date),
+        "number_of_unique_loads": partial(fetch_number_of_unique_loads, start_date, end_date),
+    })
     
     # Call stage stats
     try:
-        call_stage_results = fetch_calls_ending_in_each_call_stage_stats(start_date, end_date)
+        call_stage_results = fetched["call_stage_stats"]
         stats["call_stage_stats"] = [{"call_stage": r.call_stage, "count": r.count, "percentage": r.percentage} for r in call_stage_results]
     except Exception as e:
         logger.exception("Error fetching call stage stats")
@@ -701,7 +875,7 @@ async def get_all_stats(start_date: Optional[str] = None, end_date: Optional[str
     
     # Carrier asked transfer over total transfer attempts
     try:
-        carrier_transfer_result = fetch_carrier_asked_transfer_over_total_transfer_attempts_stats(start_date, end_date)
+        carrier_transfer_result = fetched["carrier_asked_transfer_over_total_transfer_attempts"]
         if carrier_transfer_result:
             stats["carrier_asked_transfer_over_total_transfer_attempts"] = {
                 "carrier_asked_count": carrier_transfer_result.carrier_asked_count,
@@ -717,7 +891,7 @@ async def get_all_stats(start_date: Optional[str] = None, end_date: Optional[str
     
     # Carrier asked transfer over total call attempts
     try:
-        carrier_call_result = fetch_carrier_asked_transfer_over_total_call_attempts_stats(start_date, end_date)
+        carrier_call_result = fetched["carrier_asked_transfer_over_total_call_attempts"]
         if carrier_call_result:
             stats["carrier_asked_transfer_over_total_call_attempts"] = {
                 "carrier_asked_count": carrier_call_result.carrier_asked_count,
@@ -733,7 +907,7 @@ async def get_all_stats(start_date: Optional[str] = None, end_date: Optional[str
     
     # Load not found stats
     try:
-        load_not_found_result = fetch_load_not_found_stats(start_date, end_date)
+        load_not_found_result = fetched["load_not_found"]
         if load_not_found_result:
             stats["load_not_found"] = {
                 "load_not_found_count": load_not_found_result.load_not_found_count,
@@ -749,7 +923,7 @@ async def get_all_stats(start_date: Optional[str] = None, end_date: Optional[str
     
     # Load status stats
     try:
-        load_status_results = fetch_load_status_stats(start_date, end_date)
+        load_status_results = fetched["load_status"]
         if load_status_results:
             stats["load_status"] = [{"load_status": r.load_status, "count": r.count, "total_calls": r.total_calls, "load_status_percentage": r.load_status_percentage} for r in load_status_results]
         else:
@@ -761,7 +935,7 @@ async def get_all_stats(start_date: Optional[str] = None, end_date: Optional[str
     
     # Successfully transferred for booking stats
     try:
-        transferred_result = fetch_successfully_transferred_for_booking_stats(start_date, end_date)
+        transferred_result = fetched["successfully_transferred_for_booking"]
         if transferred_result:
             stats["successfully_transferred_for_booking"] = {
                 "successfully_transferred_for_booking_count": transferred_result.successfully_transferred_for_booking_count,
@@ -777,7 +951,7 @@ async def get_all_stats(start_date: Optional[str] = None, end_date: Optional[str
     
     # Call classification stats
     try:
-        call_classification_results = fetch_call_classifcation_stats(start_date, end_date)
+        call_classification_results = fetched["call_classification"]
         if call_classification_results:
             stats["call_classification"] = [{"call_classification": r.call_classification, "count": r.count, "percentage": r.percentage} for r in call_classification_results]
         else:
@@ -789,7 +963,7 @@ async def get_all_stats(start_date: Optional[str] = None, end_date: Optional[str
     
     # Carrier qualification stats
     try:
-        carrier_qualification_results = fetch_carrier_qualification_stats(start_date, end_date)
+        carrier_qualification_results = fetched["carrier_qualification"]
         if carrier_qualification_results:
             stats["carrier_qualification"] = [{"carrier_qualification": r.carrier_qualification, "count": r.count, "percentage": r.percentage} for r in carrier_qualification_results]
         else:
@@ -801,7 +975,7 @@ async def get_all_stats(start_date: Optional[str] = None, end_date: Optional[str
     
     # Pricing stats
     try:
-        pricing_results = fetch_pricing_stats(start_date, end_date)
+        pricing_results = fetched["pricing"]
         if pricing_results:
             stats["pricing"] = [{"pricing_notes": r.pricing_notes, "count": r.count, "percentage": r.percentage} for r in pricing_results]
         else:
@@ -813,7 +987,7 @@ async def get_all_stats(start_date: Optional[str] = None, end_date: Optional[str
 
      # Carrier end state stats
     try:
-        carrier_end_state_results = fetch_carrier_end_state_stats(start_date, end_date)
+        carrier_end_state_results = fetched["carrier_end_state"]
         if carrier_end_state_results:
             stats["carrier_end_state"] = [{"carrier_end_state": r.carrier_end_state, "count": r.count, "percentage": r.percentage} for r in carrier_end_state_results]
         else:
@@ -825,7 +999,7 @@ async def get_all_stats(start_date: Optional[str] = None, end_date: Optional[str
     
     # Percent non convertible calls stats
     try:
-        percent_non_convertible_calls_result = fetch_percent_non_convertible_calls(start_date, end_date)
+        percent_non_convertible_calls_result = fetched["percent_non_convertible_calls"]
         if percent_non_convertible_calls_result:
             stats["percent_non_convertible_calls"] = {
                 "non_convertible_calls_count": percent_non_convertible_calls_result.non_convertible_calls_count,
@@ -841,7 +1015,7 @@ async def get_all_stats(start_date: Optional[str] = None, end_date: Optional[str
 
     # Number of unique loads stats
     try:
-        number_of_unique_loads_result = fetch_number_of_unique_loads(start_date, end_date)
+        number_of_unique_loads_result = fetched["number_of_unique_loads"]
         if number_of_unique_loads_result:
             stats["number_of_unique_loads"] = {
                 "number_of_unique_loads": number_of_unique_loads_result.number_of_unique_loads,
@@ -873,7 +1047,7 @@ async def get_all_stats(start_date: Optional[str] = None, end_date: Optional[str
 async def get_calls_without_carrier_asked_for_transfer_stats(start_date: Optional[str] = None, end_date: Optional[str] = None):
     """Get calls without carrier asked for transfer stats"""
     try:
-        result = fetch_calls_without_carrier_asked_for_transfer(start_date, end_date)
+        result = await run_blocking(fetch_calls_without_carrier_asked_for_transfer, start_date, end_date)
         return {
             "total_duration_no_carrier_asked_for_transfer": result.total_duration_no_carrier_asked_for_transfer / 3600,
             "total_calls_no_carrier_asked_for_transfer": result.total_calls_no_carrier_asked_for_transfer,
@@ -923,7 +1097,7 @@ async def get_calls_without_carrier_asked_for_transfer_stats(start_date: Optiona
 async def get_total_calls_and_total_duration_stats(start_date: Optional[str] = None, end_date: Optional[str] = None):
     """Get total calls and total duration stats"""
     try:
-        result = fetch_total_calls_and_total_duration(start_date, end_date)
+        result = await run_blocking(fetch_total_calls_and_total_duration, start_date, end_date)
         if not result:
             return {"total_duration": 0.0, "total_calls": 0, "avg_minutes_per_call": 0.0}
         return {
@@ -941,7 +1115,7 @@ async def get_total_calls_and_total_duration_stats(start_date: Optional[str] = N
 async def get_duration_carrier_asked_for_transfer_stats(start_date: Optional[str] = None, end_date: Optional[str] = None):
     """Get duration carrier asked for transfer stats"""
     try:
-        result = fetch_duration_carrier_asked_for_transfer(start_date, end_date)
+        result = await run_blocking(fetch_duration_carrier_asked_for_transfer, start_date, end_date)
         return {
             "duration_carrier_asked_for_transfer": result.duration_carrier_asked_for_transfer / 3600,
         }
@@ -1106,13 +1280,13 @@ async def list_reports(
         if not target_org_id:
             raise HTTPException(status_code=400, detail="org_id required (param or ORG_ID env)")
 
-        if start_date and end_date:
-            reports = get_reports_in_range(target_org_id, start_date, end_date)
-        else:
-            reports = get_recent_reports(target_org_id, limit=limit)
+        # Summary KPI columns only; the full report_data JSON isn't loaded for the list view
+        reports = await run_blocking(
+            get_report_summaries, target_org_id, limit=limit, start_date=start_date, end_date=end_date
+        )
 
         # Get org info
-        org = get_organization(target_org_id)
+        org = await run_blocking(get_organization, target_org_id)
 
         return {
             "org_id": target_org_id,
@@ -1123,10 +1297,15 @@ async def list_reports(
                     "id": r.id,
                     "report_date": r.report_date,
                     "created_at": r.created_at,
-                    # Include summary KPIs for list view
-                    "total_calls": r.report_data.get("kpis", {}).get("total_calls", 0),
-                    "success_rate_percent": r.report_data.get("kpis", {}).get("success_rate_percent"),
-                    "non_convertible_percent": r.report_data.get("kpis", {}).get("non_convertible_calls_with_carrier_not_qualified", {}).get("percentage") if r.report_data.get("kpis", {}).get("non_convertible_calls_with_carrier_not_qualified") else None,
+                    "total_calls": r.total_calls,
+                    "classified_calls": r.classified_calls,
+                    "total_duration_hours": r.total_duration_hours,
+                    "avg_minutes_per_call": r.avg_minutes_per_call,
+                    "success_rate_percent": r.success_rate_percent,
+                    "non_convertible_percent": r.non_convertible_percent,
+                    "carrier_not_qualified_percent": r.carrier_not_qualified_percent,
+                    "successfully_transferred_percent": r.successfully_transferred_percent,
+                    "is_degraded": r.is_degraded,
                 }
                 for r in reports
             ],
@@ -1146,14 +1325,13 @@ async def list_report_dates(org_id: Optional[str] = None):
         if not target_org_id:
             raise HTTPException(status_code=400, detail="org_id required (param or ORG_ID env)")
 
+        # One query: the count and range follow from the (descending) date list
         dates = get_all_report_dates(target_org_id)
-        date_range = get_date_range(target_org_id)
-        count = get_report_count(target_org_id)
 
         return {
             "org_id": target_org_id,
-            "count": count,
-            "date_range": date_range,
+            "count": len(dates),
+            "date_range": {"earliest": dates[-1], "latest": dates[0]} if dates else None,
             "dates": dates,
         }
     except HTTPException:
@@ -1189,6 +1367,89 @@ async def get_latest_stored_report(org_id: Optional[str] = None):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _rollup_response(
+    period_type: str,
+    org_id: Optional[str],
+    date: Optional[str],
+    limit: int,
+    start_date: Optional[str],
+    end_date: Optional[str],
+):
+    """Shared body of /api/reports/weekly and /api/reports/monthly."""
+    from storage import get_report_rollup, get_report_rollups
+
+    try:
+        target_org_id = org_id or os.getenv("ORG_ID")
+        if not target_org_id:
+            raise HTTPException(status_code=400, detail="org_id required (param or ORG_ID env)")
+
+        try:
+            if date:
+                rollup = await run_blocking(get_report_rollup, target_org_id, period_type, datetime.fromisoformat(date).date().isoformat())
+                if not rollup:
+                    raise HTTPException(status_code=404, detail=f"No {period_type}ly report found for {date}")
+                rollups = [rollup]
+            else:
+                rollups = await run_blocking(get_report_rollups, target_org_id, period_type, limit, start_date, end_date)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+
+        return {
+            "org_id": target_org_id,
+            "period_type": period_type,
+            "count": len(rollups),
+            "reports": [
+                {
+                    "period_start": r.period_start,
+                    "period_end": r.period_end,
+                    "days_covered": r.days_covered,
+                    "updated_at": r.updated_at,
+                    "data": r.report_data,
+                }
+                for r in rollups
+            ],
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error getting %sly reports", period_type)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/reports/weekly")
+async def list_weekly_reports(
+    org_id: Optional[str] = None,
+    date: Optional[str] = None,
+    limit: int = 8,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+):
+    """
+    Weekly (Monday to Sunday) rollups of the stored daily reports, maintained as days are saved.
+
+    - `date`: only the week containing this date
+    - Otherwise the latest `limit` weeks, or every week overlapping start_date..end_date
+    """
+    return await _rollup_response("week", org_id, date, limit, start_date, end_date)
+
+
+@app.get("/api/reports/monthly")
+async def list_monthly_reports(
+    org_id: Optional[str] = None,
+    date: Optional[str] = None,
+    limit: int = 12,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+):
+    """
+    Monthly rollups of the stored daily reports, maintained as days are saved.
+
+    - `date`: only the month containing this date
+    - Otherwise the latest `limit` months, or every month overlapping start_date..end_date
+    """
+    return await _rollup_response("month", org_id, date, limit, start_date, end_date)
+
+
 @app.get("/api/reports/{report_date}")
 async def get_stored_report(report_date: str, org_id: Optional[str] = None):
     """Get a specific stored report by date."""
@@ -1215,6 +1476,153 @@ async def get_stored_report(report_date: str, org_id: Optional[str] = None):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# =============================================================================
+# Trends API (stored report facts, no ClickHouse)
+# =============================================================================
+
+@app.get("/api/trends/metrics")
+async def list_trend_metrics():
+    """Metrics available to /api/trends and how each aggregates over several days."""
+    from storage import METRIC_FACT_KINDS, TREND_INTERVALS
+
+    return {"metrics": METRIC_FACT_KINDS, "intervals": list(TREND_INTERVALS)}
+
+
+@app.get("/api/trends")
+async def get_metric_trend_endpoint(
+    metric: str,
+    org_id: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    interval: str = "day",
+):
+    """
+    Trend of one metric over the stored daily reports, aggregated in SQL.
+
+    - `metric`: a KPI (e.g. success_rate_percent, total_calls) or a breakdown (e.g. call_stage)
+    - `interval`: day (default), week, month, or total for one point over the whole range
+    - Dates default to the last 90 days
+    """
+    from storage import get_metric_trend
+
+    try:
+        target_org_id = org_id or os.getenv("ORG_ID")
+        if not target_org_id:
+            raise HTTPException(status_code=400, detail="org_id required (param or ORG_ID env)")
+
+        try:
+            end = datetime.fromisoformat(end_date).date() if end_date else datetime.now().date()
+            start = datetime.fromisoformat(start_date).date() if start_date else end - timedelta(days=90)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+
+        try:
+            points = await run_blocking(get_metric_trend, target_org_id, metric, start.isoformat(), end.isoformat(), interval)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        return {
+            "org_id": target_org_id,
+            "metric": metric,
+            "interval": interval,
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "points": points,
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error getting metric trend")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# =============================================================================
+# Call Cube API (stored per-day cube, no ClickHouse)
+# =============================================================================
+
+@app.get("/api/cube/dimensions")
+async def list_cube_dimensions():
+    """Dimensions the call cube can be grouped and filtered by."""
+    from storage import CALL_CUBE_DIMENSIONS, TREND_INTERVALS
+
+    return {"dimensions": list(CALL_CUBE_DIMENSIONS), "intervals": list(TREND_INTERVALS)}
+
+
+@app.get("/api/cube")
+async def query_call_cube_endpoint(
+    org_id: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    group_by: Optional[str] = None,
+    interval: str = "total",
+    call_classification: Optional[str] = None,
+    call_stage: Optional[str] = None,
+    load_status: Optional[str] = None,
+    pricing_notes: Optional[str] = None,
+    carrier_end_state: Optional[str] = None,
+    transfer_reason: Optional[str] = None,
+    transfer_attempt: Optional[str] = None,
+):
+    """
+    Slice the stored daily call cubes: calls and duration summed over any date range, grouped
+    by any dimensions and filtered on any of them.
+
+    - `group_by`: comma-separated dimensions (see /api/cube/dimensions); omit for the totals
+    - Dimension params filter on comma-separated values, e.g. `carrier_end_state=CARRIER_OFFER_TOO_HIGH`
+    - `interval`: total (default), day, week or month
+    - Dates default to the last 30 days
+    """
+    from storage import query_call_cube
+
+    try:
+        target_org_id = org_id or os.getenv("ORG_ID")
+        if not target_org_id:
+            raise HTTPException(status_code=400, detail="org_id required (param or ORG_ID env)")
+
+        try:
+            end = datetime.fromisoformat(end_date).date() if end_date else datetime.now().date()
+            start = datetime.fromisoformat(start_date).date() if start_date else end - timedelta(days=30)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+
+        dimensions = [d.strip() for d in (group_by or "").split(",") if d.strip()]
+        filters = {
+            dimension: [v.strip() for v in value.split(",") if v.strip()]
+            for dimension, value in {
+                "call_classification": call_classification,
+                "call_stage": call_stage,
+                "load_status": load_status,
+                "pricing_notes": pricing_notes,
+                "carrier_end_state": carrier_end_state,
+                "transfer_reason": transfer_reason,
+                "transfer_attempt": transfer_attempt,
+            }.items()
+            if value
+        }
+
+        try:
+            result = await run_blocking(
+                query_call_cube, target_org_id, start.isoformat(), end.isoformat(), dimensions, filters, interval
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        return {
+            "org_id": target_org_id,
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "group_by": dimensions,
+            "filters": filters,
+            "interval": interval,
+            **result,
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error querying call cube")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # =============================================================================
 # Report Generation API
 # =============================================================================
@@ -1241,7 +1649,8 @@ async def generate_report(request: GenerateReportRequest):
     - If date not provided, generates for yesterday
     """
     try:
-        result = trigger_daily_report_now(
+        result = await run_blocking(
+            trigger_daily_report_now,
             org_id=request.org_id,
             target_date=request.date,
         )
@@ -1251,25 +1660,92 @@ async def generate_report(request: GenerateReportRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/api/reports/backfill")
+@app.post("/api/reports/backfill", status_code=202)
 async def backfill_historical_reports(request: BackfillRequest):
     """
-    Backfill reports for a date range.
+    Start a background job that backfills reports for a date range.
 
     Generates reports for each day in the range that doesn't already exist.
+    Returns the job immediately; poll `GET /api/reports/backfill/{job_id}` for progress.
     """
     try:
-        result = backfill_reports(
+        job = await run_blocking(
+            start_backfill_job,
             org_id=request.org_id,
             start_date=request.start_date,
             end_date=request.end_date,
         )
-        return result
+        return job_to_dict(job)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.exception("Error starting backfill job")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/reports/backfill")
+async def list_backfill_jobs(org_id: Optional[str] = None, limit: int = 50):
+    """List backfill jobs, newest first."""
+    from storage import get_backfill_jobs
+
+    try:
+        jobs = await run_blocking(get_backfill_jobs, org_id=org_id, limit=limit)
+        return [job_to_dict(job) for job in jobs]
+    except Exception as e:
+        logger.exception("Error listing backfill jobs")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/reports/backfill/{job_id}")
+async def get_backfill_job_status(job_id: int):
+    """Get a backfill job's status and progress (days done, failed and remaining)."""
+    from storage import get_backfill_job
+
+    job = await run_blocking(get_backfill_job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Backfill job {job_id} not found")
+    return job_to_dict(job)
+
+
+@app.post("/api/reports/backfill/{job_id}/cancel")
+async def cancel_backfill_job_endpoint(job_id: int):
+    """Cancel a backfill job. A running job stops before its next chunk."""
+    job = await run_blocking(cancel_backfill_job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Backfill job {job_id} not found")
+    return job_to_dict(job)
+
+
+@app.get("/api/tasks")
+async def list_report_tasks(status: Optional[str] = None, task_type: Optional[str] = None, limit: int = 50):
+    """
+    List queued report generation tasks, newest first (REPORT_QUEUE_ENABLED=true).
+
+    - `status`: queued, running, succeeded or failed (comma-separated for several)
+    - `task_type`: daily, catchup, manual or backfill
+    """
+    from storage import get_report_tasks
+
+    try:
+        statuses = [s.strip() for s in status.split(",") if s.strip()] if status else None
+        tasks = await run_blocking(get_report_tasks, statuses=statuses, task_type=task_type, limit=limit)
+        return [task_to_dict(task) for task in tasks]
     except Exception as e:
-        logger.exception("Error backfilling reports")
+        logger.exception("Error listing report tasks")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/tasks/{task_id}")
+async def get_report_task_status(task_id: int):
+    """Get a report task's status, attempts and result."""
+    from storage import get_report_task
+
+    task = await run_blocking(get_report_task, task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail=f"Report task {task_id} not found")
+    return task_to_dict(task)
+
+
 @app.get("/api/scheduler/status")
 async def get_scheduler_status():
     """Get the current scheduler status."""
@@ -1312,4 +1788,31 @@ async def get_scheduler_health_endpoint():
         "scheduler": scheduler_health,
         "database": db_info,
         "recent_runs": recent_runs,
-    }
\ No newline at end of file
+        "startup": startup_timings,
+    }
+
+# =============================================================================
+# Result Cache API
+# =============================================================================
+
+@app.get("/api/cache/stats")
+async def get_cache_stats():
+    """Hit/miss/eviction counters and size of the metric result cache."""
+    from cache import get_result_cache
+
+    return get_result_cache().stats()
+
+
+@app.post("/api/cache/invalidate")
+async def invalidate_cache(org_id: Optional[str] = None):
+    """
+    Drop cached metric results.
+
+    - With `org_id`: only that organization's entries
+    - Without: the whole cache
+    """
+    from cache import get_result_cache
+
+    cache = get_result_cache()
+    removed = cache.invalidate_org(org_id) if org_id else cache.clear()
+    return {"org_id": org_id, "removed": removed}
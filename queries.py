@@ -1,3 +1,288 @@
+import os
+from typing import Optional, Sequence, Tuple, Union
+
+QUERY_PLAN_LEGACY = "legacy"
+QUERY_PLAN_SCOPED = "scoped"
+
+
+def get_query_plan() -> str:
+    """
+    Get the ClickHouse query plan for the metric builders (CLICKHOUSE_QUERY_PLAN).
+
+    - legacy (default): recent_runs holds every org's runs in the window and node outputs are
+      hash-joined to public_runs and public_nodes
+    - scoped: recent_runs is scoped to the org, node outputs are filtered by node and time in
+      PREWHERE, run lookups are `run_id IN (...)` semi-joins and the unused public_nodes join
+      is dropped
+    """
+    plan = os.getenv("CLICKHOUSE_QUERY_PLAN", QUERY_PLAN_LEGACY).strip().lower()
+    return plan if plan in (QUERY_PLAN_LEGACY, QUERY_PLAN_SCOPED) else QUERY_PLAN_LEGACY
+
+
+def _window_lower_bound(date_filter: str) -> str:
+    # date filters are `timestamp >= X` or `timestamp >= X AND timestamp < Y`
+    return date_filter.split(" AND ")[0]
+
+
+def _match_sql(column: str, value: Union[str, Sequence[str]]) -> str:
+    """`column = 'value'`, or `column IN (...)` for a list of values."""
+    if isinstance(value, str):
+        return f"{column} = '{value}'"
+    return f"{column} IN ({_sql_in_list(value)})"
+
+
+def recent_runs_cte(date_filter: str, org_id: Union[str, Sequence[str]], plan: str, day_tz: Optional[str] = None) -> str:
+    """
+    The `recent_runs AS (...)` CTE: runs in the window, scoped to the org (or list of orgs)
+    under the scoped plan.
+    With `day_tz`, each run also carries its calendar day in that timezone as `report_day`.
+    """
+    org_scope = f"AND {_match_sql('org_id', org_id)}" if plan == QUERY_PLAN_SCOPED else ""
+    report_day = f", toDate(timestamp, '{day_tz}') AS report_day" if day_tz else ""
+    return f"""recent_runs AS (
+            SELECT id AS run_id, org_id{report_day}
+            FROM public_runs
+            WHERE {date_filter}
+              {org_scope}
+        )"""
+
+
+def node_outputs_filter_sql(date_filter: str, node_persistent_id: Union[str, Sequence[str]], plan: str) -> str:
+    """
+    WHERE (and under the scoped plan, PREWHERE) clause restricting public_node_outputs to the
+    node (or list of nodes) and the window's runs. Node outputs are written at or after their
+    run starts, so only the window's lower bound is applied to their own timestamp.
+    """
+    node_match = _match_sql("node_persistent_id", node_persistent_id)
+    if plan == QUERY_PLAN_SCOPED:
+        return f"""PREWHERE {node_match}
+              AND {_window_lower_bound(date_filter)}
+            WHERE run_id IN (SELECT run_id FROM recent_runs)"""
+    return f"""WHERE {node_match}
+              AND run_id IN (SELECT run_id FROM recent_runs)"""
+
+
+def flat_data_fields_sql(column: str = "no.flat_data") -> str:
+    """
+    Decode a flat_data blob once into a Map of top-level key -> raw JSON value.
+
+    flat_data is a flat object with dotted keys, so select this AS flat_fields and read keys
+    with flat_string_sql / flat_has_sql instead of calling JSONExtractString / JSONHas on the
+    blob repeatedly (each of those re-parses the whole document).
+    """
+    return f"CAST(JSONExtractKeysAndValuesRaw({column}), 'Map(String, String)')"
+
+
+def flat_string_sql(key: str, fields: str = "flat_fields") -> str:
+    """Same result as JSONExtractString(flat_data, key): '' when missing or not a string."""
+    return f"JSONExtractString({fields}['{key}'])"
+
+
+def flat_has_sql(key: str, fields: str = "flat_fields") -> str:
+    """Same result as JSONHas(flat_data, key)."""
+    return f"mapContains({fields}, '{key}')"
+
+
+def node_run_joins_sql(plan: str, alias: str = "no") -> str:
+    """
+    Joins from node outputs to their run and node. Under the scoped plan node outputs are
+    already semi-joined to recent_runs and public_nodes is not needed, so this is empty.
+    """
+    if plan == QUERY_PLAN_SCOPED:
+        return ""
+    return f"""INNER JOIN recent_runs rr ON {alias}.run_id = rr.run_id
+            INNER JOIN public_nodes n ON {alias}.node_id = n.id"""
+
+
+def run_facts_ctes(
+    date_filter: str,
+    org_id: Union[str, Sequence[str]],
+    node_persistent_id: Union[str, Sequence[str]],
+    excluded_user_numbers_sql: str = "",
+    plan: Optional[str] = None,
+    day_tz: Optional[str] = None,
+    org_nodes: Optional[Sequence[Tuple[str, str]]] = None,
+) -> str:
+    """
+    Shared first stage for the metric queries: one fact row per run of the node in the window.
+
+    node_outputs decodes each node output's flat_data once and extracts every field the
+    metrics use, before the join fans rows out per session. node_rows joins those to *all*
+    of the org's sessions for the run, and run_facts collapses each run to one row:
+    - the distinct values each field took (groupUniqArrayIf), so "runs per value" is a plain
+      count() over ARRAY JOIN instead of countDistinct(run_id) over re-parsed JSON
+    - row-level conditions (a transfer attempt, the booking fields) aggregated with max()
+    - one flag per session filter the metrics use:
+        in_window                   a session inside the date window
+        in_window_with_user_number  same, with a non-empty user_number
+        with_user_number            any session of the run with a non-empty user_number
+        (every run here has at least one org session)
+
+    With `day_tz`, the window is treated as a run of whole days in that timezone: run_facts
+    gets the run's `report_day`, and a session only counts as in_window on its run's day.
+    Grouping by report_day then gives, per day, the same facts a one-day window would.
+
+    With `org_nodes` ((org_id, node_persistent_id) pairs), the facts of several orgs come from
+    one scan: org_id / node_persistent_id are then the lists of those orgs and nodes, a node
+    output only joins the sessions of the org(s) mapped to its node, and run_facts has one row
+    per (report_org_id, run_id), equal to that org's single-org row.
+
+    Returns the `WITH ...` prefix; builders append `, <cte> AS (...)` and their SELECT.
+    `plan` defaults to get_query_plan().
+    """
+    plan = plan or get_query_plan()
+    # under the scoped plan every run in recent_runs belongs to the org
+    run_org_sql = f"'{org_id}'" if plan == QUERY_PLAN_SCOPED else "rr.org_id"
+    run_in_org_sql = f"run_org_id = '{org_id}'"
+    run_joins_sql = node_run_joins_sql(plan)
+    session_in_window_sql = "s.session_in_window"
+    session_day_sql = ""
+    report_day_sql = ""
+    run_report_day_sql = ""
+    session_org_sql = ""
+    node_persistent_id_sql = ""
+    report_org_sql = ""
+    org_node_filter_sql = ""
+    run_org_key_sql = ""
+    run_group_by_sql = "run_id"
+    if org_nodes is not None:
+        pairs = ", ".join(f"('{o}', '{n}')" for o, n in org_nodes)
+        # run_in_org compares the run's own org with the reported org, so the run join is
+        # needed under both plans
+        if plan == QUERY_PLAN_SCOPED:
+            run_joins_sql = "INNER JOIN recent_runs rr ON no.run_id = rr.run_id"
+        run_org_sql = "rr.org_id"
+        run_in_org_sql = "run_org_id = report_org_id"
+        session_org_sql = "org_id AS session_org_id,"
+        node_persistent_id_sql = "node_persistent_id,"
+        report_org_sql = "s.session_org_id AS report_org_id,"
+        org_node_filter_sql = f"WHERE (s.session_org_id, no.node_persistent_id) IN ({pairs})"
+        run_org_key_sql = "report_org_id,"
+        run_group_by_sql = "report_org_id, run_id"
+    if day_tz:
+        if plan == QUERY_PLAN_SCOPED:
+            # the scoped plan skips the run join, but the run's day lives on recent_runs
+            run_joins_sql = "INNER JOIN recent_runs rr ON no.run_id = rr.run_id"
+        session_in_window_sql = "s.session_in_window AND s.session_day = rr.report_day"
+        session_day_sql = f"toDate(timestamp, '{day_tz}') AS session_day,"
+        report_day_sql = "rr.report_day AS run_report_day,"
+        run_report_day_sql = "any(run_report_day) AS report_day,"
+    return f"""
+        WITH {recent_runs_cte(date_filter, org_id, plan, day_tz)},
+        sessions AS (
+            SELECT
+                run_id,
+                user_number,
+                duration,
+                {session_day_sql}
+                {session_org_sql}
+                ({date_filter}) AS session_in_window,
+                (isNotNull(user_number) AND user_number != '') AS session_has_user_number
+            FROM public_sessions
+            WHERE {_match_sql('org_id', org_id)}
+              AND run_id IN (SELECT run_id FROM recent_runs)
+              {excluded_user_numbers_sql}
+        ),
+        node_outputs AS (
+            SELECT
+                run_id,
+                node_id,
+                {node_persistent_id_sql}
+                {flat_data_fields_sql('flat_data')} AS flat_fields,
+                {flat_string_sql('result.call.call_stage')} AS call_stage,
+                {flat_string_sql('result.call.call_classification')} AS call_classification,
+                {flat_has_sql('result.call.call_classification')} AS call_classification_present,
+                {flat_string_sql('result.load.load_status')} AS load_status,
+                {flat_string_sql('result.load.reference_number')} AS reference_number,
+                {flat_string_sql('load.custom_load_id')} AS custom_load_id,
+                {flat_string_sql('result.pricing.pricing_notes')} AS pricing_notes,
+                {flat_has_sql('result.pricing.pricing_notes')} AS pricing_notes_present,
+                {flat_string_sql('result.pricing.agreed_upon_rate')} AS agreed_upon_rate,
+                {flat_has_sql('result.pricing.agreed_upon_rate')} AS agreed_upon_rate_present,
+                {flat_string_sql('result.carrier.carrier_end_state')} AS carrier_end_state,
+                {flat_string_sql('result.carrier.carrier_qualification')} AS carrier_qualification,
+                {flat_string_sql('result.transfer.transfer_reason')} AS transfer_reason,
+                {flat_string_sql('result.transfer.transfer_attempt')} AS transfer_attempt,
+                {flat_has_sql('result.transfer.transfer_attempt')} AS transfer_attempt_present
+            FROM public_node_outputs
+            {node_outputs_filter_sql(date_filter, node_persistent_id, plan)}
+        ),
+        node_rows AS (
+            SELECT
+                no.run_id AS run_id,
+                {report_day_sql}
+                {report_org_sql}
+                {run_org_sql} AS run_org_id,
+                s.user_number AS session_user_number,
+                s.duration AS session_duration,
+                ({session_in_window_sql}) AS session_in_window,
+                s.session_has_user_number AS session_has_user_number,
+                no.call_stage AS call_stage,
+                no.call_classification AS call_classification,
+                no.call_classification_present AS call_classification_present,
+                no.load_status AS load_status,
+                no.reference_number AS reference_number,
+                no.custom_load_id AS custom_load_id,
+                no.pricing_notes AS pricing_notes,
+                no.pricing_notes_present AS pricing_notes_present,
+                no.agreed_upon_rate AS agreed_upon_rate,
+                no.agreed_upon_rate_present AS agreed_upon_rate_present,
+                no.carrier_end_state AS carrier_end_state,
+                no.carrier_qualification AS carrier_qualification,
+                no.transfer_reason AS transfer_reason,
+                no.transfer_attempt AS transfer_attempt,
+                no.transfer_attempt_present AS transfer_attempt_present
+            FROM node_outputs no
+            {run_joins_sql}
+            INNER JOIN sessions s ON no.run_id = s.run_id
+            {org_node_filter_sql}
+        ),
+        run_facts AS (
+            SELECT
+                {run_org_key_sql}
+                run_id,
+                {run_report_day_sql}
+                max({run_in_org_sql}) AS run_in_org,
+                any(session_duration) AS duration,
+                any(session_user_number) AS user_number,
+                max(session_in_window) AS in_window,
+                max(session_in_window AND session_has_user_number) AS in_window_with_user_number,
+                max(session_has_user_number) AS with_user_number,
+
+                groupUniqArrayIf(call_stage, call_stage NOT IN ('', 'null')) AS call_stages,
+                groupUniqArrayIf(call_classification, call_classification NOT IN ('', 'null')) AS call_classifications,
+                max(call_classification_present) AS has_call_classification,
+                groupUniqArrayIf(load_status, load_status NOT IN ('', 'null')) AS load_statuses,
+                groupUniqArrayIf(reference_number, reference_number NOT IN ('', 'null')) AS reference_numbers,
+                groupUniqArrayIf(custom_load_id, custom_load_id NOT IN ('', 'null')) AS custom_load_ids,
+                groupUniqArrayIf(pricing_notes, pricing_notes NOT IN ('', 'null')) AS pricing_notes_values,
+                groupUniqArrayIf(carrier_end_state, carrier_end_state NOT IN ('', 'null')) AS carrier_end_states,
+                groupUniqArrayIf(carrier_qualification, carrier_qualification NOT IN ('', 'null')) AS carrier_qualifications,
+                groupUniqArrayIf(transfer_reason, transfer_reason NOT IN ('', 'null')) AS transfer_reasons,
+                groupUniqArrayIf(transfer_attempt, transfer_attempt NOT IN ('', 'null')) AS transfer_attempts,
+
+                -- transfer reasons of node outputs that actually attempted a transfer
+                groupUniqArrayIf(
+                    transfer_reason,
+                    transfer_reason NOT IN ('', 'null')
+                    AND upper(transfer_reason) != 'NO_TRANSFER_INVOLVED'
+                    AND upper(transfer_attempt) = 'YES'
+                ) AS attempted_transfer_reasons,
+
+                -- successfully transferred for booking: distinct (rate, notes) of booked transfers
+                max(transfer_attempt_present AND agreed_upon_rate_present AND pricing_notes_present) AS has_booking_fields,
+                groupUniqArrayIf(
+                    (agreed_upon_rate, pricing_notes),
+                    transfer_attempt_present AND agreed_upon_rate_present AND pricing_notes_present
+                    AND transfer_attempt = 'YES'
+                    AND agreed_upon_rate NOT IN ('', 'null')
+                    AND pricing_notes IN ('AGREEMENT_REACHED_WITH_NEGOTIATION', 'AGREEMENT_REACHED_WITHOUT_NEGOTIATION')
+                ) AS booked_rates
+            FROM node_rows
+            GROUP BY {run_group_by_sql}
+        )"""
+
+
 
 def carrier_asked_transfer_over_total_transfer_attempt_stats_query(
     date_filter: str,
@@ -7,33 +292,14 @@ def carrier_asked_transfer_over_total_transfer_attempt_stats_query(
 ) -> str:
     # percentage of carrier asked transfers over total transfer attempts
     return f"""
-            WITH recent_runs AS (
-                SELECT id AS run_id
-                FROM public_runs
-                WHERE {date_filter}
-            ),
-            sessions AS (
-                SELECT run_id, user_number FROM public_sessions
-                WHERE {date_filter}
-                AND org_id = '{org_id}'
-                {excluded_user_numbers_sql}
-            ),
+            {run_facts_ctes(date_filter, org_id, node_persistent_id, excluded_user_numbers_sql)},
             transfer_stats AS (
                 SELECT
-                    JSONExtractString(no.flat_data, 'result.transfer.transfer_reason') AS transfer_reason,
-                    countDistinct(s.run_id) AS count
-                FROM public_node_outputs no
-                INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-                INNER JOIN public_nodes n ON no.node_id = n.id
-                INNER JOIN sessions s ON no.run_id = s.run_id
-                WHERE 1 = 1
-                  AND no.node_persistent_id = '{node_persistent_id}'
-                  AND JSONHas(no.flat_data, 'result.transfer.transfer_reason') = 1
-                  AND JSONExtractString(no.flat_data, 'result.transfer.transfer_reason') != ''
-                  AND JSONExtractString(no.flat_data, 'result.transfer.transfer_reason') != 'null'
-                  AND upper(JSONExtractString(no.flat_data, 'result.transfer.transfer_reason')) != 'NO_TRANSFER_INVOLVED'
-                  AND JSONHas(no.flat_data, 'result.transfer.transfer_attempt') = 1
-                  AND upper(JSONExtractString(no.flat_data, 'result.transfer.transfer_attempt')) = 'YES'
+                    transfer_reason,
+                    count() AS count
+                FROM run_facts
+                ARRAY JOIN attempted_transfer_reasons AS transfer_reason
+                WHERE in_window
                 GROUP BY transfer_reason
             ),
             org_totals AS (
@@ -65,40 +331,19 @@ def carrier_asked_transfer_over_total_call_attempts_stats_query(
 ) -> str:
     # percentage of carrier asked transfers over ALL classified calls (not just transfers)
     return f"""
-            WITH recent_runs AS (
-                SELECT id AS run_id
-                FROM public_runs
-                WHERE {date_filter}
-            ),
-            sessions AS (
-                SELECT run_id, user_number FROM public_sessions
-                WHERE {date_filter}
-                AND org_id = '{org_id}'
-                {excluded_user_numbers_sql}
-            ),
-            carrier_asked_transfers AS (
-                SELECT countDistinct(s.run_id) AS carrier_asked_count
-                FROM public_node_outputs no
-                INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-                INNER JOIN public_nodes n ON no.node_id = n.id
-                INNER JOIN sessions s ON no.run_id = s.run_id
-                WHERE no.node_persistent_id = '{node_persistent_id}'
-                  AND JSONHas(no.flat_data, 'result.transfer.transfer_reason') = 1
-                  AND JSONExtractString(no.flat_data, 'result.transfer.transfer_reason') = 'CARRIER_ASKED_FOR_TRANSFER'
-            ),
-            total_classified_calls AS (
-                SELECT COUNT(DISTINCT s.run_id) AS total_call_attempts
-                FROM public_node_outputs no
-                INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-                INNER JOIN sessions s ON no.run_id = s.run_id
-                WHERE no.node_persistent_id = '{node_persistent_id}'
-                AND JSONHas(no.flat_data, 'result.call.call_classification') = 1
+            {run_facts_ctes(date_filter, org_id, node_persistent_id, excluded_user_numbers_sql)},
+            call_attempt_stats AS (
+                SELECT
+                    countIf(has(transfer_reasons, 'CARRIER_ASKED_FOR_TRANSFER')) AS carrier_asked_count,
+                    countIf(has_call_classification) AS total_call_attempts
+                FROM run_facts
+                WHERE in_window
             )
             SELECT
-                cat.carrier_asked_count,
-                tcc.total_call_attempts,
-                ROUND((cat.carrier_asked_count * 100.0) / nullIf(tcc.total_call_attempts, 0), 2) AS carrier_asked_percentage
-            FROM carrier_asked_transfers cat, total_classified_calls tcc
+                carrier_asked_count,
+                total_call_attempts,
+                ROUND((carrier_asked_count * 100.0) / nullIf(total_call_attempts, 0), 2) AS carrier_asked_percentage
+            FROM call_attempt_stats
         """
 
 def calls_ending_in_each_call_stage_stats_query(
@@ -109,29 +354,14 @@ def calls_ending_in_each_call_stage_stats_query(
 ) -> str:
     # percentage of calls ending in each call stage
     return f"""
-        WITH recent_runs AS (
-            SELECT id AS run_id
-            FROM public_runs
-            WHERE {date_filter}
-        ),
-        sessions AS (
-            SELECT run_id, user_number FROM public_sessions
-            WHERE {date_filter}
-            AND org_id = '{org_id}'
-            {excluded_user_numbers_sql}
-        ),
+        {run_facts_ctes(date_filter, org_id, node_persistent_id, excluded_user_numbers_sql)},
         call_stage_stats AS (
             SELECT
-                JSONExtractString(no.flat_data, 'result.call.call_stage') AS call_stage,
-                countDistinct(s.run_id) AS count
-            FROM public_node_outputs no
-            INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-            INNER JOIN public_nodes n ON no.node_id = n.id
-            INNER JOIN sessions s ON no.run_id = s.run_id
-            WHERE 1 = 1
-                AND no.node_persistent_id = '{node_persistent_id}'
-                AND JSONExtractString(no.flat_data, 'result.call.call_stage') != ''
-                AND JSONExtractString(no.flat_data, 'result.call.call_stage') != 'null'
+                call_stage,
+                count() AS count
+            FROM run_facts
+            ARRAY JOIN call_stages AS call_stage
+            WHERE in_window
             GROUP BY call_stage
         ),
         total_calls AS (
@@ -154,37 +384,14 @@ def load_not_found_stats_query(
 ) -> str:
 # percentage of calls where the load not found error is thrown
     return f"""
-        WITH recent_runs AS (
-            SELECT id AS run_id
-            FROM public_runs
-            WHERE {date_filter}
-        ),
-        sessions AS (
-            SELECT run_id, user_number
-            FROM public_sessions
-            WHERE {date_filter}
-                AND org_id = '{org_id}'
-                {excluded_user_numbers_sql}
-        ),
-        extracted AS (
-            SELECT
-                s.run_id as run_id,
-                JSONExtractString(no.flat_data, 'result.load.load_status') AS load_status
-            FROM public_node_outputs AS no
-            INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-            INNER JOIN public_nodes n ON no.node_id = n.id
-            INNER JOIN sessions s ON no.run_id = s.run_id
-            WHERE 1 = 1
-                AND no.node_persistent_id = '{node_persistent_id}'
-        ),
+        {run_facts_ctes(date_filter, org_id, node_persistent_id, excluded_user_numbers_sql)},
     load_status_stats AS (
         SELECT
             load_status,
-            countDistinct(run_id) AS cnt
-        FROM extracted
-        WHERE isNotNull(load_status)
-            AND load_status != ''
-            AND load_status != 'null'
+            count() AS cnt
+        FROM run_facts
+        ARRAY JOIN load_statuses AS load_status
+        WHERE in_window
         GROUP BY load_status
     ),
     load_not_found_count AS (
@@ -216,38 +423,15 @@ def load_status_stats_query(
     node_persistent_id: str,
     excluded_user_numbers_sql: str = "",
 ) -> str:
+    # load status counts any session of the run, not only sessions inside the window
     return f"""
-       WITH recent_runs AS (
-        SELECT id AS run_id
-        FROM public_runs
-        WHERE {date_filter}
-    ),
-    sessions AS (
-        SELECT DISTINCT s.run_id, s.user_number
-        FROM public_sessions s
-        INNER JOIN recent_runs rr ON s.run_id = rr.run_id
-        WHERE s.org_id = '{org_id}'
-          {excluded_user_numbers_sql}
-    ),
-    extracted AS (
-        SELECT
-            s.run_id AS run_id, 
-            JSONExtractString(no.flat_data, 'result.load.load_status') AS load_status
-        FROM public_node_outputs AS no
-        INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-        INNER JOIN public_nodes n ON no.node_id = n.id
-        INNER JOIN sessions s ON no.run_id = s.run_id
-        WHERE 1 = 1
-          AND no.node_persistent_id = '{node_persistent_id}'
-    ),
+    {run_facts_ctes(date_filter, org_id, node_persistent_id, excluded_user_numbers_sql)},
     load_status_stats AS (
         SELECT
             load_status,
-            countDistinct(run_id) AS cnt 
-        FROM extracted
-        WHERE isNotNull(load_status)
-          AND load_status != ''
-          AND load_status != 'null'
+            count() AS cnt
+        FROM run_facts
+        ARRAY JOIN load_statuses AS load_status
         GROUP BY load_status
     ),
     total_calls AS (
@@ -267,7 +451,6 @@ def load_status_stats_query(
         ) AS load_status_percentage
     FROM load_status_stats lss
     CROSS JOIN total_calls tc
-  
     """
 
 def successfully_transferred_for_booking_stats_query(
@@ -278,78 +461,26 @@ def successfully_transferred_for_booking_stats_query(
 ) -> str:
     # percentage of calls where the transfer was successful for booking
     return f"""
-        WITH recent_runs AS (
-        SELECT id AS run_id
-        FROM public_runs
-        WHERE {date_filter}
-        ),
-        sessions AS (
-            SELECT run_id
-            FROM public_sessions
-            WHERE {date_filter}
-            AND org_id = '{org_id}'
-            {excluded_user_numbers_sql}
-        ),
-        extracted AS (
-            SELECT
-                s.run_id AS run_id,                   
-                JSONExtractString(no.flat_data, 'result.transfer.transfer_attempt') AS transfer_attempt,
-                JSONExtractString(no.flat_data, 'result.pricing.agreed_upon_rate') AS agreed_upon_rate,
-                JSONExtractString(no.flat_data, 'result.pricing.pricing_notes') AS pricing_notes
-            FROM public_node_outputs AS no
-            INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-            INNER JOIN public_nodes n ON no.node_id = n.id
-            INNER JOIN sessions s ON no.run_id = s.run_id
-            WHERE 1 = 1
-            AND no.node_persistent_id = '{node_persistent_id}'
-            AND JSONHas(no.flat_data, 'result.transfer.transfer_attempt') = 1
-            AND JSONHas(no.flat_data, 'result.pricing.agreed_upon_rate') = 1
-            AND JSONHas(no.flat_data, 'result.pricing.pricing_notes') = 1
-            ),
-        successfully_transferred_for_booking AS (
+        {run_facts_ctes(date_filter, org_id, node_persistent_id, excluded_user_numbers_sql)},
+        booking_stats AS (
             SELECT
-                transfer_attempt,
-                agreed_upon_rate,
-                pricing_notes,
-                countDistinct(run_id) AS cnt          
-            FROM extracted
-            WHERE isNotNull(transfer_attempt)
-            AND transfer_attempt != ''
-            AND transfer_attempt != 'null'
-            AND transfer_attempt = 'YES'
-            AND isNotNull(agreed_upon_rate)
-            AND agreed_upon_rate != ''
-            AND agreed_upon_rate != 'null'
-            AND isNotNull(pricing_notes)
-            AND pricing_notes != ''
-            AND pricing_notes != 'null'
-            AND (
-                    pricing_notes = 'AGREEMENT_REACHED_WITH_NEGOTIATION'
-                OR pricing_notes = 'AGREEMENT_REACHED_WITHOUT_NEGOTIATION'
-            )
-            GROUP BY transfer_attempt, agreed_upon_rate, pricing_notes
-        ),
-        successfully_transferred_for_booking_count AS (
-            SELECT SUM(cnt) AS successfully_transferred_for_booking_count
-            FROM successfully_transferred_for_booking
-        ),
-        total_calls AS (
-            SELECT countDistinct(run_id) AS total_calls -- 🔹 distinct runs overall
-            FROM extracted
+                sum(length(booked_rates)) AS successfully_transferred_for_booking_count,
+                countIf(has_booking_fields) AS total_calls -- 🔹 distinct runs overall
+            FROM run_facts
+            WHERE in_window
         )
         SELECT
-        stfb.successfully_transferred_for_booking_count,
-        tc.total_calls,
+        successfully_transferred_for_booking_count,
+        total_calls,
         ifNull(
             round(
-                (stfb.successfully_transferred_for_booking_count * 100.0)
-                / nullIf(tc.total_calls, 0),
+                (successfully_transferred_for_booking_count * 100.0)
+                / nullIf(total_calls, 0),
                 2
             ),
             0
         ) AS successfully_transferred_for_booking_percentage
-        FROM successfully_transferred_for_booking_count stfb,
-            total_calls tc
+        FROM booking_stats
     """
 
 def call_classifcation_stats_query(
@@ -360,30 +491,14 @@ def call_classifcation_stats_query(
 ) -> str:
     # percentage of calls ending in each call stage
     return f"""
-        WITH recent_runs AS (
-            SELECT id AS run_id
-            FROM public_runs
-            WHERE {date_filter}
-        ),
-        sessions AS (
-            SELECT run_id, user_number FROM public_sessions
-            WHERE {date_filter}
-            AND org_id = '{org_id}'
-            {excluded_user_numbers_sql}
-        ),
+        {run_facts_ctes(date_filter, org_id, node_persistent_id, excluded_user_numbers_sql)},
         call_classification_stats AS (
             SELECT
-                JSONExtractString(no.flat_data, 'result.call.call_classification') AS call_classification,
-                countDistinct(s.run_id) AS count
-            FROM public_node_outputs no
-            INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-            INNER JOIN public_nodes n ON no.node_id = n.id
-            INNER JOIN sessions s ON no.run_id = s.run_id
-            WHERE 1 = 1
-            AND no.node_persistent_id = '{node_persistent_id}'
-            AND JSONHas(no.flat_data, 'result.call.call_classification') = 1
-            AND JSONExtractString(no.flat_data, 'result.call.call_classification') != ''
-            AND JSONExtractString(no.flat_data, 'result.call.call_classification') != 'null'
+                call_classification,
+                count() AS count
+            FROM run_facts
+            ARRAY JOIN call_classifications AS call_classification
+            WHERE in_window
             GROUP BY call_classification
         ),
         total_calls AS (
@@ -475,30 +590,14 @@ def carrier_qualification_stats_query(
 ) -> str:
     # percentage of calls where the carrier was qualified
     return f"""
-        WITH recent_runs AS (
-            SELECT id AS run_id
-            FROM public_runs
-            WHERE {date_filter}
-        ),
-        sessions AS (
-            SELECT run_id, user_number FROM public_sessions
-            WHERE {date_filter}
-            AND org_id = '{org_id}'
-            {excluded_user_numbers_sql}
-        ),
+        {run_facts_ctes(date_filter, org_id, node_persistent_id, excluded_user_numbers_sql)},
         carrier_qualification_stats AS (
             SELECT
-                JSONExtractString(no.flat_data, 'result.carrier.carrier_qualification') AS carrier_qualification,
-                countDistinct(s.run_id) AS count
-            FROM public_node_outputs no
-            INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-            INNER JOIN public_nodes n ON no.node_id = n.id
-            INNER JOIN sessions s ON no.run_id = s.run_id
-            WHERE 1 = 1
-            AND no.node_persistent_id = '{node_persistent_id}'
-            AND JSONHas(no.flat_data, 'result.carrier.carrier_qualification') = 1
-            AND JSONExtractString(no.flat_data, 'result.carrier.carrier_qualification') != ''
-            AND JSONExtractString(no.flat_data, 'result.carrier.carrier_qualification') != 'null'
+                carrier_qualification,
+                count() AS count
+            FROM run_facts
+            ARRAY JOIN carrier_qualifications AS carrier_qualification
+            WHERE in_window
             GROUP BY carrier_qualification
         ),
         total_calls AS (
@@ -521,30 +620,14 @@ def pricing_stats_query(
 ) -> str:
     # pricing stats
     return f"""
-        WITH recent_runs AS (
-            SELECT id AS run_id
-            FROM public_runs
-            WHERE {date_filter}
-        ),
-        sessions AS (
-        select run_id, user_number from public_sessions
-        WHERE {date_filter}
-        AND org_id = '{org_id}'
-        {excluded_user_numbers_sql}
-        ),
+        {run_facts_ctes(date_filter, org_id, node_persistent_id, excluded_user_numbers_sql)},
         pricing_stats AS (
             SELECT
-                JSONExtractString(no.flat_data, 'result.pricing.pricing_notes') AS pricing_notes,
-                countDistinct(s.run_id) AS count
-            FROM public_node_outputs no
-            INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-            INNER JOIN public_nodes n ON no.node_id = n.id
-            INNER JOIN sessions s ON no.run_id = s.run_id
-            WHERE 1 = 1
-            AND no.node_persistent_id = '{node_persistent_id}'
-            AND JSONHas(no.flat_data, 'result.pricing.pricing_notes') = 1
-            AND JSONExtractString(no.flat_data, 'result.pricing.pricing_notes') != ''
-            AND JSONExtractString(no.flat_data, 'result.pricing.pricing_notes') != 'null'
+                pricing_notes,
+                count() AS count
+            FROM run_facts
+            ARRAY JOIN pricing_notes_values AS pricing_notes
+            WHERE in_window
             GROUP BY pricing_notes
         ),
         total_calls AS (
@@ -567,30 +650,14 @@ def carrier_end_state_query(
 ) -> str:
     # pricing stats
     return f"""
-        WITH recent_runs AS (
-            SELECT id AS run_id
-            FROM public_runs
-            WHERE {date_filter}
-        ),
-        sessions AS (
-        select run_id, user_number from public_sessions
-        WHERE {date_filter}
-        AND org_id = '{org_id}'
-        {excluded_user_numbers_sql}
-        ),
+        {run_facts_ctes(date_filter, org_id, node_persistent_id, excluded_user_numbers_sql)},
         carrier_end_state_stats AS (
             SELECT
-                JSONExtractString(no.flat_data, 'result.carrier.carrier_end_state') AS carrier_end_state,
-                countDistinct(s.run_id) AS count
-            FROM public_node_outputs no
-            INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-            INNER JOIN public_nodes n ON no.node_id = n.id
-            INNER JOIN sessions s ON no.run_id = s.run_id
-            WHERE 1 = 1
-            AND no.node_persistent_id = '{node_persistent_id}'
-            AND JSONHas(no.flat_data, 'result.carrier.carrier_end_state') = 1
-            AND JSONExtractString(no.flat_data, 'result.carrier.carrier_end_state') != ''
-            AND JSONExtractString(no.flat_data, 'result.carrier.carrier_end_state') != 'null'
+                carrier_end_state,
+                count() AS count
+            FROM run_facts
+            ARRAY JOIN carrier_end_states AS carrier_end_state
+            WHERE in_window
             GROUP BY carrier_end_state
         ),
         total_calls AS (
@@ -613,12 +680,9 @@ def percent_non_convertible_calls_query(
     excluded_user_numbers_sql: str = "",
 ) -> str:
     # percentage of non convertible calls
+    plan = get_query_plan()
     return f"""
-        WITH recent_runs AS (
-            SELECT id AS run_id
-            FROM public_runs
-            WHERE {date_filter}
-        ),
+        WITH {recent_runs_cte(date_filter, org_id, plan)},
         sessions AS (
             SELECT run_id, user_number FROM public_sessions
             WHERE {date_filter}
@@ -627,24 +691,37 @@ def percent_non_convertible_calls_query(
             AND user_number != ''
             {excluded_user_numbers_sql}
         ),
+        node_outputs AS (
+            SELECT
+                run_id,
+                node_id,
+                {flat_data_fields_sql('flat_data')} AS flat_fields,
+                {flat_string_sql('result.call.call_classification')} AS call_classification,
+                {flat_has_sql('result.call.call_classification')} AS call_classification_present,
+                {flat_string_sql('result.load.load_status')} AS load_status,
+                {flat_string_sql('result.carrier.carrier_end_state')} AS carrier_end_state
+            FROM public_node_outputs
+            {node_outputs_filter_sql(date_filter, node_persistent_id, plan)}
+        ),
         non_convertible_calls_stats AS (
-            SELECT *
-            FROM public_node_outputs no
-            INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-            INNER JOIN public_nodes n ON no.node_id = n.id
+            SELECT
+                no.call_classification AS call_classification,
+                no.load_status AS load_status,
+                no.carrier_end_state AS carrier_end_state
+            FROM node_outputs no
+            {node_run_joins_sql(plan)}
             INNER JOIN sessions s ON no.run_id = s.run_id
             WHERE 1 = 1
-            AND no.node_persistent_id = '{node_persistent_id}'
-            AND JSONHas(no.flat_data, 'result.call.call_classification') = 1
-            AND JSONExtractString(no.flat_data, 'result.call.call_classification') != ''
-            AND JSONExtractString(no.flat_data, 'result.call.call_classification') != 'null'
-            AND (JSONExtractString(no.flat_data, 'result.load.load_status') = 'COVERED'
-            OR JSONExtractString(no.flat_data, 'result.load.load_status') = 'PAST_DUE'
-            OR JSONExtractString(no.flat_data, 'result.carrier.carrier_end_state') = 'CARRIER_OFFER_TOO_HIGH'
-            OR JSONExtractString(no.flat_data, 'result.carrier.carrier_end_state') = 'CARRIER_UNABLE_TO_MEET_PICKUP_DELIVERY_APPT'
-            OR JSONExtractString(no.flat_data, 'result.carrier.carrier_end_state') = 'CARRIER_UNABLE_TO_MEET_EQUIPMENT_REQ'
-            OR JSONExtractString(no.flat_data, 'result.carrier.carrier_end_state') = 'CARRIER_DID_NOT_WANT_LOAD'
-            OR JSONExtractString(no.flat_data, 'result.call.call_classification') = 'rate_too_high'
+            AND no.call_classification_present
+            AND call_classification != ''
+            AND call_classification != 'null'
+            AND (load_status = 'COVERED'
+            OR load_status = 'PAST_DUE'
+            OR carrier_end_state = 'CARRIER_OFFER_TOO_HIGH'
+            OR carrier_end_state = 'CARRIER_UNABLE_TO_MEET_PICKUP_DELIVERY_APPT'
+            OR carrier_end_state = 'CARRIER_UNABLE_TO_MEET_EQUIPMENT_REQ'
+            OR carrier_end_state = 'CARRIER_DID_NOT_WANT_LOAD'
+            OR call_classification = 'rate_too_high'
             )
         ),
         non_convertible_calls_count AS (
@@ -668,58 +745,19 @@ def non_convertible_calls_with_carrier_not_qualified_query(
     These are all calls that wouldn't have converted anyway (AI saved time).
     """
     return f"""
-        WITH recent_runs AS (
-            SELECT id AS run_id
-            FROM public_runs
-            WHERE {date_filter}
-        ),
-        sessions AS (
-            SELECT run_id, user_number FROM public_sessions
-            WHERE {date_filter}
-            AND org_id = '{org_id}'
-            AND isNotNull(user_number)
-            AND user_number != ''
-            {excluded_user_numbers_sql}
-        ),
+        {run_facts_ctes(date_filter, org_id, node_persistent_id, excluded_user_numbers_sql)},
         non_convertible_calls_stats AS (
-            SELECT DISTINCT s.run_id
-            FROM public_node_outputs no
-            INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-            INNER JOIN public_nodes n ON no.node_id = n.id
-            INNER JOIN sessions s ON no.run_id = s.run_id
-            WHERE no.node_persistent_id = '{node_persistent_id}'
-            AND JSONHas(no.flat_data, 'result.call.call_classification') = 1
-            AND JSONExtractString(no.flat_data, 'result.call.call_classification') IN (
-                'carrier_not_qualified',
-                'caller_hung_up_no_explanation',
-                'user_declined_load',
-                'carrier_cannot_see_reference_number',
-                'alternate_equipment',
-                'load_not_ready',
-                'load_past_due',
-                'covered',
-                'alternate_date_or_time',
-                'checking_with_driver',
-                'caller_put_on_hold_assistant_hung_up',
-                'rate_too_high'
-            )
-        ),
-        non_convertible_calls_count AS (
-            SELECT COUNT(*) AS non_convertible_calls_count FROM non_convertible_calls_stats
-        ),
-        total_calls AS (
-            SELECT COUNT(DISTINCT s.run_id) AS total_calls
-            FROM public_node_outputs no
-            INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-            INNER JOIN sessions s ON no.run_id = s.run_id
-            WHERE no.node_persistent_id = '{node_persistent_id}'
-            AND JSONHas(no.flat_data, 'result.call.call_classification') = 1
+            SELECT
+                countIf(hasAny(call_classifications, [{_sql_in_list(NON_CONVERTIBLE_CLASSIFICATIONS_WITH_CNQ)}])) AS non_convertible_calls_count,
+                countIf(has_call_classification) AS total_calls
+            FROM run_facts
+            WHERE in_window_with_user_number
         )
         SELECT
             non_convertible_calls_count,
             total_calls,
             ROUND((non_convertible_calls_count * 100.0) / nullIf(total_calls, 0), 2) AS non_convertible_calls_percentage
-        FROM non_convertible_calls_count, total_calls
+        FROM non_convertible_calls_stats
         """
 
 def non_convertible_calls_without_carrier_not_qualified_query(
@@ -733,57 +771,19 @@ def non_convertible_calls_without_carrier_not_qualified_query(
     These are calls with specific issues (equipment, timing, load status, etc).
     """
     return f"""
-        WITH recent_runs AS (
-            SELECT id AS run_id
-            FROM public_runs
-            WHERE {date_filter}
-        ),
-        sessions AS (
-            SELECT run_id, user_number FROM public_sessions
-            WHERE {date_filter}
-            AND org_id = '{org_id}'
-            AND isNotNull(user_number)
-            AND user_number != ''
-            {excluded_user_numbers_sql}
-        ),
+        {run_facts_ctes(date_filter, org_id, node_persistent_id, excluded_user_numbers_sql)},
         non_convertible_calls_stats AS (
-            SELECT DISTINCT s.run_id
-            FROM public_node_outputs no
-            INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-            INNER JOIN public_nodes n ON no.node_id = n.id
-            INNER JOIN sessions s ON no.run_id = s.run_id
-            WHERE no.node_persistent_id = '{node_persistent_id}'
-            AND JSONHas(no.flat_data, 'result.call.call_classification') = 1
-            AND JSONExtractString(no.flat_data, 'result.call.call_classification') IN (
-                'caller_hung_up_no_explanation',
-                'user_declined_load',
-                'carrier_cannot_see_reference_number',
-                'alternate_equipment',
-                'load_not_ready',
-                'load_past_due',
-                'covered',
-                'alternate_date_or_time',
-                'checking_with_driver',
-                'caller_put_on_hold_assistant_hung_up',
-                'rate_too_high'
-            )
-        ),
-        non_convertible_calls_count AS (
-            SELECT COUNT(*) AS non_convertible_calls_count FROM non_convertible_calls_stats
-        ),
-        total_calls AS (
-            SELECT COUNT(DISTINCT s.run_id) AS total_calls
-            FROM public_node_outputs no
-            INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-            INNER JOIN sessions s ON no.run_id = s.run_id
-            WHERE no.node_persistent_id = '{node_persistent_id}'
-            AND JSONHas(no.flat_data, 'result.call.call_classification') = 1
+            SELECT
+                countIf(hasAny(call_classifications, [{_sql_in_list(NON_CONVERTIBLE_CLASSIFICATIONS_WITHOUT_CNQ)}])) AS non_convertible_calls_count,
+                countIf(has_call_classification) AS total_calls
+            FROM run_facts
+            WHERE in_window_with_user_number
         )
         SELECT
             non_convertible_calls_count,
             total_calls,
             ROUND((non_convertible_calls_count * 100.0) / nullIf(total_calls, 0), 2) AS non_convertible_calls_percentage
-        FROM non_convertible_calls_count, total_calls
+        FROM non_convertible_calls_stats
         """
 
 def carrier_not_qualified_stats_query(
@@ -797,83 +797,45 @@ def carrier_not_qualified_stats_query(
     These are carriers that didn't meet qualification requirements.
     """
     return f"""
-        WITH recent_runs AS (
-            SELECT id AS run_id
-            FROM public_runs
-            WHERE {date_filter}
-        ),
-        sessions AS (
-            SELECT run_id, user_number FROM public_sessions
-            WHERE {date_filter}
-            AND org_id = '{org_id}'
-            AND isNotNull(user_number)
-            AND user_number != ''
-            {excluded_user_numbers_sql}
-        ),
-        carrier_not_qualified_calls AS (
-            SELECT DISTINCT s.run_id
-            FROM public_node_outputs no
-            INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-            INNER JOIN public_nodes n ON no.node_id = n.id
-            INNER JOIN sessions s ON no.run_id = s.run_id
-            WHERE no.node_persistent_id = '{node_persistent_id}'
-            AND JSONHas(no.flat_data, 'result.call.call_classification') = 1
-            AND JSONExtractString(no.flat_data, 'result.call.call_classification') = 'carrier_not_qualified'
-        ),
-        carrier_not_qualified_count AS (
-            SELECT COUNT(*) AS carrier_not_qualified_count FROM carrier_not_qualified_calls
-        ),
-        total_calls AS (
-            SELECT COUNT(DISTINCT s.run_id) AS total_calls
-            FROM public_node_outputs no
-            INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-            INNER JOIN sessions s ON no.run_id = s.run_id
-            WHERE no.node_persistent_id = '{node_persistent_id}'
-            AND JSONHas(no.flat_data, 'result.call.call_classification') = 1
+        {run_facts_ctes(date_filter, org_id, node_persistent_id, excluded_user_numbers_sql)},
+        carrier_not_qualified_stats AS (
+            SELECT
+                countIf(has(call_classifications, 'carrier_not_qualified')) AS carrier_not_qualified_count,
+                countIf(has_call_classification) AS total_calls
+            FROM run_facts
+            WHERE in_window_with_user_number
         )
         SELECT
             carrier_not_qualified_count,
             total_calls,
             ROUND((carrier_not_qualified_count * 100.0) / nullIf(total_calls, 0), 2) AS carrier_not_qualified_percentage
-        FROM carrier_not_qualified_count, total_calls
+        FROM carrier_not_qualified_stats
         """
 
-def number_of_unique_loads_query(
+def _unique_loads_stats_query(
     date_filter: str,
     org_id: str,
     node_persistent_id: str,
-    excluded_user_numbers_sql: str = "",
+    excluded_user_numbers_sql: str,
+    load_ids_column: str,
 ) -> str:
-    # number of unique loads
+    # unique loads over runs with a user_number session (any session date), and the number of
+    # distinct (run, user_number) calls they came from
     return f"""
-        WITH recent_runs AS (
-            SELECT id AS run_id
-            FROM public_runs
-            WHERE {date_filter}
-        ),
-        sessions AS (
-            SELECT DISTINCT s.run_id, s.user_number 
-            FROM public_sessions s
-            INNER JOIN recent_runs rr ON s.run_id = rr.run_id
-            WHERE s.org_id = '{org_id}'
-            AND isNotNull(s.user_number)
-            AND s.user_number != ''
-            {excluded_user_numbers_sql}
-        ),
+        {run_facts_ctes(date_filter, org_id, node_persistent_id, excluded_user_numbers_sql)},
         number_of_unique_loads_stats AS (
-            SELECT uniqExact(JSONExtractString(no.flat_data, 'load.custom_load_id')) AS number_of_unique_loads
-            FROM public_node_outputs no
-            INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-            INNER JOIN public_nodes n ON no.node_id = n.id
-            INNER JOIN sessions s ON no.run_id = s.run_id
-            WHERE 1 = 1
-            AND no.node_persistent_id = '{node_persistent_id}'
-            AND JSONHas(no.flat_data, 'load.custom_load_id') = 1
-            AND JSONExtractString(no.flat_data, 'load.custom_load_id') != ''
-            AND JSONExtractString(no.flat_data, 'load.custom_load_id') != 'null'
+            SELECT uniqExact(load_id) AS number_of_unique_loads
+            FROM run_facts
+            ARRAY JOIN {load_ids_column} AS load_id
+            WHERE with_user_number
         ),
         total_calls AS (
-            SELECT SUM(1) AS total_calls FROM sessions
+            SELECT count() AS total_calls
+            FROM (
+                SELECT DISTINCT run_id, user_number
+                FROM sessions
+                WHERE session_has_user_number
+            )
         )
         SELECT 
             number_of_unique_loads, 
@@ -882,87 +844,108 @@ def number_of_unique_loads_query(
         FROM number_of_unique_loads_stats, total_calls
         """
 
-def list_of_unique_loads_query(
+def _unique_loads_list_query(
     date_filter: str,
     org_id: str,
     node_persistent_id: str,
-    excluded_user_numbers_sql: str = "",
+    excluded_user_numbers_sql: str,
+    load_ids_column: str,
 ) -> str:
-    # list of unique loads
     return f"""
-        WITH recent_runs AS (
-            SELECT id AS run_id
-            FROM public_runs
-            WHERE {date_filter}
-        ),
-        sessions AS (
-            SELECT DISTINCT s.run_id, s.user_number 
-            FROM public_sessions s
-            INNER JOIN recent_runs rr ON s.run_id = rr.run_id
-            WHERE s.org_id = '{org_id}'
-            AND isNotNull(s.user_number)
-            AND s.user_number != ''
-            {excluded_user_numbers_sql}
-        ),
-        list_of_unique_loads_stats AS (
-            SELECT DISTINCT JSONExtractString(no.flat_data, 'load.custom_load_id') AS custom_load_id
-            FROM public_node_outputs no
-            INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-            INNER JOIN public_nodes n ON no.node_id = n.id
-            INNER JOIN sessions s ON no.run_id = s.run_id
-            WHERE 1 = 1
-            AND no.node_persistent_id = '{node_persistent_id}'
-            AND JSONHas(no.flat_data, 'load.custom_load_id') = 1
-            AND JSONExtractString(no.flat_data, 'load.custom_load_id') != ''
-            AND JSONExtractString(no.flat_data, 'load.custom_load_id') != 'null'
-        )
-        SELECT custom_load_id FROM list_of_unique_loads_stats
+        {run_facts_ctes(date_filter, org_id, node_persistent_id, excluded_user_numbers_sql)}
+        SELECT DISTINCT custom_load_id
+        FROM run_facts
+        ARRAY JOIN {load_ids_column} AS custom_load_id
+        WHERE with_user_number
         """
 
-def number_of_unique_loads_query_broker_node(
+def _unique_loads_state_query(
     date_filter: str,
     org_id: str,
     node_persistent_id: str,
-    excluded_user_numbers_sql: str = "",
+    excluded_user_numbers_sql: str,
+    load_ids_column: str,
 ) -> str:
-    # number of unique loads
+    # same as _unique_loads_stats_query, but returns a mergeable uniqExact state instead of the count
     return f"""
-        WITH recent_runs AS (
-            SELECT id AS run_id
-            FROM public_runs
-            WHERE {date_filter}
-        ),
-        sessions AS (
-            SELECT DISTINCT s.run_id, s.user_number 
-            FROM public_sessions s
-            INNER JOIN recent_runs rr ON s.run_id = rr.run_id
-            WHERE s.org_id = '{org_id}'
-            AND isNotNull(s.user_number)
-            AND s.user_number != ''
-            {excluded_user_numbers_sql}
+        {run_facts_ctes(date_filter, org_id, node_persistent_id, excluded_user_numbers_sql)},
+        unique_loads_state AS (
+            SELECT uniqExactState(load_id) AS loads_state
+            FROM run_facts
+            ARRAY JOIN {load_ids_column} AS load_id
+            WHERE with_user_number
         ),
-        number_of_unique_loads_stats AS (
-            SELECT uniqExact(JSONExtractString(no.flat_data, 'result.load.reference_number')) AS number_of_unique_loads
-            FROM public_node_outputs no
-            INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-            INNER JOIN public_nodes n ON no.node_id = n.id
-            INNER JOIN sessions s ON no.run_id = s.run_id
-            WHERE 1 = 1
-            AND no.node_persistent_id = '{node_persistent_id}'
-            AND JSONHas(no.flat_data, 'result.load.reference_number') = 1
-            AND JSONExtractString(no.flat_data, 'result.load.reference_number') != ''
-            AND JSONExtractString(no.flat_data, 'result.load.reference_number') != 'null'
-        ),
-        total_calls AS (
-            SELECT SUM(1) AS total_calls FROM sessions
+        branch_total_calls AS (
+            SELECT count() AS branch_total_calls
+            FROM (
+                SELECT DISTINCT run_id, user_number
+                FROM sessions
+                WHERE session_has_user_number
+            )
         )
-        SELECT 
-            number_of_unique_loads, 
-            total_calls, 
+        SELECT loads_state, branch_total_calls
+        FROM unique_loads_state, branch_total_calls
+        """
+
+def number_of_unique_loads_across_cutoff_query(
+    broker_date_filter: str,
+    fbr_date_filter: str,
+    org_id: str,
+    broker_node_persistent_id: str,
+    fbr_node_persistent_id: str,
+    excluded_user_numbers_sql: str = "",
+) -> str:
+    """
+    Number of unique loads for a range spanning UNIQUE_LOADS_CUTOFF_DATE: broker-node
+    reference numbers before the cutoff and FBR custom load ids after it, de-duplicated
+    across both in ClickHouse by merging the two uniqExact states. Total calls is the sum
+    of both periods.
+    """
+    broker_state = _unique_loads_state_query(
+        broker_date_filter, org_id, broker_node_persistent_id, excluded_user_numbers_sql, "reference_numbers"
+    )
+    fbr_state = _unique_loads_state_query(
+        fbr_date_filter, org_id, fbr_node_persistent_id, excluded_user_numbers_sql, "custom_load_ids"
+    )
+    return f"""
+        SELECT
+            uniqExactMerge(loads_state) AS number_of_unique_loads,
+            sum(branch_total_calls) AS total_calls,
             ifNull(round(total_calls / nullIf(number_of_unique_loads, 0), 2), 0) AS calls_per_unique_load
-        FROM number_of_unique_loads_stats, total_calls
+        FROM (
+            SELECT * FROM ({broker_state})
+            UNION ALL
+            SELECT * FROM ({fbr_state})
+        )
         """
 
+def number_of_unique_loads_query(
+    date_filter: str,
+    org_id: str,
+    node_persistent_id: str,
+    excluded_user_numbers_sql: str = "",
+) -> str:
+    # number of unique loads
+    return _unique_loads_stats_query(date_filter, org_id, node_persistent_id, excluded_user_numbers_sql, "custom_load_ids")
+
+def list_of_unique_loads_query(
+    date_filter: str,
+    org_id: str,
+    node_persistent_id: str,
+    excluded_user_numbers_sql: str = "",
+) -> str:
+    # list of unique loads
+    return _unique_loads_list_query(date_filter, org_id, node_persistent_id, excluded_user_numbers_sql, "custom_load_ids")
+
+def number_of_unique_loads_query_broker_node(
+    date_filter: str,
+    org_id: str,
+    node_persistent_id: str,
+    excluded_user_numbers_sql: str = "",
+) -> str:
+    # number of unique loads
+    return _unique_loads_stats_query(date_filter, org_id, node_persistent_id, excluded_user_numbers_sql, "reference_numbers")
+
 def list_of_unique_loads_query_broker_node(
     date_filter: str,
     org_id: str,
@@ -970,34 +953,46 @@ def list_of_unique_loads_query_broker_node(
     excluded_user_numbers_sql: str = "",
 ) -> str:
     # list of unique loads
+    return _unique_loads_list_query(date_filter, org_id, node_persistent_id, excluded_user_numbers_sql, "reference_numbers")
+
+def unique_load_ids_by_day_query(
+    broker_date_filter: Optional[str],
+    fbr_date_filter: Optional[str],
+    broker_org_nodes: Sequence[Tuple[str, str]],
+    fbr_org_nodes: Sequence[Tuple[str, str]],
+    excluded_user_numbers_sql: str = "",
+    day_tz: str = "UTC",
+) -> str:
+    """
+    The unique load ids of each org and `report_day` (in day_tz) in one query: the same ids
+    as the list_of_unique_loads queries for each one-day window. Broker-node reference numbers
+    come from the part of the window before UNIQUE_LOADS_CUTOFF_DATE (broker_date_filter) and
+    FBR custom load ids from the part after it (fbr_date_filter); pass None for a part outside
+    the window. The org_nodes map each org to the node read in that part.
+    """
+    branches = []
+    for date_filter, org_nodes, load_ids_column in (
+        (broker_date_filter, broker_org_nodes, "reference_numbers"),
+        (fbr_date_filter, fbr_org_nodes, "custom_load_ids"),
+    ):
+        if not date_filter:
+            continue
+        org_ids = sorted({org_id for org_id, _ in org_nodes})
+        node_ids = sorted({node_id for _, node_id in org_nodes})
+        branches.append(f"""
+            {run_facts_ctes(date_filter, org_ids, node_ids, excluded_user_numbers_sql, day_tz=day_tz, org_nodes=org_nodes)}
+            SELECT report_org_id, report_day, groupUniqArrayArrayIf({load_ids_column}, with_user_number) AS load_ids
+            FROM run_facts
+            GROUP BY report_org_id, report_day
+        """)
+    union = "\n            UNION ALL\n".join(f"SELECT * FROM ({branch})" for branch in branches)
     return f"""
-        WITH recent_runs AS (
-            SELECT id AS run_id
-            FROM public_runs
-            WHERE {date_filter}
-        ),
-        sessions AS (
-            SELECT DISTINCT s.run_id, s.user_number 
-            FROM public_sessions s
-            INNER JOIN recent_runs rr ON s.run_id = rr.run_id
-            WHERE s.org_id = '{org_id}'
-            AND isNotNull(s.user_number)
-            AND s.user_number != ''
-            {excluded_user_numbers_sql}
-        ),
-        list_of_unique_loads_stats AS (
-            SELECT DISTINCT JSONExtractString(no.flat_data, 'result.load.reference_number') AS custom_load_id
-            FROM public_node_outputs no
-            INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-            INNER JOIN public_nodes n ON no.node_id = n.id
-            INNER JOIN sessions s ON no.run_id = s.run_id
-            WHERE 1 = 1
-            AND no.node_persistent_id = '{node_persistent_id}'
-            AND JSONHas(no.flat_data, 'result.load.reference_number') = 1
-            AND JSONExtractString(no.flat_data, 'result.load.reference_number') != ''
-            AND JSONExtractString(no.flat_data, 'result.load.reference_number') != 'null'
+        SELECT report_org_id, report_day, arraySort(groupUniqArrayArray(load_ids)) AS load_ids
+        FROM (
+            {union}
         )
-        SELECT custom_load_id FROM list_of_unique_loads_stats
+        GROUP BY report_org_id, report_day
+        ORDER BY report_org_id, report_day
         """
 
 # def calls_without_carrier_asked_for_transfer_query(
@@ -1143,12 +1138,9 @@ def calls_without_carrier_asked_for_transfer_query(
     excluded_user_numbers_sql: str = "",
 ) -> str:
     # calls without carrier asked for transfer (optimized)
+    plan = get_query_plan()
     return f"""
-        WITH recent_runs AS (
-            SELECT id AS run_id
-            FROM public_runs
-            WHERE {date_filter}
-        ),
+        WITH {recent_runs_cte(date_filter, org_id, plan)},
 
         sessions AS (
             SELECT run_id, user_number, duration
@@ -1158,19 +1150,29 @@ def calls_without_carrier_asked_for_transfer_query(
               {excluded_user_numbers_sql}
         ),
 
+        -- Broker-node outputs for the window, flat_data decoded once per output
+        node_outputs AS (
+            SELECT
+                run_id,
+                node_id,
+                {flat_data_fields_sql('flat_data')} AS flat_fields,
+                {flat_string_sql('result.transfer.transfer_reason')} AS transfer_reason,
+                {flat_string_sql('result.call.call_classification')} AS call_classification,
+                {flat_has_sql('result.call.call_classification')} AS call_classification_present
+            FROM public_node_outputs
+            {node_outputs_filter_sql(date_filter, node_persistent_id, plan)}
+        ),
+
         -- Runs that have transfer_reason set & not carrier_asked_for_transfer
         eligible_runs AS (
             SELECT DISTINCT no.run_id AS run_id
-            FROM public_node_outputs AS no
-            INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-            INNER JOIN public_nodes n ON no.node_id = n.id
+            FROM node_outputs AS no
+            {node_run_joins_sql(plan)}
             INNER JOIN sessions s ON no.run_id = s.run_id
             WHERE 1 = 1
-              AND no.node_persistent_id = '{node_persistent_id}'
-              AND JSONHas(no.flat_data, 'result.transfer.transfer_reason') = 1
-              AND JSONExtractString(no.flat_data, 'result.transfer.transfer_reason') != ''
-              AND JSONExtractString(no.flat_data, 'result.transfer.transfer_reason') != 'null'
-              AND upper(JSONExtractString(no.flat_data, 'result.transfer.transfer_reason')) != 'CARRIER_ASKED_FOR_TRANSFER'
+              AND no.transfer_reason != ''
+              AND no.transfer_reason != 'null'
+              AND upper(no.transfer_reason) != 'CARRIER_ASKED_FOR_TRANSFER'
         ),
 
         -- Per-run stats for all eligible runs
@@ -1197,15 +1199,13 @@ def calls_without_carrier_asked_for_transfer_query(
             SELECT
                 no.run_id as run_id,
                 any(s.duration) AS duration,  -- one duration per run
-                JSONExtractString(no.flat_data, 'result.call.call_classification') AS call_classification
-            FROM public_node_outputs AS no
-            INNER JOIN recent_runs rr ON no.run_id = rr.run_id
-            INNER JOIN public_nodes n ON no.node_id = n.id
+                no.call_classification AS call_classification
+            FROM node_outputs AS no
+            {node_run_joins_sql(plan)}
             INNER JOIN sessions s ON no.run_id = s.run_id
-            INNER JOIN eligible_runs er ON no.run_id = er.run_id
             WHERE 1 = 1
-              AND no.node_persistent_id = '{node_persistent_id}'
-              AND JSONHas(no.flat_data, 'result.call.call_classification') = 1
+              AND no.run_id IN (SELECT run_id FROM eligible_runs)
+              AND no.call_classification_present
             GROUP BY
                 no.run_id,
                 call_classification
@@ -1331,41 +1331,21 @@ def calls_without_carrier_asked_for_transfer_query(
            
     """
 
-
-
 def total_calls_and_total_duration_query(
     date_filter: str,
     org_id: str,
     node_persistent_id: str,
     excluded_user_numbers_sql: str = "",
 ) -> str:
-    # total calls and total duration
+    # total calls and total duration: the org's runs in the window that reached the node,
+    # with the duration of one of their sessions (any session date)
     return f"""
-       WITH recent_runs AS (
-        SELECT id AS run_id
-        FROM public_runs
-        WHERE {date_filter}
-    ),
-    sessions AS (
-        SELECT run_id, user_number, duration
-        FROM public_sessions
-        WHERE {date_filter}
-        AND org_id = '{org_id}'
-        {excluded_user_numbers_sql}
-    ),
+    {run_facts_ctes(date_filter, org_id, node_persistent_id, excluded_user_numbers_sql)},
     total_calls_and_total_duration_stats AS (
         SELECT
-            ifNull(sum(duration), 0) AS total_duration,
-            count()      AS total_calls
-        FROM (
-            SELECT DISTINCT
-                s.run_id,
-                s.duration
-            FROM sessions s
-            INNER JOIN public_node_outputs no
-                ON s.run_id = no.run_id
-            WHERE no.node_persistent_id = '{node_persistent_id}'
-        )
+            ifNull(sumIf(duration, run_in_org), 0) AS total_duration,
+            countIf(run_in_org) AS total_calls
+        FROM run_facts
     )
     SELECT
         total_duration,
@@ -1383,36 +1363,217 @@ def duration_carrier_asked_for_transfer_query(
 ) -> str:
     # duration of carrier asked for transfer
     return f"""
-        WITH recent_runs AS (
-            SELECT id AS run_id
-            FROM public_runs
-            WHERE {date_filter}
-        ),
-        sessions AS (
-            SELECT run_id, user_number, duration
-            FROM public_sessions
-            WHERE {date_filter}
-              AND org_id = '{org_id}'
-              {excluded_user_numbers_sql}
-        ),
-        carrier_asked_sessions AS (
-            SELECT DISTINCT s.run_id as run_id, s.duration as duration
-            FROM sessions s
-            INNER JOIN recent_runs rr ON s.run_id = rr.run_id
-            INNER JOIN public_node_outputs no ON s.run_id = no.run_id
-            INNER JOIN public_nodes n ON no.node_id = n.id
-            WHERE 1 = 1
-              AND no.node_persistent_id = '{node_persistent_id}'
-              AND JSONHas(no.flat_data, 'result.transfer.transfer_reason') = 1
-              AND JSONExtractString(no.flat_data, 'result.transfer.transfer_reason') != ''
-              AND JSONExtractString(no.flat_data, 'result.transfer.transfer_reason') != 'null'
-              AND upper(JSONExtractString(no.flat_data, 'result.transfer.transfer_reason')) = 'CARRIER_ASKED_FOR_TRANSFER'
-        ),
+        {run_facts_ctes(date_filter, org_id, node_persistent_id, excluded_user_numbers_sql)},
         duration_carrier_asked_for_transfer_stats AS (
             SELECT
                 ifNull(sum(duration), 0) AS duration_carrier_asked_for_transfer
-            FROM carrier_asked_sessions
+            FROM run_facts
+            WHERE run_in_org
+              AND arrayExists(r -> upper(r) = 'CARRIER_ASKED_FOR_TRANSFER', transfer_reasons)
         )
         SELECT duration_carrier_asked_for_transfer
         FROM duration_carrier_asked_for_transfer_stats
-    """
\ No newline at end of file
+    """
+
+NON_CONVERTIBLE_CLASSIFICATIONS_WITH_CNQ = (
+    'carrier_not_qualified',
+    'caller_hung_up_no_explanation',
+    'user_declined_load',
+    'carrier_cannot_see_reference_number',
+    'alternate_equipment',
+    'load_not_ready',
+    'load_past_due',
+    'covered',
+    'alternate_date_or_time',
+    'checking_with_driver',
+    'caller_put_on_hold_assistant_hung_up',
+    'rate_too_high',
+)
+
+NON_CONVERTIBLE_CLASSIFICATIONS_WITHOUT_CNQ = tuple(
+    c for c in NON_CONVERTIBLE_CLASSIFICATIONS_WITH_CNQ if c != 'carrier_not_qualified'
+)
+
+
+def _sql_in_list(values) -> str:
+    return ", ".join(f"'{v}'" for v in values)
+
+
+def daily_report_query(
+    date_filter: str,
+    org_id: str,
+    node_persistent_id: str,
+    excluded_user_numbers_sql: str = "",
+    day_tz: Optional[str] = None,
+) -> str:
+    """
+    Every KPI and breakdown of the daily report in a single scan of node outputs.
+
+    Built on run_facts (see run_facts_ctes), so every count below is a count of
+    distinct runs exactly like the per-metric queries, each applying the same
+    session filter flag:
+    - scalar metrics are countIf(<flags>) over runs
+    - breakdowns sum each run's value set into (value -> runs) maps with sumMapIf
+
+    With `day_tz` the window must cover whole days in that timezone; the result then has one
+    row per day with runs (`report_day`), each equal to the one-day query for that day.
+    """
+    group_keys = ["report_day"] if day_tz else []
+    return _daily_report_sql(
+        run_facts_ctes(date_filter, org_id, node_persistent_id, excluded_user_numbers_sql, day_tz=day_tz),
+        group_keys,
+    )
+
+
+def all_orgs_daily_report_query(
+    date_filter: str,
+    org_nodes: Sequence[Tuple[str, str]],
+    excluded_user_numbers_sql: str = "",
+) -> str:
+    """
+    daily_report_query for several orgs in one scan: `org_nodes` maps each org to its broker
+    node as (org_id, node_persistent_id) pairs. The result has one row per org with runs
+    (`report_org_id`), each equal to daily_report_query for that org and node.
+    """
+    org_ids = sorted({org_id for org_id, _ in org_nodes})
+    node_ids = sorted({node_id for _, node_id in org_nodes})
+    return _daily_report_sql(
+        run_facts_ctes(date_filter, org_ids, node_ids, excluded_user_numbers_sql, org_nodes=org_nodes),
+        ["report_org_id"],
+    )
+
+
+# Dimensions of the daily call cube: cell column -> run_facts array of the run's values
+CALL_CUBE_DIMENSIONS = (
+    ("call_classification", "call_classifications"),
+    ("call_stage", "call_stages"),
+    ("load_status", "load_statuses"),
+    ("pricing_notes", "pricing_notes_values"),
+    ("carrier_end_state", "carrier_end_states"),
+    ("transfer_reason", "transfer_reasons"),
+    ("transfer_attempt", "transfer_attempts"),
+)
+
+
+def daily_call_cube_query(
+    date_filter: str,
+    org_nodes: Sequence[Tuple[str, str]],
+    excluded_user_numbers_sql: str = "",
+    day_tz: str = "UTC",
+) -> str:
+    """
+    Per-day call cube of one or more orgs in one scan: each org's runs (as counted by
+    total_calls) and their summed duration per `report_org_id`, `report_day` and combination of
+    CALL_CUBE_DIMENSIONS values. `org_nodes` maps each org to its broker node as
+    (org_id, node_persistent_id) pairs, like all_orgs_daily_report_query. The window must cover
+    whole days in `day_tz`.
+
+    Each run lands in exactly one cell, so cells can be summed over any dimensions: a run
+    without a value has '' and a run with several values of a dimension is keyed by all of
+    them, sorted and joined with '|'.
+    """
+    org_ids = sorted({org_id for org_id, _ in org_nodes})
+    node_ids = sorted({node_id for _, node_id in org_nodes})
+    names = ", ".join(name for name, _ in CALL_CUBE_DIMENSIONS)
+    dimensions = ",\n            ".join(
+        f"arrayStringConcat(arraySort({values}), '|') AS {name}" for name, values in CALL_CUBE_DIMENSIONS
+    )
+    return f"""
+        {run_facts_ctes(date_filter, org_ids, node_ids, excluded_user_numbers_sql, day_tz=day_tz, org_nodes=org_nodes)}
+        SELECT
+            report_org_id,
+            report_day,
+            {dimensions},
+            count() AS calls,
+            ifNull(sum(duration), 0) AS duration_seconds
+        FROM run_facts
+        WHERE run_in_org
+        GROUP BY report_org_id, report_day, {names}
+        ORDER BY report_org_id, report_day
+    """
+
+
+def _daily_report_sql(run_facts_sql: str, group_keys: Sequence[str]) -> str:
+    """The report stage of daily_report_query over run_facts, one row per group_keys value."""
+    with_cnq = _sql_in_list(NON_CONVERTIBLE_CLASSIFICATIONS_WITH_CNQ)
+    without_cnq = _sql_in_list(NON_CONVERTIBLE_CLASSIFICATIONS_WITHOUT_CNQ)
+    group_select = "".join(f"{key}, " for key in group_keys)
+    group_by = f"GROUP BY {', '.join(group_keys)}" if group_keys else ""
+    order_by = f"ORDER BY {', '.join(group_keys)}" if group_keys else ""
+    return f"""
+        {run_facts_sql},
+        report AS (
+            SELECT
+                {group_select}
+                countIf(run_in_org) AS total_calls,
+                sumIf(duration, run_in_org) AS run_duration_sum,
+
+                sumMapIf(call_stages, arrayMap(x -> toUInt64(1), call_stages), in_window) AS call_stage_map,
+                sumMapIf(call_classifications, arrayMap(x -> toUInt64(1), call_classifications), in_window) AS call_classification_map,
+                sumMap(load_statuses, arrayMap(x -> toUInt64(1), load_statuses)) AS load_status_map,
+                sumMapIf(pricing_notes_values, arrayMap(x -> toUInt64(1), pricing_notes_values), in_window) AS pricing_notes_map,
+                sumMapIf(carrier_end_states, arrayMap(x -> toUInt64(1), carrier_end_states), in_window) AS carrier_end_state_map,
+
+                sumIf(length(attempted_transfer_reasons), in_window) AS total_transfer_attempts,
+                countIf(in_window AND has(attempted_transfer_reasons, 'CARRIER_ASKED_FOR_TRANSFER')) AS carrier_asked_transfer_attempts,
+                countIf(in_window AND has(transfer_reasons, 'CARRIER_ASKED_FOR_TRANSFER')) AS carrier_asked_count,
+                countIf(in_window AND has_call_classification) AS total_call_attempts,
+
+                sumIf(length(booked_rates), in_window) AS successfully_transferred_for_booking_count,
+                countIf(in_window AND has_booking_fields) AS booking_total_calls,
+
+                -- non-convertible metrics only count sessions with a user_number
+                countIf(in_window_with_user_number AND has_call_classification) AS classified_calls,
+                countIf(in_window_with_user_number AND hasAny(call_classifications, [{with_cnq}])) AS non_convertible_with_cnq_count,
+                countIf(in_window_with_user_number AND hasAny(call_classifications, [{without_cnq}])) AS non_convertible_without_cnq_count,
+                countIf(in_window_with_user_number AND has(call_classifications, 'carrier_not_qualified')) AS carrier_not_qualified_count
+            FROM run_facts
+            {group_by}
+        )
+        SELECT
+            {group_select}
+            total_calls,
+            ifNull(run_duration_sum, 0) AS total_duration,
+            ifNull(round((run_duration_sum / nullIf(total_calls, 0)) / 60, 2), 0) AS avg_minutes_per_call,
+
+            call_stage_map.1 AS call_stage_keys,
+            call_stage_map.2 AS call_stage_counts,
+            arrayMap(c -> round((c * 100.0) / arraySum(call_stage_map.2), 2), call_stage_map.2) AS call_stage_percentages,
+            call_classification_map.1 AS call_classification_keys,
+            call_classification_map.2 AS call_classification_counts,
+            arrayMap(c -> round((c * 100.0) / arraySum(call_classification_map.2), 2), call_classification_map.2) AS call_classification_percentages,
+            load_status_map.1 AS load_status_keys,
+            load_status_map.2 AS load_status_counts,
+            arrayMap(c -> round((c * 100.0) / arraySum(load_status_map.2), 2), load_status_map.2) AS load_status_percentages,
+            pricing_notes_map.1 AS pricing_notes_keys,
+            pricing_notes_map.2 AS pricing_notes_counts,
+            arrayMap(c -> round((c * 100.0) / arraySum(pricing_notes_map.2), 2), pricing_notes_map.2) AS pricing_notes_percentages,
+            carrier_end_state_map.1 AS carrier_end_state_keys,
+            carrier_end_state_map.2 AS carrier_end_state_counts,
+            arrayMap(c -> round((c * 100.0) / arraySum(carrier_end_state_map.2), 2), carrier_end_state_map.2) AS carrier_end_state_percentages,
+
+            carrier_asked_transfer_attempts,
+            total_transfer_attempts,
+            round((carrier_asked_transfer_attempts * 100.0) / nullIf(total_transfer_attempts, 0), 2) AS carrier_asked_transfer_attempts_percentage,
+
+            carrier_asked_count,
+            total_call_attempts,
+            round((carrier_asked_count * 100.0) / nullIf(total_call_attempts, 0), 2) AS carrier_asked_percentage,
+
+            successfully_transferred_for_booking_count,
+            booking_total_calls,
+            ifNull(
+                round((successfully_transferred_for_booking_count * 100.0) / nullIf(booking_total_calls, 0), 2),
+                0
+            ) AS successfully_transferred_for_booking_percentage,
+
+            classified_calls,
+            non_convertible_with_cnq_count,
+            round((non_convertible_with_cnq_count * 100.0) / nullIf(classified_calls, 0), 2) AS non_convertible_with_cnq_percentage,
+            non_convertible_without_cnq_count,
+            round((non_convertible_without_cnq_count * 100.0) / nullIf(classified_calls, 0), 2) AS non_convertible_without_cnq_percentage,
+            carrier_not_qualified_count,
+            round((carrier_not_qualified_count * 100.0) / nullIf(classified_calls, 0), 2) AS carrier_not_qualified_percentage
+        FROM report
+        {order_by}
+    """
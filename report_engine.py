@@ -0,0 +1,407 @@
+"""
+Daily report engine.
+
+Builds the `date_range` / `kpis` / `breakdowns` structure served by `/daily-report`
+and stored by the scheduler. Both callers go through `build_daily_report` so the
+report shape is defined in one place.
+
+Failed metric queries are retried per metric: after a round of queries, only the metrics
+that failed are run again, after a jittered exponential backoff (a random delay of up to
+REPORT_METRIC_RETRY_BASE_SECONDS * 2^(retry-1)), and metrics that succeeded are reused.
+Metrics still failing after REPORT_METRIC_MAX_ATTEMPTS are listed in the report's
+`degraded_metrics` instead of failing the whole report. When the single-pass query fails,
+the metrics are fetched per metric with the same retries.
+
+Configuration via environment variables:
+- DAILY_REPORT_ENGINE: `single_pass` (default) computes every metric with one
+  ClickHouse query; `per_metric` runs the individual fetch_* queries instead.
+- REPORT_METRIC_MAX_ATTEMPTS: Attempts per metric query (default: 3)
+- REPORT_METRIC_RETRY_BASE_SECONDS: Backoff cap before the first retry (default: 5)
+"""
+
+import os
+import time
+import random
+import asyncio
+import logging
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+from db import (
+    DAILY_REPORT_FETCHERS,
+    DailyReportStats,
+    QueryContext,
+    daily_report_stats_from_results,
+    fetch_daily_report_stats,
+    fetch_daily_report_stats_by_day,
+    fetch_daily_report_stats_for_orgs,
+    track_query_errors,
+)
+from executor import gather_blocking, run_blocking
+
+logger = logging.getLogger(__name__)
+
+ENGINE_SINGLE_PASS = "single_pass"
+ENGINE_PER_METRIC = "per_metric"
+
+
+def get_report_engine() -> str:
+    """Get the configured report engine (single_pass or per_metric)."""
+    engine = os.getenv("DAILY_REPORT_ENGINE", ENGINE_SINGLE_PASS).strip().lower()
+    if engine not in (ENGINE_SINGLE_PASS, ENGINE_PER_METRIC):
+        logger.warning("Unknown DAILY_REPORT_ENGINE %r, using %s", engine, ENGINE_SINGLE_PASS)
+        return ENGINE_SINGLE_PASS
+    return engine
+
+
+def get_metric_max_attempts() -> int:
+    """Get number of attempts per metric query."""
+    return max(1, int(os.getenv("REPORT_METRIC_MAX_ATTEMPTS", "3")))
+
+
+def get_metric_retry_base_seconds() -> float:
+    """Get the backoff cap before the first metric retry."""
+    return max(0.0, float(os.getenv("REPORT_METRIC_RETRY_BASE_SECONDS", "5")))
+
+
+def metric_retry_delay(retry: int) -> float:
+    """Full-jitter exponential backoff before retry number `retry` (1 = first retry)."""
+    return random.uniform(0, get_metric_retry_base_seconds() * (2 ** (retry - 1)))
+
+
+def _fetch_metric(field: str, start_date: str, end_date: str, ctx: Optional[QueryContext]) -> Tuple[bool, Any]:
+    """Run one metric's fetcher. Returns (succeeded, value); the fetchers swallow query errors."""
+    with track_query_errors() as errors:
+        value = DAILY_REPORT_FETCHERS[field](start_date, end_date, ctx)
+    return not errors, value
+
+
+def _fetch_single_pass(start_date: str, end_date: str, ctx: Optional[QueryContext]) -> Optional[DailyReportStats]:
+    """Run the single-pass query; None if it failed."""
+    with track_query_errors() as errors:
+        stats = fetch_daily_report_stats(start_date, end_date, ctx)
+    return None if errors else stats
+
+
+def _next_retry_delay(pending: List[str], attempt: int, deadline: Optional[float]) -> Optional[float]:
+    """Backoff before retrying `pending` metrics after `attempt`, or None to give up on them."""
+    if not pending or attempt >= get_metric_max_attempts():
+        return None
+    delay = metric_retry_delay(attempt)
+    if deadline is not None and time.monotonic() + delay >= deadline:
+        logger.warning("Time budget exhausted, not retrying metrics %s", ", ".join(pending))
+        return None
+    logger.warning("Metrics %s failed (attempt %d/%d), retrying in %.1fs",
+                   ", ".join(pending), attempt, get_metric_max_attempts(), delay)
+    return delay
+
+
+def _stats_from_metrics(values: Dict[str, Any], failed: List[str], start_date: str, end_date: str) -> DailyReportStats:
+    """
+    Assemble the stats of the metrics that succeeded, recording the failed ones as degraded.
+
+    Raises:
+        RuntimeError: if every metric failed
+    """
+    if failed and not values:
+        raise RuntimeError(f"Every daily report metric failed for {start_date} to {end_date}")
+    stats = daily_report_stats_from_results(values)
+    stats.degraded_metrics = sorted(failed)
+    if failed:
+        logger.error("Daily report for %s to %s is degraded, metrics failed: %s",
+                     start_date, end_date, ", ".join(stats.degraded_metrics))
+    return stats
+
+
+def fetch_report_stats_per_metric(
+    start_date: str,
+    end_date: str,
+    ctx: Optional[QueryContext] = None,
+    deadline: Optional[float] = None,
+    query_slot: Callable[[], ContextManager] = nullcontext,
+) -> DailyReportStats:
+    """
+    Fetch the daily report metrics with one query per metric, retrying only the failed ones.
+
+    Args:
+        deadline: Optional time.monotonic() value after which no retry is started
+        query_slot: Context manager held while queries run (not during backoff), e.g.
+            scheduler.report_query_slot
+
+    Raises:
+        RuntimeError: if every metric failed
+    """
+    values: Dict[str, Any] = {}
+    pending = list(DAILY_REPORT_FETCHERS)
+    attempt = 1
+    while True:
+        with query_slot():
+            for field in pending:
+                succeeded, value = _fetch_metric(field, start_date, end_date, ctx)
+                if succeeded:
+                    values[field] = value
+        pending = [field for field in pending if field not in values]
+        delay = _next_retry_delay(pending, attempt, deadline)
+        if delay is None:
+            break
+        time.sleep(delay)
+        attempt += 1
+    return _stats_from_metrics(values, pending, start_date, end_date)
+
+
+def fetch_report_stats(
+    start_date: str,
+    end_date: str,
+    ctx: Optional[QueryContext] = None,
+    deadline: Optional[float] = None,
+    query_slot: Callable[[], ContextManager] = nullcontext,
+) -> DailyReportStats:
+    """
+    Fetch all daily report metrics with the configured engine, for `ctx` (default: env).
+    If the single-pass query fails, falls back to per-metric queries with per-metric retries.
+    See fetch_report_stats_per_metric for `deadline` and `query_slot`.
+
+    Raises:
+        RuntimeError: if every metric failed (the errors are already logged by db.py)
+    """
+    if get_report_engine() == ENGINE_SINGLE_PASS:
+        with query_slot():
+            stats = _fetch_single_pass(start_date, end_date, ctx)
+        if stats is not None:
+            return stats
+        logger.warning("Daily report query failed for %s to %s, fetching per metric", start_date, end_date)
+    return fetch_report_stats_per_metric(start_date, end_date, ctx, deadline, query_slot)
+
+
+async def fetch_report_stats_async(start_date: str, end_date: str, ctx: Optional[QueryContext] = None) -> DailyReportStats:
+    """
+    Async variant of fetch_report_stats for API endpoints: queries run on the fetch executor,
+    per-metric queries fan out concurrently, and backoff waits don't hold a thread.
+    """
+    if get_report_engine() == ENGINE_SINGLE_PASS:
+        stats = await run_blocking(_fetch_single_pass, start_date, end_date, ctx)
+        if stats is not None:
+            return stats
+        logger.warning("Daily report query failed for %s to %s, fetching per metric", start_date, end_date)
+
+    values: Dict[str, Any] = {}
+    pending = list(DAILY_REPORT_FETCHERS)
+    attempt = 1
+    while True:
+        results = await gather_blocking({
+            field: partial(_fetch_metric, field, start_date, end_date, ctx) for field in pending
+        })
+        for field, error in results.errors.items():
+            logger.error("Daily report metric %s failed: %s", field, error)
+        for field, (succeeded, value) in results.values.items():
+            if succeeded:
+                values[field] = value
+        pending = [field for field in pending if field not in values]
+        delay = _next_retry_delay(pending, attempt, None)
+        if delay is None:
+            break
+        await asyncio.sleep(delay)
+        attempt += 1
+    return _stats_from_metrics(values, pending, start_date, end_date)
+
+
+def _success_rate(stats: DailyReportStats) -> Optional[float]:
+    """Success rate from the call classification distribution."""
+    if not stats.call_classification:
+        return None
+    total = sum(int(r.count) for r in stats.call_classification if r is not None)
+    success = sum(int(r.count) for r in stats.call_classification if (r is not None and r.call_classification == "success"))
+    return round((success / total) * 100.0, 2) if total else 0.0
+
+
+def report_from_stats(stats: DailyReportStats, tz_name: str, start_date: str, end_date: str) -> Dict[str, Any]:
+    """Shape fetched metrics into the daily report structure."""
+    total_calls_and_duration = stats.total_calls_and_duration
+    non_convertible_with_cnq = stats.non_convertible_with_cnq
+    non_convertible_without_cnq = stats.non_convertible_without_cnq
+    carrier_not_qualified = stats.carrier_not_qualified
+    carrier_transfer_over_transfer_attempts = stats.carrier_transfer_over_transfer_attempts
+    carrier_transfer_over_call_attempts = stats.carrier_transfer_over_call_attempts
+    successfully_transferred = stats.successfully_transferred_for_booking
+
+    return {
+        "date_range": {
+            "tz": tz_name,
+            "start_date": start_date,
+            "end_date": end_date,
+        },
+        "kpis": {
+            "total_calls": (total_calls_and_duration.total_calls if total_calls_and_duration else 0),
+            "classified_calls": (non_convertible_with_cnq.total_calls if non_convertible_with_cnq else 0),
+            "total_duration_hours": (round(total_calls_and_duration.total_duration / 3600.0, 2) if total_calls_and_duration else 0.0),
+            "avg_minutes_per_call": (total_calls_and_duration.avg_minutes_per_call if total_calls_and_duration else 0.0),
+            "success_rate_percent": _success_rate(stats),
+            "non_convertible_calls_with_carrier_not_qualified": (
+                {
+                    "count": non_convertible_with_cnq.non_convertible_calls_count,
+                    "total_calls": non_convertible_with_cnq.total_calls,
+                    "percentage": non_convertible_with_cnq.non_convertible_calls_percentage,
+                }
+                if non_convertible_with_cnq
+                else None
+            ),
+            "non_convertible_calls_without_carrier_not_qualified": (
+                {
+                    "count": non_convertible_without_cnq.non_convertible_calls_count,
+                    "total_calls": non_convertible_without_cnq.total_calls,
+                    "percentage": non_convertible_without_cnq.non_convertible_calls_percentage,
+                }
+                if non_convertible_without_cnq
+                else None
+            ),
+            "carrier_not_qualified": (
+                {
+                    "count": carrier_not_qualified.carrier_not_qualified_count,
+                    "total_calls": carrier_not_qualified.total_calls,
+                    "percentage": carrier_not_qualified.carrier_not_qualified_percentage,
+                }
+                if carrier_not_qualified
+                else None
+            ),
+            "carrier_transfer_over_total_transfer_attempts": (
+                {
+                    "carrier_asked_count": carrier_transfer_over_transfer_attempts.carrier_asked_count,
+                    "total_transfer_attempts": carrier_transfer_over_transfer_attempts.total_transfer_attempts,
+                    "carrier_asked_percentage": carrier_transfer_over_transfer_attempts.carrier_asked_percentage,
+                }
+                if carrier_transfer_over_transfer_attempts
+                else None
+            ),
+            "carrier_transfer_over_total_call_attempts": (
+                {
+                    "carrier_asked_count": carrier_transfer_over_call_attempts.carrier_asked_count,
+                    "total_call_attempts": carrier_transfer_over_call_attempts.total_call_attempts,
+                    "carrier_asked_percentage": carrier_transfer_over_call_attempts.carrier_asked_percentage,
+                }
+                if carrier_transfer_over_call_attempts
+                else None
+            ),
+            "successfully_transferred_for_booking": (
+                {
+                    "successfully_transferred_for_booking_count": successfully_transferred.successfully_transferred_for_booking_count,
+                    "total_calls": successfully_transferred.total_calls,
+                    "successfully_transferred_for_booking_percentage": successfully_transferred.successfully_transferred_for_booking_percentage,
+                }
+                if successfully_transferred
+                else None
+            ),
+        },
+        "breakdowns": {
+            "call_stage": [{"call_stage": r.call_stage, "count": r.count, "percentage": r.percentage} for r in (stats.call_stage or [])],
+            "call_classification": [{"call_classification": r.call_classification, "count": r.count, "percentage": r.percentage} for r in (stats.call_classification or [])],
+            "load_status": [{"load_status": r.load_status, "count": r.count, "total_calls": r.total_calls, "load_status_percentage": r.load_status_percentage} for r in (stats.load_status or [])],
+            "pricing_notes": [{"pricing_notes": r.pricing_notes, "count": r.count, "percentage": r.percentage} for r in (stats.pricing or [])],
+            "carrier_end_state": [{"carrier_end_state": r.carrier_end_state, "count": r.count, "percentage": r.percentage} for r in (stats.carrier_end_state or [])],
+        },
+        "degraded_metrics": list(stats.degraded_metrics),
+    }
+
+
+def build_daily_report(
+    start_date: str,
+    end_date: str,
+    tz_name: str,
+    ctx: Optional[QueryContext] = None,
+    deadline: Optional[float] = None,
+    query_slot: Callable[[], ContextManager] = nullcontext,
+) -> Dict[str, Any]:
+    """
+    Compute the daily report for [start_date, end_date) for `ctx` (default: the current
+    ORG_ID / BROKER_NODE_PERSISTENT_ID configuration). See fetch_report_stats_per_metric for
+    `deadline` and `query_slot`.
+    """
+    stats = fetch_report_stats(start_date, end_date, ctx, deadline, query_slot)
+    return report_from_stats(stats, tz_name, start_date, end_date)
+
+
+def build_daily_reports_for_range(
+    start_day: str,
+    end_day: str,
+    tz_name: str,
+    ctx: Optional[QueryContext] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Compute the daily report for every day in [start_day, end_day] (YYYY-MM-DD, inclusive)
+    in tz_name. Returns {YYYY-MM-DD: report}, each identical to build_daily_report for that day.
+
+    The single-pass engine computes all days with one ClickHouse query grouped by day; the
+    per-metric engine falls back to building each day separately.
+
+    Raises:
+        RuntimeError: if the grouped query fails (the error is already logged by db.py)
+    """
+    tz = ZoneInfo(tz_name)
+    first = datetime.fromisoformat(start_day).date()
+    last = datetime.fromisoformat(end_day).date()
+
+    def day_range(day) -> tuple[str, str]:
+        start_dt = datetime.combine(day, datetime.min.time(), tzinfo=tz)
+        end_dt = datetime.combine(day + timedelta(days=1), datetime.min.time(), tzinfo=tz)
+        return start_dt.isoformat(), end_dt.isoformat()
+
+    if get_report_engine() == ENGINE_PER_METRIC:
+        reports = {}
+        day = first
+        while day <= last:
+            reports[day.isoformat()] = build_daily_report(*day_range(day), tz_name, ctx)
+            day += timedelta(days=1)
+        return reports
+
+    stats_by_day = fetch_daily_report_stats_by_day(start_day, end_day, tz_name, ctx)
+    if stats_by_day is None:
+        raise RuntimeError(f"Daily report query failed for {start_day} to {end_day}")
+    reports = {}
+    for day_str, stats in stats_by_day.items():
+        start_date, end_date = day_range(datetime.fromisoformat(day_str).date())
+        reports[day_str] = report_from_stats(stats, tz_name, start_date, end_date)
+    return reports
+
+
+def build_daily_reports_for_orgs(
+    start_date: str,
+    end_date: str,
+    tz_name: str,
+    contexts: Sequence[QueryContext],
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Compute the daily report for [start_date, end_date) for several orgs. Returns
+    {org_id: report}, each identical to build_daily_report with that org's context.
+
+    The single-pass engine computes all orgs with one ClickHouse query grouped by org; the
+    per-metric engine falls back to building each org separately.
+
+    Raises:
+        RuntimeError: if the grouped query fails (the error is already logged by db.py)
+    """
+    if get_report_engine() == ENGINE_PER_METRIC:
+        return {ctx.org_id: build_daily_report(start_date, end_date, tz_name, ctx) for ctx in contexts}
+
+    stats_by_org = fetch_daily_report_stats_for_orgs(start_date, end_date, contexts)
+    if stats_by_org is None:
+        raise RuntimeError(f"All-orgs daily report query failed for {start_date} to {end_date}")
+    return {
+        org_id: report_from_stats(stats, tz_name, start_date, end_date)
+        for org_id, stats in stats_by_org.items()
+    }
+
+
+async def build_daily_report_async(
+    start_date: str,
+    end_date: str,
+    tz_name: str,
+    ctx: Optional[QueryContext] = None,
+) -> Dict[str, Any]:
+    """
+    Async variant of build_daily_report for API endpoints: queries run on the fetch
+    executor, and the per-metric engine fans its queries out concurrently.
+    """
+    stats = await fetch_report_stats_async(start_date, end_date, ctx)
+    return report_from_stats(stats, tz_name, start_date, end_date)
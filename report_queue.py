@@ -0,0 +1,85 @@
+"""
+Durable queue of report generation tasks (table `report_tasks` in the storage database).
+
+With REPORT_QUEUE_ENABLED=true, the API and the scheduler leader only enqueue report work
+(daily job, catch-up, manual generation, backfill jobs) and separate `python -m worker`
+processes run it, so API processes never spend CPU, threads or ClickHouse connections on
+report generation. With it disabled (default) the same work runs in-process as before.
+
+Tasks are claimed with `SELECT ... FOR UPDATE SKIP LOCKED` on PostgreSQL (a single UPDATE under
+the write lock on SQLite) and held with a renewable lease, so a task whose worker dies is
+picked up again once its lease expires. Failed tasks are retried with exponential backoff.
+
+Configuration via environment variables:
+- REPORT_QUEUE_ENABLED: 'false' (default) / 'true' to hand report work to workers
+- REPORT_TASK_MAX_ATTEMPTS: Attempts per task before it is marked failed (default: 3)
+"""
+
+import os
+import logging
+from typing import Any, Dict, Optional
+
+from storage import ReportTask, enqueue_report_task
+
+logger = logging.getLogger(__name__)
+
+TASK_DAILY = "daily"
+TASK_CATCHUP = "catchup"
+TASK_MANUAL = "manual"
+TASK_BACKFILL = "backfill"
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_SUCCEEDED = "succeeded"
+STATUS_FAILED = "failed"
+
+
+def is_report_queue_enabled() -> bool:
+    """Check if report work is enqueued for workers instead of run in-process."""
+    return os.getenv("REPORT_QUEUE_ENABLED", "false").lower() in ("true", "1", "yes")
+
+
+def get_task_max_attempts() -> int:
+    """Get number of attempts per task before it is marked failed."""
+    return max(1, int(os.getenv("REPORT_TASK_MAX_ATTEMPTS", "3")))
+
+
+def enqueue_task(
+    task_type: str,
+    org_id: Optional[str] = None,
+    target_date: Optional[str] = None,
+    payload: Optional[Dict[str, Any]] = None,
+    dedupe_key: Optional[str] = None,
+) -> ReportTask:
+    """
+    Queue a report task for the workers. Tasks with a dedupe_key are only queued once; enqueuing
+    the same key again returns the existing task.
+    """
+    return enqueue_report_task(ReportTask(
+        id=None,
+        task_type=task_type,
+        org_id=org_id,
+        target_date=target_date,
+        payload=payload or {},
+        max_attempts=get_task_max_attempts(),
+        dedupe_key=dedupe_key,
+    ))
+
+
+def task_to_dict(task: ReportTask) -> Dict[str, Any]:
+    """JSON-friendly view of a task for the API."""
+    return {
+        "task_id": task.id,
+        "task_type": task.task_type,
+        "org_id": task.org_id,
+        "target_date": task.target_date,
+        "payload": task.payload,
+        "status": task.status,
+        "attempts": task.attempts,
+        "max_attempts": task.max_attempts,
+        "locked_by": task.locked_by,
+        "result": task.result,
+        "error_message": task.error_message,
+        "created_at": task.created_at,
+        "updated_at": task.updated_at,
+    }
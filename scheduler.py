@@ -3,50 +3,100 @@ Scheduler for automated daily report generation.
 
 Features:
 - Daily job at configurable time (default 6 AM)
-- Catch-up logic: fills missing days on startup
-- Retry logic: retries failed jobs up to 3 times
+- Catch-up logic: fills missing days in the background shortly after startup
+- Retry logic: failed metric queries are retried per metric with jittered backoff (see
+  report_engine.py); reports whose metrics kept failing are saved with `degraded_metrics`
+  and regenerated the next time their date is generated
+- Call cube: each saved report gets its day's call cube (runs and duration per combination of
+  classification, stage, load status, pricing notes, end state and transfer fields) for /api/cube
 - Health tracking: logs all runs to database
 - Graceful error handling
+- Report queue: with REPORT_QUEUE_ENABLED=true the jobs only enqueue report tasks and
+  `python -m worker` processes generate the reports (see report_queue.py)
+- Leader election: with several API workers/replicas, only the instance holding the
+  `scheduler_leader` lease (a row in scheduler_locks) runs the daily and catch-up jobs, and
+  its heartbeat resumes backfill jobs whose process died (see backfill.py).
+  Every instance renews or tries to take the lease every third of its duration, so a new
+  leader takes over (and runs catch-up) at most one lease after the old one dies.
 
 Configuration via environment variables:
 - SCHEDULER_ENABLED: Set to 'true' to enable (default: true)
 - SCHEDULER_HOUR: Hour to run daily job (default: 6)
 - SCHEDULER_MINUTE: Minute to run daily job (default: 0)
 - SCHEDULER_CATCHUP_DAYS: Days to look back for missing reports (default: 7)
+- SCHEDULER_LEADER_ELECTION: 'true' (default) / 'false' to run the jobs on every instance
+- SCHEDULER_LEADER_LEASE_SECONDS: Leader lease duration (default: 90)
+- SCHEDULER_CATCHUP_DELAY_SECONDS: Delay between scheduler start and the catch-up job, so the
+  server is accepting traffic before catch-up queries start (default: 10)
+- SCHEDULER_REPORT_MODE: `all_orgs` (default) computes the daily job's reports of every org
+  sharing a timezone with one ClickHouse query grouped by org; `per_org` runs one query per org.
+  Orgs whose grouped query fails are retried per org.
+- SCHEDULER_CONCURRENCY: Reports generated at once across organizations (default: 4)
+- SCHEDULER_ORG_TIME_BUDGET_SECONDS: Wall-clock budget per organization per run; once spent,
+  that org's remaining dates and retries are skipped until the next run (default: 1800)
+- SCHEDULER_MAX_CLICKHOUSE_QUERIES: Report queries the scheduler and backfill jobs run at
+  once, leaving the rest of the ClickHouse pool to API traffic (default: 2)
 """
 
 import os
+import uuid
+import socket
 import logging
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import asdict
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
-from typing import Optional, List
+from typing import Any, Callable, ContextManager, Dict, Optional, List, Tuple
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.date import DateTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
 from storage import (
     ensure_db_initialized,
     get_all_organizations,
     get_organization,
     save_daily_report,
+    save_daily_reports,
     get_daily_report,
     get_missing_report_dates,
     log_scheduler_run,
     get_last_successful_run,
     get_recent_scheduler_runs,
+    try_acquire_lock,
+    release_lock,
+    get_lock,
     DailyReport,
     Organization,
 )
+from report_queue import TASK_CATCHUP, TASK_DAILY, TASK_MANUAL, enqueue_task, is_report_queue_enabled
 
 logger = logging.getLogger(__name__)
 
 # Global scheduler instance
 _scheduler: Optional[BackgroundScheduler] = None
 
-# Retry configuration
-MAX_RETRIES = 3
-RETRY_DELAY_SECONDS = 60
+# Leader election: this process's lease holder id and whether it held the lease last time it checked
+LEADER_LOCK_NAME = "scheduler_leader"
+_instance_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+_is_leader = False
+_leader_lock = threading.Lock()
+
+# Progress of the current (or last) catch-up run, reported by get_scheduler_health
+_catchup_progress: Dict[str, Any] = {"status": "not_scheduled"}
+_catchup_progress_lock = threading.Lock()
+
+REPORT_MODE_ALL_ORGS = "all_orgs"
+REPORT_MODE_PER_ORG = "per_org"
+
+# Caps concurrent report queries from background generation (see report_query_slot)
+_query_slots: Optional[threading.BoundedSemaphore] = None
+_query_slots_size = 0
+_query_slots_lock = threading.Lock()
 
 
 def get_scheduler() -> BackgroundScheduler:
@@ -74,37 +124,271 @@ def get_catchup_days() -> int:
     return int(os.getenv("SCHEDULER_CATCHUP_DAYS", "7"))
 
 
+def get_catchup_delay_seconds() -> float:
+    """Get the delay between scheduler start and the background catch-up job."""
+    return max(0.0, float(os.getenv("SCHEDULER_CATCHUP_DELAY_SECONDS", "10")))
+
+
+def is_leader_election_enabled() -> bool:
+    """Check if only the lease-holding instance should run the scheduled jobs."""
+    return os.getenv("SCHEDULER_LEADER_ELECTION", "true").lower() in ("true", "1", "yes")
+
+
+def get_leader_lease_seconds() -> float:
+    """Get the leader lease duration; the lease is renewed every third of it."""
+    return max(3.0, float(os.getenv("SCHEDULER_LEADER_LEASE_SECONDS", "90")))
+
+
+def renew_leadership() -> bool:
+    """
+    Take or renew the scheduler leader lease. Returns whether this instance is the leader
+    (always True with SCHEDULER_LEADER_ELECTION disabled). Database errors count as not leading.
+    """
+    global _is_leader
+    if not is_leader_election_enabled():
+        return True
+
+    with _leader_lock:
+        try:
+            leader = try_acquire_lock(LEADER_LOCK_NAME, _instance_id, get_leader_lease_seconds())
+        except Exception as e:
+            logger.exception("Could not renew scheduler leader lease: %s", e)
+            leader = False
+        if leader and not _is_leader:
+            logger.info("Instance %s is now the scheduler leader", _instance_id)
+        elif _is_leader and not leader:
+            logger.warning("Instance %s lost scheduler leadership", _instance_id)
+        _is_leader = leader
+        return leader
+
+
+def _leader_heartbeat() -> None:
+    """
+    Interval job: keep the lease, run catch-up when this instance takes over as leader, and
+    resume backfill jobs whose process died (their job lease expired).
+    """
+    was_leader = _is_leader
+    leader = renew_leadership()
+    if leader and not was_leader:
+        # The previous leader may have died before (or during) its daily job
+        _schedule_catchup(delay_seconds=0)
+    if leader and not is_report_queue_enabled():
+        # Import here to avoid circular imports (backfill imports this module)
+        from backfill import resume_backfill_jobs
+
+        try:
+            resume_backfill_jobs()
+        except Exception as e:
+            logger.exception("Could not resume backfill jobs: %s", e)
+
+
+def get_leader_status() -> Dict[str, Any]:
+    """Leader election state for the health endpoint."""
+    status: Dict[str, Any] = {
+        "enabled": is_leader_election_enabled(),
+        "instance_id": _instance_id,
+        "is_leader": _is_leader or not is_leader_election_enabled(),
+        "lease_seconds": get_leader_lease_seconds(),
+    }
+    if status["enabled"]:
+        try:
+            status["lease"] = get_lock(LEADER_LOCK_NAME)
+        except Exception as e:
+            status["lease"] = None
+            status["error"] = str(e)
+    return status
+
+
+def _update_catchup_progress(**changes) -> None:
+    with _catchup_progress_lock:
+        _catchup_progress.update(changes)
+
+
+def get_catchup_progress() -> Dict[str, Any]:
+    """Snapshot of the catch-up job's progress (status, counts, timestamps)."""
+    with _catchup_progress_lock:
+        return dict(_catchup_progress)
+
+
+def get_report_mode() -> str:
+    """Get how the daily job computes reports (all_orgs or per_org)."""
+    mode = os.getenv("SCHEDULER_REPORT_MODE", REPORT_MODE_ALL_ORGS).strip().lower()
+    if mode not in (REPORT_MODE_ALL_ORGS, REPORT_MODE_PER_ORG):
+        logger.warning("Unknown SCHEDULER_REPORT_MODE %r, using %s", mode, REPORT_MODE_ALL_ORGS)
+        return REPORT_MODE_ALL_ORGS
+    return mode
+
+
+def get_scheduler_concurrency() -> int:
+    """Get number of reports generated at once across organizations."""
+    return max(1, int(os.getenv("SCHEDULER_CONCURRENCY", "4")))
+
+
+def get_org_time_budget_seconds() -> float:
+    """Get the per-organization wall-clock budget for one scheduler run."""
+    return float(os.getenv("SCHEDULER_ORG_TIME_BUDGET_SECONDS", "1800"))
+
+
+def get_max_clickhouse_queries() -> int:
+    """Get number of report queries background generation may run at once."""
+    return max(1, int(os.getenv("SCHEDULER_MAX_CLICKHOUSE_QUERIES", "2")))
+
+
+@contextmanager
+def report_query_slot():
+    """
+    Hold one of SCHEDULER_MAX_CLICKHOUSE_QUERIES slots while a report is computed, so
+    background generation never occupies the whole ClickHouse pool.
+    """
+    global _query_slots, _query_slots_size
+    size = get_max_clickhouse_queries()
+    with _query_slots_lock:
+        if _query_slots is None or _query_slots_size != size:
+            _query_slots = threading.BoundedSemaphore(size)
+            _query_slots_size = size
+        slots = _query_slots
+    with slots:
+        yield
+
+
+def query_context_for_org(org: Organization):
+    """QueryContext the report fetchers use for this organization."""
+    from db import QueryContext
+
+    return QueryContext.for_org(org.org_id, org.node_persistent_id, org.timezone)
+
+
+def fetch_unique_load_ids(
+    orgs: List[Organization],
+    dates: List[str],
+    query_slot: Callable[[], ContextManager] = report_query_slot,
+) -> Optional[Dict[str, Dict[str, List[str]]]]:
+    """
+    The unique load ids of each org (all sharing one timezone) and day in min(dates)..max(dates),
+    from one ClickHouse query grouped by org and day: the mergeable state the weekly/monthly
+    rollups count unique loads from. None if the query failed.
+    """
+    # Import here to avoid circular imports
+    from db import fetch_unique_load_ids_by_day
+
+    with query_slot():
+        load_ids = fetch_unique_load_ids_by_day(
+            min(dates), max(dates), orgs[0].timezone, [query_context_for_org(org) for org in orgs]
+        )
+    if load_ids is None:
+        logger.warning("Could not fetch unique loads for %d orgs (%s to %s)", len(orgs), min(dates), max(dates))
+    return load_ids
+
+
+def new_daily_report(
+    org: Organization,
+    report_date: str,
+    report_data: Dict[str, Any],
+    generated_at: str,
+    load_ids: Optional[List[str]],
+) -> DailyReport:
+    """
+    Wrap computed report data for storage: add the metadata and the day's load ids (see
+    fetch_unique_load_ids). Without load ids (their query failed), number_of_unique_loads is
+    marked degraded so the day is regenerated.
+    """
+    report_data["metadata"] = {
+        "org_id": org.org_id,
+        "org_name": org.name,
+        "generated_at": generated_at,
+    }
+    distinct_members: Dict[str, List[str]] = {}
+    if load_ids is None:
+        report_data["degraded_metrics"] = sorted(set(report_data.get("degraded_metrics") or []) | {"number_of_unique_loads"})
+    else:
+        report_data["kpis"]["number_of_unique_loads"] = len(load_ids)
+        distinct_members["number_of_unique_loads"] = load_ids
+    return DailyReport(
+        id=None,
+        org_id=org.org_id,
+        report_date=report_date,
+        report_data=report_data,
+        distinct_members=distinct_members,
+    )
+
+
+def new_daily_reports(
+    orgs: List[Organization],
+    reports: Dict[str, Dict[str, Dict[str, Any]]],
+    query_slot: Callable[[], ContextManager] = report_query_slot,
+) -> List[DailyReport]:
+    """
+    Wrap the computed reports of orgs sharing a timezone ({org_id: {date: report_data}}) for
+    storage, with each day's load ids and call cube. The load ids and the cubes of every org and
+    day come from one ClickHouse query each. `query_slot` is held while they are fetched (API
+    callers pass nullcontext).
+    """
+    dates = sorted({date_str for by_day in reports.values() for date_str in by_day})
+    generated_at = datetime.now(ZoneInfo(orgs[0].timezone)).isoformat()
+    load_ids = fetch_unique_load_ids(orgs, dates, query_slot)
+    cubes = fetch_call_cubes(orgs, dates, query_slot)
+
+    out = []
+    for org in orgs:
+        for date_str, report_data in sorted(reports[org.org_id].items()):
+            report = new_daily_report(
+                org, date_str, report_data, generated_at,
+                None if load_ids is None else load_ids[org.org_id][date_str],
+            )
+            report.call_cube = cubes.get(org.org_id, {}).get(date_str)
+            out.append(report)
+    return out
+
+
+def fetch_call_cubes(
+    orgs: List[Organization],
+    dates: List[str],
+    query_slot: Callable[[], ContextManager] = report_query_slot,
+) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    """
+    The call cube of each org (all sharing one timezone) and day in min(dates)..max(dates),
+    from one ClickHouse query grouped by org and day, to store next to the daily reports.
+    Empty if the query failed: reports saved without a cube keep the one already stored, and
+    the report itself is not affected.
+    """
+    # Import here to avoid circular imports
+    from db import fetch_daily_call_cube
+
+    with query_slot():
+        cubes = fetch_daily_call_cube(min(dates), max(dates), orgs[0].timezone, [query_context_for_org(org) for org in orgs])
+    if cubes is None:
+        logger.warning("Could not fetch the call cube for %d orgs (%s to %s)", len(orgs), min(dates), max(dates))
+        return {}
+    return {
+        org_id: {day: [asdict(cell) for cell in cells] for day, cells in by_day.items()}
+        for org_id, by_day in cubes.items()
+    }
+
+
+def is_report_complete(report: Optional[DailyReport]) -> bool:
+    """Whether a stored report exists and none of its metrics are degraded."""
+    return report is not None and not report.report_data.get("degraded_metrics")
+
+
 def generate_daily_report_for_org(
     org: Organization,
     target_date: Optional[str] = None,
-    retry_count: int = 0
+    deadline: Optional[float] = None,
 ) -> Optional[DailyReport]:
     """
-    Generate and store a daily report for a specific organization.
+    Generate and store a daily report for a specific organization. An existing report is
+    kept unless it is degraded. Failed metric queries are retried per metric by the engine.
 
     Args:
         org: The organization to generate a report for
         target_date: Optional date string (YYYY-MM-DD). Defaults to yesterday.
-        retry_count: Current retry attempt (internal use)
+        deadline: Optional time.monotonic() value after which no metric retry is started
 
     Returns:
         The saved DailyReport, or None if generation failed
     """
     # Import here to avoid circular imports
-    from db import (
-        fetch_calls_ending_in_each_call_stage_stats,
-        fetch_call_classifcation_stats,
-        fetch_load_status_stats,
-        fetch_pricing_stats,
-        fetch_carrier_end_state_stats,
-        fetch_carrier_asked_transfer_over_total_transfer_attempts_stats,
-        fetch_carrier_asked_transfer_over_total_call_attempts_stats,
-        fetch_successfully_transferred_for_booking_stats,
-        fetch_non_convertible_calls_with_carrier_not_qualified,
-        fetch_non_convertible_calls_without_carrier_not_qualified,
-        fetch_carrier_not_qualified_stats,
-        fetch_total_calls_and_total_duration,
-    )
+    from report_engine import build_daily_report
 
     try:
         # Determine target date
@@ -120,11 +404,14 @@ def generate_daily_report_for_org(
 
         # Check if report already exists
         existing = get_daily_report(org.org_id, target_str)
-        if existing:
+        if is_report_complete(existing):
             logger.info("Report already exists for %s on %s, skipping", org.name, target_str)
             return existing
-
-        logger.info("Generating daily report for %s on %s (attempt %d)", org.name, target_str, retry_count + 1)
+        if existing:
+            logger.info("Regenerating degraded report for %s on %s (%s)", org.name, target_str,
+                        ", ".join(existing.report_data["degraded_metrics"]))
+        else:
+            logger.info("Generating daily report for %s on %s", org.name, target_str)
 
         # Calculate date range (full day in org's timezone)
         start_dt = datetime.combine(target, datetime.min.time(), tzinfo=tz)
@@ -132,163 +419,200 @@ def generate_daily_report_for_org(
         start_date = start_dt.isoformat()
         end_date = end_dt.isoformat()
 
-        # Temporarily set environment variables for the org
-        original_org_id = os.environ.get("ORG_ID")
-        original_node_id = os.environ.get("BROKER_NODE_PERSISTENT_ID")
-        original_tz = os.environ.get("DEFAULT_TIMEZONE")
-
-        try:
-            os.environ["ORG_ID"] = org.org_id
-            os.environ["BROKER_NODE_PERSISTENT_ID"] = org.node_persistent_id
-            os.environ["DEFAULT_TIMEZONE"] = org.timezone
-
-            # Fetch all the metrics
-            call_stage = fetch_calls_ending_in_each_call_stage_stats(start_date, end_date)
-            call_classification = fetch_call_classifcation_stats(start_date, end_date)
-            load_status = fetch_load_status_stats(start_date, end_date)
-            pricing = fetch_pricing_stats(start_date, end_date)
-            carrier_end_state = fetch_carrier_end_state_stats(start_date, end_date)
-
-            carrier_transfer_over_transfer_attempts = fetch_carrier_asked_transfer_over_total_transfer_attempts_stats(start_date, end_date)
-            carrier_transfer_over_call_attempts = fetch_carrier_asked_transfer_over_total_call_attempts_stats(start_date, end_date)
-            successfully_transferred = fetch_successfully_transferred_for_booking_stats(start_date, end_date)
-            non_convertible_with_cnq = fetch_non_convertible_calls_with_carrier_not_qualified(start_date, end_date)
-            non_convertible_without_cnq = fetch_non_convertible_calls_without_carrier_not_qualified(start_date, end_date)
-            carrier_not_qualified = fetch_carrier_not_qualified_stats(start_date, end_date)
-            total_calls_and_duration = fetch_total_calls_and_total_duration(start_date, end_date)
-
-            # Calculate success rate
-            success_rate = None
-            if call_classification:
-                total = sum(int(r.count) for r in call_classification if r is not None)
-                success = sum(int(r.count) for r in call_classification if (r is not None and r.call_classification == "success"))
-                success_rate = round((success / total) * 100.0, 2) if total else 0.0
-
-            # Build report data structure
-            report_data = {
-                "date_range": {
-                    "tz": org.timezone,
-                    "start_date": start_date,
-                    "end_date": end_date,
-                },
-                "kpis": {
-                    "total_calls": (total_calls_and_duration.total_calls if total_calls_and_duration else 0),
-                    "classified_calls": (non_convertible_with_cnq.total_calls if non_convertible_with_cnq else 0),
-                    "total_duration_hours": (round(total_calls_and_duration.total_duration / 3600.0, 2) if total_calls_and_duration else 0.0),
-                    "avg_minutes_per_call": (total_calls_and_duration.avg_minutes_per_call if total_calls_and_duration else 0.0),
-                    "success_rate_percent": success_rate,
-                    "non_convertible_calls_with_carrier_not_qualified": (
-                        {
-                            "count": non_convertible_with_cnq.non_convertible_calls_count,
-                            "total_calls": non_convertible_with_cnq.total_calls,
-                            "percentage": non_convertible_with_cnq.non_convertible_calls_percentage,
-                        }
-                        if non_convertible_with_cnq
-                        else None
-                    ),
-                    "non_convertible_calls_without_carrier_not_qualified": (
-                        {
-                            "count": non_convertible_without_cnq.non_convertible_calls_count,
-                            "total_calls": non_convertible_without_cnq.total_calls,
-                            "percentage": non_convertible_without_cnq.non_convertible_calls_percentage,
-                        }
-                        if non_convertible_without_cnq
-                        else None
-                    ),
-                    "carrier_not_qualified": (
-                        {
-                            "count": carrier_not_qualified.carrier_not_qualified_count,
-                            "total_calls": carrier_not_qualified.total_calls,
-                            "percentage": carrier_not_qualified.carrier_not_qualified_percentage,
-                        }
-                        if carrier_not_qualified
-                        else None
-                    ),
-                    "carrier_transfer_over_total_transfer_attempts": (
-                        {
-                            "carrier_asked_count": carrier_transfer_over_transfer_attempts.carrier_asked_count,
-                            "total_transfer_attempts": carrier_transfer_over_transfer_attempts.total_transfer_attempts,
-                            "carrier_asked_percentage": carrier_transfer_over_transfer_attempts.carrier_asked_percentage,
-                        }
-                        if carrier_transfer_over_transfer_attempts
-                        else None
-                    ),
-                    "carrier_transfer_over_total_call_attempts": (
-                        {
-                            "carrier_asked_count": carrier_transfer_over_call_attempts.carrier_asked_count,
-                            "total_call_attempts": carrier_transfer_over_call_attempts.total_call_attempts,
-                            "carrier_asked_percentage": carrier_transfer_over_call_attempts.carrier_asked_percentage,
-                        }
-                        if carrier_transfer_over_call_attempts
-                        else None
-                    ),
-                    "successfully_transferred_for_booking": (
-                        {
-                            "successfully_transferred_for_booking_count": successfully_transferred.successfully_transferred_for_booking_count,
-                            "total_calls": successfully_transferred.total_calls,
-                            "successfully_transferred_for_booking_percentage": successfully_transferred.successfully_transferred_for_booking_percentage,
-                        }
-                        if successfully_transferred
-                        else None
-                    ),
-                },
-                "breakdowns": {
-                    "call_stage": [{"call_stage": r.call_stage, "count": r.count, "percentage": r.percentage} for r in (call_stage or [])],
-                    "call_classification": [{"call_classification": r.call_classification, "count": r.count, "percentage": r.percentage} for r in (call_classification or [])],
-                    "load_status": [{"load_status": r.load_status, "count": r.count, "total_calls": r.total_calls, "load_status_percentage": r.load_status_percentage} for r in (load_status or [])],
-                    "pricing_notes": [{"pricing_notes": r.pricing_notes, "count": r.count, "percentage": r.percentage} for r in (pricing or [])],
-                    "carrier_end_state": [{"carrier_end_state": r.carrier_end_state, "count": r.count, "percentage": r.percentage} for r in (carrier_end_state or [])],
-                },
-                "metadata": {
-                    "org_id": org.org_id,
-                    "org_name": org.name,
-                    "generated_at": datetime.now(tz).isoformat(),
-                },
-            }
-
-        finally:
-            # Restore original environment variables
-            if original_org_id is not None:
-                os.environ["ORG_ID"] = original_org_id
-            elif "ORG_ID" in os.environ:
-                del os.environ["ORG_ID"]
-
-            if original_node_id is not None:
-                os.environ["BROKER_NODE_PERSISTENT_ID"] = original_node_id
-            elif "BROKER_NODE_PERSISTENT_ID" in os.environ:
-                del os.environ["BROKER_NODE_PERSISTENT_ID"]
-
-            if original_tz is not None:
-                os.environ["DEFAULT_TIMEZONE"] = original_tz
-            elif "DEFAULT_TIMEZONE" in os.environ:
-                del os.environ["DEFAULT_TIMEZONE"]
+        # Fetch all the metrics for the org and build report data structure
+        # The query slot is held per round of queries, not while backing off between retries
+        report_data = build_daily_report(
+            start_date, end_date, org.timezone, query_context_for_org(org),
+            deadline=deadline, query_slot=report_query_slot,
+        )
 
         # Save the report
-        report = DailyReport(
-            id=None,
-            org_id=org.org_id,
-            report_date=target_str,
-            report_data=report_data,
-        )
+        report = new_daily_reports([org], {org.org_id: {target_str: report_data}})[0]
         saved_report = save_daily_report(report)
         logger.info("Successfully saved daily report for %s on %s", org.name, target_str)
         return saved_report
 
     except Exception as e:
-        logger.exception("Failed to generate daily report for %s (attempt %d): %s", org.name, retry_count + 1, e)
+        logger.exception("Failed to generate daily report for %s: %s", org.name, e)
+        return None
 
-        # Retry logic
-        if retry_count < MAX_RETRIES - 1:
-            logger.info("Retrying in %d seconds...", RETRY_DELAY_SECONDS)
-            time.sleep(RETRY_DELAY_SECONDS)
-            return generate_daily_report_for_org(org, target_date, retry_count + 1)
 
-        return None
+def generate_daily_reports_batch(org: Organization, dates: List[str]) -> List[str]:
+    """
+    Generate and store daily reports for several days of one organization with a single
+    ClickHouse query (grouped by day) and one bulk save. The days' load ids and call cubes
+    come from one more query grouped by day each (see new_daily_reports).
+
+    Args:
+        org: The organization to generate reports for
+        dates: Dates (YYYY-MM-DD) to generate; the query covers min(dates)..max(dates)
+
+    Returns:
+        The dates that were saved
+
+    Raises:
+        RuntimeError: if the grouped report query fails
+    """
+    # Import here to avoid circular imports
+    from report_engine import build_daily_reports_for_range
+
+    if not dates:
+        return []
+    wanted = sorted(set(dates))
+    logger.info("Generating %d daily reports for %s (%s to %s)", len(wanted), org.name, wanted[0], wanted[-1])
+
+    with report_query_slot():
+        reports_by_day = build_daily_reports_for_range(wanted[0], wanted[-1], org.timezone, query_context_for_org(org))
+
+    reports = new_daily_reports([org], {org.org_id: {date_str: reports_by_day[date_str] for date_str in wanted}})
+    save_daily_reports(reports)
+    return wanted
+
+
+def generate_daily_reports_all_orgs(
+    organizations: List[Organization],
+    target_date: Optional[str] = None,
+) -> Tuple[List[str], List[Organization]]:
+    """
+    Generate and store one day's reports for many organizations, with one ClickHouse query
+    (grouped by org) per timezone: orgs sharing a timezone share the day's window. Their load
+    ids and call cubes take one more query each per timezone (see new_daily_reports).
+
+    Args:
+        organizations: The organizations to generate reports for
+        target_date: Optional date string (YYYY-MM-DD). Defaults to yesterday in each timezone.
+
+    Returns:
+        (org_ids whose report is stored, including existing ones; orgs whose query or save failed)
+    """
+    # Import here to avoid circular imports
+    from report_engine import build_daily_reports_for_orgs
+
+    orgs_by_tz: Dict[str, List[Organization]] = {}
+    for org in organizations:
+        orgs_by_tz.setdefault(org.timezone, []).append(org)
+
+    done: List[str] = []
+    failed: List[Organization] = []
+    for tz_name, tz_orgs in orgs_by_tz.items():
+        tz = ZoneInfo(tz_name)
+        if target_date:
+            target = datetime.fromisoformat(target_date).date()
+        else:
+            target = (datetime.now(tz) - timedelta(days=1)).date()
+        target_str = target.isoformat()
+
+        pending = []
+        for org in tz_orgs:
+            if is_report_complete(get_daily_report(org.org_id, target_str)):
+                done.append(org.org_id)
+            else:
+                pending.append(org)
+        if not pending:
+            continue
+
+        start_dt = datetime.combine(target, datetime.min.time(), tzinfo=tz)
+        end_dt = start_dt + timedelta(days=1)
+        logger.info("Generating daily reports for %d orgs in %s on %s", len(pending), tz_name, target_str)
+        try:
+            with report_query_slot():
+                reports_by_org = build_daily_reports_for_orgs(
+                    start_dt.isoformat(), end_dt.isoformat(), tz_name, [query_context_for_org(org) for org in pending]
+                )
+
+            reports = new_daily_reports(pending, {org.org_id: {target_str: reports_by_org[org.org_id]} for org in pending})
+            save_daily_reports(reports)
+            done.extend(org.org_id for org in pending)
+        except Exception as e:
+            logger.exception("All-orgs daily report failed for %d orgs in %s: %s", len(pending), tz_name, e)
+            failed.extend(pending)
+
+    return done, failed
+
+
+def generate_reports_for_orgs(
+    work: List[Tuple[Organization, List[Optional[str]]]],
+    on_result: Optional[Callable[[Organization, Optional[str], bool], None]] = None,
+) -> Dict[str, List[Tuple[Optional[str], bool]]]:
+    """
+    Generate reports for several organizations concurrently on SCHEDULER_CONCURRENCY workers.
+
+    Dates are interleaved across orgs (every org's first date, then every org's second, ...)
+    so one org with a long catch-up list doesn't hold up the others. Each org gets
+    SCHEDULER_ORG_TIME_BUDGET_SECONDS from when its first report starts; dates not started
+    within the budget are skipped, and failed metric queries aren't retried past it.
+
+    Args:
+        work: (organization, dates) pairs; a None date means yesterday in the org's timezone
+        on_result: Optional callback run with (org, date, success) as each report finishes
+
+    Returns:
+        {org_id: [(date, success), ...]} in completion order
+    """
+    budget = get_org_time_budget_seconds()
+    deadlines: Dict[str, float] = {}
+    deadlines_lock = threading.Lock()
+
+    def generate(org: Organization, target_date: Optional[str]) -> bool:
+        with deadlines_lock:
+            deadline = deadlines.setdefault(org.org_id, time.monotonic() + budget)
+        if time.monotonic() >= deadline:
+            logger.warning("Time budget for %s exhausted, skipping %s", org.name, target_date or "yesterday")
+            return False
+        return generate_daily_report_for_org(org, target_date, deadline=deadline) is not None
+
+    tasks = []
+    for i in range(max((len(dates) for _, dates in work), default=0)):
+        for org, dates in work:
+            if i < len(dates):
+                tasks.append((org, dates[i]))
+
+    results: Dict[str, List[Tuple[Optional[str], bool]]] = {org.org_id: [] for org, _ in work}
+    if not tasks:
+        return results
+
+    with ThreadPoolExecutor(max_workers=get_scheduler_concurrency(), thread_name_prefix="report") as pool:
+        futures = {pool.submit(generate, org, date): (org, date) for org, date in tasks}
+        for future in as_completed(futures):
+            org, date = futures[future]
+            try:
+                success = future.result()
+            except Exception as e:
+                logger.exception("Report generation for %s on %s failed: %s", org.name, date or "yesterday", e)
+                success = False
+            results[org.org_id].append((date, success))
+            if on_result:
+                on_result(org, date, success)
+    return results
 
 
 def run_daily_report_job():
     """
-    Job function that runs daily to generate reports for all active organizations.
+    Job function that runs daily to generate reports for all active organizations
+    (or, with the report queue enabled, to queue that work for the workers).
+    """
+    if not renew_leadership():
+        logger.info("Not the scheduler leader, skipping daily report job")
+        return
+
+    if is_report_queue_enabled():
+        run_date = datetime.now(ZoneInfo("America/Los_Angeles")).date().isoformat()
+        task = enqueue_task(TASK_DAILY, dedupe_key=f"daily:{run_date}")
+        logger.info("Queued daily report task %s", task.id)
+        return
+
+    try:
+        generate_all_daily_reports()
+    except Exception:
+        pass  # already logged and recorded as an error run
+
+
+def generate_all_daily_reports() -> dict:
+    """
+    Generate yesterday's report for every active organization and log the run.
+
+    Returns:
+        Dictionary with the number of reports generated and failed
     """
     logger.info("=" * 60)
     logger.info("Starting daily report generation job...")
@@ -301,17 +625,20 @@ def run_daily_report_job():
         if not organizations:
             logger.warning("No active organizations found, skipping daily report generation")
             log_scheduler_run("daily", "success", reports_generated=0)
-            return
+            return {"reports_generated": 0, "failed": 0}
 
+        remaining = organizations
         success_count = 0
-        fail_count = 0
+        if get_report_mode() == REPORT_MODE_ALL_ORGS:
+            done, remaining = generate_daily_reports_all_orgs(organizations)
+            success_count = len(done)
+            if remaining:
+                logger.warning("Retrying %d orgs one at a time", len(remaining))
 
-        for org in organizations:
-            result = generate_daily_report_for_org(org)
-            if result:
-                success_count += 1
-            else:
-                fail_count += 1
+        results = generate_reports_for_orgs([(org, [None]) for org in remaining])
+        outcomes = [success for org_results in results.values() for _, success in org_results]
+        success_count += sum(outcomes)
+        fail_count = len(outcomes) - sum(outcomes)
 
         status = "success" if fail_count == 0 else "partial"
         error_msg = f"{fail_count} failed" if fail_count > 0 else None
@@ -321,20 +648,62 @@ def run_daily_report_job():
         logger.info("=" * 60)
         logger.info("Daily report generation complete: %d successful, %d failed", success_count, fail_count)
         logger.info("=" * 60)
+        return {"reports_generated": success_count, "failed": fail_count}
 
     except Exception as e:
         logger.exception("Error in daily report job: %s", e)
         log_scheduler_run("daily", "error", error_message=str(e))
+        raise
 
 
 def run_catchup_job():
     """
-    Catch-up job that fills in any missing reports from the last N days.
-    Runs on startup to ensure no gaps in data.
+    Catch-up job that fills in any missing reports from the last N days (or, with the
+    report queue enabled, queues that work for the workers).
+    Scheduled shortly after startup to ensure no gaps in data.
+    """
+    if not renew_leadership():
+        logger.info("Not the scheduler leader, skipping catch-up job")
+        _update_catchup_progress(status="standby")
+        return
+
+    if is_report_queue_enabled():
+        task = enqueue_task(TASK_CATCHUP)
+        _update_catchup_progress(status="queued", task_id=task.id)
+        logger.info("Queued catch-up task %s", task.id)
+        return
+
+    try:
+        fill_missing_reports()
+    except Exception:
+        pass  # already logged and recorded in the progress
+
+
+def fill_missing_reports() -> dict:
+    """
+    Generate the missing reports of the last SCHEDULER_CATCHUP_DAYS days for every active
+    organization. Progress is available from get_catchup_progress() in this process.
+
+    Returns:
+        Dictionary with the number of reports generated
     """
     logger.info("=" * 60)
     logger.info("Starting catch-up job...")
     logger.info("=" * 60)
+    _update_catchup_progress(
+        status="running",
+        started_at=datetime.now(ZoneInfo("UTC")).isoformat(),
+        finished_at=None,
+        orgs_total=0,
+        dates_total=0,
+        dates_done=0,
+        dates_failed=0,
+        error=None,
+    )
+
+    def record(org: Organization, date: Optional[str], success: bool) -> None:
+        with _catchup_progress_lock:
+            _catchup_progress["dates_done" if success else "dates_failed"] += 1
 
     try:
         ensure_db_initialized()
@@ -343,10 +712,10 @@ def run_catchup_job():
 
         if not organizations:
             logger.warning("No active organizations found, skipping catch-up")
-            return
-
-        total_generated = 0
+            _update_catchup_progress(status="completed", finished_at=datetime.now(ZoneInfo("UTC")).isoformat())
+            return {"reports_generated": 0}
 
+        work = []
         for org in organizations:
             # Pass org's timezone to ensure we only look for completed days
             missing_dates = get_missing_report_dates(org.org_id, days_back=catchup_days, timezone=org.timezone)
@@ -356,12 +725,16 @@ def run_catchup_job():
                 continue
 
             logger.info("Found %d missing reports for %s: %s", len(missing_dates), org.name, missing_dates)
+            work.append((org, missing_dates))
+
+        _update_catchup_progress(
+            orgs_total=len(organizations),
+            dates_total=sum(len(dates) for _, dates in work),
+        )
 
-            for date_str in missing_dates:
-                result = generate_daily_report_for_org(org, target_date=date_str)
-                if result:
-                    total_generated += 1
-                    logger.info("Backfilled report for %s on %s", org.name, date_str)
+        total_generated = 0
+        for org_results in generate_reports_for_orgs(work, on_result=record).values():
+            total_generated += sum(1 for _, success in org_results if success)
 
         if total_generated > 0:
             log_scheduler_run("catchup", "success", reports_generated=total_generated)
@@ -369,10 +742,29 @@ def run_catchup_job():
         logger.info("=" * 60)
         logger.info("Catch-up job complete: %d reports generated", total_generated)
         logger.info("=" * 60)
+        _update_catchup_progress(status="completed", finished_at=datetime.now(ZoneInfo("UTC")).isoformat())
+        return {"reports_generated": total_generated}
 
     except Exception as e:
         logger.exception("Error in catch-up job: %s", e)
         log_scheduler_run("catchup", "error", error_message=str(e))
+        _update_catchup_progress(status="failed", error=str(e), finished_at=datetime.now(ZoneInfo("UTC")).isoformat())
+        raise
+
+
+def _schedule_catchup(delay_seconds: float) -> None:
+    """Run the catch-up job once on the scheduler's thread pool after delay_seconds."""
+    catchup_at = datetime.now(ZoneInfo("UTC")) + timedelta(seconds=delay_seconds)
+    get_scheduler().add_job(
+        run_catchup_job,
+        DateTrigger(run_date=catchup_at),
+        id="catchup_job",
+        name="Fill Missing Reports",
+        replace_existing=True,
+        misfire_grace_time=None,
+    )
+    _update_catchup_progress(status="scheduled", scheduled_for=catchup_at.isoformat())
+    logger.info("Catch-up job scheduled for %s", catchup_at.isoformat())
 
 
 def start_scheduler():
@@ -398,28 +790,49 @@ def start_scheduler():
         replace_existing=True,
     )
 
+    if is_leader_election_enabled():
+        scheduler.add_job(
+            _leader_heartbeat,
+            IntervalTrigger(seconds=get_leader_lease_seconds() / 3),
+            id="leader_heartbeat",
+            name="Renew Scheduler Leader Lease",
+            replace_existing=True,
+            coalesce=True,
+        )
+
+    # Catch-up runs on the scheduler's thread pool once the app is serving, not during startup.
+    # Followers skip it; whoever takes over leadership later runs it then.
+    if renew_leadership():
+        _schedule_catchup(get_catchup_delay_seconds())
+    else:
+        _update_catchup_progress(status="standby")
+        logger.info("Instance %s is a scheduler follower; the leader runs the report jobs", _instance_id)
+
     scheduler.start()
     logger.info("Scheduler started - daily reports will run at %02d:%02d", hour, minute)
 
-    # Run catch-up job immediately (in a non-blocking way)
-    logger.info("Running catch-up job to fill any missing reports...")
-    try:
-        run_catchup_job()
-    except Exception as e:
-        logger.exception("Catch-up job failed: %s", e)
-
 
 def stop_scheduler():
     """Stop the background scheduler."""
+    global _is_leader
     scheduler = get_scheduler()
     if scheduler.running:
         scheduler.shutdown(wait=False)
         logger.info("Scheduler stopped")
+    if _is_leader and is_leader_election_enabled():
+        # Hand over right away instead of making followers wait for the lease to expire
+        try:
+            release_lock(LEADER_LOCK_NAME, _instance_id)
+            _is_leader = False
+            logger.info("Released scheduler leader lease")
+        except Exception as e:
+            logger.warning("Could not release scheduler leader lease: %s", e)
 
 
 def trigger_daily_report_now(org_id: Optional[str] = None, target_date: Optional[str] = None) -> dict:
     """
-    Manually trigger daily report generation.
+    Manually trigger daily report generation. With the report queue enabled the work is
+    queued for the workers and the task id is returned instead of the results.
 
     Args:
         org_id: Optional specific org to generate for. If None, generates for all.
@@ -430,6 +843,28 @@ def trigger_daily_report_now(org_id: Optional[str] = None, target_date: Optional
     """
     ensure_db_initialized()
 
+    if is_report_queue_enabled():
+        if org_id and not get_organization(org_id):
+            return {"success": False, "error": f"Organization {org_id} not found"}
+        task = enqueue_task(TASK_MANUAL, org_id=org_id, target_date=target_date)
+        return {
+            "success": True,
+            "queued": True,
+            "task_id": task.id,
+            "org_id": org_id,
+            "date": target_date or "yesterday",
+        }
+
+    return generate_reports_now(org_id, target_date)
+
+
+def generate_reports_now(org_id: Optional[str] = None, target_date: Optional[str] = None) -> dict:
+    """
+    Generate (and log as a manual run) the daily report of one or all active organizations
+    in this process. See trigger_daily_report_now.
+    """
+    ensure_db_initialized()
+
     if org_id:
         org = get_organization(org_id)
         if not org:
@@ -447,6 +882,7 @@ def trigger_daily_report_now(org_id: Optional[str] = None, target_date: Optional
             "org_id": org_id,
             "date": target_date or "yesterday",
             "report_id": result.id if result else None,
+            "degraded_metrics": result.report_data.get("degraded_metrics", []) if result else None,
         }
     else:
         # Generate for all orgs
@@ -475,61 +911,16 @@ def trigger_daily_report_now(org_id: Optional[str] = None, target_date: Optional
         }
 
 
-def backfill_reports(org_id: str, start_date: str, end_date: str) -> dict:
-    """
-    Backfill historical reports for a date range.
-
-    Args:
-        org_id: Organization ID to backfill for
-        start_date: Start date (YYYY-MM-DD)
-        end_date: End date (YYYY-MM-DD)
-
-    Returns:
-        Dictionary with results summary
-    """
-    from datetime import datetime, timedelta
-
-    ensure_db_initialized()
-
-    org = get_organization(org_id)
-    if not org:
-        return {"success": False, "error": f"Organization {org_id} not found"}
-
-    start = datetime.fromisoformat(start_date).date()
-    end = datetime.fromisoformat(end_date).date()
-
-    if start > end:
-        return {"success": False, "error": "start_date must be before end_date"}
-
-    results = []
-    current = start
-    success_count = 0
+def get_queue_status() -> dict:
+    """Report queue mode and task counts for the health endpoint."""
+    from storage import count_report_tasks_by_status
 
-    while current <= end:
-        date_str = current.isoformat()
-        result = generate_daily_report_for_org(org, date_str)
-        success = result is not None
-        if success:
-            success_count += 1
-        results.append({
-            "date": date_str,
-            "success": success,
-        })
-        current += timedelta(days=1)
-
-    log_scheduler_run("backfill", "success" if success_count == len(results) else "partial",
-                     reports_generated=success_count)
-
-    return {
-        "success": True,
-        "org_id": org_id,
-        "start_date": start_date,
-        "end_date": end_date,
-        "total_days": len(results),
-        "successful": success_count,
-        "failed": len(results) - success_count,
-        "results": results,
-    }
+    status = {"enabled": is_report_queue_enabled()}
+    try:
+        status["tasks"] = count_report_tasks_by_status()
+    except Exception as e:
+        status["error"] = str(e)
+    return status
 
 
 def get_scheduler_health() -> dict:
@@ -569,4 +960,11 @@ def get_scheduler_health() -> dict:
         "last_successful_run": last_success,
         "recent_runs": recent_runs,
         "catchup_days": get_catchup_days(),
+        "catchup": get_catchup_progress(),
+        "leader": get_leader_status(),
+        "queue": get_queue_status(),
+        "report_mode": get_report_mode(),
+        "concurrency": get_scheduler_concurrency(),
+        "org_time_budget_seconds": get_org_time_budget_seconds(),
+        "max_clickhouse_queries": get_max_clickhouse_queries(),
     }
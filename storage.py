@@ -6,14 +6,28 @@ Supports:
 - SQLite (local development fallback)
 
 The database backend is auto-detected from DATABASE_URL environment variable.
+
+Connections are reused: PostgreSQL connections come from a per-process pool (created lazily,
+health-checked with `SELECT 1` when they sat idle), and each thread keeps one persistent
+SQLite connection in WAL mode, so readers don't block on the scheduler's writes.
+
+Configuration via environment variables:
+- DB_POOL_SIZE: PostgreSQL connections kept per process (default: 5)
+- DB_POOL_TIMEOUT_SECONDS: Wait for a free pooled connection before failing (default: 30)
+- DB_POOL_PING_SECONDS: Idle time after which a pooled connection is checked before reuse (default: 30)
+- SQLITE_BUSY_TIMEOUT_SECONDS: Wait for SQLite's write lock before failing (default: 5)
 """
 
 import os
 import json
+import time
+import uuid
+import queue
 import logging
-from datetime import datetime, date, timedelta
-from typing import Optional, List, Dict, Any
-from dataclasses import dataclass
+import threading
+from datetime import datetime, date, timedelta, timezone as dt_timezone
+from typing import Optional, List, Dict, Any, Callable, Sequence, Tuple
+from dataclasses import dataclass, field
 from contextlib import contextmanager
 from urllib.parse import urlparse
 
@@ -27,6 +41,7 @@ IS_POSTGRES = DATABASE_URL.startswith("postgres")
 
 if IS_POSTGRES:
     import psycopg2
+    from psycopg2.extensions import TRANSACTION_STATUS_IDLE
     from psycopg2.extras import RealDictCursor
 else:
     import sqlite3
@@ -52,6 +67,86 @@ class DailyReport:
     report_date: str  # YYYY-MM-DD format
     report_data: Dict[str, Any]
     created_at: Optional[str] = None
+    # Members behind the report's distinct-count KPIs (metric -> ids), e.g. the day's load ids
+    # for number_of_unique_loads; stored in daily_report_members, not in report_data
+    distinct_members: Dict[str, List[str]] = field(default_factory=dict)
+    # Call cube cells of the day (see daily_call_cube); None keeps the stored cube as it is
+    call_cube: Optional[List[Dict[str, Any]]] = None
+
+
+@dataclass
+class ReportRollup:
+    """A weekly or monthly rollup of an organization's daily reports."""
+    org_id: str
+    period_type: str  # week | month
+    period_start: str  # YYYY-MM-DD, Monday of the week or first day of the month
+    period_end: str
+    days_covered: int
+    report_data: Dict[str, Any]
+    updated_at: Optional[str] = None
+
+
+@dataclass
+class DailyReportSummary:
+    """A stored daily report's KPI columns, read without loading its report_data JSON."""
+    id: Optional[int]
+    org_id: str
+    report_date: str  # YYYY-MM-DD format
+    created_at: Optional[str] = None
+    total_calls: int = 0
+    classified_calls: int = 0
+    total_duration_hours: float = 0.0
+    avg_minutes_per_call: float = 0.0
+    success_rate_percent: Optional[float] = None
+    non_convertible_percent: Optional[float] = None
+    carrier_not_qualified_percent: Optional[float] = None
+    successfully_transferred_percent: Optional[float] = None
+    is_degraded: bool = False
+
+
+@dataclass
+class BackfillJob:
+    """Represents a background backfill job (see backfill.py)."""
+    id: Optional[int]
+    org_id: str
+    start_date: str  # YYYY-MM-DD format
+    end_date: str    # YYYY-MM-DD format, inclusive
+    status: str = "queued"  # queued, running, succeeded, partial, failed, cancelled
+    days_total: int = 0
+    days_done: int = 0
+    days_failed: int = 0
+    failed_dates: List[str] = field(default_factory=list)
+    cancel_requested: bool = False
+    error_message: Optional[str] = None
+    locked_by: Optional[str] = None  # process running the job, see claim_backfill_job
+    lease_expires_at: Optional[float] = None  # Unix timestamp
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+
+    @property
+    def days_remaining(self) -> int:
+        return max(0, self.days_total - self.days_done - self.days_failed)
+
+
+@dataclass
+class ReportTask:
+    """Represents a queued unit of report generation work (see report_queue.py / worker.py)."""
+    id: Optional[int]
+    task_type: str  # daily, catchup, manual, backfill
+    org_id: Optional[str] = None
+    target_date: Optional[str] = None  # YYYY-MM-DD format
+    payload: Dict[str, Any] = field(default_factory=dict)
+    status: str = "queued"  # queued, running, succeeded, failed
+    attempts: int = 0
+    max_attempts: int = 3
+    dedupe_key: Optional[str] = None
+    locked_by: Optional[str] = None
+    lease_expires_at: Optional[float] = None  # Unix timestamp
+    run_after: float = 0.0  # Unix timestamp
+    result: Optional[Dict[str, Any]] = None
+    error_message: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
 
 
 def _parse_database_url(url: str) -> dict:
@@ -74,31 +169,213 @@ def _parse_database_url(url: str) -> dict:
     }
 
 
+def get_db_pool_size() -> int:
+    """Max number of PostgreSQL connections per process."""
+    return max(1, int(os.getenv("DB_POOL_SIZE", "5")))
+
+
+def get_db_pool_timeout() -> float:
+    """Seconds to wait for a free pooled connection."""
+    return max(0.1, float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30")))
+
+
+def get_db_pool_ping_interval() -> float:
+    """Seconds a pooled connection may sit idle before it is checked on checkout."""
+    return float(os.getenv("DB_POOL_PING_SECONDS", "30"))
+
+
+def get_sqlite_busy_timeout() -> float:
+    """Seconds SQLite waits for another connection's write lock."""
+    return max(0.0, float(os.getenv("SQLITE_BUSY_TIMEOUT_SECONDS", "5")))
+
+
+class PostgresConnectionPool:
+    """
+    Fixed-size pool of psycopg2 connections, created lazily up to `size`.
+
+    A connection that sat idle longer than DB_POOL_PING_SECONDS is checked with `SELECT 1`
+    on checkout and replaced if the server dropped it. Connections are rolled back when
+    returned, so an uncommitted transaction never leaks into the next checkout.
+    """
+
+    def __init__(self, config: Dict[str, Any], size: int):
+        self.config = config
+        self.size = size
+        self._idle: "queue.LifoQueue[Tuple[Any, float]]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self):
+        return psycopg2.connect(
+            host=self.config["host"],
+            port=self.config["port"],
+            database=self.config["database"],
+            user=self.config["user"],
+            password=self.config["password"],
+            cursor_factory=RealDictCursor,
+        )
+
+    def _new_connection(self):
+        with self._lock:
+            if self._created >= self.size:
+                return None
+            self._created += 1
+        try:
+            return self._connect()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def _forget(self, conn) -> None:
+        with self._lock:
+            self._created -= 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, conn, last_used: float) -> bool:
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used <= get_db_pool_ping_interval():
+            return True
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Check out a connection, creating one if the pool isn't full, else waiting for a free one."""
+        timeout = timeout if timeout is not None else get_db_pool_timeout()
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                conn, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._new_connection()
+                if conn is not None:
+                    return conn
+                try:
+                    conn, last_used = self._idle.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    raise TimeoutError(f"No database connection available within {timeout}s (pool size {self.size})")
+
+            if self._is_healthy(conn, last_used):
+                return conn
+            logger.warning("Pooled database connection failed health check, replacing it")
+            self._forget(conn)
+
+    def release(self, conn) -> None:
+        """Return a connection to the pool (closing it instead if it is broken or the pool was shut down)."""
+        if self._closed or conn.closed:
+            self._forget(conn)
+            return
+        try:
+            if conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+        except Exception:
+            self._forget(conn)
+            return
+        self._idle.put((conn, time.monotonic()))
+
+    def close(self) -> None:
+        """Close idle connections; connections still checked out are closed when released."""
+        self._closed = True
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._forget(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"size": self.size, "created": self._created, "idle": self._idle.qsize()}
+
+
+_pg_pool: Optional[PostgresConnectionPool] = None
+_pg_pool_lock = threading.Lock()
+
+# One persistent SQLite connection per thread (sqlite3 connections are not shared across threads)
+_sqlite_local = threading.local()
+
+
+def get_db_pool() -> PostgresConnectionPool:
+    """Get or create the process-wide PostgreSQL connection pool."""
+    global _pg_pool
+    if _pg_pool is None:
+        with _pg_pool_lock:
+            if _pg_pool is None:
+                size = get_db_pool_size()
+                logger.info("Creating database connection pool (size %d)", size)
+                _pg_pool = PostgresConnectionPool(_parse_database_url(DATABASE_URL), size)
+    return _pg_pool
+
+
+def close_db_pool() -> None:
+    """Close the process-wide PostgreSQL pool (e.g. on shutdown)."""
+    global _pg_pool
+    with _pg_pool_lock:
+        if _pg_pool is not None:
+            _pg_pool.close()
+        _pg_pool = None
+
+
+def get_db_pool_stats() -> Dict[str, Any]:
+    """Connection reuse stats for health checks."""
+    if IS_POSTGRES:
+        return _pg_pool.stats() if _pg_pool is not None else {"size": get_db_pool_size(), "created": 0, "idle": 0}
+    return {"sqlite_journal_mode": "wal", "persistent_per_thread": True}
+
+
+def _connect_sqlite(path: str):
+    conn = sqlite3.connect(path, timeout=get_sqlite_busy_timeout())
+    conn.row_factory = sqlite3.Row
+    # WAL lets readers run alongside a writer; NORMAL sync is durable across app crashes in WAL mode
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-16000")  # 16 MB page cache
+    return conn
+
+
+@contextmanager
+def _sqlite_connection(path: str):
+    """The calling thread's persistent connection; nested uses share it."""
+    conn = getattr(_sqlite_local, "conn", None)
+    if conn is None:
+        conn = _sqlite_local.conn = _connect_sqlite(path)
+        _sqlite_local.depth = 0
+    _sqlite_local.depth += 1
+    try:
+        yield conn
+    finally:
+        _sqlite_local.depth -= 1
+        if _sqlite_local.depth == 0 and conn.in_transaction:
+            # Drop uncommitted writes, as closing a per-call connection used to
+            conn.rollback()
+
+
 @contextmanager
 def get_db_connection():
-    """Context manager for database connections."""
+    """Context manager for database connections (pooled on PostgreSQL, persistent per thread on SQLite)."""
     db_config = _parse_database_url(DATABASE_URL)
 
     if db_config["type"] == "sqlite":
-        conn = sqlite3.connect(db_config["path"])
-        conn.row_factory = sqlite3.Row
-        try:
+        with _sqlite_connection(db_config["path"]) as conn:
             yield conn
-        finally:
-            conn.close()
     else:
-        conn = psycopg2.connect(
-            host=db_config["host"],
-            port=db_config["port"],
-            database=db_config["database"],
-            user=db_config["user"],
-            password=db_config["password"],
-            cursor_factory=RealDictCursor,
-        )
+        pool = get_db_pool()
+        conn = pool.acquire()
         try:
             yield conn
         finally:
-            conn.close()
+            pool.release(conn)
 
 
 def _execute(conn, query: str, params: tuple = (), fetch: str = None):
@@ -151,6 +428,15 @@ def init_database():
                     report_date DATE NOT NULL,
                     report_data JSONB NOT NULL,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    total_calls INTEGER,
+                    classified_calls INTEGER,
+                    total_duration_hours DOUBLE PRECISION,
+                    avg_minutes_per_call DOUBLE PRECISION,
+                    success_rate_percent DOUBLE PRECISION,
+                    non_convertible_percent DOUBLE PRECISION,
+                    carrier_not_qualified_percent DOUBLE PRECISION,
+                    successfully_transferred_percent DOUBLE PRECISION,
+                    is_degraded BOOLEAN DEFAULT FALSE,
                     UNIQUE(org_id, report_date)
                 )
             """)
@@ -172,6 +458,133 @@ def init_database():
                     error_message TEXT
                 )
             """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS backfill_jobs (
+                    id SERIAL PRIMARY KEY,
+                    org_id TEXT NOT NULL,
+                    start_date DATE NOT NULL,
+                    end_date DATE NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    days_total INTEGER DEFAULT 0,
+                    days_done INTEGER DEFAULT 0,
+                    days_failed INTEGER DEFAULT 0,
+                    failed_dates TEXT DEFAULT '[]',
+                    cancel_requested BOOLEAN DEFAULT FALSE,
+                    error_message TEXT,
+                    locked_by TEXT,
+                    lease_expires_at DOUBLE PRECISION,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # Leases (scheduler leader election); expires_at is a Unix timestamp
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS scheduler_locks (
+                    name TEXT PRIMARY KEY,
+                    holder TEXT NOT NULL,
+                    expires_at DOUBLE PRECISION NOT NULL
+                )
+            """)
+
+            # One-time data migrations already applied (see _run_once_migration)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    name TEXT PRIMARY KEY,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # Report generation queue (report_queue.py, worker.py)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS report_tasks (
+                    id SERIAL PRIMARY KEY,
+                    task_type TEXT NOT NULL,
+                    org_id TEXT,
+                    target_date DATE,
+                    payload TEXT DEFAULT '{}',
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    attempts INTEGER DEFAULT 0,
+                    max_attempts INTEGER DEFAULT 3,
+                    dedupe_key TEXT UNIQUE,
+                    locked_by TEXT,
+                    lease_expires_at DOUBLE PRECISION,
+                    run_after DOUBLE PRECISION DEFAULT 0,
+                    result TEXT,
+                    error_message TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_report_tasks_status
+                ON report_tasks(status, run_after)
+            """)
+
+            # Long-format facts of each daily report (see report_metric_facts)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS daily_report_metrics (
+                    org_id TEXT NOT NULL,
+                    report_date DATE NOT NULL,
+                    metric TEXT NOT NULL,
+                    dimension TEXT NOT NULL DEFAULT '',
+                    value DOUBLE PRECISION,
+                    count BIGINT,
+                    total BIGINT,
+                    PRIMARY KEY (org_id, report_date, metric, dimension)
+                )
+            """)
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_daily_report_metrics_org_metric_date
+                ON daily_report_metrics(org_id, metric, report_date)
+            """)
+
+            # Members behind distinct-count KPIs, merged by set union in the rollups
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS daily_report_members (
+                    org_id TEXT NOT NULL,
+                    report_date DATE NOT NULL,
+                    metric TEXT NOT NULL,
+                    member TEXT NOT NULL,
+                    PRIMARY KEY (org_id, metric, report_date, member)
+                )
+            """)
+
+            # Weekly/monthly rollups, recomputed from the daily partial state on each save
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS report_rollups (
+                    org_id TEXT NOT NULL,
+                    period_type TEXT NOT NULL,
+                    period_start DATE NOT NULL,
+                    period_end DATE NOT NULL,
+                    days_covered INTEGER NOT NULL DEFAULT 0,
+                    report_data JSONB NOT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (org_id, period_type, period_start)
+                )
+            """)
+
+            # Per-day call cube: runs and duration per combination of CALL_CUBE_DIMENSIONS values
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS daily_call_cube (
+                    org_id TEXT NOT NULL,
+                    report_date DATE NOT NULL,
+                    call_classification TEXT NOT NULL DEFAULT '',
+                    call_stage TEXT NOT NULL DEFAULT '',
+                    load_status TEXT NOT NULL DEFAULT '',
+                    pricing_notes TEXT NOT NULL DEFAULT '',
+                    carrier_end_state TEXT NOT NULL DEFAULT '',
+                    transfer_reason TEXT NOT NULL DEFAULT '',
+                    transfer_attempt TEXT NOT NULL DEFAULT '',
+                    calls INTEGER NOT NULL,
+                    duration_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+                    PRIMARY KEY (org_id, report_date, call_classification, call_stage, load_status,
+                                 pricing_notes, carrier_end_state, transfer_reason, transfer_attempt)
+                )
+            """)
         else:
             # SQLite schema
             cursor.execute("""
@@ -193,6 +606,15 @@ def init_database():
                     report_date DATE NOT NULL,
                     report_data TEXT NOT NULL,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    total_calls INTEGER,
+                    classified_calls INTEGER,
+                    total_duration_hours REAL,
+                    avg_minutes_per_call REAL,
+                    success_rate_percent REAL,
+                    non_convertible_percent REAL,
+                    carrier_not_qualified_percent REAL,
+                    successfully_transferred_percent REAL,
+                    is_degraded BOOLEAN DEFAULT 0,
                     UNIQUE(org_id, report_date)
                 )
             """)
@@ -214,10 +636,258 @@ def init_database():
                 )
             """)
 
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS backfill_jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    org_id TEXT NOT NULL,
+                    start_date DATE NOT NULL,
+                    end_date DATE NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    days_total INTEGER DEFAULT 0,
+                    days_done INTEGER DEFAULT 0,
+                    days_failed INTEGER DEFAULT 0,
+                    failed_dates TEXT DEFAULT '[]',
+                    cancel_requested BOOLEAN DEFAULT 0,
+                    error_message TEXT,
+                    locked_by TEXT,
+                    lease_expires_at REAL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS scheduler_locks (
+                    name TEXT PRIMARY KEY,
+                    holder TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    name TEXT PRIMARY KEY,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS report_tasks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    task_type TEXT NOT NULL,
+                    org_id TEXT,
+                    target_date DATE,
+                    payload TEXT DEFAULT '{}',
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    attempts INTEGER DEFAULT 0,
+                    max_attempts INTEGER DEFAULT 3,
+                    dedupe_key TEXT UNIQUE,
+                    locked_by TEXT,
+                    lease_expires_at REAL,
+                    run_after REAL DEFAULT 0,
+                    result TEXT,
+                    error_message TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_report_tasks_status
+                ON report_tasks(status, run_after)
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS daily_report_metrics (
+                    org_id TEXT NOT NULL,
+                    report_date DATE NOT NULL,
+                    metric TEXT NOT NULL,
+                    dimension TEXT NOT NULL DEFAULT '',
+                    value REAL,
+                    count INTEGER,
+                    total INTEGER,
+                    PRIMARY KEY (org_id, report_date, metric, dimension)
+                )
+            """)
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_daily_report_metrics_org_metric_date
+                ON daily_report_metrics(org_id, metric, report_date)
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS daily_report_members (
+                    org_id TEXT NOT NULL,
+                    report_date DATE NOT NULL,
+                    metric TEXT NOT NULL,
+                    member TEXT NOT NULL,
+                    PRIMARY KEY (org_id, metric, report_date, member)
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS report_rollups (
+                    org_id TEXT NOT NULL,
+                    period_type TEXT NOT NULL,
+                    period_start DATE NOT NULL,
+                    period_end DATE NOT NULL,
+                    days_covered INTEGER NOT NULL DEFAULT 0,
+                    report_data TEXT NOT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (org_id, period_type, period_start)
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS daily_call_cube (
+                    org_id TEXT NOT NULL,
+                    report_date DATE NOT NULL,
+                    call_classification TEXT NOT NULL DEFAULT '',
+                    call_stage TEXT NOT NULL DEFAULT '',
+                    load_status TEXT NOT NULL DEFAULT '',
+                    pricing_notes TEXT NOT NULL DEFAULT '',
+                    carrier_end_state TEXT NOT NULL DEFAULT '',
+                    transfer_reason TEXT NOT NULL DEFAULT '',
+                    transfer_attempt TEXT NOT NULL DEFAULT '',
+                    calls INTEGER NOT NULL,
+                    duration_seconds REAL NOT NULL DEFAULT 0,
+                    PRIMARY KEY (org_id, report_date, call_classification, call_stage, load_status,
+                                 pricing_notes, carrier_end_state, transfer_reason, transfer_attempt)
+                )
+            """)
+
+        _migrate_daily_report_summary(conn)
+        _migrate_daily_report_metrics(conn)
+        _run_once_migration(conn, "report_rollups", _migrate_report_rollups)
+        _run_once_migration(conn, "report_rollups_breakdown_totals", _rebuild_report_rollups)
+        _migrate_backfill_job_leases(conn)
+
         conn.commit()
         logger.info("Database initialized (PostgreSQL=%s)", IS_POSTGRES)
 
 
+def _migrate_daily_report_summary(conn) -> None:
+    """
+    Add the KPI summary columns to a daily_reports table created before them, and fill them
+    in from report_data for rows saved before them (total_calls is NULL only on those rows).
+    """
+    cursor = conn.cursor()
+    if IS_POSTGRES:
+        for column, (pg_type, _) in REPORT_SUMMARY_COLUMNS.items():
+            cursor.execute(f"ALTER TABLE daily_reports ADD COLUMN IF NOT EXISTS {column} {pg_type}")
+    else:
+        existing = {row["name"] for row in cursor.execute("PRAGMA table_info(daily_reports)").fetchall()}
+        for column, (_, sqlite_type) in REPORT_SUMMARY_COLUMNS.items():
+            if column not in existing:
+                cursor.execute(f"ALTER TABLE daily_reports ADD COLUMN {column} {sqlite_type}")
+
+    backfilled = 0
+    while True:
+        rows = _execute(conn, """
+            SELECT id, report_data FROM daily_reports
+            WHERE total_calls IS NULL
+            LIMIT 500
+        """, fetch="all")
+        if not rows:
+            break
+        params = []
+        for row in rows:
+            report_data = row["report_data"]
+            if isinstance(report_data, str):
+                report_data = json.loads(report_data)
+            params.append(tuple(report_summary_values(report_data).values()) + (row["id"],))
+        assignments = ", ".join(f"{column} = ?" for column in REPORT_SUMMARY_COLUMNS)
+        query = f"UPDATE daily_reports SET {assignments} WHERE id = ?"
+        cursor.executemany(query.replace("?", "%s") if IS_POSTGRES else query, params)
+        backfilled += len(rows)
+    if backfilled:
+        logger.info("Filled KPI summary columns of %d existing daily reports", backfilled)
+
+
+# backfill_jobs lease columns, added to tables created before them: name -> (PostgreSQL, SQLite) type
+BACKFILL_JOB_LEASE_COLUMNS = {
+    "locked_by": ("TEXT", "TEXT"),
+    "lease_expires_at": ("DOUBLE PRECISION", "REAL"),
+}
+
+
+def _migrate_backfill_job_leases(conn) -> None:
+    """Add the lease columns to a backfill_jobs table created before them."""
+    cursor = conn.cursor()
+    if IS_POSTGRES:
+        for column, (pg_type, _) in BACKFILL_JOB_LEASE_COLUMNS.items():
+            cursor.execute(f"ALTER TABLE backfill_jobs ADD COLUMN IF NOT EXISTS {column} {pg_type}")
+    else:
+        existing = {row["name"] for row in cursor.execute("PRAGMA table_info(backfill_jobs)").fetchall()}
+        for column, (_, sqlite_type) in BACKFILL_JOB_LEASE_COLUMNS.items():
+            if column not in existing:
+                cursor.execute(f"ALTER TABLE backfill_jobs ADD COLUMN {column} {sqlite_type}")
+
+
+def _migrate_daily_report_metrics(conn) -> None:
+    """Write the metric facts of reports saved before daily_report_metrics existed."""
+    backfilled = 0
+    while True:
+        rows = _execute(conn, """
+            SELECT d.org_id, d.report_date, d.report_data FROM daily_reports d
+            WHERE NOT EXISTS (
+                SELECT 1 FROM daily_report_metrics m
+                WHERE m.org_id = d.org_id AND m.report_date = d.report_date
+            )
+            LIMIT 500
+        """, fetch="all")
+        if not rows:
+            break
+        for row in rows:
+            report_data = row["report_data"]
+            if isinstance(report_data, str):
+                report_data = json.loads(report_data)
+            _write_report_metric_facts(conn, row["org_id"], str(row["report_date"]), report_data)
+        backfilled += len(rows)
+    if backfilled:
+        logger.info("Wrote metric facts of %d existing daily reports", backfilled)
+
+
+def _run_once_migration(conn, name: str, migrate: Callable[[Any], None]) -> None:
+    """
+    Run a one-time data migration unless schema_migrations records it as applied. The record
+    is written in the migration's transaction, so an interrupted migration runs again.
+    """
+    if _execute(conn, "SELECT 1 FROM schema_migrations WHERE name = ?", (name,), fetch="one"):
+        return
+    migrate(conn)
+    _execute(conn, "INSERT INTO schema_migrations (name) VALUES (?)", (name,))
+
+
+def _migrate_report_rollups(conn) -> None:
+    """Build the rollups of periods that have daily reports but no rollup yet (reports saved before rollups)."""
+    existing = {
+        (row["org_id"], row["period_type"], str(row["period_start"]))
+        for row in _execute(conn, "SELECT org_id, period_type, period_start FROM report_rollups", fetch="all")
+    }
+    missing: Dict[str, set] = {}
+    for row in _execute(conn, "SELECT org_id, report_date FROM daily_reports", fetch="all"):
+        for period_type in ROLLUP_PERIODS:
+            start, _ = rollup_period(period_type, str(row["report_date"]))
+            if (row["org_id"], period_type, start) not in existing:
+                missing.setdefault(row["org_id"], set()).add(start)
+    for org_id, dates in missing.items():
+        _update_report_rollups(conn, org_id, dates)
+    if missing:
+        logger.info("Built missing report rollups for %d organizations", len(missing))
+
+
+def _rebuild_report_rollups(conn) -> None:
+    """Recompute every stored rollup, for rollups stored in an older shape."""
+    periods: Dict[str, set] = {}
+    for row in _execute(conn, "SELECT org_id, period_start FROM report_rollups", fetch="all"):
+        periods.setdefault(row["org_id"], set()).add(str(row["period_start"]))
+    for org_id, dates in periods.items():
+        _update_report_rollups(conn, org_id, dates)
+    if periods:
+        logger.info("Rebuilt report rollups of %d organizations", len(periods))
+
+
 def ensure_db_initialized():
     """Ensure database is initialized (call on app startup)."""
     init_database()
@@ -316,39 +986,259 @@ def upsert_organization(org: Organization) -> Organization:
 # Daily Report CRUD
 # =============================================================================
 
+# KPI columns stored next to report_data so report lists skip the JSON: name -> (PostgreSQL, SQLite) type
+REPORT_SUMMARY_COLUMNS = {
+    "total_calls": ("INTEGER", "INTEGER"),
+    "classified_calls": ("INTEGER", "INTEGER"),
+    "total_duration_hours": ("DOUBLE PRECISION", "REAL"),
+    "avg_minutes_per_call": ("DOUBLE PRECISION", "REAL"),
+    "success_rate_percent": ("DOUBLE PRECISION", "REAL"),
+    "non_convertible_percent": ("DOUBLE PRECISION", "REAL"),
+    "carrier_not_qualified_percent": ("DOUBLE PRECISION", "REAL"),
+    "successfully_transferred_percent": ("DOUBLE PRECISION", "REAL"),
+    "is_degraded": ("BOOLEAN DEFAULT FALSE", "BOOLEAN DEFAULT 0"),
+}
+
+
+def report_summary_values(report_data: Dict[str, Any]) -> Dict[str, Any]:
+    """KPI column values of a report (keys in REPORT_SUMMARY_COLUMNS order)."""
+    kpis = report_data.get("kpis") or {}
+
+    def percentage(kpi: str, key: str = "percentage") -> Optional[float]:
+        value = kpis.get(kpi)
+        return value.get(key) if value else None
+
+    return {
+        "total_calls": kpis.get("total_calls") or 0,
+        "classified_calls": kpis.get("classified_calls") or 0,
+        "total_duration_hours": kpis.get("total_duration_hours") or 0.0,
+        "avg_minutes_per_call": kpis.get("avg_minutes_per_call") or 0.0,
+        "success_rate_percent": kpis.get("success_rate_percent"),
+        "non_convertible_percent": percentage("non_convertible_calls_with_carrier_not_qualified"),
+        "carrier_not_qualified_percent": percentage("carrier_not_qualified"),
+        "successfully_transferred_percent": percentage(
+            "successfully_transferred_for_booking", "successfully_transferred_for_booking_percentage"
+        ),
+        "is_degraded": bool(report_data.get("degraded_metrics")),
+    }
+
+
+# How each fact metric aggregates over several days (see get_metric_trend):
+# sum -> SUM(value); weighted_avg -> mean of value weighted by count; ratio -> 100 * SUM(count) / SUM(total);
+# share -> each dimension's percentage of SUM(count) within the period (breakdowns);
+# distinct -> COUNT(DISTINCT member) over the days' daily_report_members (never a sum of daily counts)
+METRIC_FACT_KINDS = {
+    "total_calls": "sum",
+    "classified_calls": "sum",
+    "total_duration_hours": "sum",
+    "avg_minutes_per_call": "weighted_avg",
+    "success_rate_percent": "ratio",
+    "non_convertible_calls_with_carrier_not_qualified": "ratio",
+    "non_convertible_calls_without_carrier_not_qualified": "ratio",
+    "carrier_not_qualified": "ratio",
+    "carrier_transfer_over_total_transfer_attempts": "ratio",
+    "carrier_transfer_over_total_call_attempts": "ratio",
+    "successfully_transferred_for_booking": "ratio",
+    "call_stage": "share",
+    "call_classification": "share",
+    "load_status": "share",
+    "pricing_notes": "share",
+    "carrier_end_state": "share",
+    "number_of_unique_loads": "distinct",
+}
+
+DISTINCT_FACT_METRICS = tuple(metric for metric, kind in METRIC_FACT_KINDS.items() if kind == "distinct")
+
+# Ratio KPIs: metric -> (count key, total key, percentage key) inside report_data["kpis"][metric]
+_RATIO_FACT_KEYS = {
+    "non_convertible_calls_with_carrier_not_qualified": ("count", "total_calls", "percentage"),
+    "non_convertible_calls_without_carrier_not_qualified": ("count", "total_calls", "percentage"),
+    "carrier_not_qualified": ("count", "total_calls", "percentage"),
+    "carrier_transfer_over_total_transfer_attempts": ("carrier_asked_count", "total_transfer_attempts", "carrier_asked_percentage"),
+    "carrier_transfer_over_total_call_attempts": ("carrier_asked_count", "total_call_attempts", "carrier_asked_percentage"),
+    "successfully_transferred_for_booking": (
+        "successfully_transferred_for_booking_count", "total_calls", "successfully_transferred_for_booking_percentage"
+    ),
+}
+
+# Breakdowns: name -> (dimension key, percentage key) of each row in report_data["breakdowns"][name]
+_BREAKDOWN_FACT_KEYS = {
+    "call_stage": ("call_stage", "percentage"),
+    "call_classification": ("call_classification", "percentage"),
+    "load_status": ("load_status", "load_status_percentage"),
+    "pricing_notes": ("pricing_notes", "percentage"),
+    "carrier_end_state": ("carrier_end_state", "percentage"),
+}
+
+# Breakdowns whose rows also carry the breakdown's total (the sum of its counts) under this key
+_BREAKDOWN_TOTAL_KEYS = {
+    "load_status": "total_calls",
+}
+
+
+def report_metric_facts(report_data: Dict[str, Any]) -> List[Tuple[str, str, Optional[float], Optional[int], Optional[int]]]:
+    """
+    Flatten a report into (metric, dimension, value, count, total) facts. Scalar KPIs have an
+    empty dimension; breakdowns have one fact per value. Metrics the report lacks (e.g.
+    degraded or zero-denominator ratios) get no fact.
+    """
+    kpis = report_data.get("kpis") or {}
+    breakdowns = report_data.get("breakdowns") or {}
+    total_calls = int(kpis.get("total_calls") or 0)
+    facts = [
+        ("total_calls", "", float(total_calls), total_calls, None),
+        ("classified_calls", "", float(kpis.get("classified_calls") or 0), int(kpis.get("classified_calls") or 0), None),
+        ("total_duration_hours", "", float(kpis.get("total_duration_hours") or 0.0), None, None),
+        ("avg_minutes_per_call", "", float(kpis.get("avg_minutes_per_call") or 0.0), total_calls, None),
+    ]
+
+    classifications = breakdowns.get("call_classification") or []
+    if kpis.get("success_rate_percent") is not None and classifications:
+        successes = sum(int(r.get("count") or 0) for r in classifications if r.get("call_classification") == "success")
+        classified = sum(int(r.get("count") or 0) for r in classifications)
+        facts.append(("success_rate_percent", "", float(kpis["success_rate_percent"]), successes, classified))
+
+    for metric, (count_key, total_key, percentage_key) in _RATIO_FACT_KEYS.items():
+        kpi = kpis.get(metric)
+        if kpi:
+            facts.append((metric, "", kpi.get(percentage_key), kpi.get(count_key), kpi.get(total_key)))
+
+    for metric, (dimension_key, percentage_key) in _BREAKDOWN_FACT_KEYS.items():
+        for r in breakdowns.get(metric) or []:
+            facts.append((metric, str(r.get(dimension_key)), r.get(percentage_key), r.get("count"), r.get("total_calls")))
+
+    # Distinct counts are only present when their members were captured (see DailyReport.distinct_members)
+    for metric in DISTINCT_FACT_METRICS:
+        if kpis.get(metric) is not None:
+            facts.append((metric, "", float(kpis[metric]), int(kpis[metric]), None))
+    return facts
+
+
+def _write_report_metric_facts(conn, org_id: str, report_date: str, report_data: Dict[str, Any]) -> None:
+    """Replace a report's rows in daily_report_metrics (in the caller's transaction)."""
+    _execute(conn, "DELETE FROM daily_report_metrics WHERE org_id = ? AND report_date = ?", (org_id, report_date))
+    query = """
+        INSERT INTO daily_report_metrics (org_id, report_date, metric, dimension, value, count, total)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+    # Breakdown keys are unique per report, but keep the first row if two stringify alike
+    facts: Dict[Tuple[str, str], list] = {}
+    for metric, dimension, *fact in report_metric_facts(report_data):
+        facts.setdefault((metric, dimension), fact)
+    conn.cursor().executemany(
+        query.replace("?", "%s") if IS_POSTGRES else query,
+        [(org_id, report_date, metric, dimension, *fact) for (metric, dimension), fact in facts.items()],
+    )
+
+
+def _write_report_members(conn, report: DailyReport) -> None:
+    """
+    Replace a report's rows in daily_report_members (in the caller's transaction). A report
+    saved without members for a distinct metric clears that day's members, matching its facts.
+    """
+    query = """
+        INSERT INTO daily_report_members (org_id, report_date, metric, member)
+        VALUES (?, ?, ?, ?)
+    """
+    for metric in DISTINCT_FACT_METRICS:
+        _execute(conn, "DELETE FROM daily_report_members WHERE org_id = ? AND metric = ? AND report_date = ?",
+                 (report.org_id, metric, report.report_date))
+        members = sorted({str(m) for m in report.distinct_members.get(metric) or []})
+        if members:
+            conn.cursor().executemany(
+                query.replace("?", "%s") if IS_POSTGRES else query,
+                [(report.org_id, report.report_date, metric, member) for member in members],
+            )
+
+
+def _write_call_cube(conn, report: DailyReport) -> None:
+    """Replace a report's rows in daily_call_cube, unless it carries no cube (in the caller's transaction)."""
+    if report.call_cube is None:
+        return
+    _execute(conn, "DELETE FROM daily_call_cube WHERE org_id = ? AND report_date = ?", (report.org_id, report.report_date))
+    columns = ["org_id", "report_date", *CALL_CUBE_DIMENSIONS, "calls", "duration_seconds"]
+    query = f"""
+        INSERT INTO daily_call_cube ({", ".join(columns)})
+        VALUES ({", ".join("?" for _ in columns)})
+    """
+    conn.cursor().executemany(
+        query.replace("?", "%s") if IS_POSTGRES else query,
+        [
+            (report.org_id, report.report_date, *(str(cell.get(d) or "") for d in CALL_CUBE_DIMENSIONS),
+             int(cell.get("calls") or 0), float(cell.get("duration_seconds") or 0))
+            for cell in report.call_cube
+        ],
+    )
+
+
+def _upsert_daily_report_sql() -> str:
+    """INSERT ... ON CONFLICT (org_id, report_date) DO UPDATE of a report and its KPI columns."""
+    columns = ["org_id", "report_date", "report_data", *REPORT_SUMMARY_COLUMNS]
+    placeholder = "%s" if IS_POSTGRES else "?"
+    updates = ",\n                ".join(f"{column} = excluded.{column}" for column in columns[2:])
+    return f"""
+        INSERT INTO daily_reports ({", ".join(columns)})
+        VALUES ({", ".join([placeholder] * len(columns))})
+        ON CONFLICT(org_id, report_date) DO UPDATE SET
+                {updates},
+                created_at = CURRENT_TIMESTAMP
+    """
+
+
+def _daily_report_params(report: DailyReport) -> tuple:
+    return (report.org_id, report.report_date, json.dumps(report.report_data),
+            *report_summary_values(report.report_data).values())
+
+
 def save_daily_report(report: DailyReport) -> DailyReport:
-    """Save a daily report (upsert - replaces if exists for same org+date)."""
+    """
+    Save a daily report (upsert - replaces if exists for same org+date), with its metric facts
+    and members, and update the week and month rollups containing it.
+    """
     with get_db_connection() as conn:
-        report_json = json.dumps(report.report_data) if not IS_POSTGRES else report.report_data
-
+        cursor = conn.cursor()
+        cursor.execute(_upsert_daily_report_sql() + (" RETURNING id" if IS_POSTGRES else ""),
+                       _daily_report_params(report))
         if IS_POSTGRES:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO daily_reports (org_id, report_date, report_data)
-                VALUES (%s, %s, %s)
-                ON CONFLICT(org_id, report_date) DO UPDATE SET
-                    report_data = EXCLUDED.report_data,
-                    created_at = CURRENT_TIMESTAMP
-                RETURNING id
-            """, (report.org_id, report.report_date, json.dumps(report.report_data)))
             result = cursor.fetchone()
             report.id = result["id"] if result else None
         else:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO daily_reports (org_id, report_date, report_data)
-                VALUES (?, ?, ?)
-                ON CONFLICT(org_id, report_date) DO UPDATE SET
-                    report_data = excluded.report_data,
-                    created_at = CURRENT_TIMESTAMP
-            """, (report.org_id, report.report_date, report_json))
             report.id = cursor.lastrowid
+        _write_report_metric_facts(conn, report.org_id, report.report_date, report.report_data)
+        _write_report_members(conn, report)
+        _write_call_cube(conn, report)
+        _update_report_rollups(conn, report.org_id, [report.report_date])
 
         conn.commit()
         logger.info("Saved daily report for %s on %s", report.org_id, report.report_date)
         return report
 
 
+def save_daily_reports(reports: List[DailyReport]) -> int:
+    """
+    Save many daily reports in one transaction (upsert per org+date, like save_daily_report).
+    Returns the number of reports saved.
+    """
+    if not reports:
+        return 0
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(_upsert_daily_report_sql(), [_daily_report_params(r) for r in reports])
+        dates_by_org: Dict[str, List[str]] = {}
+        for r in reports:
+            _write_report_metric_facts(conn, r.org_id, r.report_date, r.report_data)
+            _write_report_members(conn, r)
+            _write_call_cube(conn, r)
+            dates_by_org.setdefault(r.org_id, []).append(r.report_date)
+        # Each affected week/month is recomputed once, however many of its days were saved
+        for org_id, dates in dates_by_org.items():
+            _update_report_rollups(conn, org_id, dates)
+
+        conn.commit()
+        logger.info("Saved %d daily reports for %s", len(reports), ", ".join(sorted({r.org_id for r in reports})))
+        return len(reports)
+
+
 def get_daily_report(org_id: str, report_date: str) -> Optional[DailyReport]:
     """Get a specific daily report."""
     with get_db_connection() as conn:
@@ -446,12 +1336,149 @@ def get_recent_reports(org_id: str, limit: int = 30) -> List[DailyReport]:
         return reports
 
 
-def get_all_report_dates(org_id: str) -> List[str]:
-    """Get all dates that have reports for an organization."""
+def get_report_summaries(
+    org_id: str,
+    limit: Optional[int] = 30,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> List[DailyReportSummary]:
+    """
+    KPI summaries of an organization's reports, most recent first, without loading report_data.
+    With start_date and end_date, returns every report in that (inclusive) range instead of
+    the latest `limit`.
+    """
+    query = f"""
+        SELECT id, org_id, report_date, created_at, {", ".join(REPORT_SUMMARY_COLUMNS)}
+        FROM daily_reports
+        WHERE org_id = ?
+    """
+    params: tuple = (org_id,)
+    if start_date and end_date:
+        query += " AND report_date >= ? AND report_date <= ? ORDER BY report_date DESC"
+        params += (start_date, end_date)
+    else:
+        query += " ORDER BY report_date DESC LIMIT ?"
+        params += (limit,)
+
     with get_db_connection() as conn:
-        rows = _execute(conn, """
+        rows = _execute(conn, query, params, fetch="all")
+        return [
+            DailyReportSummary(
+                id=row["id"],
+                org_id=row["org_id"],
+                report_date=str(row["report_date"]),
+                created_at=str(row["created_at"]) if row["created_at"] else None,
+                total_calls=row["total_calls"] or 0,
+                classified_calls=row["classified_calls"] or 0,
+                total_duration_hours=row["total_duration_hours"] or 0.0,
+                avg_minutes_per_call=row["avg_minutes_per_call"] or 0.0,
+                success_rate_percent=row["success_rate_percent"],
+                non_convertible_percent=row["non_convertible_percent"],
+                carrier_not_qualified_percent=row["carrier_not_qualified_percent"],
+                successfully_transferred_percent=row["successfully_transferred_percent"],
+                is_degraded=bool(row["is_degraded"]),
+            )
+            for row in rows
+        ]
+
+
+TREND_INTERVALS = ("day", "week", "month", "total")
+
+
+def _period_sql(interval: str, column: str = "report_date") -> str:
+    """SQL for the start date of the period (ISO week starting Monday, or month) of `column`."""
+    if interval == "day":
+        return column
+    if IS_POSTGRES:
+        return f"CAST(date_trunc('{interval}', {column}) AS DATE)"
+    if interval == "week":
+        return f"date({column}, 'weekday 0', '-6 days')"
+    return f"date({column}, 'start of month')"
+
+
+def get_metric_trend(
+    org_id: str,
+    metric: str,
+    start_date: str,
+    end_date: str,
+    interval: str = "day",
+) -> List[Dict[str, Any]]:
+    """
+    Aggregate one metric of the stored reports per day/week/month (or over the whole range,
+    interval "total") in SQL, from daily_report_metrics. Each point has the period's start
+    date, the dimension ('' for scalar KPIs), the aggregated value (see METRIC_FACT_KINDS),
+    the summed count/total and the number of days with data.
+
+    Raises:
+        ValueError: for an unknown metric or interval
+    """
+    kind = METRIC_FACT_KINDS.get(metric)
+    if kind is None:
+        raise ValueError(f"Unknown metric {metric!r}; expected one of {', '.join(METRIC_FACT_KINDS)}")
+    if interval not in TREND_INTERVALS:
+        raise ValueError(f"Unknown interval {interval!r}; expected one of {', '.join(TREND_INTERVALS)}")
+
+    if interval == "total":
+        # One period spanning the range, labelled with its start date
+        period, group_by, partition = "?", "dimension", ""
+        params: tuple = (start_date,)
+    else:
+        period = _period_sql(interval, "f.report_date")
+        group_by, partition = f"{period}, dimension", f"PARTITION BY {period}"
+        params = ()
+
+    if kind == "distinct":
+        # Union of the days' members; the facts mark which days captured them at all
+        select = f"""
+            SELECT {period} AS period, f.dimension, COUNT(DISTINCT m.member) AS value,
+                   NULL AS count, NULL AS total, COUNT(DISTINCT f.report_date) AS days
+            FROM daily_report_metrics f
+            LEFT JOIN daily_report_members m
+              ON m.org_id = f.org_id AND m.metric = f.metric AND m.report_date = f.report_date
+        """
+    else:
+        value_sql = {
+            "sum": "SUM(f.value)",
+            "weighted_avg": "SUM(f.value * f.count) / NULLIF(SUM(f.count), 0)",
+            "ratio": "100.0 * SUM(f.count) / NULLIF(SUM(f.total), 0)",
+            "share": f"100.0 * SUM(f.count) / NULLIF(SUM(SUM(f.count)) OVER ({partition}), 0)",
+        }[kind]
+        select = f"""
+            SELECT {period} AS period, f.dimension, {value_sql} AS value,
+                   SUM(f.count) AS count, SUM(f.total) AS total, COUNT(DISTINCT f.report_date) AS days
+            FROM daily_report_metrics f
+        """
+
+    with get_db_connection() as conn:
+        rows = _execute(conn, select + f"""
+            WHERE f.org_id = ? AND f.metric = ? AND f.report_date >= ? AND f.report_date <= ?
+            GROUP BY {group_by}
+            ORDER BY period, count DESC, dimension
+        """, params + (org_id, metric, start_date, end_date), fetch="all")
+        return [
+            {
+                "period": str(row["period"]),
+                "dimension": row["dimension"],
+                "value": round(float(row["value"]), 2) if row["value"] is not None else None,
+                "count": int(row["count"]) if row["count"] is not None else None,
+                "total": int(row["total"]) if row["total"] is not None else None,
+                "days": int(row["days"]),
+            }
+            for row in rows
+        ]
+
+
+def get_all_report_dates(org_id: str, include_degraded: bool = True) -> List[str]:
+    """
+    Get all dates that have reports for an organization. With include_degraded=False, dates
+    whose report was saved with degraded metrics are left out (they still need regenerating).
+    """
+    degraded_filter = "" if include_degraded else "AND NOT is_degraded"
+    with get_db_connection() as conn:
+        rows = _execute(conn, f"""
             SELECT report_date FROM daily_reports
             WHERE org_id = ?
+              {degraded_filter}
             ORDER BY report_date DESC
         """, (org_id,), fetch="all")
         return [str(row["report_date"]) for row in rows]
@@ -481,6 +1508,326 @@ def get_date_range(org_id: str) -> Optional[Dict[str, str]]:
         return None
 
 
+# =============================================================================
+# Weekly / Monthly Rollups
+# =============================================================================
+
+ROLLUP_PERIODS = ("week", "month")
+
+
+def rollup_period(period_type: str, report_date: str) -> Tuple[str, str]:
+    """
+    First and last day of the week (Monday to Sunday) or month containing report_date.
+
+    Raises:
+        ValueError: for an unknown period type
+    """
+    day = datetime.fromisoformat(str(report_date)).date()
+    if period_type == "week":
+        start = day - timedelta(days=day.weekday())
+        return start.isoformat(), (start + timedelta(days=6)).isoformat()
+    if period_type == "month":
+        start = day.replace(day=1)
+        next_month = (start + timedelta(days=32)).replace(day=1)
+        return start.isoformat(), (next_month - timedelta(days=1)).isoformat()
+    raise ValueError(f"Unknown period {period_type!r}; expected one of {', '.join(ROLLUP_PERIODS)}")
+
+
+def _percent(count, total) -> Optional[float]:
+    return round(100.0 * count / total, 2) if total else None
+
+
+def _rollup_data(conn, org_id: str, period_type: str, start_date: str, end_date: str) -> Optional[Dict[str, Any]]:
+    """
+    Merge the partial state of a period's daily reports into a rollup shaped like a daily
+    report: counts and totals are summed from daily_report_metrics and the ratios, averages
+    and shares recomputed from the sums; distinct counts are the union of daily_report_members.
+    Returns None if the period has no reports.
+    """
+    days = _execute(conn, """
+        SELECT report_date, is_degraded FROM daily_reports
+        WHERE org_id = ? AND report_date >= ? AND report_date <= ?
+        ORDER BY report_date
+    """, (org_id, start_date, end_date), fetch="all")
+    if not days:
+        return None
+
+    rows = _execute(conn, """
+        SELECT metric, dimension, SUM(value) AS value, SUM(value * count) AS weighted,
+               SUM(count) AS count, SUM(total) AS total, COUNT(*) AS days
+        FROM daily_report_metrics
+        WHERE org_id = ? AND report_date >= ? AND report_date <= ?
+        GROUP BY metric, dimension
+    """, (org_id, start_date, end_date), fetch="all")
+    facts: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        facts.setdefault(row["metric"], {})[row["dimension"]] = row
+
+    def scalar(metric: str):
+        return facts.get(metric, {}).get("")
+
+    def summed(metric: str) -> float:
+        row = scalar(metric)
+        return float(row["value"] or 0) if row else 0.0
+
+    avg_minutes = scalar("avg_minutes_per_call")
+    success = scalar("success_rate_percent")
+    kpis: Dict[str, Any] = {
+        "total_calls": int(summed("total_calls")),
+        "classified_calls": int(summed("classified_calls")),
+        "total_duration_hours": round(summed("total_duration_hours"), 2),
+        "avg_minutes_per_call": (
+            round(float(avg_minutes["weighted"]) / int(avg_minutes["count"]), 2)
+            if avg_minutes and avg_minutes["count"] else 0.0
+        ),
+        "success_rate_percent": _percent(success["count"], success["total"]) if success else None,
+    }
+    for metric, (count_key, total_key, percentage_key) in _RATIO_FACT_KEYS.items():
+        row = scalar(metric)
+        kpis[metric] = {
+            count_key: int(row["count"] or 0),
+            total_key: int(row["total"] or 0),
+            percentage_key: _percent(row["count"] or 0, row["total"]),
+        } if row else None
+
+    distinct_days: Dict[str, int] = {}
+    for metric in DISTINCT_FACT_METRICS:
+        row = scalar(metric)
+        if row is None:
+            kpis[metric] = None
+            continue
+        members = _execute(conn, """
+            SELECT COUNT(DISTINCT member) AS members FROM daily_report_members
+            WHERE org_id = ? AND metric = ? AND report_date >= ? AND report_date <= ?
+        """, (org_id, metric, start_date, end_date), fetch="one")
+        kpis[metric] = int(members["members"]) if members else 0
+        distinct_days[metric] = int(row["days"])
+
+    breakdowns: Dict[str, List[Dict[str, Any]]] = {}
+    for metric, (dimension_key, percentage_key) in _BREAKDOWN_FACT_KEYS.items():
+        cells = facts.get(metric, {})
+        total = sum(int(row["count"] or 0) for row in cells.values())
+        total_key = _BREAKDOWN_TOTAL_KEYS.get(metric)
+        breakdowns[metric] = [
+            {
+                dimension_key: dimension,
+                "count": int(row["count"] or 0),
+                **({total_key: total} if total_key else {}),
+                percentage_key: _percent(row["count"] or 0, total),
+            }
+            for dimension, row in sorted(cells.items(), key=lambda item: (-int(item[1]["count"] or 0), item[0]))
+        ]
+
+    dates = {str(row["report_date"]) for row in days}
+    first = datetime.fromisoformat(start_date).date()
+    expected = [(first + timedelta(days=i)).isoformat()
+                for i in range((datetime.fromisoformat(end_date).date() - first).days + 1)]
+    return {
+        "period": {"type": period_type, "start_date": start_date, "end_date": end_date},
+        "coverage": {
+            "days_covered": len(dates),
+            "days_in_period": len(expected),
+            "missing_dates": [d for d in expected if d not in dates],
+            "degraded_dates": [str(row["report_date"]) for row in days if row["is_degraded"]],
+            # Days whose members were captured, per distinct-count KPI
+            "distinct_days": distinct_days,
+        },
+        "kpis": kpis,
+        "breakdowns": breakdowns,
+    }
+
+
+def _update_report_rollups(conn, org_id: str, report_dates) -> None:
+    """Recompute the week and month rollups containing report_dates (in the caller's transaction)."""
+    periods = sorted({
+        (period_type, *rollup_period(period_type, report_date))
+        for report_date in report_dates
+        for period_type in ROLLUP_PERIODS
+    })
+    upsert = """
+        INSERT INTO report_rollups (org_id, period_type, period_start, period_end, days_covered, report_data)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(org_id, period_type, period_start) DO UPDATE SET
+            period_end = excluded.period_end,
+            days_covered = excluded.days_covered,
+            report_data = excluded.report_data,
+            updated_at = CURRENT_TIMESTAMP
+    """
+    for period_type, start_date, end_date in periods:
+        if IS_POSTGRES:
+            # Serialize saves touching the same period, so the last one to commit sees every day
+            _execute(conn, "SELECT pg_advisory_xact_lock(hashtext(?))", (f"report_rollup:{org_id}:{period_type}:{start_date}",))
+        data = _rollup_data(conn, org_id, period_type, start_date, end_date)
+        if data is None:
+            _execute(conn, "DELETE FROM report_rollups WHERE org_id = ? AND period_type = ? AND period_start = ?",
+                     (org_id, period_type, start_date))
+            continue
+        _execute(conn, upsert, (org_id, period_type, start_date, end_date, data["coverage"]["days_covered"], json.dumps(data)))
+
+
+def _report_rollup_from_row(row) -> ReportRollup:
+    report_data = row["report_data"]
+    if isinstance(report_data, str):
+        report_data = json.loads(report_data)
+    return ReportRollup(
+        org_id=row["org_id"],
+        period_type=row["period_type"],
+        period_start=str(row["period_start"]),
+        period_end=str(row["period_end"]),
+        days_covered=row["days_covered"],
+        report_data=report_data,
+        updated_at=str(row["updated_at"]) if row["updated_at"] else None,
+    )
+
+
+def get_report_rollup(org_id: str, period_type: str, report_date: str) -> Optional[ReportRollup]:
+    """
+    Get the stored week or month rollup containing report_date.
+
+    Raises:
+        ValueError: for an unknown period type
+    """
+    period_start, _ = rollup_period(period_type, report_date)
+    with get_db_connection() as conn:
+        row = _execute(conn, """
+            SELECT * FROM report_rollups
+            WHERE org_id = ? AND period_type = ? AND period_start = ?
+        """, (org_id, period_type, period_start), fetch="one")
+        return _report_rollup_from_row(row) if row else None
+
+
+def get_report_rollups(
+    org_id: str,
+    period_type: str,
+    limit: int = 12,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> List[ReportRollup]:
+    """
+    Stored week or month rollups of an organization, most recent first. With start_date and
+    end_date, returns every period overlapping that (inclusive) range instead of the latest `limit`.
+
+    Raises:
+        ValueError: for an unknown period type
+    """
+    if period_type not in ROLLUP_PERIODS:
+        raise ValueError(f"Unknown period {period_type!r}; expected one of {', '.join(ROLLUP_PERIODS)}")
+    query = """
+        SELECT * FROM report_rollups
+        WHERE org_id = ? AND period_type = ?
+    """
+    params: tuple = (org_id, period_type)
+    if start_date and end_date:
+        query += " AND period_end >= ? AND period_start <= ? ORDER BY period_start DESC"
+        params += (start_date, end_date)
+    else:
+        query += " ORDER BY period_start DESC LIMIT ?"
+        params += (limit,)
+
+    with get_db_connection() as conn:
+        return [_report_rollup_from_row(row) for row in _execute(conn, query, params, fetch="all")]
+
+
+# =============================================================================
+# Call Cube
+# =============================================================================
+
+# Dimensions of daily_call_cube, in primary key order (see queries.CALL_CUBE_DIMENSIONS)
+CALL_CUBE_DIMENSIONS = (
+    "call_classification",
+    "call_stage",
+    "load_status",
+    "pricing_notes",
+    "carrier_end_state",
+    "transfer_reason",
+    "transfer_attempt",
+)
+
+
+def query_call_cube(
+    org_id: str,
+    start_date: str,
+    end_date: str,
+    group_by: Sequence[str] = (),
+    filters: Optional[Dict[str, Sequence[str]]] = None,
+    interval: str = "total",
+) -> Dict[str, Any]:
+    """
+    Sum the stored call cube cells of [start_date, end_date] (inclusive) matching `filters`
+    (dimension -> accepted values) per combination of the `group_by` dimensions, and per
+    day/week/month unless interval is "total". Cell values are matched exactly: a run with
+    no value has '' and one with several values has them sorted and joined with '|'.
+
+    Returns {"rows": [...], "totals": {...}}; each row has its calls, duration and share of
+    the calls of its period.
+
+    Raises:
+        ValueError: for an unknown dimension or interval
+    """
+    filters = {dimension: list(values) for dimension, values in (filters or {}).items() if values}
+    group_by = list(dict.fromkeys(group_by))
+    unknown = sorted({d for d in [*group_by, *filters] if d not in CALL_CUBE_DIMENSIONS})
+    if unknown:
+        raise ValueError(f"Unknown dimension {', '.join(unknown)}; expected one of {', '.join(CALL_CUBE_DIMENSIONS)}")
+    if interval not in TREND_INTERVALS:
+        raise ValueError(f"Unknown interval {interval!r}; expected one of {', '.join(TREND_INTERVALS)}")
+
+    where = "org_id = ? AND report_date >= ? AND report_date <= ?"
+    params: tuple = (org_id, start_date, end_date)
+    for dimension, values in filters.items():
+        where += f" AND {dimension} IN ({', '.join('?' for _ in values)})"
+        params += tuple(values)
+
+    keys = ([_period_sql(interval)] if interval != "total" else []) + group_by
+    names = (["period"] if interval != "total" else []) + group_by
+    select = "".join(f"{key} AS {name}, " for key, name in zip(keys, names))
+    group_clause = f"GROUP BY {', '.join(keys)}" if keys else ""
+    order_clause = "ORDER BY period, calls DESC" if interval != "total" else "ORDER BY calls DESC"
+
+    with get_db_connection() as conn:
+        rows = _execute(conn, f"""
+            SELECT {select}SUM(calls) AS calls, SUM(duration_seconds) AS duration_seconds,
+                   COUNT(DISTINCT report_date) AS days
+            FROM daily_call_cube
+            WHERE {where}
+            {group_clause}
+            {order_clause}
+        """, params, fetch="all")
+        totals = _execute(conn, f"""
+            SELECT SUM(calls) AS calls, SUM(duration_seconds) AS duration_seconds,
+                   COUNT(DISTINCT report_date) AS days
+            FROM daily_call_cube
+            WHERE {where}
+        """, params, fetch="one")
+
+    rows = [row for row in rows if row["calls"]]
+    period_calls: Dict[Any, int] = {}
+    for row in rows:
+        period = str(row["period"]) if interval != "total" else None
+        period_calls[period] = period_calls.get(period, 0) + int(row["calls"])
+
+    def measures(calls, duration_seconds) -> Dict[str, Any]:
+        calls = int(calls or 0)
+        duration_seconds = float(duration_seconds or 0)
+        return {
+            "calls": calls,
+            "duration_hours": round(duration_seconds / 3600.0, 2),
+            "avg_minutes_per_call": round(duration_seconds / calls / 60.0, 2) if calls else 0.0,
+        }
+
+    out = []
+    for row in rows:
+        point: Dict[str, Any] = {name: str(row[name]) for name in names}
+        point.update(measures(row["calls"], row["duration_seconds"]))
+        point["percentage"] = _percent(point["calls"], period_calls[point.get("period")])
+        point["days"] = int(row["days"])
+        out.append(point)
+    return {
+        "rows": out,
+        "totals": {**measures(totals["calls"], totals["duration_seconds"]), "days": int(totals["days"] or 0)},
+    }
+
+
 # =============================================================================
 # Scheduler Health Tracking
 # =============================================================================
@@ -579,6 +1926,366 @@ def get_database_info() -> Dict:
         }
 
 
+# =============================================================================
+# Scheduler Locks
+# =============================================================================
+
+def try_acquire_lock(name: str, holder: str, lease_seconds: float) -> bool:
+    """
+    Take or renew the lease `name` for `holder`. Succeeds when the lock is free, expired or
+    already held by `holder`; returns whether `holder` holds it afterwards.
+
+    The conditional upsert is a single statement, so two instances racing for an expired
+    lease can't both win.
+    """
+    now = time.time()
+    with get_db_connection() as conn:
+        _execute(conn, """
+            INSERT INTO scheduler_locks (name, holder, expires_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT (name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at
+            WHERE scheduler_locks.holder = excluded.holder OR scheduler_locks.expires_at < ?
+        """, (name, holder, now + lease_seconds, now))
+        conn.commit()
+        row = _execute(conn, "SELECT holder FROM scheduler_locks WHERE name = ?", (name,), fetch="one")
+        return bool(row) and row["holder"] == holder
+
+
+def release_lock(name: str, holder: str) -> None:
+    """Release the lease `name` if `holder` still holds it."""
+    with get_db_connection() as conn:
+        _execute(conn, "DELETE FROM scheduler_locks WHERE name = ? AND holder = ?", (name, holder))
+        conn.commit()
+
+
+def get_lock(name: str) -> Optional[Dict[str, Any]]:
+    """Current holder and expiry of the lease `name`, or None if nobody holds it."""
+    with get_db_connection() as conn:
+        row = _execute(conn, "SELECT holder, expires_at FROM scheduler_locks WHERE name = ?", (name,), fetch="one")
+    if not row:
+        return None
+    return {
+        "holder": row["holder"],
+        "expires_at": datetime.fromtimestamp(float(row["expires_at"]), tz=dt_timezone.utc).isoformat(),
+        "expired": float(row["expires_at"]) < time.time(),
+    }
+
+
+# =============================================================================
+# Report Task Queue
+# =============================================================================
+
+def _report_task_from_row(row) -> ReportTask:
+    payload = row["payload"]
+    result = row["result"]
+    return ReportTask(
+        id=row["id"],
+        task_type=row["task_type"],
+        org_id=row["org_id"],
+        target_date=str(row["target_date"]) if row["target_date"] else None,
+        payload=json.loads(payload) if payload else {},
+        status=row["status"],
+        attempts=row["attempts"],
+        max_attempts=row["max_attempts"],
+        dedupe_key=row["dedupe_key"],
+        locked_by=row["locked_by"],
+        lease_expires_at=row["lease_expires_at"],
+        run_after=row["run_after"] or 0.0,
+        result=json.loads(result) if result else None,
+        error_message=row["error_message"],
+        created_at=str(row["created_at"]) if row["created_at"] else None,
+        updated_at=str(row["updated_at"]) if row["updated_at"] else None,
+    )
+
+
+def enqueue_report_task(task: ReportTask) -> ReportTask:
+    """
+    Add a task to the queue. If a task with the same dedupe_key already exists (in any
+    status), nothing is inserted and that task is returned instead.
+    """
+    with get_db_connection() as conn:
+        params = (task.task_type, task.org_id, task.target_date, json.dumps(task.payload),
+                  task.max_attempts, task.dedupe_key, task.run_after)
+        if IS_POSTGRES:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO report_tasks (task_type, org_id, target_date, payload, max_attempts, dedupe_key, run_after)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (dedupe_key) DO NOTHING
+                RETURNING id
+            """, params)
+            result = cursor.fetchone()
+            task_id = result["id"] if result else None
+        else:
+            cursor = _execute(conn, """
+                INSERT INTO report_tasks (task_type, org_id, target_date, payload, max_attempts, dedupe_key, run_after)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (dedupe_key) DO NOTHING
+            """, params)
+            task_id = cursor.lastrowid if cursor.rowcount else None
+        conn.commit()
+
+        if task_id is None:
+            row = _execute(conn, "SELECT * FROM report_tasks WHERE dedupe_key = ?", (task.dedupe_key,), fetch="one")
+            logger.info("Report task %s already queued as task %s", task.dedupe_key, row["id"])
+            return _report_task_from_row(row)
+
+        row = _execute(conn, "SELECT * FROM report_tasks WHERE id = ?", (task_id,), fetch="one")
+        logger.info("Queued report task %s (%s)", task_id, task.task_type)
+        return _report_task_from_row(row)
+
+
+def claim_report_task(worker_id: str, lease_seconds: float) -> Optional[ReportTask]:
+    """
+    Claim the oldest runnable task for a worker: a queued task whose run_after has passed, or a
+    running task whose worker stopped renewing its lease. Returns None if there is none.
+
+    On PostgreSQL the candidate row is picked with FOR UPDATE SKIP LOCKED, so concurrent
+    workers never block on or double-claim a task; on SQLite the single UPDATE runs under the
+    database write lock, which gives the same guarantee.
+    """
+    now = time.time()
+    token = f"{worker_id}:{uuid.uuid4().hex[:12]}"
+    skip_locked = "FOR UPDATE SKIP LOCKED" if IS_POSTGRES else ""
+    with get_db_connection() as conn:
+        _execute(conn, f"""
+            UPDATE report_tasks
+            SET status = 'running', locked_by = ?, lease_expires_at = ?, attempts = attempts + 1,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = (
+                SELECT id FROM report_tasks
+                WHERE (status = 'queued' AND run_after <= ?)
+                   OR (status = 'running' AND lease_expires_at < ?)
+                ORDER BY id
+                LIMIT 1
+                {skip_locked}
+            )
+        """, (token, now + lease_seconds, now, now))
+        conn.commit()
+        row = _execute(conn, "SELECT * FROM report_tasks WHERE locked_by = ? AND status = 'running'", (token,), fetch="one")
+        return _report_task_from_row(row) if row else None
+
+
+def renew_report_task_lease(task: ReportTask, lease_seconds: float) -> bool:
+    """Extend a claimed task's lease. Returns False if the task was reclaimed by another worker."""
+    with get_db_connection() as conn:
+        cursor = _execute(conn, """
+            UPDATE report_tasks
+            SET lease_expires_at = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND locked_by = ? AND status = 'running'
+        """, (time.time() + lease_seconds, task.id, task.locked_by))
+        conn.commit()
+        return cursor.rowcount == 1
+
+
+def finish_report_task(task: ReportTask) -> bool:
+    """
+    Save a claimed task's status, result, error and run_after (set status 'queued' to retry it).
+    Returns False if the task was reclaimed by another worker, in which case nothing is saved.
+    """
+    with get_db_connection() as conn:
+        cursor = _execute(conn, """
+            UPDATE report_tasks
+            SET status = ?, result = ?, error_message = ?, run_after = ?, lease_expires_at = NULL,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND locked_by = ?
+        """, (task.status, json.dumps(task.result) if task.result is not None else None, task.error_message,
+              task.run_after, task.id, task.locked_by))
+        conn.commit()
+        return cursor.rowcount == 1
+
+
+def get_report_task(task_id: int) -> Optional[ReportTask]:
+    """Get a report task by id."""
+    with get_db_connection() as conn:
+        row = _execute(conn, "SELECT * FROM report_tasks WHERE id = ?", (task_id,), fetch="one")
+        return _report_task_from_row(row) if row else None
+
+
+def get_report_tasks(statuses: Optional[List[str]] = None, task_type: Optional[str] = None, limit: int = 50) -> List[ReportTask]:
+    """Get report tasks, newest first, optionally filtered by status and type."""
+    conditions = []
+    params: List[Any] = []
+    if statuses:
+        conditions.append(f"status IN ({', '.join('?' for _ in statuses)})")
+        params.extend(statuses)
+    if task_type:
+        conditions.append("task_type = ?")
+        params.append(task_type)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    params.append(limit)
+
+    with get_db_connection() as conn:
+        rows = _execute(conn, f"""
+            SELECT * FROM report_tasks
+            {where}
+            ORDER BY id DESC
+            LIMIT ?
+        """, tuple(params), fetch="all")
+        return [_report_task_from_row(row) for row in rows]
+
+
+def count_report_tasks_by_status() -> Dict[str, int]:
+    """Number of report tasks per status."""
+    with get_db_connection() as conn:
+        rows = _execute(conn, "SELECT status, COUNT(*) AS count FROM report_tasks GROUP BY status", fetch="all")
+        return {row["status"]: row["count"] for row in rows}
+
+
+# =============================================================================
+# Backfill Jobs
+# =============================================================================
+
+def _backfill_job_from_row(row) -> BackfillJob:
+    failed_dates = row["failed_dates"]
+    if isinstance(failed_dates, str):
+        failed_dates = json.loads(failed_dates or "[]")
+    return BackfillJob(
+        id=row["id"],
+        org_id=row["org_id"],
+        start_date=str(row["start_date"]),
+        end_date=str(row["end_date"]),
+        status=row["status"],
+        days_total=row["days_total"] or 0,
+        days_done=row["days_done"] or 0,
+        days_failed=row["days_failed"] or 0,
+        failed_dates=failed_dates or [],
+        cancel_requested=bool(row["cancel_requested"]),
+        error_message=row["error_message"],
+        locked_by=row["locked_by"],
+        lease_expires_at=row["lease_expires_at"],
+        created_at=str(row["created_at"]) if row["created_at"] else None,
+        updated_at=str(row["updated_at"]) if row["updated_at"] else None,
+    )
+
+
+def create_backfill_job(job: BackfillJob) -> BackfillJob:
+    """Create a backfill job."""
+    with get_db_connection() as conn:
+        params = (job.org_id, job.start_date, job.end_date, job.status, job.days_total)
+        if IS_POSTGRES:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO backfill_jobs (org_id, start_date, end_date, status, days_total)
+                VALUES (%s, %s, %s, %s, %s)
+                RETURNING id
+            """, params)
+            result = cursor.fetchone()
+            job.id = result["id"] if result else None
+        else:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO backfill_jobs (org_id, start_date, end_date, status, days_total)
+                VALUES (?, ?, ?, ?, ?)
+            """, params)
+            job.id = cursor.lastrowid
+
+        conn.commit()
+        logger.info("Created backfill job %s for %s (%s to %s)", job.id, job.org_id, job.start_date, job.end_date)
+        return job
+
+
+def get_backfill_job(job_id: int) -> Optional[BackfillJob]:
+    """Get a backfill job by id."""
+    with get_db_connection() as conn:
+        row = _execute(conn, "SELECT * FROM backfill_jobs WHERE id = ?", (job_id,), fetch="one")
+        return _backfill_job_from_row(row) if row else None
+
+
+def get_backfill_jobs(org_id: Optional[str] = None, statuses: Optional[List[str]] = None, limit: int = 50) -> List[BackfillJob]:
+    """Get backfill jobs, newest first, optionally filtered by org and status."""
+    conditions = []
+    params: List[Any] = []
+    if org_id:
+        conditions.append("org_id = ?")
+        params.append(org_id)
+    if statuses:
+        conditions.append(f"status IN ({', '.join('?' for _ in statuses)})")
+        params.extend(statuses)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    params.append(limit)
+
+    with get_db_connection() as conn:
+        rows = _execute(conn, f"""
+            SELECT * FROM backfill_jobs
+            {where}
+            ORDER BY id DESC
+            LIMIT ?
+        """, tuple(params), fetch="all")
+        return [_backfill_job_from_row(row) for row in rows]
+
+
+def update_backfill_job(job: BackfillJob) -> BackfillJob:
+    """
+    Save a backfill job's status and progress. cancel_requested is left alone, so a cancel
+    request made while the job runs is never overwritten by a progress update.
+    """
+    with get_db_connection() as conn:
+        _execute(conn, """
+            UPDATE backfill_jobs
+            SET status = ?, days_total = ?, days_done = ?, days_failed = ?, failed_dates = ?,
+                error_message = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, (job.status, job.days_total, job.days_done, job.days_failed, json.dumps(job.failed_dates),
+              job.error_message, job.id))
+        conn.commit()
+        return job
+
+
+def claim_backfill_job(job_id: int, holder: str, lease_seconds: float) -> bool:
+    """
+    Take the lease on a queued or running job for `holder` (the process that will run it).
+    Succeeds when nobody holds it, its lease expired or `holder` already holds it; returns
+    whether `holder` holds it afterwards. The conditional UPDATE is a single statement, so
+    two processes resuming the same job can't both win.
+    """
+    now = time.time()
+    with get_db_connection() as conn:
+        cursor = _execute(conn, """
+            UPDATE backfill_jobs
+            SET locked_by = ?, lease_expires_at = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND status IN ('queued', 'running')
+              AND (locked_by IS NULL OR locked_by = ? OR lease_expires_at < ?)
+        """, (holder, now + lease_seconds, job_id, holder, now))
+        conn.commit()
+        return cursor.rowcount == 1
+
+
+def renew_backfill_job_lease(job_id: int, holder: str, lease_seconds: float) -> bool:
+    """Extend a claimed job's lease. Returns False if another process took the job over."""
+    with get_db_connection() as conn:
+        cursor = _execute(conn, """
+            UPDATE backfill_jobs
+            SET lease_expires_at = ?
+            WHERE id = ? AND locked_by = ?
+        """, (time.time() + lease_seconds, job_id, holder))
+        conn.commit()
+        return cursor.rowcount == 1
+
+
+def release_backfill_job(job_id: int, holder: str) -> None:
+    """Drop `holder`'s lease on a job (once it stopped running)."""
+    with get_db_connection() as conn:
+        _execute(conn, """
+            UPDATE backfill_jobs
+            SET locked_by = NULL, lease_expires_at = NULL
+            WHERE id = ? AND locked_by = ?
+        """, (job_id, holder))
+        conn.commit()
+
+
+def request_backfill_job_cancel(job_id: int) -> Optional[BackfillJob]:
+    """Flag a backfill job for cancellation; the runner stops before its next chunk."""
+    with get_db_connection() as conn:
+        _execute(conn, """
+            UPDATE backfill_jobs
+            SET cancel_requested = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, (True, job_id))
+        conn.commit()
+    return get_backfill_job(job_id)
+
+
 # =============================================================================
 # Catch-up Logic
 # =============================================================================
@@ -646,4 +2353,5 @@ def get_database_info() -> Dict[str, Any]:
         "type": "postgresql" if IS_POSTGRES else "sqlite",
         "url_configured": bool(os.getenv("DATABASE_URL")),
         "is_production": IS_POSTGRES,
+        "pool": get_db_pool_stats(),
     }
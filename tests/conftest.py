@@ -0,0 +1,186 @@
+"""
+Shared test setup.
+
+storage reads DATABASE_URL at import time, so it is pointed at a throwaway SQLite database
+before any application module is imported. The `clickhouse` fixture runs the fetchers' SQL on
+fixture rows in an embedded ClickHouse (chdb); tests using it are skipped without chdb.
+"""
+
+import json
+import os
+import re
+import sys
+import tempfile
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import pytest
+
+_db_dir = tempfile.mkdtemp(prefix="analytics-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_db_dir) / 'analytics.db'}"
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+CLICKHOUSE_TABLES = (
+    """CREATE TABLE public_runs (
+        id String, org_id String, timestamp DateTime64(6, 'UTC')
+    ) ENGINE = MergeTree ORDER BY (org_id, timestamp)""",
+    """CREATE TABLE public_sessions (
+        run_id String, org_id String, user_number Nullable(String), duration UInt32,
+        timestamp DateTime64(6, 'UTC')
+    ) ENGINE = MergeTree ORDER BY (org_id, timestamp)""",
+    """CREATE TABLE public_node_outputs (
+        run_id String, node_id String, node_persistent_id String, flat_data String,
+        timestamp DateTime64(6, 'UTC')
+    ) ENGINE = MergeTree ORDER BY (node_persistent_id, timestamp)""",
+    """CREATE TABLE public_nodes (
+        id String
+    ) ENGINE = MergeTree ORDER BY id""",
+)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    import storage
+
+    storage.init_database()
+    yield
+
+
+def _split_type_args(args: str) -> List[str]:
+    parts, depth, start = [], 0, 0
+    for i, ch in enumerate(args):
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(args[start:i].strip())
+            start = i + 1
+    parts.append(args[start:].strip())
+    return parts
+
+
+def _convert(value: Any, ch_type: str) -> Any:
+    """A JSONCompact value as clickhouse-connect would return it for `ch_type`."""
+    if value is None:
+        return None
+    match = re.match(r"^(\w+)\((.*)\)$", ch_type)
+    name, args = (match.group(1), match.group(2)) if match else (ch_type, "")
+    if name in ("Nullable", "LowCardinality"):
+        return _convert(value, args)
+    if name == "Array":
+        return [_convert(v, args) for v in value]
+    if name == "Tuple":
+        # Named tuple elements are "name Type"
+        types = [re.sub(r"^\w+ (?=\w)", "", t) for t in _split_type_args(args)]
+        return tuple(_convert(v, t) for v, t in zip(value, types))
+    if name == "Map":
+        key_type, value_type = _split_type_args(args)
+        return {_convert(k, key_type): _convert(v, value_type) for k, v in value.items()}
+    if name in ("Date", "Date32"):
+        return date.fromisoformat(value)
+    if name.startswith("DateTime"):
+        return datetime.fromisoformat(value)
+    if name.startswith("Decimal"):
+        return Decimal(str(value))
+    if name.startswith(("Int", "UInt")):
+        return int(value)
+    if name.startswith("Float"):
+        return float(value)
+    if name == "Bool":
+        return bool(value)
+    return value
+
+
+class FixtureQueryResult:
+    """The parts of a clickhouse-connect QueryResult the fetchers read."""
+
+    def __init__(self, column_names: Sequence[str], result_rows: List[tuple]):
+        self.column_names = tuple(column_names)
+        self.result_rows = result_rows
+
+    @property
+    def result_columns(self) -> List[list]:
+        return [list(column) for column in zip(*self.result_rows)] or [[] for _ in self.column_names]
+
+
+class FixtureClickHouse:
+    """An embedded ClickHouse holding the public_* tables, standing in for the fetchers' client."""
+
+    def __init__(self, session):
+        self._session = session
+        self.queries: List[str] = []
+        for ddl in CLICKHOUSE_TABLES:
+            self._session.query(ddl)
+
+    def query(self, query: str, settings: Optional[Dict[str, Any]] = None, **kwargs) -> FixtureQueryResult:
+        self.queries.append(query)
+        result = json.loads(self._session.query(query.strip().rstrip(";"), "JSONCompact").bytes() or b"{}")
+        meta = result.get("meta", [])
+        rows = [
+            tuple(_convert(value, column["type"]) for value, column in zip(row, meta))
+            for row in result.get("data", [])
+        ]
+        return FixtureQueryResult([column["name"] for column in meta], rows)
+
+    def command(self, query: str, *args, **kwargs):
+        return self._session.query(query)
+
+    def ping(self) -> bool:
+        return True
+
+    def _insert(self, table: str, rows: List[Dict[str, Any]]) -> None:
+        if rows:
+            self._session.query(f"INSERT INTO {table} FORMAT JSONEachRow " + "\n".join(json.dumps(r) for r in rows))
+
+    def add_run(self, run_id: str, org_id: str, timestamp: str,
+                sessions: Sequence[Dict[str, Any]] = (), outputs: Sequence[Dict[str, Any]] = ()) -> None:
+        """
+        Insert a run with its sessions ({"duration", "user_number", "timestamp", "org_id"}, each
+        defaulting to the run's) and node outputs ({"node", "timestamp", **flat_data fields}).
+        """
+        self._insert("public_runs", [{"id": run_id, "org_id": org_id, "timestamp": timestamp}])
+        self._insert("public_sessions", [
+            {
+                "run_id": run_id,
+                "org_id": s.get("org_id", org_id),
+                "user_number": s.get("user_number"),
+                "duration": s.get("duration", 0),
+                "timestamp": s.get("timestamp", timestamp),
+            }
+            for s in sessions
+        ])
+        rows = []
+        for i, output in enumerate(outputs):
+            fields = {k: v for k, v in output.items() if k not in ("node", "timestamp")}
+            node_id = f"{run_id}-node-{i}"
+            rows.append({
+                "run_id": run_id,
+                "node_id": node_id,
+                "node_persistent_id": output["node"],
+                "flat_data": json.dumps(fields),
+                "timestamp": output.get("timestamp", timestamp),
+            })
+            self._insert("public_nodes", [{"id": node_id}])
+        self._insert("public_node_outputs", rows)
+
+
+@pytest.fixture
+def clickhouse(monkeypatch, tmp_path):
+    """Serve the fetchers' queries from an empty embedded ClickHouse; fill it with add_run()."""
+    chdb_session = pytest.importorskip("chdb.session")
+    import db
+
+    session = chdb_session.Session(str(tmp_path / "chdb"))
+    session.query("SET output_format_json_quote_64bit_integers = 0")
+    client = FixtureClickHouse(session)
+    # Every test fills the tables afresh, so results must not come from an earlier test
+    monkeypatch.setenv("CACHE_ENABLED", "false")
+    monkeypatch.setattr(db, "get_clickhouse_client", lambda: client)
+    try:
+        yield client
+    finally:
+        session.close()
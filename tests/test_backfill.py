@@ -0,0 +1,57 @@
+import time
+import uuid
+
+import pytest
+
+import backfill
+import storage
+from storage import Organization, create_organization, get_backfill_job, get_db_connection
+
+
+@pytest.fixture
+def job(monkeypatch):
+    monkeypatch.setenv("BACKFILL_BATCH_DAYS", "1")
+    monkeypatch.setenv("BACKFILL_CONCURRENCY", "1")
+    monkeypatch.setattr(backfill, "get_backfill_lease_seconds", lambda: 0.03)
+    org = create_organization(Organization(
+        id=None, org_id=f"test-org-{uuid.uuid4().hex[:8]}", name="Test org", node_persistent_id="broker-node",
+    ))
+    return backfill.create_job(org.org_id, "2026-03-01", "2026-03-05")
+
+
+def _take_over(job_id):
+    with get_db_connection() as conn:
+        storage._execute(conn, "UPDATE backfill_jobs SET locked_by = 'other-process' WHERE id = ?", (job_id,))
+        conn.commit()
+
+
+def test_job_stops_when_another_process_takes_its_lease(job, monkeypatch):
+    chunks = []
+
+    def run_chunk(org, dates, existing_dates):
+        chunks.append(dates)
+        _take_over(job.id)
+        time.sleep(0.1)  # the lease renewal notices in the meantime
+        return dates, []
+
+    monkeypatch.setattr(backfill, "_run_chunk", run_chunk)
+
+    backfill.run_backfill_job(job.id)
+
+    assert chunks == [["2026-03-01"]]
+    stored = get_backfill_job(job.id)
+    # Progress and status belong to the process that took the job over
+    assert stored.locked_by == "other-process"
+    assert stored.status == backfill.STATUS_RUNNING
+    assert stored.days_done == 0
+
+
+def test_job_runs_every_chunk_while_it_holds_its_lease(job, monkeypatch):
+    monkeypatch.setattr(backfill, "_run_chunk", lambda org, dates, existing_dates: (dates, []))
+
+    backfill.run_backfill_job(job.id)
+
+    stored = get_backfill_job(job.id)
+    assert stored.status == backfill.STATUS_SUCCEEDED
+    assert stored.days_done == 5
+    assert stored.locked_by is None
@@ -0,0 +1,156 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import cache
+import db
+from cache import ResultCache, cached_metric, ttl_for_range
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def result_cache(monkeypatch):
+    fresh = ResultCache(max_entries=16, max_bytes=1024 * 1024)
+    monkeypatch.setattr(cache, "_cache", fresh)
+    monkeypatch.setenv("CACHE_ENABLED", "true")
+    monkeypatch.setenv("ORG_ID", "org-cache")
+    return fresh
+
+
+def test_ttl_is_long_only_for_ranges_ended_before_today(monkeypatch):
+    monkeypatch.setenv("CACHE_TTL_PAST_SECONDS", "86400")
+    monkeypatch.setenv("CACHE_TTL_RECENT_SECONDS", "300")
+    today = datetime.now(timezone.utc).date()
+    yesterday = today - timedelta(days=1)
+
+    assert ttl_for_range(f"{yesterday}T00:00:00", f"{today}T00:00:00", "UTC") == 86400
+    assert ttl_for_range(f"{today}T00:00:00", f"{today + timedelta(days=1)}T00:00:00", "UTC") == 300
+    assert ttl_for_range(None, None, "UTC") == 300
+    assert ttl_for_range(f"{yesterday}T00:00:00", "not a date", "UTC") == 300
+
+
+def test_entries_expire_after_their_ttl(clock):
+    results = ResultCache(max_entries=4, max_bytes=1024)
+    results.put(("a",), [1, 2], ttl_seconds=60, org_id="org")
+
+    clock[0] += 59
+    assert results.get(("a",)) == (True, [1, 2])
+    clock[0] += 1
+    assert results.get(("a",)) == (False, None)
+    assert results.stats()["expirations"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    results = ResultCache(max_entries=2, max_bytes=1024)
+    results.put(("a",), "a", ttl_seconds=60, org_id="org")
+    results.put(("b",), "b", ttl_seconds=60, org_id="org")
+    results.get(("a",))
+    results.put(("c",), "c", ttl_seconds=60, org_id="org")
+
+    assert results.get(("b",)) == (False, None)
+    assert results.get(("a",)) == (True, "a")
+    assert results.get(("c",)) == (True, "c")
+    assert results.stats()["evictions"] == 1
+
+
+def test_memory_cap_evicts_and_skips_oversized_values():
+    results = ResultCache(max_entries=10, max_bytes=200)
+    results.put(("big",), "x" * 500, ttl_seconds=60, org_id="org")
+    assert results.get(("big",)) == (False, None)
+
+    for i in range(5):
+        results.put((i,), "y" * 60, ttl_seconds=60, org_id="org")
+    assert results.stats()["bytes"] <= 200
+    assert results.get((0,)) == (False, None)
+    assert results.get((4,)) == (True, "y" * 60)
+
+
+def test_invalidate_org_only_drops_that_org():
+    results = ResultCache(max_entries=10, max_bytes=1024)
+    results.put(("a",), 1, ttl_seconds=60, org_id="org-a")
+    results.put(("b",), 2, ttl_seconds=60, org_id="org-b")
+
+    assert results.invalidate_org("org-a") == 1
+    assert results.get(("a",)) == (False, None)
+    assert results.get(("b",)) == (True, 2)
+
+
+def test_cached_metric_serves_repeat_calls_from_the_cache(result_cache, monkeypatch):
+    monkeypatch.setenv("CACHE_TTL_PAST_SECONDS", "86400")
+    calls = []
+
+    @cached_metric("test_metric")
+    def fetch(start_date=None, end_date=None, ctx=None):
+        calls.append((start_date, end_date))
+        return [{"count": 3}]
+
+    first = fetch("2020-01-01T00:00:00", "2020-01-02T00:00:00")
+    first[0]["count"] = 99  # callers get their own copy
+    assert fetch("2020-01-01T00:00:00", "2020-01-02T00:00:00") == [{"count": 3}]
+    assert len(calls) == 1
+
+    fetch("2020-01-02T00:00:00", "2020-01-03T00:00:00")
+    monkeypatch.setenv("ORG_ID", "org-other")
+    fetch("2020-01-01T00:00:00", "2020-01-02T00:00:00")
+    assert len(calls) == 3
+
+
+def test_empty_results_get_the_short_ttl(result_cache, monkeypatch, clock):
+    monkeypatch.setenv("CACHE_TTL_RECENT_SECONDS", "300")
+    calls = []
+
+    @cached_metric("test_metric")
+    def fetch(start_date=None, end_date=None, ctx=None):
+        calls.append(1)
+        return None
+
+    fetch("2020-01-01T00:00:00", "2020-01-02T00:00:00")
+    clock[0] += 299
+    fetch("2020-01-01T00:00:00", "2020-01-02T00:00:00")
+    clock[0] += 1
+    fetch("2020-01-01T00:00:00", "2020-01-02T00:00:00")
+    assert len(calls) == 2
+
+
+class _DownClickHouse:
+    def query(self, query, settings=None):
+        raise ConnectionError("ClickHouse is down")
+
+
+def test_results_of_failed_queries_are_not_cached(result_cache):
+    calls = []
+
+    @cached_metric("test_metric")
+    def fetch(start_date=None, end_date=None, ctx=None):
+        # Like the db.py fetchers: the query error is logged and swallowed
+        calls.append(1)
+        try:
+            db._query_columns(_DownClickHouse(), "SELECT 1")
+        except ConnectionError:
+            return None
+
+    fetch("2020-01-01T00:00:00", "2020-01-02T00:00:00")
+    fetch("2020-01-01T00:00:00", "2020-01-02T00:00:00")
+    assert len(calls) == 2
+    assert result_cache.stats()["entries"] == 0
+
+
+def test_disabled_cache_always_calls_the_fetcher(result_cache, monkeypatch):
+    monkeypatch.setenv("CACHE_ENABLED", "false")
+    calls = []
+
+    @cached_metric("test_metric")
+    def fetch(start_date=None, end_date=None, ctx=None):
+        calls.append(1)
+        return [1]
+
+    fetch("2020-01-01T00:00:00", "2020-01-02T00:00:00")
+    fetch("2020-01-01T00:00:00", "2020-01-02T00:00:00")
+    assert len(calls) == 2
+    assert result_cache.stats()["entries"] == 0
@@ -0,0 +1,114 @@
+import uuid
+
+import pytest
+
+from db import QueryContext, fetch_daily_call_cube
+from storage import DailyReport, query_call_cube, save_daily_report, save_daily_reports
+
+ORG = "org-a"
+BROKER = "broker-node"
+MONDAY = "2026-03-02"
+TUESDAY = "2026-03-03"
+NEXT_MONDAY = "2026-03-09"
+
+
+def _cell(calls, duration_seconds, **dimensions):
+    return {"calls": calls, "duration_seconds": duration_seconds, **dimensions}
+
+
+def _report(org_id, report_date, cells):
+    return DailyReport(id=None, org_id=org_id, report_date=report_date, report_data={"kpis": {}}, call_cube=cells)
+
+
+@pytest.fixture
+def org_id():
+    return f"test-org-{uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture
+def cube(org_id):
+    save_daily_reports([
+        _report(org_id, MONDAY, [
+            _cell(6, 3600, call_classification="success", load_status="FOUND"),
+            _cell(2, 600, call_classification="rate_too_high", load_status="FOUND"),
+            _cell(2, 300, call_classification="rate_too_high", load_status="NOT_FOUND"),
+        ]),
+        _report(org_id, TUESDAY, [
+            _cell(3, 900, call_classification="success", load_status="FOUND"),
+            _cell(1, 60, call_classification="", load_status="NOT_FOUND"),
+        ]),
+        _report(org_id, NEXT_MONDAY, [
+            _cell(4, 1200, call_classification="success", load_status="FOUND"),
+        ]),
+    ])
+    return org_id
+
+
+def test_slice_groups_cells_over_the_range(cube):
+    result = query_call_cube(cube, MONDAY, TUESDAY, group_by=["call_classification"])
+
+    assert [(r["call_classification"], r["calls"], r["percentage"], r["days"]) for r in result["rows"]] == [
+        ("success", 9, 64.29, 2), ("rate_too_high", 4, 28.57, 1), ("", 1, 7.14, 1),
+    ]
+    assert result["rows"][0]["avg_minutes_per_call"] == round(4500 / 9 / 60, 2)
+    assert result["totals"] == {"calls": 14, "duration_hours": round(5460 / 3600, 2),
+                                "avg_minutes_per_call": round(5460 / 14 / 60, 2), "days": 2}
+
+
+def test_slice_filters_and_splits_per_week(cube):
+    result = query_call_cube(
+        cube, MONDAY, NEXT_MONDAY, group_by=["load_status"],
+        filters={"call_classification": ["success", "rate_too_high"]}, interval="week",
+    )
+
+    assert [(r["period"], r["load_status"], r["calls"], r["percentage"]) for r in result["rows"]] == [
+        (MONDAY, "FOUND", 11, 84.62), (MONDAY, "NOT_FOUND", 2, 15.38), (NEXT_MONDAY, "FOUND", 4, 100.0),
+    ]
+    assert result["totals"]["calls"] == 17
+
+
+def test_report_saved_without_a_cube_keeps_the_stored_one(cube):
+    save_daily_report(_report(cube, MONDAY, None))
+    assert query_call_cube(cube, MONDAY, MONDAY)["totals"]["calls"] == 10
+
+    save_daily_report(_report(cube, MONDAY, [_cell(1, 60, call_classification="success")]))
+    assert query_call_cube(cube, MONDAY, MONDAY)["totals"]["calls"] == 1
+
+
+def test_unknown_dimension_is_rejected(org_id):
+    with pytest.raises(ValueError):
+        query_call_cube(org_id, MONDAY, TUESDAY, group_by=["carrier_name"])
+    with pytest.raises(ValueError):
+        query_call_cube(org_id, MONDAY, TUESDAY, filters={"carrier_name": ["x"]})
+
+
+def test_each_run_lands_in_one_cell_of_its_org_and_day(clickhouse):
+    clickhouse.add_run("run-a", ORG, f"{MONDAY} 10:00:00", [{"duration": 120, "user_number": "+15551110001"}], [
+        {"node": BROKER, "result.call.call_classification": "success", "result.load.load_status": "FOUND"},
+        {"node": BROKER, "result.call.call_classification": "covered", "result.load.load_status": "FOUND"},
+    ])
+    clickhouse.add_run("run-b", ORG, f"{MONDAY} 11:00:00", [{"duration": 60, "user_number": "+15551110002"}], [
+        {"node": BROKER, "result.call.call_classification": "success"},
+    ])
+    clickhouse.add_run("run-c", ORG, f"{TUESDAY} 09:00:00", [{"duration": 30, "user_number": "+15551110003"}], [
+        {"node": BROKER, "result.call.call_classification": "success", "result.load.load_status": "FOUND"},
+    ])
+
+    clickhouse.add_run("run-d", "org-b", f"{MONDAY} 12:00:00", [{"duration": 90, "user_number": "+15551110004"}], [
+        {"node": "other-broker", "result.call.call_classification": "rate_too_high"},
+    ])
+
+    by_org = fetch_daily_call_cube(MONDAY, "2026-03-04", "UTC", [
+        QueryContext.for_org(ORG, BROKER, "UTC"), QueryContext.for_org("org-b", "other-broker", "UTC"),
+    ])
+
+    assert [(c.call_classification, c.calls) for c in by_org["org-b"][MONDAY]] == [("rate_too_high", 1)]
+    cubes = by_org[ORG]
+
+    assert sorted(cubes) == [MONDAY, TUESDAY, "2026-03-04"]
+    monday = sorted(cubes[MONDAY], key=lambda cell: cell.call_classification)
+    assert [(c.call_classification, c.load_status, c.calls, c.duration_seconds) for c in monday] == [
+        ("covered|success", "FOUND", 1, 120.0), ("success", "", 1, 60.0),
+    ]
+    assert [(c.call_classification, c.calls) for c in cubes[TUESDAY]] == [("success", 1)]
+    assert cubes["2026-03-04"] == []
@@ -0,0 +1,70 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import Response
+
+import main
+from storage import Organization, create_organization, get_daily_report
+
+BROKER = "broker-node"
+DAY = "2026-03-02"
+
+
+@pytest.fixture
+def org(clickhouse, monkeypatch):
+    monkeypatch.setenv("DAILY_REPORT_READ_THROUGH", "true")
+    org = create_organization(Organization(
+        id=None, org_id=f"test-org-{uuid.uuid4().hex[:8]}", name="Test org", node_persistent_id=BROKER,
+    ))
+    clickhouse.add_run("run-a", org.org_id, f"{DAY} 10:00:00", [{"duration": 120, "user_number": "+15551110001"}], [{
+        "node": BROKER,
+        "result.call.call_classification": "success",
+        "result.load.load_status": "FOUND",
+        "result.load.reference_number": "L-1",
+    }])
+    return org
+
+
+def _get(org, date=DAY, tz="UTC", fresh=False):
+    response = Response()
+    report = asyncio.run(main.get_live_daily_report(response, date=date, tz=tz, org_id=org.org_id, fresh=fresh))
+    return response.headers["X-Report-Source"], report
+
+
+def test_completed_day_is_computed_once_then_read_from_storage(org, clickhouse):
+    source, computed = _get(org)
+    assert source == "computed"
+    assert computed["kpis"]["total_calls"] == 1
+    assert get_daily_report(org.org_id, DAY) is not None
+
+    queries = len(clickhouse.queries)
+    source, stored = _get(org)
+    assert source == "stored"
+    assert stored == computed
+    assert len(clickhouse.queries) == queries
+
+    source, _ = _get(org, fresh=True)
+    assert source == "computed"
+    assert len(clickhouse.queries) > queries
+
+
+def test_every_source_returns_the_live_shape(org):
+    _, computed = _get(org)
+    _, stored = _get(org)
+    # Another timezone than the org's is always computed live
+    source, live = _get(org, tz="America/Chicago")
+
+    assert source == "live"
+    assert computed.keys() == stored.keys() == live.keys()
+    assert computed["kpis"].keys() == stored["kpis"].keys() == live["kpis"].keys()
+    assert "metadata" in get_daily_report(org.org_id, DAY).report_data
+
+
+def test_today_is_computed_live(org):
+    today = datetime.now(timezone.utc).date()
+    source, _ = _get(org, date=today.isoformat())
+
+    assert source == "live"
+    assert get_daily_report(org.org_id, today.isoformat()) is None
@@ -0,0 +1,95 @@
+import pytest
+
+from report_engine import build_daily_report
+
+ORG = "org-a"
+OTHER_ORG = "org-b"
+BROKER = "broker-node"
+START = "2026-03-02T00:00:00"
+END = "2026-03-03T00:00:00"
+IN_WINDOW = "2026-03-02 10:00:00"
+
+
+def _output(**fields):
+    return {"node": BROKER, **{f"result.{k.replace('__', '.')}": v for k, v in fields.items()}}
+
+
+@pytest.fixture
+def calls(clickhouse, monkeypatch):
+    monkeypatch.setenv("ORG_ID", ORG)
+    monkeypatch.setenv("BROKER_NODE_PERSISTENT_ID", BROKER)
+    monkeypatch.setenv("EXCLUDED_USER_NUMBERS", "+15550000000")
+
+    # Booked: carrier asked for the transfer, agreed rate after negotiating
+    clickhouse.add_run("booked", ORG, IN_WINDOW, [{"duration": 300, "user_number": "+15551110001"}], [_output(
+        call__call_stage="LOAD_PITCHED", call__call_classification="success", load__load_status="FOUND",
+        pricing__pricing_notes="AGREEMENT_REACHED_WITH_NEGOTIATION", pricing__agreed_upon_rate="1200",
+        carrier__carrier_end_state="BOOKED", carrier__carrier_qualification="QUALIFIED",
+        transfer__transfer_reason="CARRIER_ASKED_FOR_TRANSFER", transfer__transfer_attempt="YES",
+    )])
+    # Two sessions, only one with a user number
+    clickhouse.add_run("two-sessions", ORG, IN_WINDOW, [
+        {"duration": 90, "user_number": "+15551110002"},
+        {"duration": 90, "user_number": ""},
+    ], [_output(
+        call__call_stage="QUALIFICATION", call__call_classification="carrier_not_qualified",
+        load__load_status="FOUND", carrier__carrier_end_state="NOT_QUALIFIED",
+        carrier__carrier_qualification="NOT_QUALIFIED", transfer__transfer_reason="NO_TRANSFER_INVOLVED",
+    )])
+    # No user number: counted as a call, not in the non-convertible ratios
+    clickhouse.add_run("anonymous", ORG, IN_WINDOW, [{"duration": 45, "user_number": ""}], [_output(
+        call__call_stage="LOAD_PITCHED", call__call_classification="rate_too_high", load__load_status="NOT_FOUND",
+        pricing__pricing_notes="NO_AGREEMENT", transfer__transfer_reason="OTHER", transfer__transfer_attempt="YES",
+    )])
+    # Two node outputs that disagree on the classification
+    clickhouse.add_run("two-outputs", ORG, IN_WINDOW, [{"duration": 120, "user_number": "+15551110003"}], [
+        _output(call__call_stage="LOAD_PITCHED", call__call_classification="covered", load__load_status="FOUND"),
+        _output(call__call_stage="CLOSING", call__call_classification="success", load__load_status="FOUND"),
+    ])
+    # Run in the window whose only session is the next day
+    clickhouse.add_run("late-session", ORG, IN_WINDOW, [
+        {"duration": 60, "user_number": "+15551110004", "timestamp": "2026-03-03 01:00:00"},
+    ], [_output(call__call_stage="LOAD_PITCHED", call__call_classification="user_declined_load")])
+    # Run the day before with a session in the window
+    clickhouse.add_run("early-run", ORG, "2026-03-01 23:59:00", [
+        {"duration": 30, "user_number": "+15551110005", "timestamp": "2026-03-02 00:01:00"},
+    ], [_output(call__call_stage="LOAD_PITCHED", call__call_classification="success")])
+    # Excluded test number only
+    clickhouse.add_run("test-call", ORG, IN_WINDOW, [{"duration": 10, "user_number": "+15550000000"}],
+                       [_output(call__call_stage="LOAD_PITCHED", call__call_classification="success")])
+    # Another org on the same node, and the org on another node
+    clickhouse.add_run("other-org", OTHER_ORG, IN_WINDOW, [{"duration": 500, "user_number": "+15551110006"}],
+                       [_output(call__call_stage="LOAD_PITCHED", call__call_classification="success")])
+    clickhouse.add_run("other-node", ORG, IN_WINDOW, [{"duration": 500, "user_number": "+15551110007"}],
+                       [{"node": "fbr-node", "result.call.call_classification": "success"}])
+    return clickhouse
+
+
+def _report(monkeypatch, engine):
+    monkeypatch.setenv("DAILY_REPORT_ENGINE", engine)
+    report = build_daily_report(START, END, "UTC")
+    # Ties in a breakdown come back in no particular order from either engine
+    for rows in report["breakdowns"].values():
+        rows.sort(key=lambda row: (-row["count"], str(row)))
+    return report
+
+
+def test_single_pass_matches_per_metric_queries(calls, monkeypatch):
+    single_pass = _report(monkeypatch, "single_pass")
+    per_metric = _report(monkeypatch, "per_metric")
+
+    assert single_pass == per_metric
+    assert len(calls.queries) > 2
+
+
+def test_total_calls_counts_the_orgs_runs_in_the_window(calls, monkeypatch):
+    kpis = _report(monkeypatch, "single_pass")["kpis"]
+
+    # Runs of the org started in the window that reached the broker node and have a
+    # non-excluded session (of any date), each counted once with one session's duration
+    assert kpis["total_calls"] == 5
+    assert kpis["total_duration_hours"] == round((300 + 90 + 45 + 120 + 60) / 3600, 2)
+    assert kpis["avg_minutes_per_call"] == round((300 + 90 + 45 + 120 + 60) / 5 / 60, 2)
+    # Only in-window sessions with a user number count as classified calls
+    assert kpis["classified_calls"] == 3
+    assert kpis["carrier_not_qualified"] == {"count": 1, "total_calls": 3, "percentage": 33.33}
@@ -0,0 +1,103 @@
+import uuid
+
+import pytest
+
+import storage
+from storage import DailyReport, get_db_connection, get_metric_trend, save_daily_reports
+
+
+MONDAY = "2026-03-02"
+TUESDAY = "2026-03-03"
+NEXT_MONDAY = "2026-03-09"
+
+
+def _report(org_id, report_date, total_calls, successes, failures, not_qualified, avg_minutes, hours):
+    return DailyReport(
+        id=None,
+        org_id=org_id,
+        report_date=report_date,
+        report_data={
+            "kpis": {
+                "total_calls": total_calls,
+                "classified_calls": successes + failures,
+                "total_duration_hours": hours,
+                "avg_minutes_per_call": avg_minutes,
+                "success_rate_percent": round(100.0 * successes / (successes + failures), 2),
+                "carrier_not_qualified": {
+                    "count": not_qualified,
+                    "total_calls": total_calls,
+                    "percentage": round(100.0 * not_qualified / total_calls, 2),
+                },
+            },
+            "breakdowns": {
+                "call_classification": [
+                    {"call_classification": "success", "count": successes},
+                    {"call_classification": "failure", "count": failures},
+                ],
+            },
+        },
+    )
+
+
+@pytest.fixture
+def org_id():
+    return f"test-org-{uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture
+def three_days(org_id):
+    save_daily_reports([
+        _report(org_id, MONDAY, 10, 4, 4, 2, 12.0, 2.0),
+        _report(org_id, TUESDAY, 30, 15, 5, 3, 10.0, 5.0),
+        _report(org_id, NEXT_MONDAY, 20, 10, 10, 0, 6.0, 2.0),
+    ])
+    return org_id
+
+
+def test_sums_per_day_and_week(three_days):
+    daily = get_metric_trend(three_days, "total_calls", MONDAY, NEXT_MONDAY, "day")
+    assert [(p["period"], p["value"], p["days"]) for p in daily] == [
+        (MONDAY, 10.0, 1), (TUESDAY, 30.0, 1), (NEXT_MONDAY, 20.0, 1),
+    ]
+
+    weekly = get_metric_trend(three_days, "total_duration_hours", MONDAY, NEXT_MONDAY, "week")
+    assert [(p["period"], p["value"], p["days"]) for p in weekly] == [(MONDAY, 7.0, 2), (NEXT_MONDAY, 2.0, 1)]
+
+
+def test_average_minutes_are_weighted_by_calls(three_days):
+    [week] = get_metric_trend(three_days, "avg_minutes_per_call", MONDAY, TUESDAY, "week")
+    assert week["value"] == 10.5
+
+
+def test_ratios_are_recomputed_from_counts(three_days):
+    [cnq] = get_metric_trend(three_days, "carrier_not_qualified", MONDAY, TUESDAY, "week")
+    assert (cnq["value"], cnq["count"], cnq["total"]) == (12.5, 5, 40)
+
+    [success] = get_metric_trend(three_days, "success_rate_percent", MONDAY, TUESDAY, "total")
+    assert (success["value"], success["count"], success["total"]) == (67.86, 19, 28)
+
+
+def test_breakdowns_are_shares_of_the_period(three_days):
+    shares = get_metric_trend(three_days, "call_classification", MONDAY, NEXT_MONDAY, "total")
+    assert [(p["period"], p["dimension"], p["count"], p["value"]) for p in shares] == [
+        (MONDAY, "success", 29, 60.42), (MONDAY, "failure", 19, 39.58),
+    ]
+
+
+def test_facts_of_reports_saved_before_the_table_are_written_on_init(three_days):
+    with get_db_connection() as conn:
+        storage._execute(conn, "DELETE FROM daily_report_metrics WHERE org_id = ?", (three_days,))
+        conn.commit()
+    assert get_metric_trend(three_days, "total_calls", MONDAY, NEXT_MONDAY, "total") == []
+
+    storage.init_database()
+
+    [total] = get_metric_trend(three_days, "total_calls", MONDAY, NEXT_MONDAY, "total")
+    assert (total["value"], total["days"]) == (60.0, 3)
+
+
+def test_unknown_metric_or_interval_is_rejected(org_id):
+    with pytest.raises(ValueError):
+        get_metric_trend(org_id, "not_a_metric", MONDAY, TUESDAY)
+    with pytest.raises(ValueError):
+        get_metric_trend(org_id, "total_calls", MONDAY, TUESDAY, "year")
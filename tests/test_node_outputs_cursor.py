@@ -0,0 +1,56 @@
+import base64
+import json
+
+import pytest
+
+from db import decode_node_outputs_cursor, encode_node_outputs_cursor
+
+
+def test_cursor_round_trip():
+    cursor = encode_node_outputs_cursor("2026-03-02 14:05:09.123456", "run_01-ABC")
+
+    assert "=" not in cursor
+    assert decode_node_outputs_cursor(cursor) == ("2026-03-02 14:05:09.123456", "run_01-ABC")
+
+
+def _forge(run_timestamp, run_id):
+    payload = json.dumps([run_timestamp, run_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+@pytest.mark.parametrize("cursor", [
+    _forge("2026-03-02 14:05:09", "x' OR 1=1 --"),
+    _forge("2026-03-02'; DROP TABLE x; --", "run_1"),
+    _forge(1700000000, "run_1"),
+    base64.urlsafe_b64encode(b'["2026-03-02 14:05:09"]').decode("ascii"),
+    "not-a-cursor!",
+])
+def test_tampered_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_node_outputs_cursor(cursor)
+
+
+def test_keyset_pages_cover_every_row_once(clickhouse, monkeypatch):
+    import db
+
+    monkeypatch.setenv("ORG_ID", "org-a")
+    monkeypatch.delenv("EXCLUDED_USER_NUMBERS", raising=False)
+    # Two runs share a timestamp, so the keyset also has to order by run id
+    for run_id, timestamp in [("run-a", "2026-03-02 08:00:00"), ("run-b", "2026-03-02 09:00:00"),
+                              ("run-c", "2026-03-02 09:00:00"), ("run-d", "2026-03-02 11:30:00.250")]:
+        clickhouse.add_run(run_id, "org-a", timestamp, [{"duration": 60, "user_number": "+15551110001"}],
+                           [{"node": "broker"}, {"node": "broker"}])
+
+    pages, after = [], None
+    while True:
+        query = db._daily_node_outputs_query("2026-03-02T00:00:00", "2026-03-03T00:00:00", "broker", 3,
+                                             after=after, paginate=True)
+        rows = clickhouse.query(query).result_rows
+        if not rows:
+            break
+        pages.append([row[0] for row in rows])
+        last = rows[-1]
+        after = decode_node_outputs_cursor(encode_node_outputs_cursor(last[1], last[0]))
+
+    # Each page is extended to the end of its last run
+    assert pages == [["run-d", "run-d", "run-c", "run-c"], ["run-b", "run-b", "run-a", "run-a"]]
@@ -0,0 +1,104 @@
+import pytest
+
+import report_engine
+from db import DAILY_REPORT_FETCHERS
+from report_engine import build_daily_report
+
+ORG = "org-a"
+BROKER = "broker-node"
+START = "2026-03-02T00:00:00"
+END = "2026-03-03T00:00:00"
+IN_WINDOW = "2026-03-02 10:00:00"
+
+
+@pytest.fixture
+def calls(clickhouse, monkeypatch):
+    monkeypatch.setenv("ORG_ID", ORG)
+    monkeypatch.setenv("BROKER_NODE_PERSISTENT_ID", BROKER)
+    monkeypatch.setenv("DAILY_REPORT_ENGINE", "single_pass")
+    monkeypatch.setenv("REPORT_METRIC_MAX_ATTEMPTS", "3")
+    monkeypatch.setenv("REPORT_METRIC_RETRY_BASE_SECONDS", "0")
+    for run_id, notes in (
+        ("run-a", "NO_AGREEMENT"), ("run-b", "NO_AGREEMENT"), ("run-c", "AGREEMENT_REACHED_WITHOUT_NEGOTIATION"),
+    ):
+        clickhouse.add_run(run_id, ORG, IN_WINDOW, [{"duration": 60, "user_number": f"+1555{run_id}"}], [{
+            "node": BROKER,
+            "result.call.call_classification": "success",
+            "result.load.load_status": "FOUND",
+            "result.pricing.pricing_notes": notes,
+        }])
+    return clickhouse
+
+
+def _failing(client, monkeypatch, fn, failures):
+    """Wrap `fn` so its ClickHouse queries fail on its first `failures` calls; returns (wrapper, attempts)."""
+    attempts = []
+
+    def fail(query, settings=None, **kwargs):
+        raise ConnectionError("Connection reset by peer")
+
+    def wrapper(*args, **kwargs):
+        attempts.append(1)
+        if len(attempts) > failures:
+            return fn(*args, **kwargs)
+        with monkeypatch.context() as m:
+            m.setattr(client, "query", fail)
+            return fn(*args, **kwargs)
+
+    return wrapper, attempts
+
+
+def _fail_single_pass(calls, monkeypatch):
+    single_pass, _ = _failing(calls, monkeypatch, report_engine.fetch_daily_report_stats, failures=1)
+    monkeypatch.setattr(report_engine, "fetch_daily_report_stats", single_pass)
+
+
+def _fail_metric(calls, monkeypatch, field, failures):
+    fetcher, attempts = _failing(calls, monkeypatch, DAILY_REPORT_FETCHERS[field], failures)
+    monkeypatch.setitem(DAILY_REPORT_FETCHERS, field, fetcher)
+    return attempts
+
+
+def test_failed_single_pass_falls_back_to_per_metric_queries(calls, monkeypatch):
+    healthy = build_daily_report(START, END, "UTC")
+    _fail_single_pass(calls, monkeypatch)
+
+    assert build_daily_report(START, END, "UTC") == healthy
+    assert healthy["degraded_metrics"] == []
+
+
+def test_only_the_failed_metric_is_retried(calls, monkeypatch):
+    _fail_single_pass(calls, monkeypatch)
+    pricing_attempts = _fail_metric(calls, monkeypatch, "pricing", failures=2)
+    load_status_attempts = _fail_metric(calls, monkeypatch, "load_status", failures=0)
+
+    report = build_daily_report(START, END, "UTC")
+
+    assert len(pricing_attempts) == 3
+    assert len(load_status_attempts) == 1
+    assert report["degraded_metrics"] == []
+    assert [(row["pricing_notes"], row["count"]) for row in report["breakdowns"]["pricing_notes"]] == [
+        ("NO_AGREEMENT", 2), ("AGREEMENT_REACHED_WITHOUT_NEGOTIATION", 1),
+    ]
+
+
+def test_metric_failing_every_attempt_is_reported_as_degraded(calls, monkeypatch):
+    _fail_single_pass(calls, monkeypatch)
+    pricing_attempts = _fail_metric(calls, monkeypatch, "pricing", failures=3)
+
+    report = build_daily_report(START, END, "UTC")
+
+    assert len(pricing_attempts) == 3
+    assert report["degraded_metrics"] == ["pricing"]
+    assert report["breakdowns"]["pricing_notes"] == []
+    assert report["kpis"]["total_calls"] == 3
+    assert [(row["load_status"], row["count"]) for row in report["breakdowns"]["load_status"]] == [("FOUND", 3)]
+
+
+def test_report_fails_when_every_metric_fails(calls, monkeypatch):
+    _fail_single_pass(calls, monkeypatch)
+    for field in list(DAILY_REPORT_FETCHERS):
+        _fail_metric(calls, monkeypatch, field, failures=3)
+
+    with pytest.raises(RuntimeError):
+        build_daily_report(START, END, "UTC")
@@ -0,0 +1,77 @@
+import uuid
+
+import pytest
+
+import worker
+from report_queue import STATUS_FAILED, STATUS_QUEUED
+from storage import ReportTask, claim_report_task, enqueue_report_task, finish_report_task, get_report_task
+
+TASK_TYPE = "test_fail"
+
+
+def _enqueue(max_attempts):
+    return enqueue_report_task(ReportTask(
+        id=None, task_type=TASK_TYPE, max_attempts=max_attempts, dedupe_key=f"test:{uuid.uuid4().hex}",
+    ))
+
+
+def _fail(task):
+    raise RuntimeError("boom")
+
+
+@pytest.fixture
+def failing_handler(monkeypatch):
+    monkeypatch.setitem(worker.TASK_HANDLERS, TASK_TYPE, _fail)
+    monkeypatch.setenv("WORKER_RETRY_BASE_SECONDS", "0")
+
+
+def test_task_cannot_be_claimed_twice():
+    task = _enqueue(max_attempts=3)
+
+    claimed = claim_report_task("worker-a", lease_seconds=60)
+    assert claimed.id == task.id
+    assert claimed.attempts == 1
+    assert claim_report_task("worker-b", lease_seconds=60) is None
+
+    claimed.status = STATUS_FAILED
+    assert finish_report_task(claimed)
+
+
+def test_expired_lease_is_reclaimed_and_stale_worker_cannot_finish():
+    task = _enqueue(max_attempts=3)
+
+    stale = claim_report_task("worker-a", lease_seconds=-1)
+    reclaimed = claim_report_task("worker-b", lease_seconds=60)
+    assert reclaimed.id == task.id
+    assert reclaimed.attempts == 2
+
+    stale.status = STATUS_FAILED
+    assert not finish_report_task(stale)
+    reclaimed.status = STATUS_FAILED
+    assert finish_report_task(reclaimed)
+
+
+def test_task_fails_after_max_attempts(failing_handler):
+    task = _enqueue(max_attempts=2)
+
+    first = worker.process_task(claim_report_task("worker-a", lease_seconds=60))
+    assert first.status == STATUS_QUEUED
+    assert get_report_task(task.id).status == STATUS_QUEUED
+
+    second = worker.process_task(claim_report_task("worker-a", lease_seconds=60))
+    assert second.attempts == 2
+    assert second.status == STATUS_FAILED
+    stored = get_report_task(task.id)
+    assert stored.status == STATUS_FAILED
+    assert stored.error_message == "boom"
+    assert claim_report_task("worker-a", lease_seconds=60) is None
+
+
+def test_reclaimed_task_past_max_attempts_fails_without_running(failing_handler):
+    task = _enqueue(max_attempts=1)
+
+    claim_report_task("worker-a", lease_seconds=-1)  # worker dies on its only attempt
+    reclaimed = worker.process_task(claim_report_task("worker-b", lease_seconds=60))
+    assert reclaimed.attempts == 2
+    assert reclaimed.status == STATUS_FAILED
+    assert get_report_task(task.id).error_message == "Worker lease expired on the last attempt"
@@ -0,0 +1,80 @@
+import json
+import uuid
+
+import pytest
+
+import storage
+from storage import DailyReport, get_db_connection, get_report_summaries, save_daily_report, save_daily_reports
+
+
+def _report_data(total_calls, degraded_metrics=()):
+    return {
+        "kpis": {
+            "total_calls": total_calls,
+            "classified_calls": total_calls - 1,
+            "total_duration_hours": 1.5,
+            "avg_minutes_per_call": 4.5,
+            "success_rate_percent": 62.5,
+            "non_convertible_calls_with_carrier_not_qualified": {"count": 2, "total_calls": 8, "percentage": 25.0},
+            "carrier_not_qualified": None,
+            "successfully_transferred_for_booking": {
+                "count": 3, "total_calls": 8, "successfully_transferred_for_booking_percentage": 37.5,
+            },
+        },
+        "breakdowns": {},
+        "degraded_metrics": list(degraded_metrics),
+    }
+
+
+@pytest.fixture
+def org_id():
+    return f"org-{uuid.uuid4().hex[:8]}"
+
+
+def test_summary_columns_are_read_without_the_report_json(org_id):
+    save_daily_report(DailyReport(id=None, org_id=org_id, report_date="2026-03-02", report_data=_report_data(9)))
+
+    [summary] = get_report_summaries(org_id)
+
+    assert summary.report_date == "2026-03-02"
+    assert summary.total_calls == 9
+    assert summary.classified_calls == 8
+    assert summary.total_duration_hours == 1.5
+    assert summary.avg_minutes_per_call == 4.5
+    assert summary.success_rate_percent == 62.5
+    assert summary.non_convertible_percent == 25.0
+    assert summary.carrier_not_qualified_percent is None
+    assert summary.successfully_transferred_percent == 37.5
+    assert summary.is_degraded is False
+
+
+def test_saving_a_report_again_updates_its_summary(org_id):
+    save_daily_reports([
+        DailyReport(id=None, org_id=org_id, report_date=day, report_data=_report_data(5))
+        for day in ("2026-03-01", "2026-03-02", "2026-03-03")
+    ])
+    save_daily_report(DailyReport(
+        id=None, org_id=org_id, report_date="2026-03-02", report_data=_report_data(7, ["pricing"]),
+    ))
+
+    summaries = get_report_summaries(org_id, start_date="2026-03-02", end_date="2026-03-03")
+
+    assert [(s.report_date, s.total_calls, s.is_degraded) for s in summaries] == [
+        ("2026-03-03", 5, False), ("2026-03-02", 7, True),
+    ]
+    assert [s.report_date for s in get_report_summaries(org_id, limit=1)] == ["2026-03-03"]
+
+
+def test_migration_fills_the_summary_of_reports_saved_before_the_columns(org_id):
+    with get_db_connection() as conn:
+        storage._execute(conn, """
+            INSERT INTO daily_reports (org_id, report_date, report_data) VALUES (?, ?, ?)
+        """, (org_id, "2026-03-02", json.dumps(_report_data(12))))
+        conn.commit()
+    assert get_report_summaries(org_id)[0].success_rate_percent is None
+
+    storage.init_database()
+
+    [summary] = get_report_summaries(org_id)
+    assert summary.total_calls == 12
+    assert summary.success_rate_percent == 62.5
@@ -0,0 +1,134 @@
+import uuid
+
+import pytest
+
+import storage
+from storage import DailyReport, get_db_connection, get_metric_trend, get_report_rollup, save_daily_report, save_daily_reports
+
+
+MONDAY = "2026-03-02"
+TUESDAY = "2026-03-03"
+
+
+def _report(org_id, report_date, total_calls, successes, failures, not_qualified, avg_minutes, hours, load_ids):
+    return DailyReport(
+        id=None,
+        org_id=org_id,
+        report_date=report_date,
+        report_data={
+            "kpis": {
+                "total_calls": total_calls,
+                "classified_calls": successes + failures,
+                "total_duration_hours": hours,
+                "avg_minutes_per_call": avg_minutes,
+                "success_rate_percent": round(100.0 * successes / (successes + failures), 2),
+                "carrier_not_qualified": {
+                    "count": not_qualified,
+                    "total_calls": total_calls,
+                    "percentage": round(100.0 * not_qualified / total_calls, 2),
+                },
+                "number_of_unique_loads": len(load_ids),
+            },
+            "breakdowns": {
+                "call_classification": [
+                    {"call_classification": "success", "count": successes},
+                    {"call_classification": "failure", "count": failures},
+                ],
+            },
+        },
+        distinct_members={"number_of_unique_loads": load_ids},
+    )
+
+
+@pytest.fixture
+def org_id():
+    return f"test-org-{uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture
+def two_days(org_id):
+    save_daily_reports([
+        _report(org_id, MONDAY, 10, 4, 4, 2, 12.0, 2.0, ["a", "b", "c"]),
+        _report(org_id, TUESDAY, 30, 15, 5, 3, 10.0, 5.0, ["b", "c", "d"]),
+    ])
+    return org_id
+
+
+def test_weekly_rollup_merges_days(two_days):
+    rollup = get_report_rollup(two_days, "week", TUESDAY)
+
+    assert rollup.period_start == MONDAY
+    assert rollup.period_end == "2026-03-08"
+    assert rollup.days_covered == 2
+    kpis = rollup.report_data["kpis"]
+    assert kpis["total_calls"] == 40
+    assert kpis["classified_calls"] == 28
+    assert kpis["total_duration_hours"] == 7.0
+    # Weighted by each day's calls, not the mean of the daily averages
+    assert kpis["avg_minutes_per_call"] == 10.5
+    assert kpis["success_rate_percent"] == 67.86
+    assert kpis["carrier_not_qualified"] == {"count": 5, "total_calls": 40, "percentage": 12.5}
+    # Union of the days' load ids, not 3 + 3
+    assert kpis["number_of_unique_loads"] == 4
+
+    coverage = rollup.report_data["coverage"]
+    assert coverage["days_in_period"] == 7
+    assert coverage["missing_dates"] == ["2026-03-04", "2026-03-05", "2026-03-06", "2026-03-07", "2026-03-08"]
+    assert coverage["distinct_days"] == {"number_of_unique_loads": 2}
+
+
+def test_resaving_a_day_updates_the_rollup(two_days):
+    save_daily_report(_report(two_days, TUESDAY, 30, 15, 5, 3, 10.0, 5.0, ["d", "e"]))
+
+    kpis = get_report_rollup(two_days, "week", MONDAY).report_data["kpis"]
+    assert kpis["number_of_unique_loads"] == 5
+
+
+def test_rollup_breakdown_rows_have_the_daily_fields(org_id):
+    def day(report_date, found, not_found):
+        total = found + not_found
+        return DailyReport(id=None, org_id=org_id, report_date=report_date, report_data={
+            "kpis": {"total_calls": total},
+            "breakdowns": {"load_status": [
+                {"load_status": "FOUND", "count": found, "total_calls": total,
+                 "load_status_percentage": round(100.0 * found / total, 2)},
+                {"load_status": "NOT_FOUND", "count": not_found, "total_calls": total,
+                 "load_status_percentage": round(100.0 * not_found / total, 2)},
+            ]},
+        })
+
+    save_daily_reports([day(MONDAY, 3, 1), day(TUESDAY, 5, 3)])
+
+    assert get_report_rollup(org_id, "week", MONDAY).report_data["breakdowns"]["load_status"] == [
+        {"load_status": "FOUND", "count": 8, "total_calls": 12, "load_status_percentage": 66.67},
+        {"load_status": "NOT_FOUND", "count": 4, "total_calls": 12, "load_status_percentage": 33.33},
+    ]
+
+
+def _delete_rollups(org_id):
+    with get_db_connection() as conn:
+        storage._execute(conn, "DELETE FROM report_rollups WHERE org_id = ?", (org_id,))
+        conn.commit()
+
+
+def test_rollups_of_older_reports_are_built_once(two_days):
+    _delete_rollups(two_days)
+    with get_db_connection() as conn:
+        storage._execute(conn, "DELETE FROM schema_migrations WHERE name = 'report_rollups'")
+        conn.commit()
+
+    storage.init_database()
+    assert get_report_rollup(two_days, "week", MONDAY).report_data["kpis"]["total_calls"] == 40
+
+    # Later startups don't scan the daily reports again
+    _delete_rollups(two_days)
+    storage.init_database()
+    assert get_report_rollup(two_days, "week", MONDAY) is None
+
+
+def test_unique_loads_trend_counts_each_load_once_per_period(two_days):
+    daily = get_metric_trend(two_days, "number_of_unique_loads", MONDAY, TUESDAY, "day")
+    assert [(p["period"], p["value"], p["days"]) for p in daily] == [(MONDAY, 3.0, 1), (TUESDAY, 3.0, 1)]
+
+    weekly = get_metric_trend(two_days, "number_of_unique_loads", MONDAY, TUESDAY, "week")
+    assert [(p["period"], p["value"], p["days"]) for p in weekly] == [(MONDAY, 4.0, 2)]
@@ -0,0 +1,228 @@
+"""
+Report generation worker.
+
+Consumes the `report_tasks` queue (see report_queue.py) so report generation runs outside the
+API processes. Run one or more of these next to the API with REPORT_QUEUE_ENABLED=true:
+
+    python -m worker
+    python -m worker --concurrency 4
+    python -m worker --once    # drain the queue and exit
+
+Each claimed task holds a lease that is renewed while it runs; if the worker dies, another
+worker reclaims the task when the lease expires. A task that raises is retried with
+exponential backoff (WORKER_RETRY_BASE_SECONDS * 2^(attempt-1)) until REPORT_TASK_MAX_ATTEMPTS.
+
+Configuration via environment variables:
+- WORKER_CONCURRENCY: Tasks run at once per worker process (default: 2)
+- WORKER_POLL_SECONDS: Idle wait between queue polls (default: 5)
+- WORKER_LEASE_SECONDS: Task lease duration, renewed every third of it (default: 300)
+- WORKER_RETRY_BASE_SECONDS: Backoff before the first retry of a failed task (default: 60)
+"""
+
+import os
+import sys
+import time
+import json
+import socket
+import signal
+import logging
+import argparse
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+if __name__ == "__main__":
+    # Load `.env` before storage reads DATABASE_URL at import time
+    load_dotenv(dotenv_path=Path(__file__).parent / ".env", override=False)
+
+from storage import (
+    ReportTask,
+    claim_report_task,
+    ensure_db_initialized,
+    finish_report_task,
+    renew_report_task_lease,
+)
+from report_queue import (
+    STATUS_FAILED,
+    STATUS_QUEUED,
+    STATUS_SUCCEEDED,
+    TASK_BACKFILL,
+    TASK_CATCHUP,
+    TASK_DAILY,
+    TASK_MANUAL,
+)
+from scheduler import fill_missing_reports, generate_all_daily_reports, generate_reports_now
+from backfill import job_to_dict, run_backfill_job
+
+logger = logging.getLogger(__name__)
+
+
+def get_worker_concurrency() -> int:
+    """Get number of tasks a worker process runs at once."""
+    return max(1, int(os.getenv("WORKER_CONCURRENCY", "2")))
+
+
+def get_poll_seconds() -> float:
+    """Get the idle wait between queue polls."""
+    return max(0.1, float(os.getenv("WORKER_POLL_SECONDS", "5")))
+
+
+def get_lease_seconds() -> float:
+    """Get the task lease duration."""
+    return max(3.0, float(os.getenv("WORKER_LEASE_SECONDS", "300")))
+
+
+def get_retry_base_seconds() -> float:
+    """Get the backoff before the first retry of a failed task."""
+    return max(0.0, float(os.getenv("WORKER_RETRY_BASE_SECONDS", "60")))
+
+
+def _run_daily(task: ReportTask) -> Dict[str, Any]:
+    return generate_all_daily_reports()
+
+
+def _run_catchup(task: ReportTask) -> Dict[str, Any]:
+    return fill_missing_reports()
+
+
+def _run_manual(task: ReportTask) -> Dict[str, Any]:
+    return generate_reports_now(task.org_id, task.target_date)
+
+
+def _run_backfill(task: ReportTask) -> Dict[str, Any]:
+    job = run_backfill_job(int(task.payload["job_id"]))
+    if job is None:
+        return {"success": False, "error": f"Backfill job {task.payload['job_id']} not found"}
+    return job_to_dict(job)
+
+
+# task_type -> handler; a handler raises to have the task retried
+TASK_HANDLERS: Dict[str, Callable[[ReportTask], Dict[str, Any]]] = {
+    TASK_DAILY: _run_daily,
+    TASK_CATCHUP: _run_catchup,
+    TASK_MANUAL: _run_manual,
+    TASK_BACKFILL: _run_backfill,
+}
+
+
+def _keep_lease(task: ReportTask, done: threading.Event) -> None:
+    """Renew the task's lease until `done` is set or the task is reclaimed elsewhere."""
+    lease = get_lease_seconds()
+    while not done.wait(lease / 3):
+        try:
+            if not renew_report_task_lease(task, lease):
+                logger.warning("Lost the lease on report task %s", task.id)
+                return
+        except Exception as e:
+            logger.warning("Could not renew lease on report task %s: %s", task.id, e)
+
+
+def process_task(task: ReportTask) -> ReportTask:
+    """Run a claimed task and record its outcome (succeeded, failed, or queued for a retry)."""
+    handler = TASK_HANDLERS.get(task.task_type)
+    logger.info("Running report task %s (%s, attempt %d/%d)", task.id, task.task_type, task.attempts, task.max_attempts)
+
+    if handler is None:
+        task.status = STATUS_FAILED
+        task.error_message = f"Unknown task type {task.task_type!r}"
+    elif task.attempts > task.max_attempts:
+        # Reclaimed after its worker died on the last attempt
+        task.status = STATUS_FAILED
+        task.error_message = task.error_message or "Worker lease expired on the last attempt"
+    else:
+        done = threading.Event()
+        renewer = threading.Thread(target=_keep_lease, args=(task, done), name=f"lease-{task.id}", daemon=True)
+        renewer.start()
+        try:
+            task.result = handler(task)
+            # generate_reports_now reports per-org failures (already retried) in its result
+            task.status = STATUS_FAILED if task.result.get("success") is False else STATUS_SUCCEEDED
+            task.error_message = task.result.get("error")
+        except Exception as e:
+            logger.exception("Report task %s failed: %s", task.id, e)
+            task.error_message = str(e)
+            if task.attempts < task.max_attempts:
+                task.status = STATUS_QUEUED
+                task.run_after = time.time() + get_retry_base_seconds() * (2 ** (task.attempts - 1))
+            else:
+                task.status = STATUS_FAILED
+        finally:
+            done.set()
+
+    if not finish_report_task(task):
+        logger.warning("Report task %s was reclaimed by another worker; its outcome was not saved", task.id)
+    else:
+        logger.info("Report task %s %s", task.id, task.status)
+    return task
+
+
+def work(worker_id: str, stop: threading.Event, once: bool = False) -> int:
+    """
+    Claim and run tasks until `stop` is set (or, with `once`, until the queue is empty).
+    Returns the number of tasks processed.
+    """
+    processed = 0
+    while not stop.is_set():
+        try:
+            task = claim_report_task(worker_id, get_lease_seconds())
+        except Exception as e:
+            logger.warning("Could not claim a report task: %s", e)
+            task = None
+
+        if task is None:
+            if once:
+                break
+            stop.wait(get_poll_seconds())
+            continue
+
+        process_task(task)
+        processed += 1
+    return processed
+
+
+def run_workers(concurrency: int, once: bool = False, stop: Optional[threading.Event] = None) -> int:
+    """Run `concurrency` worker threads until stopped. Returns the number of tasks processed."""
+    stop = stop or threading.Event()
+    base_id = f"{socket.gethostname()}:{os.getpid()}"
+    counts: List[int] = [0] * concurrency
+
+    def target(i: int) -> None:
+        counts[i] = work(f"{base_id}:{i}", stop, once=once)
+
+    threads = [threading.Thread(target=target, args=(i,), name=f"report-worker-{i}") for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m worker", description="Run report generation tasks from the queue.")
+    parser.add_argument("--concurrency", type=int, help="Tasks run at once (default: WORKER_CONCURRENCY)")
+    parser.add_argument("--once", action="store_true", help="Exit once the queue is empty")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+    ensure_db_initialized()
+
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        logger.info("Received signal %s, finishing running tasks before exiting", signum)
+        stop.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    concurrency = max(1, args.concurrency or get_worker_concurrency())
+    logger.info("Report worker started with concurrency %d", concurrency)
+    processed = run_workers(concurrency, once=args.once, stop=stop)
+    print(json.dumps({"tasks_processed": processed}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())